@@ -7,6 +7,7 @@
 
 from __future__ import annotations
 
+from collections.abc import MutableMapping
 from datetime import datetime
 from enum import StrEnum
 
@@ -49,16 +50,20 @@ def __init__(
 
     def inject_headers(self, response: Response) -> None:
         """Inject versioning and deprecation headers into response."""
-        response.headers["X-API-Version"] = self.version.value
-        response.headers["X-API-Status"] = self.status.value
+        self.apply_headers(response.headers)
+
+    def apply_headers(self, headers: MutableMapping[str, str]) -> None:
+        """Write versioning and deprecation headers into a mutable header mapping."""
+        headers["X-API-Version"] = self.version.value
+        headers["X-API-Status"] = self.status.value
 
         if self.deprecated_at:
-            response.headers["Deprecation"] = f"@{int(self.deprecated_at.timestamp())}"
+            headers["Deprecation"] = f"@{int(self.deprecated_at.timestamp())}"
             if self.migration_guide_url:
-                response.headers["Link"] = f'<{self.migration_guide_url}>; rel="deprecation-guide"'
+                headers["Link"] = f'<{self.migration_guide_url}>; rel="deprecation-guide"'
 
         if self.sunset_at:
-            response.headers["Sunset"] = self.sunset_at.strftime("%a, %d %b %Y %H:%M:%S GMT")
+            headers["Sunset"] = self.sunset_at.strftime("%a, %d %b %Y %H:%M:%S GMT")
 
 
 # Unified registry of version metadata
@@ -84,6 +84,7 @@ class ServerSettings:
     debug: bool = False
     root_path: str = ""
     proxy_headers: bool = True
+    asgi_pipeline: bool = False  # Run the middleware chain as pure-ASGI pipeline stages
 
     @classmethod
     def from_env(cls) -> ServerSettings:
@@ -97,6 +98,7 @@ def from_env(cls) -> ServerSettings:
             debug=_parse_bool(env.get("MOTHERSHIP_DEBUG")),
             root_path=env.get("MOTHERSHIP_ROOT_PATH", ""),
             proxy_headers=_parse_bool(env.get("MOTHERSHIP_PROXY_HEADERS"), True),
+            asgi_pipeline=_parse_bool(env.get("MOTHERSHIP_ASGI_PIPELINE"), False),
         )
 
 
@@ -671,6 +673,11 @@ class BillingSettings:
     # Billing cycle
     billing_cycle_days: int = 30
 
+    # Usage metering pipeline
+    usage_queue_size: int = 10000  # Pending usage events before new ones are dropped
+    usage_batch_size: int = 500  # Flush as soon as this many events are pending
+    usage_flush_interval_seconds: float = 1.0  # Flush at least this often
+
     @classmethod
     def from_env(cls) -> BillingSettings:
         """Load billing settings from environment variables."""
@@ -695,6 +702,9 @@ def from_env(cls) -> BillingSettings:
             resonance_event_overage_cents=int(env.get("BILLING_RESONANCE_OVERAGE_CENTS", "1")),
             high_impact_event_overage_cents=int(env.get("BILLING_HIGH_IMPACT_OVERAGE_CENTS", "5")),
             billing_cycle_days=int(env.get("BILLING_CYCLE_DAYS", "30")),
+            usage_queue_size=int(env.get("BILLING_USAGE_QUEUE_SIZE", "10000")),
+            usage_batch_size=int(env.get("BILLING_USAGE_BATCH_SIZE", "500")),
+            usage_flush_interval_seconds=float(env.get("BILLING_USAGE_FLUSH_INTERVAL_SECONDS", "1.0")),
         )
 
 
@@ -515,6 +515,12 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         reset_cockpit_service()
         logger.info("Cockpit service shut down")
 
+        # Write out queued usage records before the database goes away
+        from .services.billing import close_usage_meters
+
+        await close_usage_meters()
+        logger.info("Usage meters flushed")
+
         # Stop DB metrics updater
         from .db.metrics_updater import stop_metrics_updater
 
@@ -685,7 +691,7 @@ def create_app(settings: MothershipSettings | None = None) -> FastAPI:
     app.add_middleware(GZipMiddleware, minimum_size=1000)
 
     # 2. Mothership custom middlewares (Centralized Setup)
-    from .middleware import setup_middleware
+    from .middleware import install_middleware_plan, setup_middleware
     from .middleware.accountability_contract import AccountabilityContractMiddleware
 
     # This sets up:
@@ -707,15 +713,19 @@ def create_app(settings: MothershipSettings | None = None) -> FastAPI:
         logger.error(f"Failed to apply security defaults: {e}")
         # Continue startup but log the security issue
 
+    # 4-7. Monitoring and enforcement middleware
+    # Collected as a plan in add order (innermost first). With MOTHERSHIP_ASGI_PIPELINE,
+    # data corruption detection, DRT and accountability contracts run as pipeline stages;
+    # stream monitoring (already pure ASGI) and Safety keep their positions in the chain.
+    # Stream monitoring, DRT and accountability are optional: if one fails to register
+    # it is logged and skipped, as before the plan existed.
+    from .middleware.pipeline import DRTStage
+
+    monitoring_plan: list[tuple[type, dict[str, Any]]] = []
+
     # 4. Stream Monitoring Middleware
-    try:
-        app.add_middleware(StreamMonitorMiddleware)
-        logger.info("Stream monitoring middleware enabled")
-    except ImportError:
-        logger.warning(
-            "Stream monitoring middleware not available. "
-            "Install prometheus_client for metrics: pip install prometheus_client"
-        )
+    monitoring_plan.append((StreamMonitorMiddleware, {}))
+    logger.info("Stream monitoring middleware enabled")
 
     # 5. Data Corruption Detection Middleware
     # Tracks and penalizes endpoints that cause data/environment corruption
@@ -723,15 +733,19 @@ def create_app(settings: MothershipSettings | None = None) -> FastAPI:
         from grid.resilience.data_corruption_penalty import DataCorruptionPenaltyTracker
 
         corruption_tracker = DataCorruptionPenaltyTracker()
-        app.add_middleware(
-            DataCorruptionDetectionMiddleware,
-            tracker=corruption_tracker,
-            critical_endpoints={
-                "/api/v1/data/upload",
-                "/api/v1/data/delete",
-                "/api/v1/config/update",
-                "/api/v1/cockpit/state",
-            },
+        monitoring_plan.append(
+            (
+                DataCorruptionDetectionMiddleware,
+                {
+                    "tracker": corruption_tracker,
+                    "critical_endpoints": {
+                        "/api/v1/data/upload",
+                        "/api/v1/data/delete",
+                        "/api/v1/config/update",
+                        "/api/v1/cockpit/state",
+                    },
+                },
+            )
         )
         logger.info("Data corruption detection middleware enabled")
     except ImportError as e:
@@ -739,51 +753,44 @@ def create_app(settings: MothershipSettings | None = None) -> FastAPI:
 
     # 6. DRT (Don't Repeat Themselves) Monitoring Middleware
     # Monitors endpoint behaviors for attack vector similarities and escalates protections
-    try:
-        # Create unified middleware instance with settings from SecuritySettings
-        # Register DRT middleware via add_middleware (single instance)
-        app.add_middleware(
+    monitoring_plan.append(
+        (
             UnifiedDRTMiddleware,
-            enabled=settings.security.drt_enabled,
-            similarity_threshold=settings.security.drt_behavioral_similarity_threshold,
-            retention_hours=settings.security.drt_retention_hours,
-            enforcement_mode=settings.security.drt_enforcement_mode,
-            websocket_monitoring_enabled=settings.security.drt_websocket_monitoring_enabled,
-            api_movement_logging_enabled=settings.security.drt_api_movement_logging_enabled,
-            penalty_points_enabled=settings.security.drt_penalty_points_enabled,
-            slo_evaluation_interval_seconds=settings.security.drt_slo_evaluation_interval_seconds,
-            slo_violation_penalty_base=settings.security.drt_slo_violation_penalty_base,
-            report_generation_enabled=settings.security.drt_report_generation_enabled,
-            sampling_rate=1.0,
-            escalation_timeout_minutes=60,
-            rate_limit_multiplier=0.5,
-            alert_on_escalation=True,
+            {
+                "enabled": settings.security.drt_enabled,
+                "similarity_threshold": settings.security.drt_behavioral_similarity_threshold,
+                "retention_hours": settings.security.drt_retention_hours,
+                "enforcement_mode": settings.security.drt_enforcement_mode,
+                "websocket_monitoring_enabled": settings.security.drt_websocket_monitoring_enabled,
+                "api_movement_logging_enabled": settings.security.drt_api_movement_logging_enabled,
+                "penalty_points_enabled": settings.security.drt_penalty_points_enabled,
+                "slo_evaluation_interval_seconds": settings.security.drt_slo_evaluation_interval_seconds,
+                "slo_violation_penalty_base": settings.security.drt_slo_violation_penalty_base,
+                "report_generation_enabled": settings.security.drt_report_generation_enabled,
+                "sampling_rate": 1.0,
+                "escalation_timeout_minutes": 60,
+                "rate_limit_multiplier": 0.5,
+                "alert_on_escalation": True,
+            },
         )
-        # Store reference for shutdown handling and router access
-        # Note: Starlette wraps the middleware, so we retrieve the actual instance
-        # from the middleware stack after registration
-        drt_middleware = app.middleware_stack  # type: ignore[reportAttributeAccessIssue]
-        app.state.drt_middleware = drt_middleware  # type: ignore[reportAttributeAccessIssue]
-        set_unified_drt_middleware(drt_middleware)
-        logger.info("Unified DRT behavioral monitoring middleware enabled")
-    except Exception as e:
-        logger.warning(f"DRT monitoring middleware not available: {e}")
+    )
 
     # 6b. Accountability Contract Enforcement Middleware
     # Enforces accountability contracts with RBAC and claims support
     if settings.security.accountability_enabled:
-        try:
-            app.add_middleware(
+        monitoring_plan.append(
+            (
                 AccountabilityContractMiddleware,
-                enforcement_mode=settings.security.accountability_enforcement_mode,
-                contract_path=settings.security.accountability_contract_path,
-                skip_paths=["/health", "/metrics", "/docs", "/redoc", "/openapi.json"],
-            )
-            logger.info(
-                f"Accountability contract enforcement middleware enabled: mode={settings.security.accountability_enforcement_mode}"
+                {
+                    "enforcement_mode": settings.security.accountability_enforcement_mode,
+                    "contract_path": settings.security.accountability_contract_path,
+                    "skip_paths": ["/health", "/metrics", "/docs", "/redoc", "/openapi.json"],
+                },
             )
-        except Exception as e:
-            logger.warning(f"Accountability contract middleware not available: {e}")
+        )
+        logger.info(
+            f"Accountability contract enforcement middleware enabled: mode={settings.security.accountability_enforcement_mode}"
+        )
 
     # 7. Safety Enforcement Middleware (MANDATORY)
     # This middleware MUST run before model inference endpoints
@@ -791,13 +798,32 @@ def create_app(settings: MothershipSettings | None = None) -> FastAPI:
     try:
         from safety.api.middleware import SafetyMiddleware
 
-        app.add_middleware(SafetyMiddleware)
+        monitoring_plan.append((SafetyMiddleware, {}))
         logger.info("Safety enforcement middleware enabled (MANDATORY)")
     except Exception as e:
         logger.error(f"Safety enforcement middleware failed to load: {e}")
         if settings.is_production:
             raise RuntimeError("Safety middleware is mandatory in production") from e
 
+    stages = install_middleware_plan(
+        app,
+        monitoring_plan,
+        asgi_pipeline=settings.server.asgi_pipeline,
+        optional={StreamMonitorMiddleware, UnifiedDRTMiddleware, AccountabilityContractMiddleware},
+    )
+
+    # Store the DRT instance for shutdown handling and router access. Starlette
+    # builds BaseHTTPMiddleware instances lazily, so outside the pipeline only
+    # the middleware stack is available here.
+    drt_stage = next((stage for stage in stages if isinstance(stage, DRTStage)), None)
+    if drt_stage is not None or any(m.cls is UnifiedDRTMiddleware for m in app.user_middleware):
+        drt_middleware: Any = app.middleware_stack  # type: ignore[reportAttributeAccessIssue]
+        if drt_stage is not None:
+            drt_middleware = drt_stage.policy
+        app.state.drt_middleware = drt_middleware  # type: ignore[reportAttributeAccessIssue]
+        set_unified_drt_middleware(drt_middleware)
+        logger.info("Unified DRT behavioral monitoring middleware enabled")
+
     # 8. Parasite Guard (Total Rickall Defense)
     # Phase 3: Enable Sanitization (Production Enabled)
     if settings.security.parasite_guard_enabled:
@@ -24,16 +24,22 @@
 import uuid
 from contextvars import ContextVar
 from datetime import UTC, datetime, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from fastapi import FastAPI, Request, Response, status
 from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.types import ASGIApp
 
 from ..logging_structured import bind_context, clear_context
 from .versioning import VersioningMiddleware
 
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from .pipeline import PipelineStage
+
 logger = logging.getLogger(__name__)
 
 # Context variables for request tracking
@@ -138,16 +144,12 @@ def __init__(
         self.log_response_body = log_response_body
         self.exclude_paths = exclude_paths or ["/health", "/ping", "/metrics"]
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        # Skip logging for excluded paths
-        if any(request.url.path.startswith(p) for p in self.exclude_paths):
-            return await call_next(request)
-
-        request_id = get_request_id() or "unknown"
-        correlation_id = get_correlation_id()
-        start_time = time.perf_counter()
+    def _is_excluded(self, path: str) -> bool:
+        """Check if a path is excluded from request logging."""
+        return any(path.startswith(p) for p in self.exclude_paths)
 
-        # Log request
+    async def _log_request(self, request: Request, request_id: str, correlation_id: str | None) -> None:
+        """Log an incoming request."""
         log_data = {
             "type": "request",
             "request_id": request_id,
@@ -172,30 +174,50 @@ async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -
 
         logger.info(f"Incoming request: {json.dumps(log_data)}")
 
-        # Process request
-        response = await call_next(request)
-
-        # Log response
-        duration = time.perf_counter() - start_time
+    def _log_response(
+        self,
+        request: Request,
+        request_id: str,
+        correlation_id: str | None,
+        status_code: int,
+        duration: float,
+    ) -> None:
+        """Log a completed request at a level matching its status code."""
         response_log = {
             "type": "response",
             "request_id": request_id,
             "correlation_id": correlation_id,
             "method": request.method,
             "path": request.url.path,
-            "status_code": response.status_code,
+            "status_code": status_code,
             "duration_ms": round(duration * 1000, 2),
             "timestamp": utc_now().isoformat(),
         }
 
         log_level = logging.INFO
-        if response.status_code >= 500:
+        if status_code >= 500:
             log_level = logging.ERROR
-        elif response.status_code >= 400:
+        elif status_code >= 400:
             log_level = logging.WARNING
 
         logger.log(log_level, f"Request completed: {json.dumps(response_log)}")
 
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        # Skip logging for excluded paths
+        if self._is_excluded(request.url.path):
+            return await call_next(request)
+
+        request_id = get_request_id() or "unknown"
+        correlation_id = get_correlation_id()
+        start_time = time.perf_counter()
+
+        await self._log_request(request, request_id, correlation_id)
+
+        # Process request
+        response = await call_next(request)
+
+        self._log_response(request, request_id, correlation_id, response.status_code, time.perf_counter() - start_time)
+
         return response
 
 
@@ -230,35 +252,35 @@ def __init__(
 
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         response = await call_next(request)
+        self._apply_headers(response.headers, request.url.scheme, request.url.path)
+        return response
 
+    def _apply_headers(self, headers: MutableHeaders, scheme: str, path: str) -> None:
+        """Write the security headers for a response to ``path`` over ``scheme``."""
         # Hardened Security Headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        headers["X-Content-Type-Options"] = "nosniff"
+        headers["X-Frame-Options"] = "DENY"
+        headers["X-XSS-Protection"] = "1; mode=block"
+        headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
 
         # Privacy: Minimal permissions by default
-        response.headers["Permissions-Policy"] = (
-            "camera=(), microphone=(), geolocation=(), usb=(self), interest-cohort=()"
-        )
+        headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=(), usb=(self), interest-cohort=()"
 
         # Content Security Policy
-        response.headers["Content-Security-Policy"] = self.csp
+        headers["Content-Security-Policy"] = self.csp
 
         # HSTS (Strict-Transport-Security) - Industry grade if over HTTPS
-        if request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = f"max-age={self.hsts_max_age}; includeSubDomains; preload"
+        if scheme == "https":
+            headers["Strict-Transport-Security"] = f"max-age={self.hsts_max_age}; includeSubDomains; preload"
 
         # Anti-Cache for sensitive paths (optional, but good for security)
-        if request.url.path.startswith("/api/v1/admin") or request.url.path.startswith("/api/v1/auth"):
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-            response.headers["Pragma"] = "no-cache"
+        if path.startswith("/api/v1/admin") or path.startswith("/api/v1/auth"):
+            headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+            headers["Pragma"] = "no-cache"
 
         # Custom headers
         for name, value in self.custom_headers.items():
-            response.headers[name] = value
-
-        return response
+            headers[name] = value
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -367,36 +389,48 @@ def _is_rate_limited(self, key: str) -> bool:
         self._store[key].append(now)
         return False
 
+    def _is_excluded(self, path: str) -> bool:
+        """Check if a path bypasses rate limiting."""
+        return any(path.startswith(p) for p in self.exclude_paths)
+
+    def _limited_response(self) -> JSONResponse:
+        """Build the 429 response returned to a rate limited client."""
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={
+                "success": False,
+                "error": {
+                    "code": "RATE_LIMIT_EXCEEDED",
+                    "message": "Too many requests. Please slow down.",
+                },
+            },
+            headers={
+                "Retry-After": "60",
+                "X-RateLimit-Limit": str(self.requests_per_minute),
+                "X-RateLimit-Remaining": "0",
+            },
+        )
+
+    def _apply_headers(self, headers: MutableHeaders, client_key: str) -> None:
+        """Add rate limit headers for an allowed request."""
+        remaining = self.requests_per_minute - len(self._store.get(client_key, []))
+        headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
+        headers["X-RateLimit-Remaining"] = str(max(0, remaining))
+
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         # Skip rate limiting for excluded paths
-        if any(request.url.path.startswith(p) for p in self.exclude_paths):
+        if self._is_excluded(request.url.path):
             return await call_next(request)
 
         client_key = self._get_client_key(request)
 
         if self._is_rate_limited(client_key):
-            return JSONResponse(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                content={
-                    "success": False,
-                    "error": {
-                        "code": "RATE_LIMIT_EXCEEDED",
-                        "message": "Too many requests. Please slow down.",
-                    },
-                },
-                headers={
-                    "Retry-After": "60",
-                    "X-RateLimit-Limit": str(self.requests_per_minute),
-                    "X-RateLimit-Remaining": "0",
-                },
-            )
+            return self._limited_response()
 
         response = await call_next(request)
 
         # Add rate limit headers
-        remaining = self.requests_per_minute - len(self._store.get(client_key, []))
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(max(0, remaining))
+        self._apply_headers(response.headers, client_key)
 
         return response
 
@@ -436,59 +470,65 @@ async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -
         try:
             return await call_next(request)
         except Exception as exc:
-            request_id = get_request_id() or "unknown"
-            correlation_id = get_correlation_id()
-            logger.exception(f"Unhandled exception in request {request_id}: {exc}")
-
-            error_detail = str(exc) if self.debug else "Internal server error"
-
-            response = JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={
-                    "success": False,
-                    "error": {
-                        "code": "INTERNAL_ERROR",
-                        "message": error_detail,
-                    },
-                    "request_id": request_id,
-                    "correlation_id": correlation_id,
-                    "timestamp": utc_now().isoformat(),
+            return self._error_response(exc)
+
+    def _error_response(self, exc: Exception) -> JSONResponse:
+        """Log an unhandled exception and build the consistent 500 response for it."""
+        request_id = get_request_id() or "unknown"
+        correlation_id = get_correlation_id()
+        logger.exception(f"Unhandled exception in request {request_id}: {exc}")
+
+        error_detail = str(exc) if self.debug else "Internal server error"
+
+        response = JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={
+                "success": False,
+                "error": {
+                    "code": "INTERNAL_ERROR",
+                    "message": error_detail,
                 },
-            )
-            response.headers["X-Request-ID"] = request_id
-            if correlation_id:
-                response.headers["X-Correlation-ID"] = correlation_id
-            return response
+                "request_id": request_id,
+                "correlation_id": correlation_id,
+                "timestamp": utc_now().isoformat(),
+            },
+        )
+        response.headers["X-Request-ID"] = request_id
+        if correlation_id:
+            response.headers["X-Correlation-ID"] = correlation_id
+        return response
 
 
 def setup_middleware(app: FastAPI, settings: Any) -> None:
     """
     Configure all middleware for the application.
 
+    With ``settings.server.asgi_pipeline`` enabled, the chain runs as stages of
+    a single :class:`~.pipeline.ASGIPipelineMiddleware` instead of one
+    ``BaseHTTPMiddleware`` per layer; see :func:`install_middleware_plan`.
+
     Args:
         app: FastAPI application instance
         settings: Application settings
     """
-    # Add middleware in reverse order (last added runs first)
+    # Plan entries are in add order (last added runs first)
+    plan: list[tuple[type, dict[str, Any]]] = []
 
     # Error handling (runs first, catches all errors)
-    app.add_middleware(
-        ErrorHandlingMiddleware,
-        debug=getattr(settings, "debug_enabled", False),
-    )
+    plan.append((ErrorHandlingMiddleware, {"debug": getattr(settings, "debug_enabled", False)}))
 
     # Parasite Guard (Total Rickall Defense - detects parasitic calls)
     if getattr(settings, "security", None) and getattr(settings.security, "parasite_guard_enabled", False):
         try:
             from grid.security.parasite_guard import ParasiteDetectorMiddleware
 
-            app.add_middleware(ParasiteDetectorMiddleware)
+            plan.append((ParasiteDetectorMiddleware, {}))
             logger.info("Parasite Guard middleware enabled")
         except ImportError as e:
             logger.warning(f"Parasite Guard not available: {e}")
 
     # Security headers
-    app.add_middleware(SecurityHeadersMiddleware)
+    plan.append((SecurityHeadersMiddleware, {}))
 
     # Security enforcer (input sanitization, auth verification)
     if getattr(settings, "security", None):
@@ -511,14 +551,18 @@ def setup_middleware(app: FastAPI, settings: Any) -> None:
         # Determine audit logging setting
         audit_logging_enabled = bool(getattr(settings, "telemetry", None) and settings.telemetry.enabled)
 
-        app.add_middleware(
-            SecurityEnforcerMiddleware,
-            strict_mode=getattr(settings.security, "strict_mode", False),
-            audit_logging=audit_logging_enabled,
-            sanitize_inputs=getattr(settings.security, "input_sanitization_enabled", True),
-            enforce_https=settings.is_production if hasattr(settings, "is_production") else False,
-            max_body_size=getattr(settings.security, "max_request_size_bytes", 10 * 1024 * 1024),
-            block_insecure_transport=getattr(settings.security, "block_insecure_transport", False),
+        plan.append(
+            (
+                SecurityEnforcerMiddleware,
+                {
+                    "strict_mode": getattr(settings.security, "strict_mode", False),
+                    "audit_logging": audit_logging_enabled,
+                    "sanitize_inputs": getattr(settings.security, "input_sanitization_enabled", True),
+                    "enforce_https": settings.is_production if hasattr(settings, "is_production") else False,
+                    "max_body_size": getattr(settings.security, "max_request_size_bytes", 10 * 1024 * 1024),
+                    "block_insecure_transport": getattr(settings.security, "block_insecure_transport", False),
+                },
+            )
         )
 
         # Wire up audit service to the middleware after it's added
@@ -531,19 +575,23 @@ def setup_middleware(app: FastAPI, settings: Any) -> None:
     if getattr(settings, "security", None) and getattr(settings.security, "circuit_breaker_enabled", False):
         from .circuit_breaker import CircuitBreakerMiddleware
 
-        app.add_middleware(
-            CircuitBreakerMiddleware,
-            failure_threshold=getattr(settings.security, "circuit_breaker_failure_threshold", 5),
-            recovery_timeout=getattr(settings.security, "circuit_breaker_recovery_timeout", 30),
-            request_timeout=getattr(settings.security, "request_timeout_seconds", 30.0),
+        plan.append(
+            (
+                CircuitBreakerMiddleware,
+                {
+                    "failure_threshold": getattr(settings.security, "circuit_breaker_failure_threshold", 5),
+                    "recovery_timeout": getattr(settings.security, "circuit_breaker_recovery_timeout", 30),
+                    "request_timeout": getattr(settings.security, "request_timeout_seconds", 30.0),
+                },
+            )
         )
 
     # Request logging
     if getattr(settings, "telemetry", None) and settings.telemetry.enabled:
-        app.add_middleware(RequestLoggingMiddleware)
+        plan.append((RequestLoggingMiddleware, {}))
 
     # Timing
-    app.add_middleware(TimingMiddleware)
+    plan.append((TimingMiddleware, {}))
 
     # Accountability (endpoint delivery profiling and scoring)
     # Enabled when telemetry is enabled or explicitly via accountability_enabled
@@ -553,28 +601,25 @@ def setup_middleware(app: FastAPI, settings: Any) -> None:
     if accountability_enabled:
         from .accountability import AccountabilityMiddleware
 
-        app.add_middleware(AccountabilityMiddleware)
+        plan.append((AccountabilityMiddleware, {}))
         logger.info("Accountability middleware enabled")
 
     # Request ID (runs last, sets up context for others)
-    app.add_middleware(RequestIDMiddleware)
+    plan.append((RequestIDMiddleware, {}))
 
     # API Versioning
-    app.add_middleware(VersioningMiddleware, default_version="v1")
+    plan.append((VersioningMiddleware, {"default_version": "v1"}))
 
     # Request size limiting (deny-by-default security)
     if hasattr(settings, "security"):
         from .request_size import RequestSizeLimitMiddleware
 
-        app.add_middleware(
-            RequestSizeLimitMiddleware,
-            max_size_bytes=settings.security.max_request_size_bytes,
-        )
+        plan.append((RequestSizeLimitMiddleware, {"max_size_bytes": settings.security.max_request_size_bytes}))
 
     # Usage tracking (for billing)
     from .usage_tracking import UsageTrackingMiddleware
 
-    app.add_middleware(UsageTrackingMiddleware)
+    plan.append((UsageTrackingMiddleware, {}))
 
     # Rate limiting (if enabled)
     if getattr(settings, "security", None) and settings.security.rate_limit_enabled:
@@ -582,16 +627,84 @@ def setup_middleware(app: FastAPI, settings: Any) -> None:
         if getattr(settings, "database", None) and settings.database.redis_enabled:
             from .rate_limit_redis import RedisRateLimitMiddleware
 
-            app.add_middleware(
-                RedisRateLimitMiddleware,
-                requests_per_minute=settings.security.rate_limit_requests,
-                redis_url=settings.database.redis_url,
+            plan.append(
+                (
+                    RedisRateLimitMiddleware,
+                    {
+                        "requests_per_minute": settings.security.rate_limit_requests,
+                        "redis_url": settings.database.redis_url,
+                    },
+                )
             )
         else:
-            app.add_middleware(
-                RateLimitMiddleware,
-                requests_per_minute=settings.security.rate_limit_requests,
-            )
+            plan.append((RateLimitMiddleware, {"requests_per_minute": settings.security.rate_limit_requests}))
+
+    server = getattr(settings, "server", None)
+    install_middleware_plan(app, plan, asgi_pipeline=bool(getattr(server, "asgi_pipeline", False)))
+
+
+def install_middleware_plan(
+    app: FastAPI,
+    plan: list[tuple[type, dict[str, Any]]],
+    asgi_pipeline: bool = False,
+    optional: Collection[type] = (),
+) -> list[PipelineStage]:
+    """
+    Add a middleware plan to the application.
+
+    Args:
+        app: FastAPI application instance
+        plan: ``(middleware_class, kwargs)`` pairs in add order (innermost first)
+        asgi_pipeline: If True, run each run of consecutive middleware that
+            have a pipeline stage as one pure-ASGI pipeline. Middleware without
+            a stage (circuit breaker, parasite guard, Redis rate limiting) is
+            added as-is between the pipelines, so the order of the chain is
+            unchanged.
+        optional: Middleware classes that are logged and skipped if they fail
+            to register (or, with ``asgi_pipeline``, to build their stage)
+            instead of aborting startup
+
+    Returns:
+        The pipeline stages built, outermost first (empty without ``asgi_pipeline``)
+    """
+    if not asgi_pipeline:
+        for middleware_class, kwargs in plan:
+            try:
+                app.add_middleware(middleware_class, **kwargs)
+            except Exception as e:
+                if middleware_class not in optional:
+                    raise
+                logger.warning(f"{middleware_class.__name__} not available: {e}")
+        return []
+
+    from .pipeline import ASGIPipelineMiddleware, stage_for
+
+    installed: list[PipelineStage] = []
+    segment: list[PipelineStage] = []
+
+    def add_segment() -> None:
+        if segment:
+            # Pipeline stages run outermost first
+            app.add_middleware(ASGIPipelineMiddleware, stages=segment[::-1])
+            installed[:0] = segment[::-1]
+            segment.clear()
+
+    for middleware_class, kwargs in plan:
+        try:
+            stage = stage_for(middleware_class, **kwargs)
+            if stage is None:
+                add_segment()
+                app.add_middleware(middleware_class, **kwargs)
+            else:
+                segment.append(stage)
+        except Exception as e:
+            if middleware_class not in optional:
+                raise
+            logger.warning(f"{middleware_class.__name__} not available: {e}")
+    add_segment()
+
+    logger.info(f"ASGI middleware pipeline enabled with {len(installed)} stages")
+    return installed
 
 
 # Lazy imports for optional middleware
@@ -648,6 +761,7 @@ def get_accountability_middleware():
     "get_parasite_guard_middleware",
     "get_accountability_middleware",
     "VersioningMiddleware",
-    # Setup function
+    # Setup functions
     "setup_middleware",
+    "install_middleware_plan",
 ]
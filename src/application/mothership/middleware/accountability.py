@@ -19,6 +19,7 @@
 
 if TYPE_CHECKING:
     from fastapi import Request, Response
+    from starlette.datastructures import MutableHeaders
 
 logger = logging.getLogger(__name__)
 
@@ -72,7 +73,7 @@ async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -
         path = request.url.path
 
         # Only track configured path prefixes
-        if not any(path.startswith(prefix) for prefix in self.tracked_prefixes):
+        if not self._is_tracked(path):
             return await call_next(request)
 
         # Build endpoint identifier
@@ -84,9 +85,25 @@ async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -
 
         # Calculate latency
         latency_ms = (time.perf_counter() - start_time) * 1000
+        self._score(endpoint, response.status_code, latency_ms, response.headers)
 
+        return response
+
+    def _is_tracked(self, path: str) -> bool:
+        """Check if a path is tracked for accountability scoring."""
+        return any(path.startswith(prefix) for prefix in self.tracked_prefixes)
+
+    def _score(self, endpoint: str, status_code: int, latency_ms: float, headers: MutableHeaders) -> None:
+        """Record the attempt and add delivery score headers.
+
+        Args:
+            endpoint: ``METHOD:path`` identifier.
+            status_code: Response status code.
+            latency_ms: Time from request entry to response.
+            headers: Response headers to annotate.
+        """
         # Determine success based on status code
-        success = response.status_code < 400
+        success = status_code < 400
 
         try:
             # Import here to avoid circular imports and allow lazy loading
@@ -107,8 +124,8 @@ async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -
             score = calculator.calculate_score(endpoint, latency_ms)
 
             # Add accountability headers
-            response.headers["X-Delivery-Score"] = str(round(score.score, 1))
-            response.headers["X-Delivery-Class"] = score.classification
+            headers["X-Delivery-Score"] = str(round(score.score, 1))
+            headers["X-Delivery-Class"] = score.classification
 
             # Log degraded/critical endpoints
             if self.log_degraded and score.classification in ("DEGRADED", "CRITICAL"):
@@ -127,8 +144,6 @@ async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -
             # Don't let scoring errors break the request
             logger.warning("Accountability scoring failed for %s: %s", endpoint, e)
 
-        return response
-
 
 __all__ = [
     "AccountabilityMiddleware",
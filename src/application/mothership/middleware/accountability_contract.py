@@ -11,6 +11,7 @@
 from typing import Any, Callable
 
 from fastapi import Request, Response, status
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from grid.resilience.accountability.contracts import EnforcementResult
@@ -75,20 +76,8 @@ async def dispatch(self, request: Request, call_next: Callable) -> Response:
 
         response = None
         try:
-            # Extract authentication context
-            auth_context = await self._extract_auth_context(request)
-
-            # Extract request data
-            request_data = await self._extract_request_data(request)
-
             # Enforce request contract
-            request_result = self.enforcer.enforce_request(
-                path=request.url.path,
-                method=request.method,
-                auth_context=auth_context,
-                request_data=request_data,
-                client_ip=self._get_client_ip(request),
-            )
+            request_result = await self._enforce_request(request)
 
             # Handle request enforcement result
             if not request_result.allowed:
@@ -97,27 +86,14 @@ async def dispatch(self, request: Request, call_next: Callable) -> Response:
             # Process request
             response = await call_next(request)
 
-            # Calculate response time
-            response_time_ms = (time.time() - start_time) * 1000
-
             # Extract response data for validation
             response_data = await self._extract_response_data(response)
 
-            # Enforce response contract
-            response_result = self.enforcer.enforce_response(
-                path=request.url.path,
-                method=request.method,
-                response_data=response_data,
-                response_status=response.status_code,
-                response_time_ms=response_time_ms,
+            # Enforce response contract, add headers and log violations
+            self._enforce_response(
+                request, response.headers, response.status_code, start_time, request_result, response_data
             )
 
-            # Add enforcement headers
-            self._add_enforcement_headers(response, request_result, response_result)
-
-            # Log violations
-            self._log_violations(request, request_result, response_result)
-
             return response
 
         except Exception as e:
@@ -132,6 +108,49 @@ async def dispatch(self, request: Request, call_next: Callable) -> Response:
             response.headers["X-Accountability-Error"] = "middleware_error"
             return response
 
+    async def _enforce_request(self, request: Request) -> EnforcementResult:
+        """Enforce the request contract for a request."""
+        # Extract authentication context
+        auth_context = await self._extract_auth_context(request)
+
+        # Extract request data
+        request_data = await self._extract_request_data(request)
+
+        return self.enforcer.enforce_request(
+            path=request.url.path,
+            method=request.method,
+            auth_context=auth_context,
+            request_data=request_data,
+            client_ip=self._get_client_ip(request),
+        )
+
+    def _enforce_response(
+        self,
+        request: Request,
+        headers: MutableHeaders,
+        status_code: int,
+        start_time: float,
+        request_result: EnforcementResult,
+        response_data: dict[str, Any] | None,
+    ) -> None:
+        """Enforce the response contract and record the outcome on the response headers."""
+        # Calculate response time
+        response_time_ms = (time.time() - start_time) * 1000
+
+        response_result = self.enforcer.enforce_response(
+            path=request.url.path,
+            method=request.method,
+            response_data=response_data,
+            response_status=status_code,
+            response_time_ms=response_time_ms,
+        )
+
+        # Add enforcement headers
+        self._add_enforcement_headers(headers, request_result, response_result)
+
+        # Log violations
+        self._log_violations(request, request_result, response_result)
+
     def _should_skip_enforcement(self, request: Request) -> bool:
         """Check if enforcement should be skipped for this request."""
         path = request.url.path
@@ -285,21 +304,21 @@ def _create_blocked_response(self, request_result: EnforcementResult) -> Respons
 
     def _add_enforcement_headers(
         self,
-        response: Response,
+        headers: MutableHeaders,
         request_result: EnforcementResult,
         response_result: EnforcementResult | None,
     ) -> None:
         """Add accountability enforcement headers to the response."""
-        response.headers["X-Accountability-Status"] = "enforced" if self.enforcement_mode == "enforce" else "monitored"
+        headers["X-Accountability-Status"] = "enforced" if self.enforcement_mode == "enforce" else "monitored"
 
         total_violations = len(request_result.violations)
         if response_result:
             total_violations += len(response_result.violations)
 
-        response.headers["X-Accountability-Violation-Count"] = str(total_violations)
+        headers["X-Accountability-Violation-Count"] = str(total_violations)
 
         if total_violations > 0:
-            response.headers["X-Accountability-Violation"] = "true"
+            headers["X-Accountability-Violation"] = "true"
 
     def _log_violations(
         self,
@@ -12,6 +12,7 @@
 from typing import Any, Callable
 
 from fastapi import FastAPI, Request, Response
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
@@ -74,36 +75,16 @@ def __init__(
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process a request and detect any corruption events."""
-        request_id = str(id(request))
-        correlation_id = request.headers.get("X-Correlation-ID", str(datetime.now(UTC).timestamp()))
-        endpoint = f"{request.method} {request.url.path}"
-
-        # Track request metadata
-        self._tracked_requests[request_id] = {
-            "endpoint": endpoint,
-            "correlation_id": correlation_id,
-            "start_time": datetime.now(UTC),
-            "metadata": {
-                "user_agent": request.headers.get("User-Agent"),
-                "content_type": request.headers.get("Content-Type"),
-                "client_ip": request.client.host if request.client else None,
-            },
-        }
+        request_id, correlation_id, endpoint = self._track_request(request)
 
         try:
             response = await call_next(request)
 
             # Check for corruption indicators in response
-            await self._check_response_for_corruption(request_id, response, correlation_id)
+            self._check_status_for_corruption(request_id, response.status_code, correlation_id)
 
             # Add corruption penalty headers to response
-            penalty = self.tracker.get_endpoint_penalty(endpoint)
-            response.headers["X-Data-Penalty-Score"] = str(penalty)
-            response.headers["X-Data-Penalty-Correlation-ID"] = correlation_id
-
-            if self.tracker.is_endpoint_critical(endpoint):
-                response.headers["X-Endpoint-Critical"] = "true"
-                response.headers["X-Endpoint-Warning"] = "Data corruption detected"
+            self._add_penalty_headers(response.headers, endpoint, correlation_id)
 
             return response
 
@@ -117,26 +98,58 @@ async def dispatch(self, request: Request, call_next: Callable) -> Response:
             # Clean up tracking data
             self._tracked_requests.pop(request_id, None)
 
-    async def _check_response_for_corruption(
+    def _track_request(self, request: Request) -> tuple[str, str, str]:
+        """Start tracking a request.
+
+        Returns:
+            Tuple of (request_id, correlation_id, endpoint)
+        """
+        request_id = str(id(request))
+        correlation_id = request.headers.get("X-Correlation-ID", str(datetime.now(UTC).timestamp()))
+        endpoint = f"{request.method} {request.url.path}"
+
+        # Track request metadata
+        self._tracked_requests[request_id] = {
+            "endpoint": endpoint,
+            "correlation_id": correlation_id,
+            "start_time": datetime.now(UTC),
+            "metadata": {
+                "user_agent": request.headers.get("User-Agent"),
+                "content_type": request.headers.get("Content-Type"),
+                "client_ip": request.client.host if request.client else None,
+            },
+        }
+        return request_id, correlation_id, endpoint
+
+    def _add_penalty_headers(self, headers: MutableHeaders, endpoint: str, correlation_id: str) -> None:
+        """Add corruption penalty headers to a response."""
+        penalty = self.tracker.get_endpoint_penalty(endpoint)
+        headers["X-Data-Penalty-Score"] = str(penalty)
+        headers["X-Data-Penalty-Correlation-ID"] = correlation_id
+
+        if self.tracker.is_endpoint_critical(endpoint):
+            headers["X-Endpoint-Critical"] = "true"
+            headers["X-Endpoint-Warning"] = "Data corruption detected"
+
+    def _check_status_for_corruption(
         self,
         request_id: str,
-        response: Response,
+        status_code: int,
         correlation_id: str,
     ) -> None:
-        """Check response for indicators of data corruption."""
+        """Check a response status for indicators of data corruption."""
         request_data = self._tracked_requests.get(request_id)
         if not request_data:
             return
 
         endpoint = request_data["endpoint"]
-        status_code = str(response.status_code)
 
         # Check status code indicators
-        if status_code in self.corruption_indicators:
-            indicator = self.corruption_indicators[status_code]
+        if str(status_code) in self.corruption_indicators:
+            indicator = self.corruption_indicators[str(status_code)]
 
             # Only record if it's a server error
-            if response.status_code >= 500:
+            if status_code >= 500:
                 self._record_corruption_from_indicator(endpoint, correlation_id, indicator, request_data)
 
     def _record_corruption_from_indicator(
@@ -1,13 +1,21 @@
 """
 DRT (Don't Repeat Themselves) Middleware for focused monitoring.
+
+Requests are matched against stored attack vectors through an
+``AttackVectorIndex``: vectors are bucketed by (method, normalized path), the
+only pairs that can score above zero, and header sets are bitmasks over an
+interned header vocabulary so Jaccard similarity is two popcounts.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import re
 import secrets
 import time
+import urllib.parse
+from collections.abc import Iterable
 from datetime import UTC, datetime, timedelta
 from typing import Any, Callable
 
@@ -16,6 +24,10 @@
 
 logger = logging.getLogger(__name__)
 
+_UUID_SEGMENT = re.compile(r"/[a-f0-9-]{36}")
+_NUMERIC_SEGMENT = re.compile(r"/\d+")
+_EXCLUDED_HEADERS = frozenset({"authorization", "cookie", "x-api-key", "x-request-id"})
+
 
 class BehavioralSignature:
     """Represents a behavioral signature for pattern matching."""
@@ -48,6 +60,75 @@ def to_dict(self) -> dict[str, Any]:
         }
 
 
+class AttackVectorIndex:
+    """
+    Attack vectors bucketed by (method, path pattern) with header sets as bitmasks.
+
+    Only vectors with the same method and path pattern as a request can score
+    above zero, so a match scans one bucket. Within a bucket vectors with the
+    same header set share one entry (the first added is reported), and the
+    similarity is |a & b| / |a | b| on integer masks. Request headers outside
+    the vocabulary are counted but not interned, so requests can't grow it.
+    """
+
+    def __init__(self, vectors: Iterable[BehavioralSignature] = ()):
+        self.vectors: list[BehavioralSignature] = list(vectors)
+        self._header_bits: dict[str, int] = {}
+        self._buckets: dict[tuple[str, str], dict[int, BehavioralSignature]] = {}
+        self._filed = 0
+        self._reindex()
+
+    def add(self, vector: BehavioralSignature) -> None:
+        self.vectors.append(vector)
+        self._file(vector)
+
+    def _file(self, vector: BehavioralSignature) -> None:
+        mask = 0
+        for header in vector.headers:
+            mask |= 1 << self._header_bits.setdefault(header, len(self._header_bits))
+        self._buckets.setdefault((vector.method, vector.path_pattern), {}).setdefault(mask, vector)
+        self._filed += 1
+
+    def _reindex(self) -> None:
+        self._header_bits.clear()
+        self._buckets.clear()
+        self._filed = 0
+        for vector in self.vectors:
+            self._file(vector)
+
+    def best_match(self, signature: BehavioralSignature) -> tuple[float, BehavioralSignature | None]:
+        """Highest header similarity among vectors with the signature's method and path, and that vector."""
+        if self._filed != len(self.vectors):
+            self._reindex()  # The list was appended to or shortened directly
+
+        bucket = self._buckets.get((signature.method, signature.path_pattern))
+        if not bucket:
+            return 0.0, None
+
+        mask, unknown = 0, 0
+        for header in set(signature.headers):
+            bit = self._header_bits.get(header)
+            if bit is None:
+                unknown += 1
+            else:
+                mask |= 1 << bit
+
+        if not unknown and mask in bucket:
+            return 1.0, bucket[mask]
+
+        best, matched = 0.0, None
+        for vector_mask, vector in bucket.items():
+            if not vector_mask:
+                continue  # Empty header sets only match empty ones, handled above
+            similarity = (mask & vector_mask).bit_count() / ((mask | vector_mask).bit_count() + unknown)
+            if similarity > best:
+                best, matched = similarity, vector
+        return best, matched
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+
 class ComprehensiveDRTMiddleware(BaseHTTPMiddleware):
     """Middleware for DRT - Don't Repeat Themselves focused monitoring."""
 
@@ -87,13 +168,22 @@ def __init__(
         # In-memory caches for performance
         self.ESCALATED_ENDPOINTS: dict[str, datetime] = {}
         self.behavioral_history: list[BehavioralSignature] = []
-        self.attack_vectors: list[BehavioralSignature] = []
+        self.attack_vectors = []
         self._attack_vector_ids: dict[str, str] = {}  # signature_id -> attack_vector_id
         self._cleanup_task: asyncio.Task | None = None
 
         # Initialize from database
         self._initialized = False
 
+    @property
+    def attack_vectors(self) -> list[BehavioralSignature]:
+        """Stored attack vectors; add through add_attack_vector() or assign a new list."""
+        return self._attack_index.vectors
+
+    @attack_vectors.setter
+    def attack_vectors(self, vectors: Iterable[BehavioralSignature]) -> None:
+        self._attack_index = AttackVectorIndex(vectors)
+
     def _ensure_db_components(self) -> None:
         """Lazy-load database components when needed."""
         if self._db_session is None:
@@ -208,15 +298,7 @@ async def dispatch(self, request: Request, call_next: Callable) -> Response:
         return response
 
     def _build_signature(self, request: Request) -> BehavioralSignature:
-        header_keys = tuple(
-            sorted(
-                [
-                    k
-                    for k in request.headers.keys()
-                    if k.lower() not in {"authorization", "cookie", "x-api-key", "x-request-id"}
-                ]
-            )
-        )
+        header_keys = tuple(sorted(k for k in request.headers.keys() if k.lower() not in _EXCLUDED_HEADERS))
 
         return BehavioralSignature(
             path_pattern=self._normalize_path(request.url.path),
@@ -227,15 +309,10 @@ def _build_signature(self, request: Request) -> BehavioralSignature:
         )
 
     def _normalize_path(self, path: str) -> str:
-        import re
-
-        normalized = re.sub(r"/[a-f0-9-]{36}", "/{UUID}", path)
-        normalized = re.sub(r"/\d+", "/{ID}", normalized)
-        return normalized
+        normalized = _UUID_SEGMENT.sub("/{UUID}", path)
+        return _NUMERIC_SEGMENT.sub("/{ID}", normalized)
 
     def _normalize_query(self, query: str) -> str:
-        import urllib.parse
-
         params = urllib.parse.parse_qs(query)
         return "&".join(sorted(params.keys()))
 
@@ -260,16 +337,7 @@ def _extract_body_pattern(self, request: Request) -> str | None:
         return None
 
     def _check_similarity(self, signature: BehavioralSignature) -> tuple[float, BehavioralSignature | None]:
-        max_similarity = 0.0
-        matched_vector = None
-
-        for vector in self.attack_vectors:
-            similarity = self._calculate_similarity(signature, vector)
-            if similarity > max_similarity:
-                max_similarity = similarity
-                matched_vector = vector
-
-        return max_similarity, matched_vector
+        return self._attack_index.best_match(signature)
 
     def _calculate_similarity(self, sig1: BehavioralSignature, sig2: BehavioralSignature) -> float:
         if sig1.method != sig2.method or sig1.path_pattern != sig2.path_pattern:
@@ -335,21 +403,9 @@ async def _record_violation(
 
         try:
             # Get attack vector ID and severity
-            attack_vector_id = None
+            attack_vector_id = self._attack_vector_ids.get(str(id(matched_vector)))
             severity = "medium"  # default
 
-            for vector_id, vector_sig in self._attack_vector_ids.items():
-                if self._calculate_similarity(signature, vector_sig) >= self.similarity_threshold:
-                    attack_vector_id = vector_id
-                    # Try to get severity from attack vectors
-                    for attack_sig, attack_severity in zip(
-                        self.attack_vectors, ["medium"] * len(self.attack_vectors), strict=False
-                    ):
-                        if attack_sig == vector_sig:
-                            severity = attack_severity
-                            break
-                    break
-
             if attack_vector_id:
                 # Extract request metadata
                 client_ip = request.client.host if request.client else None
@@ -477,7 +533,7 @@ async def shutdown(self) -> None:
             logger.info("Stopped DRT periodic cleanup task")
 
     def add_attack_vector(self, signature: BehavioralSignature) -> None:
-        self.attack_vectors.append(signature)
+        self._attack_index.add(signature)
         logger.info(f"DRT: Added attack vector: {signature.path_pattern}")
 
         # Record metrics
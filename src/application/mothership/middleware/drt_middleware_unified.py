@@ -13,6 +13,7 @@
 from typing import Any, Callable
 
 from fastapi import Request, Response
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
 
 # Import core DRT engine
@@ -75,14 +76,37 @@ def __init__(
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request through unified DRT pipeline."""
 
-        if not self.enabled:
+        start_time = time.time()
+        monitoring_result = await self._monitor(request)
+        if monitoring_result is None:
             return await call_next(request)
 
+        # Process request
+        response = await call_next(request)
+
+        # Add DRT headers to response
+        self._add_drt_headers(response.headers, monitoring_result)
+
+        # Log API movement if enabled
+        if self.api_movement_logging_enabled:
+            duration_ms = (time.time() - start_time) * 1000
+            self._log_api_movement(request, response.status_code, duration_ms, monitoring_result)
+
+        return response
+
+    async def _monitor(self, request: Request) -> dict[str, Any] | None:
+        """Check a request against the core DRT engine.
+
+        Returns:
+            The monitoring result, or None if the request is not monitored
+            (middleware disabled or request not sampled)
+        """
+        if not self.enabled:
+            return None
+
         # Apply sampling
         if random.random() > self.sampling_rate:  # noqa: S311 non-security random use
-            return await call_next(request)
-
-        start_time = time.time()
+            return None
 
         # Extract request information
         client_ip = self._get_client_ip(request)
@@ -99,18 +123,7 @@ async def dispatch(self, request: Request, call_next: Callable) -> Response:
         if monitoring_result.get("escalation_applied", False):
             await self._handle_escalation(request, monitoring_result)
 
-        # Process request
-        response = await call_next(request)
-
-        # Add DRT headers to response
-        self._add_drt_headers(response, monitoring_result)
-
-        # Log API movement if enabled
-        if self.api_movement_logging_enabled:
-            duration_ms = (time.time() - start_time) * 1000
-            self._log_api_movement(request, response, duration_ms, monitoring_result)
-
-        return response
+        return monitoring_result
 
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP from request."""
@@ -158,7 +171,7 @@ async def _handle_escalation(self, request: Request, monitoring_result: dict[str
         # Record escalation in middleware state
         self.escalated_endpoints[path] = datetime.now(UTC) + timedelta(minutes=self.escalation_timeout_minutes)
 
-    def _add_drt_headers(self, response: Response, monitoring_result: dict[str, Any]) -> None:
+    def _add_drt_headers(self, response_headers: MutableHeaders, monitoring_result: dict[str, Any]) -> None:
         """Add DRT monitoring headers to response."""
 
         headers = {
@@ -180,10 +193,10 @@ def _add_drt_headers(self, response: Response, monitoring_result: dict[str, Any]
 
         # Add headers to response
         for key, value in headers.items():
-            response.headers[key] = value
+            response_headers[key] = value
 
     def _log_api_movement(
-        self, request: Request, response: Response, duration_ms: float, monitoring_result: dict[str, Any]
+        self, request: Request, status_code: int, duration_ms: float, monitoring_result: dict[str, Any]
     ) -> None:
         """Log API movement for audit trail."""
 
@@ -192,7 +205,7 @@ def _log_api_movement(
             "method": request.method,
             "path": request.url.path,
             "query": request.url.query,
-            "status_code": response.status_code,
+            "status_code": status_code,
             "duration_ms": round(duration_ms, 2),
             "client_ip": self._get_client_ip(request),
             "user_agent": request.headers.get("user-agent", ""),
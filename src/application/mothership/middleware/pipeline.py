@@ -0,0 +1,648 @@
+"""
+Pure-ASGI middleware pipeline for Mothership Cockpit.
+
+Every ``BaseHTTPMiddleware`` in the default chain adds its own task hop,
+``Request`` construction and ``StreamingResponse`` re-wrapping. The pipeline
+replaces that stack with a single ASGI middleware that runs lightweight
+stages against one shared per-request context:
+
+- headers, client address and ``request.state`` are parsed once
+- the request body is buffered at most once, and only if a stage asks for it
+- response headers are patched in place on ``http.response.start`` instead of
+  wrapping the response once per layer
+
+Stages reuse the policy code of the middleware they replace (each holds an
+unmounted instance of it), so configuration, metrics and audit behaviour are
+identical in both modes.
+
+Usage:
+    from application.mothership.middleware.pipeline import ASGIPipelineMiddleware, RequestIDStage, TimingStage
+
+    app.add_middleware(ASGIPipelineMiddleware, stages=[RequestIDStage(), TimingStage()])
+
+``setup_middleware`` builds the full pipeline when
+``settings.server.asgi_pipeline`` (``MOTHERSHIP_ASGI_PIPELINE``) is enabled.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..logging_structured import bind_context, clear_context
+
+logger = logging.getLogger(__name__)
+
+
+class RequestContext:
+    """
+    Per-request state shared by every stage of a pipeline.
+
+    Wraps the ASGI scope and receive channel. ``body()`` buffers the request
+    body on first use; downstream then receives the buffered (or replaced)
+    body once before the original channel resumes, so disconnect messages
+    still reach streaming endpoints. Requests whose body no stage reads are
+    streamed through untouched.
+    """
+
+    __slots__ = (
+        "scope",
+        "start_time",
+        "request_id",
+        "correlation_id",
+        "status_code",
+        "error",
+        "stage_data",
+        "_receive",
+        "_body",
+        "_body_delivered",
+        "_request",
+        "_headers",
+    )
+
+    def __init__(self, scope: Scope, receive: Receive) -> None:
+        self.scope = scope
+        self.start_time = time.perf_counter()
+        self.request_id: str | None = None
+        self.correlation_id: str | None = None
+        self.status_code: int | None = None
+        self.error: Exception | None = None
+        # Per-request values a stage needs again in a later hook, keyed by stage
+        self.stage_data: dict[PipelineStage, Any] = {}
+        self._receive = receive
+        self._body: bytes | None = None
+        self._body_delivered = False
+        self._request: Request | None = None
+        self._headers: Headers | None = None
+        scope.setdefault("state", {})
+
+    @property
+    def method(self) -> str:
+        return self.scope["method"]
+
+    @property
+    def path(self) -> str:
+        return self.scope["path"]
+
+    @property
+    def scheme(self) -> str:
+        return self.scope.get("scheme", "http")
+
+    @property
+    def headers(self) -> Headers:
+        """Request headers (case-insensitive), shared with ``request.headers``."""
+        if self._headers is None:
+            self._headers = self.request.headers
+        return self._headers
+
+    @property
+    def state(self) -> dict[str, Any]:
+        """The dict backing ``request.state`` for this request."""
+        return self.scope["state"]
+
+    @property
+    def request(self) -> Request:
+        """A single Starlette ``Request`` whose body reads go through the shared buffer."""
+        if self._request is None:
+            self._request = Request(self.scope, self._stage_receive)
+        return self._request
+
+    async def body(self) -> bytes:
+        """Return the request body, reading it from the client on first use."""
+        if self._body is None:
+            chunks = []
+            more_body = True
+            while more_body:
+                message = await self._receive()
+                if message["type"] != "http.request":
+                    break
+                chunks.append(message.get("body", b""))
+                more_body = message.get("more_body", False)
+            self._body = b"".join(chunks)
+        return self._body
+
+    def replace_body(self, body: bytes) -> None:
+        """Swap the body delivered downstream, keeping Content-Length consistent."""
+        self._body = body
+        raw = [(k, v) for k, v in self.scope["headers"] if k != b"content-length"]
+        raw.append((b"content-length", str(len(body)).encode("latin-1")))
+        self.scope["headers"] = raw
+        self._headers = None
+        if self._request is not None:
+            self._request._body = body  # type: ignore[attr-defined]
+            self._request.__dict__.pop("_headers", None)
+
+    async def _stage_receive(self) -> Message:
+        return {"type": "http.request", "body": await self.body(), "more_body": False}
+
+    async def receive(self) -> Message:
+        """Receive channel handed to the wrapped application."""
+        if self._body is not None and not self._body_delivered:
+            self._body_delivered = True
+            return {"type": "http.request", "body": self._body, "more_body": False}
+        return await self._receive()
+
+
+class PipelineStage:
+    """
+    One step of an :class:`ASGIPipelineMiddleware`.
+
+    Stages are shared across concurrent requests; per-request values belong
+    on the :class:`RequestContext`. Override only the hooks a stage needs, the
+    pipeline skips the rest. Hooks of stages after one that short-circuits do
+    not run, mirroring nested middleware.
+    """
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        """Inspect the request; return a response to short-circuit the pipeline."""
+        return None
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        """Patch response headers before they are sent (inner stages first)."""
+
+    async def on_complete(self, ctx: RequestContext) -> None:
+        """Run after the response has been sent (inner stages first)."""
+
+    def on_error(self, ctx: RequestContext, exc: Exception) -> Response | None:
+        """Turn an unhandled exception into a response, or return None to propagate."""
+        return None
+
+
+def _overrides(stage: PipelineStage, hook: str) -> bool:
+    return getattr(type(stage), hook) is not getattr(PipelineStage, hook)
+
+
+class ASGIPipelineMiddleware:
+    """
+    Run a sequence of :class:`PipelineStage` objects as one ASGI middleware.
+
+    ``stages`` are ordered outermost first, i.e. the first stage sees the
+    request first and the response last, like the first middleware in a stack.
+    """
+
+    def __init__(self, app: ASGIApp, stages: Sequence[PipelineStage]) -> None:
+        self.app = app
+        self.stages = list(stages)
+        indexed = list(enumerate(self.stages))
+        self._request_hooks = [(i, s) for i, s in indexed if _overrides(s, "on_request")]
+        self._response_hooks = [(i, s) for i, s in reversed(indexed) if _overrides(s, "on_response_start")]
+        self._complete_hooks = [(i, s) for i, s in reversed(indexed) if _overrides(s, "on_complete")]
+        self._error_hooks = [(i, s) for i, s in reversed(indexed) if _overrides(s, "on_error")]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(scope, receive)
+        # Stages before index `depth` patch the response; stages before `entered` see on_complete
+        depth = entered = len(self.stages)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                ctx.status_code = message["status"]
+                if self._response_hooks:
+                    headers = MutableHeaders(scope=message)
+                    for index, stage in self._response_hooks:
+                        if index < depth:
+                            stage.on_response_start(ctx, headers)
+            await send(message)
+
+        error: Exception | None = None
+        handled_at = 0
+        try:
+            response: Response | None = None
+            for entered, stage in self._request_hooks:
+                response = await stage.on_request(ctx)
+                if response is not None:
+                    depth = entered
+                    break
+            else:
+                entered = len(self.stages)
+
+            if response is not None:
+                await response(scope, ctx.receive, send_wrapper)
+            else:
+                await self.app(scope, ctx.receive, send_wrapper)
+        except Exception as exc:
+            error = exc
+            handled = None if ctx.status_code is not None else self._handle_error(ctx, exc, entered)
+            if handled is None:
+                raise
+            depth, response = handled
+            handled_at = depth
+            await response(scope, ctx.receive, send_wrapper)
+        finally:
+            for index, stage in self._complete_hooks:
+                if index < entered:
+                    # Stages outside the one that handled an error only saw its response
+                    ctx.error = error if index >= handled_at else None
+                    try:
+                        await stage.on_complete(ctx)
+                    except Exception:
+                        logger.exception(f"Pipeline stage {type(stage).__name__} failed to complete request")
+
+    def _handle_error(self, ctx: RequestContext, exc: Exception, limit: int) -> tuple[int, Response] | None:
+        """Offer an exception to entered stages, innermost first."""
+        for index, stage in self._error_hooks:
+            if index < limit:
+                response = stage.on_error(ctx, exc)
+                if response is not None:
+                    return index, response
+        return None
+
+
+# =============================================================================
+# Stages
+# =============================================================================
+
+
+class RequestIDStage(PipelineStage):
+    """Assign request/correlation IDs and bind them to the logging context."""
+
+    def __init__(self, header_name: str = "X-Request-ID") -> None:
+        self.header_name = header_name
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        from . import correlation_id_ctx, request_id_ctx
+
+        headers = ctx.headers
+        ctx.request_id = headers.get(self.header_name) or str(uuid.uuid4())
+        ctx.correlation_id = headers.get("X-Correlation-ID") or ctx.request_id
+        request_id_ctx.set(ctx.request_id)
+        correlation_id_ctx.set(ctx.correlation_id)
+        bind_context(request_id=ctx.request_id, correlation_id=ctx.correlation_id)
+        ctx.state["request_id"] = ctx.request_id
+        ctx.state["correlation_id"] = ctx.correlation_id
+        return None
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        headers[self.header_name] = ctx.request_id
+        headers["X-Correlation-ID"] = ctx.correlation_id
+
+    async def on_complete(self, ctx: RequestContext) -> None:
+        clear_context()
+
+
+class TimingStage(PipelineStage):
+    """Add X-Process-Time headers measured from pipeline entry."""
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        from . import request_start_time_ctx
+
+        request_start_time_ctx.set(ctx.start_time)
+        return None
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        process_time = time.perf_counter() - ctx.start_time
+        headers["X-Process-Time"] = f"{process_time:.6f}"
+        headers["X-Process-Time-Ms"] = f"{process_time * 1000:.2f}"
+
+
+class RequestLoggingStage(PipelineStage):
+    """Structured request/response logging (see ``RequestLoggingMiddleware``)."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        from . import RequestLoggingMiddleware
+
+        self.policy = RequestLoggingMiddleware(None, **kwargs)  # type: ignore[arg-type]
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        from . import get_correlation_id, get_request_id
+
+        if self.policy._is_excluded(ctx.path):
+            return None
+        ids = (get_request_id() or "unknown", get_correlation_id(), time.perf_counter())
+        ctx.stage_data[self] = ids
+        await self.policy._log_request(ctx.request, ids[0], ids[1])
+        return None
+
+    async def on_complete(self, ctx: RequestContext) -> None:
+        ids = ctx.stage_data.get(self)
+        if ids is not None:
+            request_id, correlation_id, start_time = ids
+            self.policy._log_response(
+                ctx.request, request_id, correlation_id, ctx.status_code or 500, time.perf_counter() - start_time
+            )
+
+
+class SecurityHeadersStage(PipelineStage):
+    """Hardened security response headers (see ``SecurityHeadersMiddleware``)."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        from . import SecurityHeadersMiddleware
+
+        self.policy = SecurityHeadersMiddleware(None, **kwargs)  # type: ignore[arg-type]
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        self.policy._apply_headers(headers, ctx.scheme, ctx.path)
+
+
+class RateLimitStage(PipelineStage):
+    """In-memory sliding window rate limiting (see ``RateLimitMiddleware``)."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        from . import RateLimitMiddleware
+
+        self.policy = RateLimitMiddleware(None, **kwargs)  # type: ignore[arg-type]
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        if self.policy._is_excluded(ctx.path):
+            return None
+        client_key = self.policy._get_client_key(ctx.request)
+        if self.policy._is_rate_limited(client_key):
+            return self.policy._limited_response()
+        ctx.stage_data[self] = client_key
+        return None
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        client_key = ctx.stage_data.get(self)
+        if client_key is not None:
+            self.policy._apply_headers(headers, client_key)
+
+
+class CognitiveRateLimitStage(PipelineStage):
+    """Redis-backed, load-adjusted rate limiting (see ``CognitiveRedisRateLimitMiddleware``)."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        from .rate_limit_redis import CognitiveRedisRateLimitMiddleware
+
+        self.policy = CognitiveRedisRateLimitMiddleware(None, **kwargs)  # type: ignore[arg-type]
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        if any(ctx.path.startswith(p) for p in self.policy.exclude_paths):
+            return None
+        limited, headers = await self.policy._check(ctx.request)
+        ctx.stage_data[self] = headers
+        return limited
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        headers.update(ctx.stage_data.get(self, {}))
+
+
+class SecurityEnforcerStage(PipelineStage):
+    """Input sanitization and request validation (see ``SecurityEnforcerMiddleware``)."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        from .security_enforcer import SecurityEnforcerMiddleware
+
+        self.policy = SecurityEnforcerMiddleware(None, **kwargs)  # type: ignore[arg-type]
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        result, blocked = await self.policy.enforce_request(ctx.request, ctx.request_id)
+        if result is None or blocked is not None:
+            return blocked
+        if result.sanitized_body is not None:
+            ctx.replace_body(result.sanitized_body)
+        ctx.stage_data[self] = result
+        return None
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        result = ctx.stage_data.get(self)
+        if result is not None:
+            self.policy.apply_response_headers(headers, result)
+
+    async def on_complete(self, ctx: RequestContext) -> None:
+        result = ctx.stage_data.get(self)
+        if result is not None:
+            allowed = ctx.error is None
+            if not allowed:
+                logger.error(f"Error processing request: {ctx.error}")
+            self.policy.record_outcome(ctx.request, result, ctx.status_code or 500, allowed)
+
+
+class RequestSizeLimitStage(PipelineStage):
+    """Reject oversized bodies by Content-Length (see ``RequestSizeLimitMiddleware``)."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        from .request_size import RequestSizeLimitMiddleware
+
+        self.policy = RequestSizeLimitMiddleware(None, **kwargs)  # type: ignore[arg-type]
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        return self.policy._oversize_response(ctx.request)
+
+
+class VersioningStage(PipelineStage):
+    """API version and deprecation headers (see ``VersioningMiddleware``)."""
+
+    def __init__(self, default_version: str = "v1") -> None:
+        from .versioning import VersioningMiddleware
+
+        self.policy = VersioningMiddleware(None, default_version=default_version)  # type: ignore[arg-type]
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        from ..api.versioning import get_version_metadata
+
+        version_meta = get_version_metadata(self.policy._version_for_path(ctx.path))
+        if version_meta:
+            version_meta.apply_headers(headers)
+
+
+class AccountabilityStage(PipelineStage):
+    """Endpoint delivery scoring headers (see ``AccountabilityMiddleware``)."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        from .accountability import AccountabilityMiddleware
+
+        self.policy = AccountabilityMiddleware(None, **kwargs)
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        if self.policy._is_tracked(ctx.path):
+            ctx.stage_data[self] = time.perf_counter()
+        return None
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        start_time = ctx.stage_data.get(self)
+        if start_time is not None:
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            self.policy._score(f"{ctx.method}:{ctx.path}", ctx.status_code or 500, latency_ms, headers)
+
+
+class UsageTrackingStage(PipelineStage):
+    """Billing usage records for authenticated requests (see ``UsageTrackingMiddleware``)."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        from .usage_tracking import UsageTrackingMiddleware
+
+        self.policy = UsageTrackingMiddleware(None, **kwargs)  # type: ignore[arg-type]
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        if self.policy._should_track(ctx.path):
+            # Read up front, like the middleware: only identities set by outer layers count
+            user_id = ctx.state.get("user_id")
+            if user_id:
+                ctx.stage_data[self] = (user_id, ctx.state.get("api_key_id"))
+        return None
+
+    async def on_complete(self, ctx: RequestContext) -> None:
+        identity = ctx.stage_data.get(self)
+        if identity is not None and ctx.status_code is not None:
+            await self.policy._record(ctx.request, identity[0], identity[1], ctx.status_code)
+
+
+class DataCorruptionStage(PipelineStage):
+    """Corruption penalty tracking and headers (see ``DataCorruptionDetectionMiddleware``)."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        from .data_corruption import DataCorruptionDetectionMiddleware
+
+        self.policy = DataCorruptionDetectionMiddleware(None, **kwargs)  # type: ignore[arg-type]
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        ctx.stage_data[self] = self.policy._track_request(ctx.request)
+        return None
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        request_id, correlation_id, endpoint = ctx.stage_data[self]
+        self.policy._check_status_for_corruption(request_id, ctx.status_code or 500, correlation_id)
+        self.policy._add_penalty_headers(headers, endpoint, correlation_id)
+
+    async def on_complete(self, ctx: RequestContext) -> None:
+        request_id, correlation_id, _ = ctx.stage_data[self]
+        if ctx.error is not None:
+            await self.policy._record_exception_as_corruption(request_id, ctx.error, correlation_id)
+        self.policy._tracked_requests.pop(request_id, None)
+
+
+class DRTStage(PipelineStage):
+    """Behavioral attack-vector monitoring (see ``UnifiedDRTMiddleware``)."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        from .drt_middleware_unified import UnifiedDRTMiddleware
+
+        self.policy = UnifiedDRTMiddleware(None, **kwargs)
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        start_time = time.time()
+        monitoring_result = await self.policy._monitor(ctx.request)
+        if monitoring_result is not None:
+            ctx.stage_data[self] = (start_time, monitoring_result)
+        return None
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        monitored = ctx.stage_data.get(self)
+        if monitored is not None:
+            self.policy._add_drt_headers(headers, monitored[1])
+
+    async def on_complete(self, ctx: RequestContext) -> None:
+        monitored = ctx.stage_data.get(self)
+        # The middleware logs only responses it saw, not propagated errors
+        if monitored is not None and ctx.error is None and self.policy.api_movement_logging_enabled:
+            start_time, monitoring_result = monitored
+            duration_ms = (time.time() - start_time) * 1000
+            self.policy._log_api_movement(ctx.request, ctx.status_code or 500, duration_ms, monitoring_result)
+
+
+class AccountabilityContractStage(PipelineStage):
+    """
+    Accountability contract enforcement (see ``AccountabilityContractMiddleware``).
+
+    Response bodies are not captured for response-contract validation, same
+    as the middleware.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        from .accountability_contract import AccountabilityContractMiddleware
+
+        self.policy = AccountabilityContractMiddleware(None, **kwargs)
+
+    async def on_request(self, ctx: RequestContext) -> Response | None:
+        if self.policy._should_skip_enforcement(ctx.request):
+            return None
+        start_time = time.time()
+        try:
+            request_result = await self.policy._enforce_request(ctx.request)
+        except Exception as e:
+            logger.error(f"Accountability middleware error: {e}")
+            ctx.stage_data[self] = None
+            return None
+        if not request_result.allowed:
+            return self.policy._create_blocked_response(request_result)
+        ctx.stage_data[self] = (start_time, request_result)
+        return None
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        if self not in ctx.stage_data:
+            return
+        enforced = ctx.stage_data[self]
+        if enforced is not None:
+            start_time, request_result = enforced
+            try:
+                self.policy._enforce_response(
+                    ctx.request, headers, ctx.status_code or 500, start_time, request_result, None
+                )
+                return
+            except Exception as e:
+                logger.error(f"Accountability middleware error: {e}")
+        headers["X-Accountability-Error"] = "middleware_error"
+
+
+class ErrorHandlingStage(PipelineStage):
+    """Consistent JSON 500 responses for unhandled errors (see ``ErrorHandlingMiddleware``)."""
+
+    def __init__(self, debug: bool = False) -> None:
+        from . import ErrorHandlingMiddleware
+
+        self.policy = ErrorHandlingMiddleware(None, debug=debug)  # type: ignore[arg-type]
+
+    def on_error(self, ctx: RequestContext, exc: Exception) -> Response | None:
+        return self.policy._error_response(exc)
+
+
+# Middleware class name -> stage taking the same keyword arguments
+STAGE_FOR_MIDDLEWARE: dict[str, type[PipelineStage]] = {
+    "ErrorHandlingMiddleware": ErrorHandlingStage,
+    "SecurityHeadersMiddleware": SecurityHeadersStage,
+    "SecurityEnforcerMiddleware": SecurityEnforcerStage,
+    "RequestLoggingMiddleware": RequestLoggingStage,
+    "TimingMiddleware": TimingStage,
+    "AccountabilityMiddleware": AccountabilityStage,
+    "RequestIDMiddleware": RequestIDStage,
+    "VersioningMiddleware": VersioningStage,
+    "RequestSizeLimitMiddleware": RequestSizeLimitStage,
+    "UsageTrackingMiddleware": UsageTrackingStage,
+    "DataCorruptionDetectionMiddleware": DataCorruptionStage,
+    "UnifiedDRTMiddleware": DRTStage,
+    "AccountabilityContractMiddleware": AccountabilityContractStage,
+    "RateLimitMiddleware": RateLimitStage,
+    "CognitiveRedisRateLimitMiddleware": CognitiveRateLimitStage,
+}
+
+
+def stage_for(middleware_class: type, **kwargs: Any) -> PipelineStage | None:
+    """Build the stage equivalent to ``middleware_class(app, **kwargs)``, if there is one."""
+    stage_class = STAGE_FOR_MIDDLEWARE.get(middleware_class.__name__)
+    return stage_class(**kwargs) if stage_class is not None else None
+
+
+__all__ = [
+    "RequestContext",
+    "PipelineStage",
+    "ASGIPipelineMiddleware",
+    "RequestIDStage",
+    "TimingStage",
+    "RequestLoggingStage",
+    "SecurityHeadersStage",
+    "RateLimitStage",
+    "CognitiveRateLimitStage",
+    "SecurityEnforcerStage",
+    "RequestSizeLimitStage",
+    "VersioningStage",
+    "AccountabilityStage",
+    "UsageTrackingStage",
+    "DataCorruptionStage",
+    "DRTStage",
+    "AccountabilityContractStage",
+    "ErrorHandlingStage",
+    "STAGE_FOR_MIDDLEWARE",
+    "stage_for",
+]
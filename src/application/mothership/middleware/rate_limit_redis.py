@@ -183,11 +183,13 @@ def _is_rate_limited_memory(self, key: str, effective_rpm: int) -> tuple[bool, i
         remaining = max(0, effective_rpm - current_count - 1)
         return False, remaining, effective_rpm
 
-    async def dispatch(self, request: Request, call_next: Any) -> Response:
-        """Process request with cognitive-aware rate limiting."""
-        if any(request.url.path.startswith(p) for p in self.exclude_paths):
-            return await call_next(request)
+    async def _check(self, request: Request) -> tuple[JSONResponse | None, dict[str, str]]:
+        """
+        Apply the cognitive rate limit to a request.
 
+        Returns:
+            Tuple of (429 response if limited, headers to add to an allowed response)
+        """
         client_key = self._get_client_key(request)
 
         try:
@@ -198,6 +200,7 @@ async def dispatch(self, request: Request, call_next: Any) -> Response:
             remaining = self.base_requests_per_minute
             effective_rpm = self.base_requests_per_minute
 
+        adjustment = f"{effective_rpm / self.base_requests_per_minute:.2f}"
         if is_limited:
             return JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -213,14 +216,27 @@ async def dispatch(self, request: Request, call_next: Any) -> Response:
                     "Retry-After": "60",
                     "X-RateLimit-Limit": str(effective_rpm),
                     "X-RateLimit-Remaining": "0",
-                    "X-Cognitive-Load-Adjustment": f"{effective_rpm / self.base_requests_per_minute:.2f}",
+                    "X-Cognitive-Load-Adjustment": adjustment,
                 },
-            )
+            ), {}
+
+        return None, {
+            "X-RateLimit-Limit": str(effective_rpm),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-Cognitive-Load-Adjustment": adjustment,
+        }
+
+    async def dispatch(self, request: Request, call_next: Any) -> Response:
+        """Process request with cognitive-aware rate limiting."""
+        if any(request.url.path.startswith(p) for p in self.exclude_paths):
+            return await call_next(request)
+
+        limited, headers = await self._check(request)
+        if limited is not None:
+            return limited
 
         response = await call_next(request)
-        response.headers["X-RateLimit-Limit"] = str(effective_rpm)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-Cognitive-Load-Adjustment"] = f"{effective_rpm / self.base_requests_per_minute:.2f}"
+        response.headers.update(headers)
 
         return response
 
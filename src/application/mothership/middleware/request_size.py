@@ -39,11 +39,11 @@ def __init__(
         self.max_size_bytes = max_size_bytes
         self.exclude_paths = exclude_paths or ["/health", "/ping", "/metrics"]
 
-    async def dispatch(self, request: Request, call_next: Callable) -> JSONResponse:
-        """Process request with size limit enforcement."""
+    def _oversize_response(self, request: Request) -> JSONResponse | None:
+        """Return a 413 response if the declared body size exceeds the limit."""
         # Skip size limiting for excluded paths
         if any(request.url.path.startswith(p) for p in self.exclude_paths):
-            return await call_next(request)
+            return None
 
         # Check Content-Length header if present
         content_length = request.headers.get("Content-Length")
@@ -65,5 +65,13 @@ async def dispatch(self, request: Request, call_next: Callable) -> JSONResponse:
                 # Invalid Content-Length header, continue (will fail later if needed)
                 pass
 
+        return None
+
+    async def dispatch(self, request: Request, call_next: Callable) -> JSONResponse:
+        """Process request with size limit enforcement."""
+        rejected = self._oversize_response(request)
+        if rejected is not None:
+            return rejected
+
         # Process request (streaming bodies are handled by FastAPI/Starlette)
         return await call_next(request)
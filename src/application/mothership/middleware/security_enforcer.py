@@ -34,6 +34,7 @@
 
 from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.types import ASGIApp
 
@@ -182,6 +183,19 @@ def to_dict(self) -> dict[str, Any]:
         }
 
 
+@dataclass
+class EnforcementResult:
+    """Per-request state carried from the security checks to the audit entry."""
+
+    request_id: str
+    client_ip: str | None
+    start_time: float
+    violations: list[SecurityViolation] = field(default_factory=list)
+    threats_count: int = 0
+    sanitized: bool = False
+    sanitized_body: bytes | None = None
+
+
 # =============================================================================
 # Security Enforcer Middleware
 # =============================================================================
@@ -627,40 +641,52 @@ def get_audit_log(
         # Return most recent entries
         return [e.to_dict() for e in entries[-limit:]]
 
-    async def dispatch(
+    async def enforce_request(
         self,
         request: Request,
-        call_next: RequestResponseEndpoint,
-    ) -> Response:
-        """Process request through security enforcer."""
+        request_id: str | None = None,
+    ) -> tuple[EnforcementResult | None, JSONResponse | None]:
+        """
+        Run the pre-request security checks.
+
+        Args:
+            request: Incoming request
+            request_id: Request ID already assigned upstream, if any
+
+        Returns:
+            Tuple of (enforcement result, block response). The result is None
+            for excluded paths; the block response is None when the request
+            may proceed.
+        """
         start_time = time.perf_counter()
 
         # Check for audit service in app state (set by middleware setup)
-        if self.audit_service is None and hasattr(request.app, "state"):
+        if self.audit_service is None and "app" in request.scope and hasattr(request.app, "state"):
             audit_svc = getattr(request.app.state, "audit_service", None)
             if audit_svc is not None:
                 self.audit_service = audit_svc
 
         # Skip excluded paths
         if self._is_excluded(request.url.path):
-            return await call_next(request)
+            return None, None
 
-        request_id = self._get_request_id(request)
-        client_ip = self._get_client_ip(request)
-        violations: list[SecurityViolation] = []
-        threats_count = 0
-        sanitized = False
+        result = EnforcementResult(
+            request_id=request_id or self._get_request_id(request),
+            client_ip=self._get_client_ip(request),
+            start_time=start_time,
+        )
+        violations = result.violations
 
         # Store request ID in state
-        request.state.request_id = request_id
+        request.state.request_id = result.request_id
 
         # Validate Content-Type
         if not await self._validate_content_type(request, violations):
-            return self._block_response(request_id, violations, "Invalid Content-Type")
+            return result, self._block_response(result.request_id, violations, "Invalid Content-Type")
 
         # Validate Content-Length
         if not await self._validate_content_length(request, violations):
-            return self._block_response(request_id, violations, "Request body too large")
+            return result, self._block_response(result.request_id, violations, "Request body too large")
 
         # Validate HTTPS
         await self._validate_https(request, violations)
@@ -669,7 +695,7 @@ async def dispatch(
         await self._validate_authentication(request, violations)
 
         # Sanitize body
-        is_safe, threats_count, sanitized_body = await self._sanitize_body(request)
+        is_safe, result.threats_count, result.sanitized_body = await self._sanitize_body(request)
 
         if not is_safe and self.strict_mode:
             violations.append(
@@ -679,29 +705,99 @@ async def dispatch(
                     description="Malicious content detected in request body",
                     path=request.url.path,
                     method=request.method,
-                    client_ip=client_ip,
+                    client_ip=result.client_ip,
                 )
             )
-            return self._block_response(request_id, violations, "Malicious content detected")
+            return result, self._block_response(result.request_id, violations, "Malicious content detected")
 
-        if threats_count > 0:
-            sanitized = True
+        if result.threats_count > 0:
+            result.sanitized = True
 
-        if sanitized_body is not None:
-            request._body = sanitized_body  # type: ignore[attr-defined]
+        if result.sanitized_body is not None:
             request.state.sanitized_body = True
-            request.state.threats_count = threats_count
+            request.state.threats_count = result.threats_count
 
         # Check for critical violations in strict mode
         if self.strict_mode:
             critical_violations = [v for v in violations if v.severity in ("high", "critical")]
             if critical_violations:
-                return self._block_response(
-                    request_id,
+                return result, self._block_response(
+                    result.request_id,
                     violations,
                     critical_violations[0].description,
                 )
 
+        return result, None
+
+    def record_outcome(
+        self,
+        request: Request,
+        result: EnforcementResult,
+        response_code: int,
+        allowed: bool,
+    ) -> None:
+        """Write the audit entry and metrics for a request that passed the checks."""
+        latency_ms = (time.perf_counter() - result.start_time) * 1000
+
+        # Get auth info
+        auth_method, auth_level = self._get_auth_info(request)
+        user_id = self._get_user_id(request)
+
+        # Update violations with context
+        for v in result.violations:
+            v.client_ip = result.client_ip
+            v.user_id = user_id
+            v.request_id = result.request_id
+
+        # Create audit entry
+        audit_entry = SecurityAuditEntry(
+            request_id=result.request_id,
+            path=request.url.path,
+            method=request.method,
+            client_ip=result.client_ip,
+            user_id=user_id,
+            auth_method=auth_method,
+            auth_level=auth_level,
+            sanitization_applied=result.sanitized,
+            threats_detected=result.threats_count,
+            violations=result.violations,
+            allowed=allowed,
+            response_code=response_code,
+            latency_ms=latency_ms,
+        )
+
+        # Log and record metrics
+        self._log_audit_entry(audit_entry)
+        self.metrics.record_request(
+            allowed=allowed,
+            sanitized=result.sanitized,
+            violations=result.violations,
+            threats=result.threats_count,
+        )
+
+    def apply_response_headers(self, headers: MutableHeaders, result: EnforcementResult) -> None:
+        """Add the enforcement headers to an allowed response."""
+        headers["X-Request-ID"] = result.request_id
+        headers["X-Security-Enforced"] = "true"
+
+        if result.violations:
+            headers["X-Security-Violations"] = str(len(result.violations))
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: RequestResponseEndpoint,
+    ) -> Response:
+        """Process request through security enforcer."""
+        result, blocked = await self.enforce_request(request)
+        if result is None:
+            return await call_next(request)
+        if blocked is not None:
+            return blocked
+
+        if result.sanitized_body is not None:
+            request._body = result.sanitized_body  # type: ignore[attr-defined]
+
         # Process request
         try:
             response = await call_next(request)
@@ -713,50 +809,9 @@ async def dispatch(
             allowed = False
             raise
         finally:
-            latency_ms = (time.perf_counter() - start_time) * 1000
-
-            # Get auth info
-            auth_method, auth_level = self._get_auth_info(request)
-            user_id = self._get_user_id(request)
-
-            # Update violations with context
-            for v in violations:
-                v.client_ip = client_ip
-                v.user_id = user_id
-                v.request_id = request_id
-
-            # Create audit entry
-            audit_entry = SecurityAuditEntry(
-                request_id=request_id,
-                path=request.url.path,
-                method=request.method,
-                client_ip=client_ip,
-                user_id=user_id,
-                auth_method=auth_method,
-                auth_level=auth_level,
-                sanitization_applied=sanitized,
-                threats_detected=threats_count,
-                violations=violations,
-                allowed=allowed,
-                response_code=response_code,
-                latency_ms=latency_ms,
-            )
-
-            # Log and record metrics
-            self._log_audit_entry(audit_entry)
-            self.metrics.record_request(
-                allowed=allowed,
-                sanitized=sanitized,
-                violations=violations,
-                threats=threats_count,
-            )
-
-        # Add security headers to response
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Security-Enforced"] = "true"
+            self.record_outcome(request, result, response_code, allowed)
 
-        if violations:
-            response.headers["X-Security-Violations"] = str(len(violations))
+        self.apply_response_headers(response.headers, result)
 
         return response
 
@@ -794,5 +849,6 @@ def _block_response(
     "SecurityViolation",
     "SecurityAuditEntry",
     "EnforcerMetrics",
+    "EnforcementResult",
     "SecurityEnforcerMiddleware",
 ]
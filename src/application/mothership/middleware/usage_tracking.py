@@ -24,7 +24,9 @@ class UsageTrackingMiddleware(BaseHTTPMiddleware):
     Middleware to track API usage for billing.
 
     Records usage for each API call to track consumption
-    and enforce tier limits.
+    and enforce tier limits. Records are queued on the usage meter and
+    bulk-written by its background flush task, so requests never wait on
+    metering storage.
     """
 
     def __init__(
@@ -80,20 +82,25 @@ async def dispatch(self, request: Request, call_next: Callable[[Request], Awaita
         # Process request
         response = await call_next(request)
 
-        # Track usage only for successful requests
-        if response.status_code < 400:
-            try:
-                await self.usage_meter.record_usage(
-                    user_id=user_id,
-                    endpoint=request.url.path,
-                    api_key_id=api_key_id,
-                    metadata={
-                        "method": request.method,
-                        "status_code": response.status_code,
-                    },
-                )
-            except Exception as e:
-                # Don't fail the request if usage tracking fails
-                logger.error(f"Usage tracking failed: {e}", exc_info=True)
+        await self._record(request, user_id, api_key_id, response.status_code)
 
         return response
+
+    async def _record(self, request: Request, user_id: str, api_key_id: str | None, status_code: int) -> None:
+        """Queue usage for a completed request; only successful requests are billed."""
+        if status_code >= 400:
+            return
+
+        try:
+            self.usage_meter.enqueue_usage(
+                user_id=user_id,
+                endpoint=request.url.path,
+                api_key_id=api_key_id,
+                metadata={
+                    "method": request.method,
+                    "status_code": status_code,
+                },
+            )
+        except Exception as e:
+            # Don't fail the request if usage tracking fails
+            logger.error(f"Usage tracking failed: {e}", exc_info=True)
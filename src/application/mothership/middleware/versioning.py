@@ -30,17 +30,18 @@ def __init__(
         super().__init__(app)
         self.default_version = default_version
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        # Determine version from path (e.g., /api/v1/...)
-        path = request.url.path
-        version_str = self.default_version
-
+    def _version_for_path(self, path: str) -> str:
+        """Determine the API version from the path (e.g., /api/v1/...)."""
         if "/api/v2" in path:
-            version_str = "v2"
-        elif "/api/v1" in path:
-            version_str = "v1"
-        elif "/api/experimental" in path:
-            version_str = "experimental"
+            return "v2"
+        if "/api/v1" in path:
+            return "v1"
+        if "/api/experimental" in path:
+            return "experimental"
+        return self.default_version
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        version_str = self._version_for_path(request.url.path)
 
         # Process request
         response = await call_next(request)
@@ -9,19 +9,26 @@
 
 import asyncio
 import logging
+import os
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator, Callable
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from operator import attrgetter
 from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 from ..models import utc_now
+from ..models.api_key import APIKey
 from ..models.cockpit import Alert as CockpitAlert
 from ..models.cockpit import CockpitState as CockpitStateModel
 from ..models.cockpit import Component as CockpitComponent
 from ..models.cockpit import Session as CockpitSession
 from ..models.cockpit import Task, TaskStatus
+from ..models.payment import Invoice, PaymentTransaction, Subscription
+from ..models.subscription import UsageRecord
+from .backends import Collection, InMemoryBackend, SQLiteBackend, StateBackend, create_state_backend
 
 if TYPE_CHECKING:
     from ..models.cockpit import AlertSeverity as CockpitAlertSeverity
@@ -82,6 +89,49 @@ async def count(self) -> int:
 # =============================================================================
 
 
+# Secondary indexes per collection: index name -> key function
+STATE_INDEXES: dict[str, dict[str, Callable[[Any], Any]]] = {
+    "sessions": {"user_id": attrgetter("user_id")},
+    "tasks": {"status": attrgetter("status"), "task_type": attrgetter("task_type")},
+    "components": {"name": attrgetter("name")},
+    "alerts": {"component_id": attrgetter("component_id"), "severity": attrgetter("severity")},
+    "api_keys": {"user_id": attrgetter("user_id"), "key_hash": attrgetter("key_hash")},
+    "payment_transactions": {
+        "user_id": attrgetter("user_id"),
+        "status": attrgetter("status"),
+        "idempotency_key": attrgetter("idempotency_key"),
+    },
+    "subscriptions": {
+        "user_id": attrgetter("user_id"),
+        "status": attrgetter("status"),
+        "tier": attrgetter("tier"),
+    },
+    "invoices": {"user_id": attrgetter("user_id"), "subscription_id": attrgetter("subscription_id")},
+    "usage_records": {"user_id": attrgetter("user_id")},
+}
+
+# Entity type stored in each collection, used by backends that serialize entities
+STATE_ENTITY_TYPES: dict[str, type[Any]] = {
+    "sessions": CockpitSession,
+    "tasks": Task,
+    "components": CockpitComponent,
+    "alerts": CockpitAlert,
+    "api_keys": APIKey,
+    "payment_transactions": PaymentTransaction,
+    "subscriptions": Subscription,
+    "invoices": Invoice,
+    "usage_records": UsageRecord,
+}
+
+# Lock shards: one per collection plus the cockpit state model
+LOCK_NAMES: tuple[str, ...] = tuple(sorted((*STATE_INDEXES, "cockpit_state")))
+
+# Locks held by the running task, so nested transactions don't wait on themselves
+_held_locks: ContextVar[tuple[asyncio.Task | None, frozenset[int]]] = ContextVar(
+    "state_store_held_locks", default=(None, frozenset())
+)
+
+
 @dataclass
 class StateStore:
     """
@@ -89,26 +139,40 @@ class StateStore:
 
     Provides centralized state management with atomic operations,
     event notification, and query capabilities.
+
+    Entity collections live in a pluggable backend (process-local by default,
+    or SQLite shared across workers) and carry the secondary indexes declared
+    in ``STATE_INDEXES``. Transactions lock only the collections they name.
     """
 
+    # Storage for entity collections
+    backend: StateBackend = field(default_factory=InMemoryBackend)
+
     # Core state
     cockpit_state: CockpitStateModel = field(default_factory=CockpitStateModel)
 
     # Entity collections
-    sessions: dict[str, CockpitSession] = field(default_factory=dict)
-    tasks: dict[str, Task] = field(default_factory=dict)
-    components: dict[str, CockpitComponent] = field(default_factory=dict)
-    alerts: dict[str, CockpitAlert] = field(default_factory=dict)
+    sessions: Collection = field(init=False)
+    tasks: Collection = field(init=False)
+    components: Collection = field(init=False)
+    alerts: Collection = field(init=False)
 
     # Additional collections (Phase 1 in-memory storage)
-    api_keys: dict[str, Any] = field(default_factory=dict)
-    payment_transactions: dict[str, Any] = field(default_factory=dict)
-    subscriptions: dict[str, Any] = field(default_factory=dict)
-    invoices: dict[str, Any] = field(default_factory=dict)
-    usage_records: dict[str, Any] = field(default_factory=dict)
-
-    # Synchronization
-    _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    api_keys: Collection = field(init=False)
+    payment_transactions: Collection = field(init=False)
+    subscriptions: Collection = field(init=False)
+    invoices: Collection = field(init=False)
+    usage_records: Collection = field(init=False)
+
+    # Usage aggregates maintained by UsageRepository: record IDs by user and hour bucket,
+    # cost units by user, endpoint and hour, and what each record contributed to them.
+    # Process-local, so only used when the backend is not shared.
+    usage_index: dict[str, dict[int, dict[str, None]]] = field(default_factory=dict)
+    usage_rollups: dict[str, dict[str, dict[int, int]]] = field(default_factory=dict)
+    usage_contributions: dict[str, tuple[str, str, int, int]] = field(default_factory=dict)
+
+    # Synchronization: one lock per entry in LOCK_NAMES
+    _locks: dict[str, asyncio.Lock] = field(default_factory=lambda: {name: asyncio.Lock() for name in LOCK_NAMES})
 
     # Event subscribers
     _subscribers: dict[str, list[Callable]] = field(default_factory=dict)
@@ -117,16 +181,40 @@ class StateStore:
     created_at: datetime = field(default_factory=utc_now)
     last_modified: datetime = field(default_factory=utc_now)
 
+    def __post_init__(self) -> None:
+        for name, indexes in STATE_INDEXES.items():
+            setattr(self, name, self.backend.collection(name, indexes, STATE_ENTITY_TYPES[name]))
+
     @asynccontextmanager
-    async def transaction(self) -> AsyncIterator[StateStore]:
-        """Context manager for atomic state modifications."""
-        async with self._lock:
+    async def transaction(self, *collections: str) -> AsyncIterator[StateStore]:
+        """
+        Context manager for atomic state modifications.
+
+        Args:
+            collections: Names from LOCK_NAMES to lock; none locks the whole store.
+                Locks are taken in a fixed order, and a nested transaction in the
+                same task reuses the locks its caller already holds.
+        """
+        task = asyncio.current_task()
+        owner, held = _held_locks.get()
+        if owner is not task:
+            held = frozenset()
+
+        names = sorted(set(collections)) if collections else LOCK_NAMES
+        locks = [self._locks[name] for name in names if id(self._locks[name]) not in held]
+
+        async with AsyncExitStack() as stack:
+            for lock in locks:
+                await stack.enter_async_context(lock)
+            token = _held_locks.set((task, held | {id(lock) for lock in locks}))
             try:
                 yield self
                 self.last_modified = utc_now()
             except Exception as e:
                 logger.error(f"Transaction failed: {e}")
                 raise
+            finally:
+                _held_locks.reset(token)
 
     async def subscribe(self, event_type: str, callback: Callable) -> None:
         """Subscribe to state change events."""
@@ -171,16 +259,28 @@ def get_snapshot(self) -> dict[str, Any]:
 
 
 def get_state_store() -> StateStore:
-    """Get or create the global state store instance."""
+    """
+    Get or create the global state store instance.
+
+    The backend is chosen by MOTHERSHIP_STATE_BACKEND ("memory" or "sqlite");
+    the sqlite backend stores state in MOTHERSHIP_STATE_PATH so every worker
+    process shares it.
+    """
     global _state_store
     if _state_store is None:
-        _state_store = StateStore()
+        backend = create_state_backend(
+            os.getenv("MOTHERSHIP_STATE_BACKEND", "memory"),
+            os.getenv("MOTHERSHIP_STATE_PATH", "./mothership_state.db"),
+        )
+        _state_store = StateStore(backend=backend)
     return _state_store
 
 
 def reset_state_store() -> StateStore:
     """Reset the state store (useful for testing)."""
     global _state_store
+    if _state_store is not None:
+        _state_store.backend.close()
     _state_store = StateStore()
     return _state_store
 
@@ -206,7 +306,7 @@ async def get_all(self) -> list[CockpitSession]:
 
     async def add(self, entity: CockpitSession) -> CockpitSession:
         """Add a new session."""
-        async with self._store.transaction():
+        async with self._store.transaction("sessions", "cockpit_state"):
             self._store.sessions[entity.id] = entity
             self._store.cockpit_state.add_session(entity)
         await self._store.emit("session.created", entity)
@@ -214,7 +314,7 @@ async def add(self, entity: CockpitSession) -> CockpitSession:
 
     async def update(self, entity: CockpitSession) -> CockpitSession:
         """Update an existing session."""
-        async with self._store.transaction():
+        async with self._store.transaction("sessions"):
             if entity.id not in self._store.sessions:
                 raise ValueError(f"Session not found: {entity.id}")
             self._store.sessions[entity.id] = entity
@@ -223,7 +323,7 @@ async def update(self, entity: CockpitSession) -> CockpitSession:
 
     async def delete(self, id: str) -> bool:
         """Delete a session."""
-        async with self._store.transaction():
+        async with self._store.transaction("sessions"):
             if id in self._store.sessions:
                 session = self._store.sessions.pop(id)
                 await self._store.emit("session.deleted", session)
@@ -240,7 +340,7 @@ async def count(self) -> int:
 
     async def get_by_user(self, user_id: str) -> list[CockpitSession]:
         """Get all sessions for a user."""
-        return [s for s in self._store.sessions.values() if s.user_id == user_id]
+        return self._store.sessions.lookup("user_id", user_id)
 
     async def get_active(self) -> list[CockpitSession]:
         """Get all active sessions."""
@@ -291,7 +391,7 @@ async def get_all(self) -> list[Task]:
 
     async def add(self, entity: Task) -> Task:
         """Add a new task."""
-        async with self._store.transaction():
+        async with self._store.transaction("tasks", "cockpit_state"):
             self._store.tasks[entity.id] = entity
             self._store.cockpit_state.add_task(entity)
         await self._store.emit("task.created", entity)
@@ -299,7 +399,7 @@ async def add(self, entity: Task) -> Task:
 
     async def update(self, entity: Task) -> Task:
         """Update an existing task."""
-        async with self._store.transaction():
+        async with self._store.transaction("tasks"):
             if entity.id not in self._store.tasks:
                 raise ValueError(f"Task not found: {entity.id}")
             self._store.tasks[entity.id] = entity
@@ -308,7 +408,7 @@ async def update(self, entity: Task) -> Task:
 
     async def delete(self, id: str) -> bool:
         """Delete a task."""
-        async with self._store.transaction():
+        async with self._store.transaction("tasks"):
             if id in self._store.tasks:
                 task = self._store.tasks.pop(id)
                 await self._store.emit("task.deleted", task)
@@ -325,7 +425,7 @@ async def count(self) -> int:
 
     async def get_by_status(self, status: TaskStatus) -> list[Task]:
         """Get tasks by status."""
-        return [t for t in self._store.tasks.values() if t.status == status]
+        return self._store.tasks.lookup("status", status)
 
     async def get_pending(self) -> list[Task]:
         """Get all pending tasks."""
@@ -337,7 +437,7 @@ async def get_running(self) -> list[Task]:
 
     async def get_by_type(self, task_type: str) -> list[Task]:
         """Get tasks by type."""
-        return [t for t in self._store.tasks.values() if t.task_type == task_type]
+        return self._store.tasks.lookup("task_type", task_type)
 
     async def get_next_runnable(self) -> Task | None:
         """Get the next task that can be executed (highest priority first)."""
@@ -391,7 +491,7 @@ async def get_all(self) -> list[CockpitComponent]:
 
     async def add(self, entity: CockpitComponent) -> CockpitComponent:
         """Register a new component."""
-        async with self._store.transaction():
+        async with self._store.transaction("components", "cockpit_state"):
             self._store.components[entity.id] = entity
             self._store.cockpit_state.add_component(entity)
         await self._store.emit("component.registered", entity)
@@ -399,7 +499,7 @@ async def add(self, entity: CockpitComponent) -> CockpitComponent:
 
     async def update(self, entity: CockpitComponent) -> CockpitComponent:
         """Update component information."""
-        async with self._store.transaction():
+        async with self._store.transaction("components"):
             if entity.id not in self._store.components:
                 raise ValueError(f"Component not found: {entity.id}")
             self._store.components[entity.id] = entity
@@ -408,7 +508,7 @@ async def update(self, entity: CockpitComponent) -> CockpitComponent:
 
     async def delete(self, id: str) -> bool:
         """Unregister a component."""
-        async with self._store.transaction():
+        async with self._store.transaction("components", "cockpit_state"):
             if id in self._store.components:
                 component = self._store.components.pop(id)
                 self._store.cockpit_state.remove_component(id)
@@ -426,10 +526,7 @@ async def count(self) -> int:
 
     async def get_by_name(self, name: str) -> CockpitComponent | None:
         """Get component by name."""
-        for component in self._store.components.values():
-            if component.name == name:
-                return component
-        return None
+        return self._store.components.first("name", name)
 
     async def get_by_type(self, component_type: str) -> list[CockpitComponent]:
         """Get components by type."""
@@ -481,7 +578,7 @@ async def get_all(self) -> list[CockpitAlert]:
 
     async def add(self, entity: CockpitAlert) -> CockpitAlert:
         """Create a new alert."""
-        async with self._store.transaction():
+        async with self._store.transaction("alerts", "cockpit_state"):
             self._store.alerts[entity.id] = entity
             self._store.cockpit_state.add_alert(entity)
         await self._store.emit("alert.created", entity)
@@ -489,7 +586,7 @@ async def add(self, entity: CockpitAlert) -> CockpitAlert:
 
     async def update(self, entity: CockpitAlert) -> CockpitAlert:
         """Update an alert."""
-        async with self._store.transaction():
+        async with self._store.transaction("alerts"):
             if entity.id not in self._store.alerts:
                 raise ValueError(f"Alert not found: {entity.id}")
             self._store.alerts[entity.id] = entity
@@ -498,7 +595,7 @@ async def update(self, entity: CockpitAlert) -> CockpitAlert:
 
     async def delete(self, id: str) -> bool:
         """Delete an alert."""
-        async with self._store.transaction():
+        async with self._store.transaction("alerts"):
             if id in self._store.alerts:
                 alert = self._store.alerts.pop(id)
                 await self._store.emit("alert.deleted", alert)
@@ -519,7 +616,7 @@ async def get_active(self) -> list[CockpitAlert]:
 
     async def get_by_severity(self, severity: CockpitAlertSeverity) -> list[CockpitAlert]:
         """Get alerts by severity."""
-        return [a for a in self._store.alerts.values() if a.severity == severity]
+        return self._store.alerts.lookup("severity", severity)
 
     async def get_critical(self) -> list[CockpitAlert]:
         """Get critical alerts."""
@@ -533,7 +630,7 @@ async def get_unacknowledged(self) -> list[CockpitAlert]:
 
     async def get_by_component(self, component_id: str) -> list[CockpitAlert]:
         """Get alerts for a specific component."""
-        return [a for a in self._store.alerts.values() if a.component_id == component_id]
+        return self._store.alerts.lookup("component_id", component_id)
 
     async def acknowledge(self, alert_id: str, user_id: str) -> CockpitAlert | None:
         """Acknowledge an alert."""
@@ -583,7 +680,7 @@ async def get_state(self) -> CockpitStateModel:
 
     async def update_state(self, state: CockpitStateModel) -> CockpitStateModel:
         """Update the cockpit state."""
-        async with self._store.transaction():
+        async with self._store.transaction("cockpit_state"):
             self._store.cockpit_state = state
         await self._store.emit("cockpit.state_updated", state)
         return state
@@ -598,7 +695,7 @@ async def get_full_state(self) -> dict[str, Any]:
 
     async def set_mode(self, mode: OperationMode) -> CockpitStateModel:
         """Set the cockpit operation mode."""
-        async with self._store.transaction():
+        async with self._store.transaction("cockpit_state"):
             self._store.cockpit_state.mode = mode
         await self._store.emit("cockpit.mode_changed", mode)
         return self._store.cockpit_state
@@ -669,6 +766,10 @@ def get_unit_of_work(store: StateStore | None = None) -> UnitOfWork:
     "BaseRepository",
     # State Store
     "StateStore",
+    "StateBackend",
+    "InMemoryBackend",
+    "SQLiteBackend",
+    "create_state_backend",
     "get_state_store",
     "reset_state_store",
     # Repositories
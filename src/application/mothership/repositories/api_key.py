@@ -31,7 +31,7 @@ async def get_all(self) -> list[APIKey]:
 
     async def add(self, entity: APIKey) -> APIKey:
         """Add a new API key."""
-        async with self._store.transaction():
+        async with self._store.transaction("api_keys"):
             self._store.api_keys[entity.id] = entity
         return entity
 
@@ -39,7 +39,7 @@ async def update(self, entity: APIKey) -> APIKey:
         """Update an existing API key."""
         from ..models.api_key import utc_now
 
-        async with self._store.transaction():
+        async with self._store.transaction("api_keys"):
             if entity.id not in self._store.api_keys:
                 raise ValueError(f"API key not found: {entity.id}")
             entity.updated_at = utc_now()
@@ -48,7 +48,7 @@ async def update(self, entity: APIKey) -> APIKey:
 
     async def delete(self, id: str) -> bool:
         """Delete an API key."""
-        async with self._store.transaction():
+        async with self._store.transaction("api_keys"):
             if id in self._store.api_keys:
                 del self._store.api_keys[id]
                 return True
@@ -64,11 +64,8 @@ async def count(self) -> int:
 
     async def get_by_user(self, user_id: str) -> list[APIKey]:
         """Get all API keys for a user."""
-        return [k for k in self._store.api_keys.values() if k.user_id == user_id]
+        return self._store.api_keys.lookup("user_id", user_id)
 
     async def get_by_key_hash(self, key_hash: str) -> APIKey | None:
         """Get API key by hash (for authentication)."""
-        for key in self._store.api_keys.values():
-            if key.key_hash == key_hash:
-                return key
-        return None
+        return self._store.api_keys.first("key_hash", key_hash)
@@ -0,0 +1,306 @@
+"""
+State backends for the Mothership StateStore.
+
+A backend provides the StateStore's entity collections as mutable mappings
+keyed by entity ID, each maintaining the secondary indexes it was declared
+with so repositories can look entities up by attribute instead of scanning.
+
+- ``InMemoryBackend``: process-local dicts (the default).
+- ``SQLiteBackend``: a SQLite database in WAL mode shared by every worker
+  process pointed at the same file. Entities are stored as JSON through a
+  pydantic ``TypeAdapter`` for the collection's entity type, so reading the
+  shared file never executes code; each write is its own SQLite transaction, so writes from one worker are visible to the others
+  as soon as the call returns.
+
+Index keys are computed when an entity is written, so an index reflects the
+entity as of its last ``add``/``update``. Lookups re-check the key against
+the current value and drop entries that no longer match.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, MutableMapping
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from pydantic import TypeAdapter
+
+logger = logging.getLogger(__name__)
+
+IndexKey = Callable[[Any], Any]
+
+
+class Collection(MutableMapping[str, Any], ABC):
+    """Entities of one kind keyed by ID, with declared secondary indexes."""
+
+    def __init__(self, name: str, indexes: dict[str, IndexKey] | None = None):
+        self.name = name
+        self.index_keys: dict[str, IndexKey] = dict(indexes or {})
+
+    @abstractmethod
+    def _candidates(self, index: str, key: Any) -> list[Any]:
+        """Entities filed under key in an index, possibly stale."""
+
+    def lookup(self, index: str, key: Any) -> list[Any]:
+        """Entities whose indexed attribute equals key."""
+        key_fn = self.index_keys[index]
+        return [entity for entity in self._candidates(index, key) if key_fn(entity) == key]
+
+    def first(self, index: str, key: Any) -> Any | None:
+        """Any one entity whose indexed attribute equals key, or None."""
+        matches = self.lookup(index, key)
+        return matches[0] if matches else None
+
+
+class MemoryCollection(Collection):
+    """Dict-backed collection with in-process hash indexes."""
+
+    def __init__(self, name: str, indexes: dict[str, IndexKey] | None = None):
+        super().__init__(name, indexes)
+        self._data: dict[str, Any] = {}
+        self._indexes: dict[str, dict[Any, dict[str, None]]] = {index: {} for index in self.index_keys}
+        self._filed: dict[str, dict[str, Any]] = {}  # ID -> index -> key it is filed under
+
+    def __getitem__(self, id: str) -> Any:
+        return self._data[id]
+
+    def __setitem__(self, id: str, entity: Any) -> None:
+        self._unfile(id)
+        self._data[id] = entity
+        if self.index_keys:
+            filed = {index: key_fn(entity) for index, key_fn in self.index_keys.items()}
+            for index, key in filed.items():
+                self._indexes[index].setdefault(key, {})[id] = None
+            self._filed[id] = filed
+
+    def __delitem__(self, id: str) -> None:
+        del self._data[id]
+        self._unfile(id)
+
+    def __contains__(self, id: object) -> bool:
+        return id in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def values(self):  # type: ignore[override]
+        return self._data.values()
+
+    def items(self):  # type: ignore[override]
+        return self._data.items()
+
+    def _unfile(self, id: str) -> None:
+        for index, key in self._filed.pop(id, {}).items():
+            bucket = self._indexes[index][key]
+            del bucket[id]
+            if not bucket:
+                del self._indexes[index][key]
+
+    def _candidates(self, index: str, key: Any) -> list[Any]:
+        return [self._data[id] for id in self._indexes[index].get(key, ())]
+
+
+def _encode_key(key: Any) -> str:
+    """Index key as stored in SQLite."""
+    return json.dumps(key.value if isinstance(key, Enum) else key, default=str)
+
+
+class SQLiteCollection(Collection):
+    """Collection stored in a shared SQLite database as JSON documents."""
+
+    def __init__(
+        self,
+        backend: SQLiteBackend,
+        name: str,
+        indexes: dict[str, IndexKey] | None = None,
+        entity_type: type[Any] | None = None,
+    ):
+        super().__init__(name, indexes)
+        if entity_type is None:
+            raise ValueError(f"SQLite collection {name!r} needs an entity type to decode its rows")
+        self._backend = backend
+        self._adapter: TypeAdapter[Any] = TypeAdapter(entity_type)
+
+    def _decode(self, value: bytes) -> Any:
+        return self._adapter.validate_json(value)
+
+    def __getitem__(self, id: str) -> Any:
+        row = self._backend.fetchone("SELECT value FROM entries WHERE collection = ? AND id = ?", (self.name, id))
+        if row is None:
+            raise KeyError(id)
+        return self._decode(row[0])
+
+    def __setitem__(self, id: str, entity: Any) -> None:
+        filed = [(self.name, index, _encode_key(key_fn(entity)), id) for index, key_fn in self.index_keys.items()]
+        with self._backend.write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (collection, id, value) VALUES (?, ?, ?)",
+                (self.name, id, self._adapter.dump_json(entity)),
+            )
+            conn.execute("DELETE FROM index_entries WHERE collection = ? AND id = ?", (self.name, id))
+            conn.executemany("INSERT INTO index_entries (collection, name, key, id) VALUES (?, ?, ?, ?)", filed)
+
+    def __delitem__(self, id: str) -> None:
+        with self._backend.write() as conn:
+            deleted = conn.execute("DELETE FROM entries WHERE collection = ? AND id = ?", (self.name, id)).rowcount
+            conn.execute("DELETE FROM index_entries WHERE collection = ? AND id = ?", (self.name, id))
+        if not deleted:
+            raise KeyError(id)
+
+    def __contains__(self, id: object) -> bool:
+        query = "SELECT 1 FROM entries WHERE collection = ? AND id = ?"
+        return self._backend.fetchone(query, (self.name, id)) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._backend.fetchall("SELECT id FROM entries WHERE collection = ?", (self.name,))
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        return self._backend.fetchone("SELECT COUNT(*) FROM entries WHERE collection = ?", (self.name,))[0]
+
+    def values(self) -> list[Any]:  # type: ignore[override]
+        rows = self._backend.fetchall("SELECT value FROM entries WHERE collection = ?", (self.name,))
+        return [self._decode(row[0]) for row in rows]
+
+    def items(self) -> list[tuple[str, Any]]:  # type: ignore[override]
+        rows = self._backend.fetchall("SELECT id, value FROM entries WHERE collection = ?", (self.name,))
+        return [(row[0], self._decode(row[1])) for row in rows]
+
+    def _candidates(self, index: str, key: Any) -> list[Any]:
+        query = """
+            SELECT e.value FROM index_entries i
+            JOIN entries e ON e.collection = i.collection AND e.id = i.id
+            WHERE i.collection = ? AND i.name = ? AND i.key = ?
+        """
+        rows = self._backend.fetchall(query, (self.name, index, _encode_key(key)))
+        return [self._decode(row[0]) for row in rows]
+
+
+class StateBackend(ABC):
+    """Storage for StateStore collections."""
+
+    # Whether writes are visible to other processes using the same backend
+    shared: bool = False
+
+    @abstractmethod
+    def collection(
+        self, name: str, indexes: dict[str, IndexKey] | None = None, entity_type: type[Any] | None = None
+    ) -> Collection:
+        """Create or open a collection of entity_type with the given secondary indexes."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release backend resources."""
+
+
+class InMemoryBackend(StateBackend):
+    """Process-local collections."""
+
+    def collection(
+        self, name: str, indexes: dict[str, IndexKey] | None = None, entity_type: type[Any] | None = None
+    ) -> Collection:
+        return MemoryCollection(name, indexes)
+
+    def close(self) -> None:
+        pass  # Nothing outlives the process
+
+
+class SQLiteBackend(StateBackend):
+    """
+    Collections in a SQLite database in WAL mode, shared across worker processes.
+
+    Args:
+        path: Database file; every worker must use the same path
+        timeout: Seconds to wait for another process's write lock
+    """
+
+    shared = True
+
+    def __init__(self, path: str | Path, timeout: float = 5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self.write() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "collection TEXT NOT NULL, id TEXT NOT NULL, value BLOB NOT NULL, PRIMARY KEY (collection, id))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS index_entries ("
+                "collection TEXT NOT NULL, name TEXT NOT NULL, key TEXT NOT NULL, id TEXT NOT NULL, "
+                "PRIMARY KEY (collection, name, id))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS index_entries_key ON index_entries (collection, name, key)")
+            conn.execute("CREATE INDEX IF NOT EXISTS index_entries_id ON index_entries (collection, id)")
+        logger.info(f"SQLite state backend at {self.path}")
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one immediate (write-locking) transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def fetchone(self, query: str, params: tuple[Any, ...]) -> tuple[Any, ...] | None:
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()
+
+    def fetchall(self, query: str, params: tuple[Any, ...]) -> list[tuple[Any, ...]]:
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def collection(
+        self, name: str, indexes: dict[str, IndexKey] | None = None, entity_type: type[Any] | None = None
+    ) -> Collection:
+        return SQLiteCollection(self, name, indexes, entity_type)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_state_backend(kind: str = "memory", path: str | Path = "./mothership_state.db") -> StateBackend:
+    """
+    Create a state backend by name.
+
+    Args:
+        kind: "memory" or "sqlite"
+        path: Database file for the sqlite backend
+
+    Raises:
+        ValueError: If kind is not a known backend
+    """
+    if kind == "memory":
+        return InMemoryBackend()
+    if kind == "sqlite":
+        return SQLiteBackend(path)
+    raise ValueError(f"Unknown state backend: {kind!r} (expected 'memory' or 'sqlite')")
+
+
+__all__ = [
+    "Collection",
+    "InMemoryBackend",
+    "MemoryCollection",
+    "SQLiteBackend",
+    "SQLiteCollection",
+    "StateBackend",
+    "create_state_backend",
+]
@@ -119,6 +119,18 @@ def _row_to_usage(row: UsageRecordRow) -> UsageRecord:
     )
 
 
+def _usage_to_row(entity: UsageRecord) -> UsageRecordRow:
+    return UsageRecordRow(
+        id=entity.id,
+        user_id=entity.user_id,
+        api_key_id=entity.api_key_id,
+        endpoint=entity.endpoint,
+        cost_units=entity.cost_units,
+        meta=entity.metadata or {},
+        timestamp=entity.timestamp,
+    )
+
+
 class DbUsageRepository:
     def __init__(self, session: AsyncSession):
         self._db = session
@@ -132,19 +144,13 @@ async def get_all(self) -> list[UsageRecord]:
         return [_row_to_usage(r) for r in rows]
 
     async def add(self, entity: UsageRecord) -> UsageRecord:
-        self._db.add(
-            UsageRecordRow(
-                id=entity.id,
-                user_id=entity.user_id,
-                api_key_id=entity.api_key_id,
-                endpoint=entity.endpoint,
-                cost_units=entity.cost_units,
-                meta=entity.metadata or {},
-                timestamp=entity.timestamp,
-            )
-        )
+        self._db.add(_usage_to_row(entity))
         return entity
 
+    async def add_many(self, entities: list[UsageRecord]) -> list[UsageRecord]:
+        self._db.add_all([_usage_to_row(entity) for entity in entities])
+        return entities
+
     async def update(self, entity: UsageRecord) -> UsageRecord:
         row = await self._db.get(UsageRecordRow, entity.id)
         if not row:
@@ -38,7 +38,7 @@ async def get_all(self) -> list[PaymentTransaction]:
 
     async def add(self, entity: PaymentTransaction) -> PaymentTransaction:
         """Add a new transaction."""
-        async with self._store.transaction():
+        async with self._store.transaction("payment_transactions"):
             self._store.payment_transactions[entity.id] = entity
         return entity
 
@@ -46,7 +46,7 @@ async def update(self, entity: PaymentTransaction) -> PaymentTransaction:
         """Update an existing transaction."""
         from ..models.payment import utc_now
 
-        async with self._store.transaction():
+        async with self._store.transaction("payment_transactions"):
             if entity.id not in self._store.payment_transactions:
                 raise ValueError(f"Transaction not found: {entity.id}")
             entity.updated_at = utc_now()
@@ -55,7 +55,7 @@ async def update(self, entity: PaymentTransaction) -> PaymentTransaction:
 
     async def delete(self, id: str) -> bool:
         """Delete a transaction."""
-        async with self._store.transaction():
+        async with self._store.transaction("payment_transactions"):
             if id in self._store.payment_transactions:
                 del self._store.payment_transactions[id]
                 return True
@@ -71,18 +71,15 @@ async def count(self) -> int:
 
     async def get_by_user(self, user_id: str) -> list[PaymentTransaction]:
         """Get all transactions for a user."""
-        return [t for t in self._store.payment_transactions.values() if t.user_id == user_id]
+        return self._store.payment_transactions.lookup("user_id", user_id)
 
     async def get_by_status(self, status: PaymentStatus) -> list[PaymentTransaction]:
         """Get transactions by status."""
-        return [t for t in self._store.payment_transactions.values() if t.status == status]
+        return self._store.payment_transactions.lookup("status", status)
 
     async def get_by_idempotency_key(self, idempotency_key: str) -> PaymentTransaction | None:
         """Get transaction by idempotency key (prevent duplicates)."""
-        for t in self._store.payment_transactions.values():
-            if t.idempotency_key == idempotency_key:
-                return t
-        return None
+        return self._store.payment_transactions.first("idempotency_key", idempotency_key)
 
 
 class SubscriptionRepository(BaseRepository[Subscription]):
@@ -101,7 +98,7 @@ async def get_all(self) -> list[Subscription]:
 
     async def add(self, entity: Subscription) -> Subscription:
         """Add a new subscription."""
-        async with self._store.transaction():
+        async with self._store.transaction("subscriptions"):
             self._store.subscriptions[entity.id] = entity
         return entity
 
@@ -109,7 +106,7 @@ async def update(self, entity: Subscription) -> Subscription:
         """Update an existing subscription."""
         from ..models.payment import utc_now
 
-        async with self._store.transaction():
+        async with self._store.transaction("subscriptions"):
             if entity.id not in self._store.subscriptions:
                 raise ValueError(f"Subscription not found: {entity.id}")
             entity.updated_at = utc_now()
@@ -118,7 +115,7 @@ async def update(self, entity: Subscription) -> Subscription:
 
     async def delete(self, id: str) -> bool:
         """Delete a subscription."""
-        async with self._store.transaction():
+        async with self._store.transaction("subscriptions"):
             if id in self._store.subscriptions:
                 del self._store.subscriptions[id]
                 return True
@@ -134,22 +131,22 @@ async def count(self) -> int:
 
     async def get_by_user(self, user_id: str) -> list[Subscription]:
         """Get all subscriptions for a user."""
-        return [s for s in self._store.subscriptions.values() if s.user_id == user_id]
+        return self._store.subscriptions.lookup("user_id", user_id)
 
     async def get_active_by_user(self, user_id: str) -> Subscription | None:
         """Get active subscription for a user."""
-        for sub in self._store.subscriptions.values():
-            if sub.user_id == user_id and sub.is_active():
+        for sub in self._store.subscriptions.lookup("user_id", user_id):
+            if sub.is_active():
                 return sub
         return None
 
     async def get_by_tier(self, tier: SubscriptionTier) -> list[Subscription]:
         """Get subscriptions by tier."""
-        return [s for s in self._store.subscriptions.values() if s.tier == tier]
+        return self._store.subscriptions.lookup("tier", tier)
 
     async def get_by_status(self, status: SubscriptionStatus) -> list[Subscription]:
         """Get subscriptions by status."""
-        return [s for s in self._store.subscriptions.values() if s.status == status]
+        return self._store.subscriptions.lookup("status", status)
 
 
 class InvoiceRepository(BaseRepository[Invoice]):
@@ -168,7 +165,7 @@ async def get_all(self) -> list[Invoice]:
 
     async def add(self, entity: Invoice) -> Invoice:
         """Add a new invoice."""
-        async with self._store.transaction():
+        async with self._store.transaction("invoices"):
             self._store.invoices[entity.id] = entity
         return entity
 
@@ -176,7 +173,7 @@ async def update(self, entity: Invoice) -> Invoice:
         """Update an existing invoice."""
         from ..models.payment import utc_now
 
-        async with self._store.transaction():
+        async with self._store.transaction("invoices"):
             if entity.id not in self._store.invoices:
                 raise ValueError(f"Invoice not found: {entity.id}")
             entity.updated_at = utc_now()
@@ -185,7 +182,7 @@ async def update(self, entity: Invoice) -> Invoice:
 
     async def delete(self, id: str) -> bool:
         """Delete an invoice."""
-        async with self._store.transaction():
+        async with self._store.transaction("invoices"):
             if id in self._store.invoices:
                 del self._store.invoices[id]
                 return True
@@ -201,8 +198,8 @@ async def count(self) -> int:
 
     async def get_by_user(self, user_id: str) -> list[Invoice]:
         """Get all invoices for a user."""
-        return [i for i in self._store.invoices.values() if i.user_id == user_id]
+        return self._store.invoices.lookup("user_id", user_id)
 
     async def get_by_subscription(self, subscription_id: str) -> list[Invoice]:
         """Get invoices for a subscription."""
-        return [i for i in self._store.invoices.values() if i.subscription_id == subscription_id]
+        return self._store.invoices.lookup("subscription_id", subscription_id)
@@ -15,12 +15,65 @@
 logger = logging.getLogger(__name__)
 
 
+def _hour(timestamp: datetime) -> int:
+    """Hour bucket a timestamp falls into."""
+    return int(timestamp.timestamp() // 3600)
+
+
 class UsageRepository(BaseRepository[UsageRecord]):
-    """Repository for usage records."""
+    """
+    Repository for usage records.
+
+    Alongside the records, the store keeps a per-user index of record IDs by
+    hour and pre-rolled cost units per user, endpoint and hour, so billing
+    queries sum hourly counters instead of scanning every record. Only the
+    hour bucket straddling the start of a period is read record by record.
+
+    The aggregates are process-local, so with a shared state backend, where
+    other workers add records too, queries read the user's records through
+    the backend's per-user index instead.
+    """
 
     def __init__(self, store: StateStore | None = None):
         self._store = store or get_state_store()
 
+    def _index(self, record: UsageRecord) -> None:
+        """Add a record to the hourly index and rollups (caller holds the lock)."""
+        hour = _hour(record.timestamp)
+        self._store.usage_index.setdefault(record.user_id, {}).setdefault(hour, {})[record.id] = None
+        hours = self._store.usage_rollups.setdefault(record.user_id, {}).setdefault(record.endpoint, {})
+        hours[hour] = hours.get(hour, 0) + record.cost_units
+        self._store.usage_contributions[record.id] = (record.user_id, record.endpoint, hour, record.cost_units)
+
+    def _unindex(self, id: str) -> None:
+        """Remove a record's contribution from the index and rollups (caller holds the lock)."""
+        # Use what was recorded at insert time; the record object may since have been mutated
+        contribution = self._store.usage_contributions.pop(id, None)
+        if contribution is None:
+            return
+        user_id, endpoint, hour, cost_units = contribution
+        buckets = self._store.usage_index[user_id]
+        del buckets[hour][id]
+        if not buckets[hour]:
+            del buckets[hour]
+        hours = self._store.usage_rollups[user_id][endpoint]
+        hours[hour] -= cost_units
+        if not hours[hour]:
+            del hours[hour]
+
+    @property
+    def _use_rollups(self) -> bool:
+        return not self._store.backend.shared
+
+    def _store_record(self, entity: UsageRecord) -> None:
+        """Insert or replace a record, keeping the aggregates in step (caller holds the lock)."""
+        if not self._use_rollups:
+            self._store.usage_records[entity.id] = entity
+            return
+        self._unindex(entity.id)
+        self._store.usage_records[entity.id] = entity
+        self._index(entity)
+
     async def get(self, id: str) -> UsageRecord | None:
         """Get usage record by ID."""
         return self._store.usage_records.get(id)
@@ -31,23 +84,32 @@ async def get_all(self) -> list[UsageRecord]:
 
     async def add(self, entity: UsageRecord) -> UsageRecord:
         """Add a new usage record."""
-        async with self._store.transaction():
-            self._store.usage_records[entity.id] = entity
+        async with self._store.transaction("usage_records"):
+            self._store_record(entity)
         return entity
 
+    async def add_many(self, entities: list[UsageRecord]) -> list[UsageRecord]:
+        """Add a batch of usage records in one transaction."""
+        async with self._store.transaction("usage_records"):
+            for entity in entities:
+                self._store_record(entity)
+        return entities
+
     async def update(self, entity: UsageRecord) -> UsageRecord:
         """Update an existing usage record (rarely used)."""
-        async with self._store.transaction():
+        async with self._store.transaction("usage_records"):
             if entity.id not in self._store.usage_records:
                 raise ValueError(f"Usage record not found: {entity.id}")
-            self._store.usage_records[entity.id] = entity
+            self._store_record(entity)
         return entity
 
     async def delete(self, id: str) -> bool:
         """Delete a usage record."""
-        async with self._store.transaction():
-            if id in self._store.usage_records:
-                del self._store.usage_records[id]
+        async with self._store.transaction("usage_records"):
+            record = self._store.usage_records.pop(id, None)
+            if record is not None:
+                if self._use_rollups:
+                    self._unindex(id)
                 return True
         return False
 
@@ -63,27 +125,66 @@ async def get_by_user(
         self, user_id: str, start_date: datetime | None = None, end_date: datetime | None = None
     ) -> list[UsageRecord]:
         """Get usage records for a user within a date range."""
-        records = [r for r in self._store.usage_records.values() if r.user_id == user_id]
+        if not self._use_rollups:
+            records = self._store.usage_records.lookup("user_id", user_id)
+            return [
+                r
+                for r in records
+                if (not start_date or r.timestamp >= start_date) and (not end_date or r.timestamp <= end_date)
+            ]
+
+        first = _hour(start_date) if start_date else None
+        last = _hour(end_date) if end_date else None
+        records = []
+        for hour, ids in self._store.usage_index.get(user_id, {}).items():
+            if (first is not None and hour < first) or (last is not None and hour > last):
+                continue
+            records.extend(self._store.usage_records[record_id] for record_id in ids)
         if start_date:
             records = [r for r in records if r.timestamp >= start_date]
         if end_date:
             records = [r for r in records if r.timestamp <= end_date]
         return records
 
+    def _boundary_records(self, user_id: str, start_date: datetime) -> list[UsageRecord]:
+        """Records in the hour bucket containing start_date that fall inside the period."""
+        ids = self._store.usage_index.get(user_id, {}).get(_hour(start_date), ())
+        records = (self._store.usage_records[record_id] for record_id in ids)
+        return [r for r in records if r.timestamp >= start_date]
+
     async def get_usage_by_endpoint(self, user_id: str, endpoint: str, period_days: int = 30) -> int:
         """Get total cost units for a specific endpoint within a period."""
         start_date = datetime.now(UTC) - timedelta(days=period_days)
-        records = await self.get_by_user(user_id, start_date=start_date)
-        endpoint_records = [r for r in records if r.endpoint == endpoint]
-        return sum(r.cost_units for r in endpoint_records)
+        if not self._use_rollups:
+            records = await self.get_by_user(user_id, start_date=start_date)
+            return sum(r.cost_units for r in records if r.endpoint == endpoint)
+
+        hours = self._store.usage_rollups.get(user_id, {}).get(endpoint)
+        if not hours:
+            return 0
+        first = _hour(start_date)
+        total = sum(units for hour, units in hours.items() if hour > first)
+        if first in hours:
+            total += sum(r.cost_units for r in self._boundary_records(user_id, start_date) if r.endpoint == endpoint)
+        return total
 
     async def get_total_usage(self, user_id: str, period_days: int = 30) -> dict[str, int]:
         """Get total usage by endpoint type for a user."""
         start_date = datetime.now(UTC) - timedelta(days=period_days)
-        records = await self.get_by_user(user_id, start_date=start_date)
-
         usage: dict[str, int] = {}
-        for record in records:
+        if not self._use_rollups:
+            for record in await self.get_by_user(user_id, start_date=start_date):
+                endpoint_type = record.endpoint.split("/")[0] if "/" in record.endpoint else record.endpoint
+                usage[endpoint_type] = usage.get(endpoint_type, 0) + record.cost_units
+            return usage
+
+        first = _hour(start_date)
+        for endpoint, hours in self._store.usage_rollups.get(user_id, {}).items():
+            units = sum(units for hour, units in hours.items() if hour > first)
+            if units:
+                endpoint_type = endpoint.split("/")[0] if "/" in endpoint else endpoint
+                usage[endpoint_type] = usage.get(endpoint_type, 0) + units
+        for record in self._boundary_records(user_id, start_date):
             endpoint_type = record.endpoint.split("/")[0] if "/" in record.endpoint else record.endpoint
             usage[endpoint_type] = usage.get(endpoint_type, 0) + record.cost_units
 
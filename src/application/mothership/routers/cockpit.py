@@ -35,6 +35,7 @@
     ReadinessResponse,
     SystemStatusSchema,
 )
+from ..utils.cache import cache_json
 
 logger = logging.getLogger(__name__)
 
@@ -188,6 +189,7 @@ async def liveness_check() -> LivenessResponse:
     summary="Get Cockpit State",
     description="Get the current state of the cockpit system.",
 )
+@cache_json("cockpit-state", expire=2, stale=10)
 async def get_state(
     cockpit: Cockpit,
     auth: Auth,
@@ -674,6 +676,7 @@ async def restart_system(
     summary="Get Statistics",
     description="Get cockpit statistics and metrics.",
 )
+@cache_json("cockpit-stats", expire=5, stale=30)
 async def get_statistics(
     cockpit: Cockpit,
     auth: Auth,
@@ -28,6 +28,7 @@
 from ..security.api_sentinels import (
     get_api_defaults,
 )
+from ..utils.cache import cache_json, get_cache_stats
 
 logger = logging.getLogger(__name__)
 
@@ -254,6 +255,7 @@ class CircuitBreakerStatus(BaseModel):
     summary="Health Check",
     description="Comprehensive health check endpoint for monitoring",
 )
+@cache_json("health", expire=2)
 async def health_check(
     cockpit: Cockpit,
     settings: Settings,
@@ -773,6 +775,7 @@ async def metrics(
             "unresolved": sum(1 for a in state.alerts.values() if not a.is_resolved),
             "critical": sum(1 for a in state.alerts.values() if not a.is_resolved and a.severity.value == "critical"),
         },
+        "cache": get_cache_stats(),
     }
 
 
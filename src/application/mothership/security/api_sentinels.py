@@ -241,6 +241,11 @@ def __init__(
         """
         self.patterns = patterns or THREAT_PATTERNS
         self.compiled_patterns = [(p, p.compile()) for p in self.patterns]
+        # One alternation of every pattern: strings it does not match skip the per-pattern pass
+        self._prefilter = re.compile(
+            "|".join(f"(?:{p.pattern})" for p in self.patterns) or "(?!)",
+            re.IGNORECASE | re.MULTILINE,
+        )
         self.max_input_length = max_input_length
         self.max_recursion_depth = max_recursion_depth
         self.strict_mode = strict_mode
@@ -278,6 +283,13 @@ def sanitize_string(self, value: str) -> SanitizationResult:
                 action_taken=SanitizationAction.REJECT,
             )
 
+        if self._prefilter.search(value) is None:
+            return SanitizationResult(
+                is_safe=True,
+                original_value=value,
+                sanitized_value=value,
+            )
+
         threats: list[dict[str, Any]] = []
         sanitized = value
         action = SanitizationAction.LOG_ONLY
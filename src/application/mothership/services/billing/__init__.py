@@ -4,10 +4,11 @@
 Services for usage metering, billing, and subscription management.
 """
 
-from .meter import UsageMeter
+from .meter import UsageMeter, close_usage_meters
 from .service import BillingService
 
 __all__ = [
     "UsageMeter",
     "BillingService",
+    "close_usage_meters",
 ]
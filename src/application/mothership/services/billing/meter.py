@@ -6,7 +6,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import uuid
+import weakref
+from collections import deque
 
 from ...config import get_settings
 from ...models.payment import SubscriptionTier
@@ -15,9 +19,21 @@
 
 logger = logging.getLogger(__name__)
 
+# Meters with a running flush task, so shutdown can drain them all
+_active_meters: weakref.WeakSet[UsageMeter] = weakref.WeakSet()
+
 
 class UsageMeter:
-    """Service for tracking and calculating API usage."""
+    """
+    Service for tracking and calculating API usage.
+
+    ``record_usage`` writes a record straight to the repository.
+    ``enqueue_usage`` is the hot-path variant: it appends the record to a
+    bounded in-process queue and returns immediately, and a background task
+    bulk-inserts the queue with ``add_many`` once ``batch_size`` records are
+    pending or ``flush_interval`` seconds have passed. When the queue is full
+    new records are dropped and counted in ``dropped``.
+    """
 
     # Cost units per endpoint type
     ENDPOINT_COSTS = {
@@ -27,15 +43,34 @@ class UsageMeter:
         "scenario_analysis": 5,
     }
 
-    def __init__(self, usage_repo: UsageRepository | None = None):
+    def __init__(
+        self,
+        usage_repo: UsageRepository | None = None,
+        queue_size: int | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+    ):
         """
         Initialize usage meter.
 
         Args:
             usage_repo: Usage repository (created if not provided)
+            queue_size: Maximum pending records for enqueue_usage (defaults to billing settings)
+            batch_size: Pending records that trigger a flush (defaults to billing settings)
+            flush_interval: Maximum seconds between flushes (defaults to billing settings)
         """
         self.usage_repo = usage_repo or UsageRepository()
         self.settings = get_settings()
+        billing = self.settings.billing
+        self.queue_size = queue_size if queue_size is not None else billing.usage_queue_size
+        self.batch_size = max(1, batch_size if batch_size is not None else billing.usage_batch_size)
+        self.flush_interval = flush_interval if flush_interval is not None else billing.usage_flush_interval_seconds
+        self.dropped = 0
+
+        self._pending: deque[UsageRecord] = deque()
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._wakeup: asyncio.Event | None = None
 
     def get_cost_units(self, endpoint: str) -> int:
         """
@@ -85,12 +120,22 @@ async def record_usage(
         Returns:
             Created usage record
         """
-        import uuid
+        record = self._build_record(user_id, endpoint, api_key_id, cost_units, metadata)
+        await self.usage_repo.add(record)
+        return record
 
+    def _build_record(
+        self,
+        user_id: str,
+        endpoint: str,
+        api_key_id: str | None,
+        cost_units: int | None,
+        metadata: dict | None,
+    ) -> UsageRecord:
         if cost_units is None:
             cost_units = self.get_cost_units(endpoint)
 
-        record = UsageRecord(
+        return UsageRecord(
             id=str(uuid.uuid4()),
             user_id=user_id,
             api_key_id=api_key_id,
@@ -99,8 +144,105 @@ async def record_usage(
             metadata=metadata or {},
         )
 
-        await self.usage_repo.add(record)
-        return record
+    def enqueue_usage(
+        self,
+        user_id: str,
+        endpoint: str,
+        api_key_id: str | None = None,
+        cost_units: int | None = None,
+        metadata: dict | None = None,
+    ) -> bool:
+        """
+        Queue API usage for the next batched flush without waiting on storage.
+
+        Args:
+            user_id: User identifier
+            endpoint: API endpoint path
+            api_key_id: API key ID (if used)
+            cost_units: Cost units (calculated if not provided)
+            metadata: Additional metadata
+
+        Returns:
+            False if the queue was full and the record was dropped
+        """
+        if len(self._pending) >= self.queue_size:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Usage queue full, {self.dropped} usage records dropped")
+            return False
+
+        self._pending.append(self._build_record(user_id, endpoint, api_key_id, cost_units, metadata))
+        self._ensure_flusher()
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Number of queued records not yet written."""
+        return len(self._pending)
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flush task on the running loop if it is not running."""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop yet; the next flush() or enqueue from a loop picks the records up
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._flush_task = loop.create_task(self._flush_loop())
+        _active_meters.add(self)
+
+    async def _flush_loop(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write all queued records to the repository in batches.
+
+        Returns:
+            Number of records written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        written = 0
+        async with self._flush_lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                try:
+                    await self.usage_repo.add_many(batch)
+                except asyncio.CancelledError:
+                    self._pending.extendleft(reversed(batch))
+                    raise
+                except Exception as e:
+                    # Put the batch back for the next attempt rather than losing billable usage
+                    logger.error(f"Usage flush failed, {len(batch)} records re-queued: {e}")
+                    self._pending.extendleft(reversed(batch))
+                    break
+                written += len(batch)
+        return written
+
+    async def close(self) -> None:
+        """Stop the background flush task and write any queued records."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        _active_meters.discard(self)
+        await self.flush()
 
     async def get_tier_limits(self, tier: SubscriptionTier) -> dict[str, int]:
         """
@@ -164,3 +306,12 @@ async def check_usage_limit(
         current_usage = await self.usage_repo.get_usage_by_endpoint(user_id, endpoint, period_days)
 
         return current_usage < limit, current_usage, limit
+
+
+async def close_usage_meters() -> None:
+    """Flush and stop every meter with a running flush task (called on shutdown)."""
+    for meter in list(_active_meters):
+        try:
+            await meter.close()
+        except Exception as e:
+            logger.warning(f"Error closing usage meter: {e}")
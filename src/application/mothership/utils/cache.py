@@ -1,20 +1,95 @@
+"""
+Two-tier response cache for the Mothership Cockpit.
+
+Values are JSON strings. Reads go to a bounded in-process LRU first and to
+Redis (when MOTHERSHIP_USE_REDIS=1 and reachable) on a local miss; values
+found in Redis are kept locally for at most ``promote_ttl`` seconds so
+workers don't serve another worker's stale copy for long.
+
+``cache_json`` adds, on top of plain get/set:
+- single-flight: concurrent misses for a key share one computation
+- stale-while-revalidate: for ``stale`` seconds after expiry the old value is
+  served while one background task recomputes it
+- stable keys: a hash of the JSON-encoded arguments
+
+Hit, miss, stale-hit, coalesced-wait and eviction counts are kept per cache
+(``stats()``) and, with prometheus_client installed, exported as
+``mothership_cache_*`` metrics.
+"""
+
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import inspect
 import json
 import logging
 import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
 
-import redis
 from pydantic import BaseModel
 
+try:
+    import redis  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+try:
+    from prometheus_client import REGISTRY, Counter  # type: ignore[import-not-found]
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+class _NoopCounter:
+    def labels(self, **kwargs) -> _NoopCounter:
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+
+def _get_or_create_counter(name: str, documentation: str, labelnames: list[str]) -> Any:
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopCounter()
+    existing = getattr(REGISTRY, "_names_to_collectors", {}).get(name)
+    if existing is not None:
+        return existing
+    return Counter(name, documentation, labelnames)
+
+
+CACHE_REQUESTS = _get_or_create_counter(
+    "mothership_cache_requests_total",
+    "Cache lookups by tier and result (hit, miss, stale)",
+    ["tier", "result"],
+)
+CACHE_EVICTIONS = _get_or_create_counter(
+    "mothership_cache_evictions_total",
+    "Entries dropped from the in-process cache by reason (capacity, expired)",
+    ["reason"],
+)
+CACHE_COALESCED = _get_or_create_counter(
+    "mothership_cache_coalesced_total",
+    "Cache misses that waited on an in-flight computation instead of recomputing",
+    [],
+)
+
+
 class RedisCache:
     """Redis-backed cache implementation."""
 
     def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0, password: str | None = None):
         try:
+            if redis is None:
+                raise ImportError("redis package is not installed")
             self.client = redis.Redis(
                 host=host, port=port, db=db, password=password, decode_responses=True, socket_timeout=2
             )
@@ -45,65 +120,315 @@ def set(self, key: str, value: str, expire: int = 3600) -> bool:
             return False
 
 
+@dataclass
+class _Entry:
+    value: str
+    fresh_until: float  # Monotonic time after which the value is stale
+    stale_until: float  # Monotonic time after which the value is dropped
+    size: int
+
+
 class MemoryCache:
-    """In-memory fallback cache."""
+    """
+    Bounded in-process LRU cache with per-entry TTL.
+
+    Args:
+        max_entries: Evict least recently used entries beyond this count
+        max_bytes: Evict least recently used entries beyond this many characters of values
+        default_expire: TTL in seconds when set() is given none (None keeps entries until evicted)
+    """
 
-    def __init__(self):
-        self._data: dict[str, str] = {}
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024, default_expire: int | None = 3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_expire = default_expire
+        self._data: OrderedDict[str, _Entry] = OrderedDict()
+        self.size_bytes = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
         logger.info("Initialized in-memory cache fallback")
 
     def get(self, key: str) -> str | None:
-        return self._data.get(key)
+        """Fresh value for key, or None."""
+        found = self.get_entry(key)
+        if found is None or not found[1]:
+            return None
+        return found[0]
+
+    def get_entry(self, key: str) -> tuple[str, bool] | None:
+        """(value, is_fresh) for key, including values in their stale window; None on a miss."""
+        entry = self._data.get(key)
+        now = time.monotonic()
+        if entry is not None and now >= entry.stale_until:
+            self._remove(key)
+            self.expirations += 1
+            CACHE_EVICTIONS.labels(reason="expired").inc()
+            entry = None
+        if entry is None:
+            self.misses += 1
+            CACHE_REQUESTS.labels(tier="memory", result="miss").inc()
+            return None
+
+        self._data.move_to_end(key)
+        fresh = now < entry.fresh_until
+        if fresh:
+            self.hits += 1
+            CACHE_REQUESTS.labels(tier="memory", result="hit").inc()
+        else:
+            self.stale_hits += 1
+            CACHE_REQUESTS.labels(tier="memory", result="stale").inc()
+        return entry.value, fresh
+
+    def set(self, key: str, value: str, expire: int | None = None, stale: int = 0) -> bool:
+        """
+        Store a value.
 
-    def set(self, key: str, value: str, expire: int = None) -> bool:
-        self._data[key] = value
+        Args:
+            key: Cache key
+            value: Value to store
+            expire: Seconds the value stays fresh (default_expire if None)
+            stale: Further seconds the value may be served by get_entry() as stale
+        """
+        expire = self.default_expire if expire is None else expire
+        now = time.monotonic()
+        fresh_until = now + expire if expire is not None else float("inf")
+        entry = _Entry(value, fresh_until, fresh_until + stale, len(value))
+        if entry.size > self.max_bytes:
+            return False
+
+        self._remove(key)
+        self._data[key] = entry
+        self.size_bytes += entry.size
+        while len(self._data) > self.max_entries or self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+            CACHE_EVICTIONS.labels(reason="capacity").inc()
         return True
 
+    def delete(self, key: str) -> bool:
+        return self._remove(key) is not None
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.size_bytes = 0
+
+    def _remove(self, key: str) -> _Entry | None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry.size
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._data),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class TieredCache:
+    """
+    In-process MemoryCache in front of an optional RedisCache.
+
+    Args:
+        local: In-process tier
+        remote: Shared tier, or None for a process-local cache
+        promote_ttl: Max seconds a value read from the remote tier is kept locally
+    """
+
+    def __init__(self, local: MemoryCache | None = None, remote: RedisCache | None = None, promote_ttl: int = 5):
+        self.local = local or MemoryCache()
+        self.remote = remote
+        self.promote_ttl = promote_ttl
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+        self._refreshing: set[str] = set()
+        self.coalesced = 0
+
+    def get(self, key: str) -> str | None:
+        value = self.local.get(key)
+        if value is None and self.remote is not None:
+            value = self.remote.get(key)
+            self._promote(key, value)
+        return value
+
+    def set(self, key: str, value: str, expire: int | None = None, stale: int = 0) -> bool:
+        stored = self.local.set(key, value, expire=expire, stale=stale)
+        if self.remote is not None:
+            stored = self.remote.set(key, value, expire=(expire or 3600) + stale) or stored
+        return stored
+
+    def _promote(self, key: str, value: str | None) -> None:
+        CACHE_REQUESTS.labels(tier="redis", result="miss" if value is None else "hit").inc()
+        if value is not None:
+            self.local.set(key, value, expire=self.promote_ttl)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[str]],
+        expire: int,
+        stale: int = 0,
+    ) -> str:
+        """
+        Cached value for key, computing it at most once at a time per key.
+
+        Args:
+            key: Cache key
+            compute: Coroutine factory producing the value on a miss
+            expire: Seconds the computed value stays fresh
+            stale: Seconds after expiry the old value is still served while it is recomputed
+        """
+        found = self.local.get_entry(key)
+        if found is not None:
+            value, fresh = found
+            if not fresh and key not in self._refreshing:
+                self._refreshing.add(key)
+                asyncio.create_task(self._refresh(key, compute, expire, stale))
+            return value
+
+        if self.remote is not None:
+            value = await asyncio.to_thread(self.remote.get, key)
+            self._promote(key, value)
+            if value is not None:
+                return value
+
+        return await self._compute_once(key, compute, expire, stale)
+
+    async def _compute_once(self, key: str, compute: Callable[[], Awaitable[str]], expire: int, stale: int) -> str:
+        # The computation runs as its own task so a cancelled caller doesn't cancel it for the others
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute_and_store(key, compute, expire, stale))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._computed, key))
+        else:
+            self.coalesced += 1
+            CACHE_COALESCED.inc()
+        return await asyncio.shield(task)
+
+    def _computed(self, key: str, task: asyncio.Task[str]) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # Callers re-raise it; don't warn if they all went away
+
+    async def _compute_and_store(self, key: str, compute: Callable[[], Awaitable[str]], expire: int, stale: int) -> str:
+        value = await compute()
+        self.local.set(key, value, expire=expire, stale=stale)
+        if self.remote is not None:
+            await asyncio.to_thread(self.remote.set, key, value, expire + stale)
+        return value
+
+    async def _refresh(self, key: str, compute: Callable[[], Awaitable[str]], expire: int, stale: int) -> None:
+        try:
+            await self._compute_once(key, compute, expire, stale)
+        except Exception as e:
+            logger.warning(f"Background refresh of cache key {key} failed: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.local.stats(),
+            "coalesced": self.coalesced,
+            "remote": "redis" if self.remote is not None else None,
+        }
+
 
 class GlobalCache:
     """Factory for cache instances."""
 
-    _instance: RedisCache | MemoryCache | None = None
+    _instance: TieredCache | None = None
 
     @classmethod
-    def get_instance(cls) -> RedisCache | MemoryCache:
+    def get_instance(cls) -> TieredCache:
         if cls._instance is None:
+            local = MemoryCache(
+                max_entries=int(os.getenv("MOTHERSHIP_CACHE_MAX_ENTRIES", "10000")),
+                max_bytes=int(os.getenv("MOTHERSHIP_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            )
+            remote = None
             use_redis = os.getenv("MOTHERSHIP_USE_REDIS", "0") == "1"
             if use_redis:
-                cls._instance = RedisCache(
+                remote = RedisCache(
                     host=os.getenv("REDIS_HOST", "localhost"),
                     port=int(os.getenv("REDIS_PORT", "6379")),
                 )
-                if not cls._instance.available:
-                    cls._instance = MemoryCache()
-            else:
-                cls._instance = MemoryCache()
+                if not remote.available:
+                    remote = None
+            cls._instance = TieredCache(local, remote)
         return cls._instance
 
 
-def cache_json(key: str, expire: int = 3600):
-    """Decorator for caching JSON-serializable function results."""
+def _key_default(value: Any) -> Any:
+    """JSON encoding for cache key arguments."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, set | frozenset):
+        return sorted(value, key=repr)
+    # Injected services and other opaque objects don't vary the key
+    return f"<{type(value).__module__}.{type(value).__qualname__}>"
+
+
+def make_cache_key(func: Callable[..., Any], key: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+    """Stable cache key: function, key prefix and a hash of the JSON-encoded arguments."""
+    payload = json.dumps([args, kwargs], sort_keys=True, default=_key_default, separators=(",", ":"))
+    digest = hashlib.sha256(payload.encode()).hexdigest()[:32]
+    return f"{func.__module__}.{func.__qualname__}:{key}:{digest}"
+
+
+def cache_json(key: str, expire: int = 3600, stale: int = 0):
+    """
+    Decorator for caching JSON-serializable function results.
+
+    On a hit the decoded JSON is returned (a dict for pydantic results).
+    Arguments that are not JSON-like, such as injected dependencies, do not
+    vary the key.
+
+    Args:
+        key: Key prefix, shared by all calls of the function
+        expire: Seconds a result stays fresh
+        stale: Seconds after expiry the old result is served while it is recomputed
+    """
 
     def decorator(func):
+        @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             cache = GlobalCache.get_instance()
-            # Simple key generation (can be improved)
-            cache_key = f"{func.__name__}:{key}:" + str(args) + str(kwargs)
-            cached_val = cache.get(cache_key)
-            if cached_val:
-                return json.loads(cached_val)
-
-            result = await func(*args, **kwargs)
+            cache_key = make_cache_key(func, key, args, kwargs)
 
-            # Serialize result
-            if isinstance(result, BaseModel):
-                val_to_cache = result.model_dump_json()
-            else:
-                val_to_cache = json.dumps(result)
+            async def compute() -> str:
+                result = await func(*args, **kwargs)
+                # Serialize result
+                if isinstance(result, BaseModel):
+                    return result.model_dump_json()
+                return json.dumps(result)
 
-            cache.set(cache_key, val_to_cache, expire=expire)
-            return result
+            return json.loads(await cache.get_or_compute(cache_key, compute, expire=expire, stale=stale))
 
+        # Resolve string annotations against func's module so FastAPI can inject dependencies
+        try:
+            wrapper.__signature__ = inspect.signature(func, eval_str=True)
+        except NameError:
+            pass
         return wrapper
 
     return decorator
+
+
+def get_cache_stats() -> dict[str, Any]:
+    """Hit, miss and eviction counts for the global cache."""
+    return GlobalCache.get_instance().stats()
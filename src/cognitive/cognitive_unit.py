@@ -217,6 +217,11 @@ class CognitiveVector:
 
     A CognitiveVector represents a trajectory through the cognitive space,
     capturing the evolution of cognitive state over time.
+
+    Vectors produced by ``CognitiveVectorizer.vectorize_behavior`` carry the
+    vectorized feature matrix (derivatives, normalization and clipping
+    applied); ``to_matrix``, ``centroid`` and ``variance`` then work on it
+    instead of the raw unit vectors.
     """
 
     units: list[CognitiveUnit] = field(default_factory=list)
@@ -225,6 +230,7 @@ class CognitiveVector:
     _length: float | None = None
     _displacement: float | None = None
     _centroid: np.ndarray | None = None
+    _matrix: np.ndarray | None = None
 
     def add_unit(self, unit: CognitiveUnit) -> None:
         """Add a cognitive unit to this vector.
@@ -237,6 +243,23 @@ def add_unit(self, unit: CognitiveUnit) -> None:
         self._length = None
         self._displacement = None
         self._centroid = None
+        self._matrix = None
+
+    def set_matrix(self, matrix: np.ndarray) -> None:
+        """Attach a precomputed feature matrix for the current units.
+
+        Args:
+            matrix: Matrix with one row per unit
+
+        Raises:
+            ValueError: If the row count does not match the units
+        """
+        if matrix.ndim != 2 or matrix.shape[0] != len(self.units):
+            raise ValueError(f"matrix must have one row per unit ({len(self.units)}), got shape {matrix.shape}")
+        matrix = np.array(matrix, dtype=np.float32)
+        matrix.flags.writeable = False
+        self._matrix = matrix
+        self._centroid = None
 
     def length(self) -> float:
         """Calculate total path length.
@@ -287,8 +310,7 @@ def centroid(self) -> np.ndarray:
             self._centroid = np.zeros(32, dtype=np.float32)
             return self._centroid
 
-        vectors = np.array([u.to_vector() for u in self.units])
-        self._centroid = np.mean(vectors, axis=0)
+        self._centroid = np.mean(self.to_matrix(), axis=0)
         return self._centroid
 
     def straightness(self) -> float:
@@ -313,7 +335,7 @@ def variance(self) -> float:
             return 0.0
 
         centroid = self.centroid()
-        vectors = np.array([u.to_vector() for u in self.units])
+        vectors = self.to_matrix()
 
         return float(np.mean(np.sum((vectors - centroid) ** 2, axis=1)))
 
@@ -321,8 +343,11 @@ def to_matrix(self) -> np.ndarray:
         """Convert to matrix for batch processing.
 
         Returns:
-            Matrix with shape (len(units), 32)
+            Matrix with shape (len(units), 32), or the attached feature
+            matrix (read-only) if one was set
         """
+        if self._matrix is not None:
+            return self._matrix
         return np.array([u.to_vector() for u in self.units], dtype=np.float32)
 
     def serialize(self) -> dict[str, Any]:
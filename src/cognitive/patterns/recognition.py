@@ -15,18 +15,30 @@
 7. Cause - Causal relationships
 8. Time - Temporal evolution
 9. Combination - Composite patterns
+
+PatternMatcher runs the recognizers concurrently. The heavier computations
+(repetition, deviation and temporal analysis) are pure module-level kernels,
+which can be offloaded to an executor such as a ProcessPoolExecutor while
+each recognizer's history stays in this process. recognize_batch() scores
+many users' windows at once with numpy.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import math
 from abc import ABC, abstractmethod
+from bisect import bisect_left
 from collections import Counter, deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from enum import StrEnum
-from typing import Any, TypeVar
+from typing import Any, TypeVar, cast
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +113,25 @@ def __init__(self, name: str):
         self.name = name
         self.detection_threshold = 0.5
         self.history_size = 50
+        self.executor: Executor | None = None
+
+    async def _compute[R](self, func: Callable[..., R], *args: Any) -> R:
+        """Run a pure kernel, in the executor if one is set.
+
+        Kernels are module-level functions of plain data, so they can be
+        pickled to a process pool; recognizer state is updated before the
+        call and stays in this process.
+
+        Args:
+            func: Module-level kernel
+            *args: Kernel arguments
+
+        Returns:
+            Kernel result
+        """
+        if self.executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
 
     @abstractmethod
     async def recognize(self, data: T) -> PatternDetection:
@@ -886,11 +917,8 @@ async def recognize(self, data: dict[str, Any]) -> PatternDetection:
         if elements:
             self.pattern_history.extend(elements)
 
-        # Detect repetitions
-        repetition_score = self._calculate_repetition_score(list(self.pattern_history))
-
-        # Find specific repeating sequences
-        repeating_sequences = self._find_repeating_sequences(list(self.pattern_history))
+        # Detect repetitions and find specific repeating sequences
+        repetition_score, repeating_sequences = await self._compute(_analyze_repetition, list(self.pattern_history))
 
         features = {
             "repetition_score": repetition_score,
@@ -938,49 +966,11 @@ def recommend(self, detection: PatternDetection) -> list[str]:
 
     def _calculate_repetition_score(self, elements: list[str]) -> float:
         """Calculate how repetitive the sequence is."""
-        if len(elements) < 3:
-            return 0.0
-
-        # Count element frequencies
-        counts = Counter(elements)
-
-        # Calculate repetition based on frequency distribution
-        most_common = counts.most_common(1)[0] if counts else (None, 0)
-        repetition_ratio = most_common[1] / len(elements) if most_common[1] else 0
-
-        # Adjust for number of unique elements
-        unique_ratio = 1.0 - (len(counts) / len(elements))
-
-        return (repetition_ratio + unique_ratio) / 2.0
+        return _repetition_score(elements)
 
     def _find_repeating_sequences(self, elements: list[str]) -> list[dict[str, Any]]:
         """Find sequences that repeat."""
-        if len(elements) < 4:
-            return []
-
-        repeating = []
-
-        # Check for sequences of length 2 and 3
-        for seq_len in [2, 3]:
-            if len(elements) < seq_len * 2:
-                continue
-
-            for i in range(len(elements) - seq_len + 1):
-                seq = tuple(elements[i : i + seq_len])
-
-                # Look for this sequence elsewhere
-                for j in range(i + seq_len, len(elements) - seq_len + 1):
-                    if tuple(elements[j : j + seq_len]) == seq:
-                        repeating.append(
-                            {
-                                "sequence": " ".join(seq),
-                                "start_indices": [i, j],
-                                "length": seq_len,
-                            }
-                        )
-                        break
-
-        return repeating[:10]  # Limit results
+        return _find_repeating_sequences(elements)
 
     def _generate_explanation(self, score: float, features: dict[str, Any]) -> str:
         """Generate human-readable explanation."""
@@ -1041,7 +1031,9 @@ async def recognize(self, data: dict[str, Any]) -> PatternDetection:
             self.value_history.extend(analysis_values)
 
         # Detect deviations
-        deviation_score, anomalies = self._detect_deviations(list(self.value_history))
+        deviation_score, anomalies = await self._compute(
+            _detect_deviations, list(self.value_history), self.baseline_window
+        )
 
         features = {
             "deviation_score": deviation_score,
@@ -1094,35 +1086,7 @@ def recommend(self, detection: PatternDetection) -> list[str]:
 
     def _detect_deviations(self, values: list[float]) -> tuple[float, list[dict[str, Any]]]:
         """Detect deviations using statistical methods."""
-        if len(values) < self.baseline_window:
-            return 0.0, []
-
-        # Use first half as baseline
-        baseline = values[: self.baseline_window]
-        test_values = values[self.baseline_window :]
-
-        # Calculate baseline statistics
-        mean = sum(baseline) / len(baseline)
-        std_dev = math.sqrt(sum((x - mean) ** 2 for x in baseline) / len(baseline))
-
-        # Detect anomalies (more than 2 standard deviations)
-        anomalies = []
-        for i, val in enumerate(test_values):
-            z_score = abs((val - mean) / std_dev) if std_dev > 0 else 0
-            if z_score > 2.0:
-                anomalies.append(
-                    {
-                        "index": self.baseline_window + i,
-                        "value": val,
-                        "expected": mean,
-                        "z_score": z_score,
-                    }
-                )
-
-        # Deviation score based on anomaly proportion
-        deviation_score = min(1.0, len(anomalies) / len(test_values) * 3) if len(test_values) > 0 else 0.0
-
-        return deviation_score, anomalies
+        return _detect_deviations(values, self.baseline_window)
 
     def _generate_explanation(self, score: float, features: dict[str, Any]) -> str:
         """Generate human-readable explanation."""
@@ -1417,7 +1381,7 @@ async def recognize(self, data: dict[str, Any]) -> PatternDetection:
             self.time_series.extend(series)
 
         # Analyze temporal patterns
-        trend, volatility, seasonality = self._analyze_temporal_patterns(list(self.time_series))
+        trend, volatility, seasonality = await self._compute(_analyze_temporal_values, [v for _, v in self.time_series])
 
         # Calculate overall time pattern score
         time_score = (abs(trend) + (1 - volatility) + seasonality) / 3.0
@@ -1476,63 +1440,11 @@ def _analyze_temporal_patterns(self, series: list[tuple[datetime, float]]) -> tu
         Returns:
             Tuple of (trend, volatility, seasonality)
         """
-        if len(series) < 3:
-            return 0.0, 0.5, 0.0
-
-        # Extract values
-        values = [v for _, v in series]
-
-        # Calculate trend (linear regression slope)
-        n = len(values)
-        x = list(range(n))
-        sum_x = sum(x)
-        sum_y = sum(values)
-        sum_xy = sum(xi * yi for xi, yi in zip(x, values, strict=False))
-        sum_x2 = sum(xi * xi for xi in x)
-
-        if sum_x2 - (sum_x**2) / n != 0:
-            slope = (sum_xy - (sum_x * sum_y) / n) / (sum_x2 - (sum_x**2) / n)
-            # Normalize trend
-            trend = math.tanh(slope * 10)  # Scale and normalize to [-1, 1]
-        else:
-            trend = 0.0
-
-        # Calculate volatility (coefficient of variation)
-        mean = sum(values) / n
-        std_dev = math.sqrt(sum((v - mean) ** 2 for v in values) / n) if mean != 0 else 0
-        volatility = min(1.0, (std_dev / abs(mean)) if mean != 0 else std_dev)
-
-        # Simple seasonality detection (check for periodicity)
-        seasonality = self._detect_seasonality(values)
-
-        return trend, volatility, seasonality
+        return _analyze_temporal_values([v for _, v in series])
 
     def _detect_seasonality(self, values: list[float], max_period: int = 10) -> float:
         """Detect seasonal patterns using autocorrelation."""
-        if len(values) < max_period * 2:
-            return 0.0
-
-        n = len(values)
-        mean = sum(values) / n
-        variance = sum((v - mean) ** 2 for v in values) / n
-
-        if variance == 0:
-            return 0.0
-
-        # Calculate autocorrelation for different periods
-        max_autocorr = 0.0
-        for period in range(1, min(max_period, n // 2)):
-            autocorr = 0.0
-            count = 0
-            for i in range(n - period):
-                autocorr += (values[i] - mean) * (values[i + period] - mean)
-                count += 1
-
-            if count > 0:
-                autocorr = autocorr / (count * variance)
-                max_autocorr = max(max_autocorr, abs(autocorr))
-
-        return max_autocorr
+        return _detect_seasonality(values, max_period)
 
     def _generate_explanation(self, score: float, features: dict[str, Any]) -> str:
         """Generate human-readable explanation."""
@@ -2020,11 +1932,280 @@ def _generate_explanation(self, score: float, features: dict[str, Any]) -> str:
             return "Weak pattern interactions - patterns mostly independent."
 
 
+# =============================================================================
+# Kernels
+# =============================================================================
+# Pure functions of plain data, kept at module level so recognizers can hand
+# them to a process pool.
+
+
+def _repetition_score(elements: Sequence[str]) -> float:
+    """Calculate how repetitive a sequence is."""
+    if len(elements) < 3:
+        return 0.0
+
+    # Count element frequencies
+    counts = Counter(elements)
+
+    # Calculate repetition based on frequency distribution
+    most_common = counts.most_common(1)[0] if counts else (None, 0)
+    repetition_ratio = most_common[1] / len(elements) if most_common[1] else 0
+
+    # Adjust for number of unique elements
+    unique_ratio = 1.0 - (len(counts) / len(elements))
+
+    return (repetition_ratio + unique_ratio) / 2.0
+
+
+def _find_repeating_sequences(
+    elements: Sequence[str],
+    lengths: tuple[int, ...] = (2, 3),
+    limit: int = 10,
+) -> list[dict[str, Any]]:
+    """Find sequences that repeat.
+
+    For each start position, reports the first later occurrence of the
+    sequence starting there that does not overlap it; lengths in order, then
+    positions in order, up to limit results. Later occurrences are looked up
+    in an index of each sequence's start positions instead of rescanning.
+    """
+    if len(elements) < 4:
+        return []
+
+    repeating: list[dict[str, Any]] = []
+
+    for seq_len in lengths:
+        if len(elements) < seq_len * 2:
+            continue
+
+        sequences = [tuple(elements[i : i + seq_len]) for i in range(len(elements) - seq_len + 1)]
+        starts: dict[tuple[str, ...], list[int]] = {}
+        for i, seq in enumerate(sequences):
+            starts.setdefault(seq, []).append(i)
+
+        for i, seq in enumerate(sequences):
+            positions = starts[seq]
+            k = bisect_left(positions, i + seq_len)
+            if k == len(positions):
+                continue
+            repeating.append(
+                {
+                    "sequence": " ".join(seq),
+                    "start_indices": [i, positions[k]],
+                    "length": seq_len,
+                }
+            )
+            if len(repeating) == limit:
+                return repeating
+
+    return repeating
+
+
+def _analyze_repetition(elements: list[str]) -> tuple[float, list[dict[str, Any]]]:
+    """Repetition score and repeating sequences of a history."""
+    return _repetition_score(elements), _find_repeating_sequences(elements)
+
+
+def _detect_deviations(values: list[float], baseline_window: int) -> tuple[float, list[dict[str, Any]]]:
+    """Detect deviations from the baseline window using z-scores."""
+    if len(values) < baseline_window:
+        return 0.0, []
+
+    # Use first half as baseline
+    baseline = values[:baseline_window]
+    test_values = values[baseline_window:]
+
+    # Calculate baseline statistics
+    mean = sum(baseline) / len(baseline)
+    std_dev = math.sqrt(sum((x - mean) ** 2 for x in baseline) / len(baseline))
+
+    # Detect anomalies (more than 2 standard deviations)
+    anomalies = []
+    for i, val in enumerate(test_values):
+        z_score = abs((val - mean) / std_dev) if std_dev > 0 else 0
+        if z_score > 2.0:
+            anomalies.append(
+                {
+                    "index": baseline_window + i,
+                    "value": val,
+                    "expected": mean,
+                    "z_score": z_score,
+                }
+            )
+
+    # Deviation score based on anomaly proportion
+    deviation_score = min(1.0, len(anomalies) / len(test_values) * 3) if len(test_values) > 0 else 0.0
+
+    return deviation_score, anomalies
+
+
+def _analyze_temporal_values(values: list[float]) -> tuple[float, float, float]:
+    """Trend, volatility and seasonality of a series of values."""
+    if len(values) < 3:
+        return 0.0, 0.5, 0.0
+
+    # Calculate trend (linear regression slope)
+    n = len(values)
+    x = list(range(n))
+    sum_x = sum(x)
+    sum_y = sum(values)
+    sum_xy = sum(xi * yi for xi, yi in zip(x, values, strict=False))
+    sum_x2 = sum(xi * xi for xi in x)
+
+    if sum_x2 - (sum_x**2) / n != 0:
+        slope = (sum_xy - (sum_x * sum_y) / n) / (sum_x2 - (sum_x**2) / n)
+        # Normalize trend
+        trend = math.tanh(slope * 10)  # Scale and normalize to [-1, 1]
+    else:
+        trend = 0.0
+
+    # Calculate volatility (coefficient of variation)
+    mean = sum(values) / n
+    std_dev = math.sqrt(sum((v - mean) ** 2 for v in values) / n) if mean != 0 else 0
+    volatility = min(1.0, (std_dev / abs(mean)) if mean != 0 else std_dev)
+
+    # Simple seasonality detection (check for periodicity)
+    seasonality = _detect_seasonality(values)
+
+    return trend, volatility, seasonality
+
+
+def _detect_seasonality(values: list[float], max_period: int = 10) -> float:
+    """Detect seasonal patterns using autocorrelation."""
+    if len(values) < max_period * 2:
+        return 0.0
+
+    n = len(values)
+    mean = sum(values) / n
+    variance = sum((v - mean) ** 2 for v in values) / n
+
+    if variance == 0:
+        return 0.0
+
+    # Calculate autocorrelation for different periods
+    max_autocorr = 0.0
+    for period in range(1, min(max_period, n // 2)):
+        autocorr = 0.0
+        count = 0
+        for i in range(n - period):
+            autocorr += (values[i] - mean) * (values[i + period] - mean)
+            count += 1
+
+        if count > 0:
+            autocorr = autocorr / (count * variance)
+            max_autocorr = max(max_autocorr, abs(autocorr))
+
+    return max_autocorr
+
+
+# =============================================================================
+# Batch scoring
+# =============================================================================
+# Vectorized versions of the numeric recognizers' scores. Each row of the
+# (users, window) matrix is one user's window, padded with NaN past its end.
+
+
+def _pad_windows(windows: Sequence[Sequence[float]] | np.ndarray, maxlen: int | None) -> tuple[np.ndarray, np.ndarray]:
+    """Stack the last maxlen values of each window into a NaN-padded matrix.
+
+    Returns:
+        (values, lengths) with values of shape (users, width)
+    """
+    start = -maxlen if maxlen else None
+    if isinstance(windows, np.ndarray) and windows.ndim == 2:
+        values = windows[:, start:].astype(float)
+        return values, np.full(len(values), values.shape[1])
+
+    rows = [list(window)[start:] for window in windows]
+    lengths = np.array([len(row) for row in rows], dtype=int)
+    values = np.full((len(rows), int(lengths.max(initial=0))), np.nan)
+    for i, row in enumerate(rows):
+        values[i, : len(row)] = row
+    return values, lengths
+
+
+def _batch_rhythm_scores(intervals: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """RhythmPattern confidence per row of intervals."""
+    n = np.maximum(lengths, 1)
+    mean = np.nansum(intervals, axis=1) / n
+    std_dev = np.sqrt(np.nansum((intervals - mean[:, None]) ** 2, axis=1) / n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = 1.0 - np.minimum(std_dev / mean, 1.0)
+    return np.where((lengths > 5) & (mean != 0), score, 0.0)
+
+
+def _batch_deviation_scores(values: np.ndarray, lengths: np.ndarray, baseline_window: int) -> np.ndarray:
+    """DeviationPattern confidence per row of values."""
+    scores = np.zeros(len(values))
+    valid = lengths > baseline_window
+    if not valid.any():
+        return scores
+
+    baseline = values[valid, :baseline_window]
+    mean = baseline.mean(axis=1)
+    std_dev = np.sqrt(((baseline - mean[:, None]) ** 2).mean(axis=1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_scores = np.abs((values[valid, baseline_window:] - mean[:, None]) / std_dev[:, None])
+    # NaN padding and zero deviation baselines never count as anomalies
+    anomalies = np.where(std_dev[:, None] > 0, z_scores > 2.0, False).sum(axis=1)
+    scores[valid] = np.minimum(1.0, anomalies / (lengths[valid] - baseline_window) * 3)
+    return scores
+
+
+def _batch_time_scores(values: np.ndarray, lengths: np.ndarray, max_period: int = 10) -> np.ndarray:
+    """TimePattern confidence per row of values."""
+    n = np.maximum(lengths, 1).astype(float)
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+
+    # Trend (linear regression slope against position)
+    positions = np.arange(values.shape[1], dtype=float)
+    sum_x = n * (n - 1) / 2
+    sum_x2 = (n - 1) * n * (2 * n - 1) / 6
+    sum_y = filled.sum(axis=1)
+    sum_xy = filled @ positions
+    denominator = sum_x2 - sum_x**2 / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        trend = np.where(denominator != 0, np.tanh((sum_xy - sum_x * sum_y / n) / denominator * 10), 0.0)
+
+    # Volatility (coefficient of variation)
+    mean = sum_y / n
+    centered = np.where(present, values - mean[:, None], 0.0)
+    variance = (centered**2).sum(axis=1) / n
+    std_dev = np.sqrt(variance)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volatility = np.where(mean != 0, np.minimum(1.0, std_dev / np.abs(mean)), 0.0)
+
+    # Seasonality (largest autocorrelation over short periods)
+    seasonality = np.zeros(len(values))
+    seasonal = (lengths >= max_period * 2) & (variance != 0)
+    for period in range(1, max_period):
+        if period >= values.shape[1]:
+            break
+        products = (centered[:, :-period] * centered[:, period:]).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            autocorr = np.abs(products / ((n - period) * variance))
+        seasonality = np.where(seasonal, np.maximum(seasonality, autocorr), seasonality)
+
+    short = lengths < 3
+    trend = np.where(short, 0.0, trend)
+    volatility = np.where(short, 0.5, volatility)
+    return (np.abs(trend) + (1 - volatility) + seasonality) / 3.0
+
+
 class PatternMatcher:
     """Orchestrates all 9 pattern recognizers."""
 
-    def __init__(self):
-        """Initialize the pattern matcher."""
+    # Patterns recognize_batch() can score
+    BATCH_PATTERNS = ("rhythm", "deviation", "time")
+
+    def __init__(self, executor: Executor | None = None):
+        """Initialize the pattern matcher.
+
+        Args:
+            executor: Optional executor (e.g. a ProcessPoolExecutor) for the
+                recognizers' CPU-heavy kernels; they run inline when omitted
+        """
         self.patterns: dict[str, PatternRecognizer] = {
             "flow": FlowPattern(),
             "spatial": SpatialPattern(),
@@ -2036,6 +2217,9 @@ def __init__(self):
             "time": TimePattern(),
             "combination": CombinationPattern(),
         }
+        self.executor = executor
+        for recognizer in self.patterns.values():
+            recognizer.executor = executor
         logger.info(f"PatternMatcher initialized with {len(self.patterns)} patterns")
 
     async def recognize_all(
@@ -2045,6 +2229,10 @@ async def recognize_all(
     ) -> dict[str, PatternDetection]:
         """Run all or specified pattern recognizers.
 
+        With an executor the recognizers run concurrently, overlapping their
+        offloaded kernels. Without one nothing would overlap, since no
+        recognizer yields, so they run in turn to avoid task overhead.
+
         Args:
             data: Input data for pattern recognition
             patterns_to_run: Optional list of specific patterns to run
@@ -2052,28 +2240,64 @@ async def recognize_all(
         Returns:
             Dictionary mapping pattern names to detection results
         """
-        results = {}
-
-        pattern_names = patterns_to_run or list(self.patterns.keys())
-
-        for pattern_name in pattern_names:
-            if pattern_name in self.patterns:
-                try:
-                    result = await self.patterns[pattern_name].recognize(data)
-                    results[pattern_name] = result
-                except Exception as e:
-                    logger.error(f"Error running {pattern_name} pattern: {e}")
-                    # Create a fallback detection
-                    results[pattern_name] = PatternDetection(
-                        pattern_name=pattern_name,
-                        detected=False,
-                        confidence=0.0,
-                        features={},
-                        explanation=f"Error: {str(e)}",
-                        recommendations=[],
-                    )
-
-        return results
+        pattern_names = [name for name in dict.fromkeys(patterns_to_run or self.patterns) if name in self.patterns]
+        if self.executor is None:
+            return {name: await self._recognize(name, data) for name in pattern_names}
+
+        detections = await asyncio.gather(*(self._recognize(name, data) for name in pattern_names))
+        return dict(zip(pattern_names, detections, strict=True))
+
+    def recognize_batch(
+        self,
+        windows: Sequence[Sequence[float]] | np.ndarray,
+        patterns_to_run: list[str] | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Score many users' windows at once for the numeric patterns.
+
+        Each window is one user's recent values (intervals for rhythm) and is
+        scored as a fresh recognizer would score it as its whole history,
+        including the recognizer's history length. Windows may differ in
+        length. Recognizer histories are not read or updated.
+
+        Args:
+            windows: One window per user, or a (users, window) array
+            patterns_to_run: Optional subset of BATCH_PATTERNS
+
+        Returns:
+            Dictionary mapping pattern names to per-user confidence arrays
+        """
+        pattern_names = patterns_to_run or list(self.BATCH_PATTERNS)
+        unknown = set(pattern_names) - set(self.BATCH_PATTERNS)
+        if unknown:
+            raise ValueError(f"Patterns without batch scoring: {sorted(unknown)}")
+
+        rhythm = cast(RhythmPattern, self.patterns["rhythm"])
+        deviation = cast(DeviationPattern, self.patterns["deviation"])
+        time_pattern = cast(TimePattern, self.patterns["time"])
+        scorers: dict[str, Callable[[], np.ndarray]] = {
+            "rhythm": lambda: _batch_rhythm_scores(*_pad_windows(windows, rhythm.timestamp_history.maxlen)),
+            "deviation": lambda: _batch_deviation_scores(
+                *_pad_windows(windows, deviation.value_history.maxlen), deviation.baseline_window
+            ),
+            "time": lambda: _batch_time_scores(*_pad_windows(windows, time_pattern.time_series.maxlen)),
+        }
+        return {name: scorers[name]() for name in pattern_names}
+
+    async def _recognize(self, pattern_name: str, data: dict[str, Any]) -> PatternDetection:
+        """Run one recognizer, falling back to an empty detection on error."""
+        try:
+            return await self.patterns[pattern_name].recognize(data)
+        except Exception as e:
+            logger.error(f"Error running {pattern_name} pattern: {e}")
+            # Create a fallback detection
+            return PatternDetection(
+                pattern_name=pattern_name,
+                detected=False,
+                confidence=0.0,
+                features={},
+                explanation=f"Error: {str(e)}",
+                recommendations=[],
+            )
 
     def analyze_pattern(
         self,
@@ -4,13 +4,16 @@
 - Pattern vectorization
 - Drift apex detection
 - RDP simplification
+- Trajectory similarity search (VectorDatabase)
 """
 
 from __future__ import annotations
 
+import json
 import logging
 import math
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
 import numpy as np
@@ -22,8 +25,17 @@
     detect_drift_apex,
 )
 
+try:
+    import faiss
+
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+
 logger = logging.getLogger(__name__)
 
+COMPARISON_METHODS = ("cosine", "euclidean", "correlation")
+
 
 @dataclass
 class VectorizationConfig:
@@ -134,7 +146,8 @@ def vectorize_behavior(self, units: list[CognitiveUnit]) -> CognitiveVector:
             units: List of cognitive units
 
         Returns:
-            CognitiveVector with vectorized representation
+            CognitiveVector whose ``to_matrix()`` is the vectorized
+            representation (one row per unit)
         """
         if not units:
             return CognitiveVector()
@@ -165,18 +178,10 @@ def vectorize_behavior(self, units: list[CognitiveUnit]) -> CognitiveVector:
         if self.config.clip_values:
             vectors = np.clip(vectors, 0.0, 1.0)
 
-        # Create result
-        VectorizationResult(
-            vectors=vectors,
-            feature_names=self.feature_names[: vectors.shape[1]],
-            metadata={
-                "num_units": len(units),
-                "config": self.config.metadata,
-            },
-        )
-
-        # Return cognitive vector with updated units
-        return CognitiveVector(units=units)
+        # Keep the computed features on the vector
+        cv = CognitiveVector(units=list(units))
+        cv.set_matrix(vectors)
+        return cv
 
     def vectorize_windows(
         self,
@@ -514,19 +519,121 @@ def compare_signatures(
 
 
 class VectorDatabase:
-    """Simple in-memory database for storing and searching cognitive vectors."""
+    """In-memory database for storing and searching cognitive vectors.
+
+    Trajectory signatures (the centroid of each vectorized trajectory) are
+    rows of a contiguous float32 matrix, alongside an L2-normalised copy for
+    cosine search. A search scores every row with one matrix-vector product
+    and selects the top k with ``argpartition`` instead of sorting all
+    results. Replaced and deleted rows are tombstoned and compacted once they
+    exceed ``compact_threshold`` of the matrix.
+
+    When FAISS is installed, cosine searches over at least ``ann_threshold``
+    trajectories use an HNSW index instead. The index is built lazily and
+    only new rows are appended to it. ``save``/``load`` persist the rows,
+    metadata and index, so large trajectory libraries do not rebuild the
+    graph on startup.
+    """
+
+    _VECTORS_FILE = "vectors.npz"
+    _METADATA_FILE = "metadata.json"
+    _INDEX_FILE = "index.faiss"
 
-    def __init__(self, vector_size: int = 32):
+    def __init__(
+        self,
+        vector_size: int = 32,
+        *,
+        ann_threshold: int | None = 10_000,
+        hnsw_m: int = 32,
+        hnsw_ef_search: int = 64,
+        compact_threshold: float = 0.25,
+        initial_capacity: int = 256,
+    ):
         """Initialize the vector database.
 
         Args:
             vector_size: Size of vectors to store
+            ann_threshold: Stored trajectories above which cosine search uses
+                the HNSW index (None disables it)
+            hnsw_m: HNSW graph degree
+            hnsw_ef_search: HNSW search breadth
+            compact_threshold: Fraction of dead rows that triggers compaction
+            initial_capacity: Rows allocated on the first store
         """
         self.vector_size = vector_size
-        self.vectors: dict[str, np.ndarray] = {}
+        self.ann_threshold = ann_threshold
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_search = hnsw_ef_search
+        self.compact_threshold = compact_threshold
         self.metadata: dict[str, dict[str, Any]] = {}
         self._vectorizer = CognitiveVectorizer(VectorizationConfig(vector_size=vector_size))
 
+        self._initial_capacity = max(1, initial_capacity)
+        self._raw = np.zeros((0, vector_size), dtype=np.float32)
+        self._unit = np.zeros((0, vector_size), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._keys: list[str] = []
+        self._row_of: dict[str, int] = {}
+        self._size = 0
+        self._dead = 0
+
+        self._index: Any = None
+        self._indexed = 0
+
+    @property
+    def vectors(self) -> dict[str, np.ndarray]:
+        """Stored signatures by key (copies)."""
+        return {key: self._raw[row].copy() for key, row in self._row_of.items()}
+
+    def _signature(self, units: list[CognitiveUnit]) -> np.ndarray:
+        """Vectorize a trajectory into a ``vector_size`` signature."""
+        centroid = self._vectorizer.vectorize_behavior(units).centroid()
+        signature = np.zeros(self.vector_size, dtype=np.float32)
+        size = min(len(centroid), self.vector_size)
+        signature[:size] = centroid[:size]
+        return signature
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self._alive)
+        if needed <= capacity:
+            return
+        capacity = max(capacity, self._initial_capacity)
+        while capacity < needed:
+            capacity *= 2
+        for name in ("_raw", "_unit"):
+            grown = np.zeros((capacity, self.vector_size), dtype=np.float32)
+            grown[: self._size] = getattr(self, name)[: self._size]
+            setattr(self, name, grown)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        self._alive = alive
+
+    def _append(self, keys: list[str], vectors: np.ndarray, metadatas: list[dict[str, Any]]) -> None:
+        """Append rows, replacing any rows already stored under the same keys."""
+        for key in keys:
+            row = self._row_of.pop(key, None)
+            if row is not None:
+                self._alive[row] = False
+                self._dead += 1
+
+        self._reserve(len(keys))
+        start, end = self._size, self._size + len(keys)
+        self._raw[start:end] = vectors
+        self._unit[start:end] = self._normalize(vectors)
+        self._alive[start:end] = True
+        self._size = end
+        for offset, (key, metadata) in enumerate(zip(keys, metadatas, strict=True)):
+            self._keys.append(key)
+            self._row_of[key] = start + offset
+            self.metadata[key] = metadata
+        self._maybe_compact()
+
     def store(self, key: str, units: list[CognitiveUnit], metadata: dict[str, Any] | None = None) -> None:
         """Store a vectorized trajectory.
 
@@ -535,11 +642,7 @@ def store(self, key: str, units: list[CognitiveUnit], metadata: dict[str, Any] |
             units: List of cognitive units
             metadata: Optional metadata to store
         """
-        cv = self._vectorizer.vectorize_behavior(units)
-        vector = cv.centroid()
-
-        self.vectors[key] = vector
-        self.metadata[key] = metadata or {}
+        self._append([key], self._signature(units)[np.newaxis], [metadata or {}])
 
     def search(
         self,
@@ -549,35 +652,99 @@ def search(
     ) -> list[tuple[str, float, dict[str, Any]]]:
         """Search for similar trajectories.
 
+        Scores match ``CognitiveVectorizer.compare_signatures``. Cosine
+        searches served by the HNSW index are approximate.
+
         Args:
             query_units: Query trajectory
             top_k: Number of results to return
-            method: Comparison method
+            method: Comparison method ("cosine", "euclidean", "correlation")
 
         Returns:
-            List of (key, similarity, metadata) tuples
+            List of (key, similarity, metadata) tuples, most similar first
+
+        Raises:
+            ValueError: If the comparison method is unknown
         """
-        if not self.vectors:
+        if not self._row_of or top_k <= 0:
             return []
+        if method not in COMPARISON_METHODS:
+            raise ValueError(f"Unknown comparison method: {method}")
 
-        # Vectorize query
-        query_cv = self._vectorizer.vectorize_behavior(query_units)
-        query_vector = query_cv.centroid()
-
-        # Calculate similarities
-        results = []
-        for key, vector in self.vectors.items():
-            similarity = self._vectorizer.compare_signatures(
-                query_vector,
-                vector,
-                method=method,
-            )
-            results.append((key, similarity, self.metadata[key].copy()))
+        query = self._signature(query_units)
+        if method == "cosine" and self._use_index():
+            scored = self._search_index(query, top_k)
+        else:
+            scored = self._top_k(self._similarities(query, method), top_k)
 
-        # Sort by similarity (descending)
-        results.sort(key=lambda x: x[1], reverse=True)
+        return [(self._keys[row], similarity, self.metadata[self._keys[row]].copy()) for row, similarity in scored]
 
-        return results[:top_k]
+    def _similarities(self, query: np.ndarray, method: str) -> np.ndarray:
+        """Similarity of the query to every row; dead rows score -inf."""
+        if method == "cosine":
+            sims = self._unit[: self._size] @ self._normalize(query[np.newaxis])[0]
+        elif method == "euclidean":
+            distances = np.linalg.norm(self._raw[: self._size] - query, axis=1)
+            sims = 1.0 - np.minimum(distances / np.sqrt(self.vector_size), 1.0)
+        elif self.vector_size < 2:
+            sims = np.zeros(self._size, dtype=np.float32)
+        else:
+            rows = self._raw[: self._size] - self._raw[: self._size].mean(axis=1, keepdims=True)
+            centered = query - query.mean()
+            denominators = np.linalg.norm(rows, axis=1) * np.linalg.norm(centered)
+            sims = np.abs(np.divide(rows @ centered, denominators, out=np.zeros(self._size), where=denominators > 0))
+
+        sims = sims.astype(np.float64)
+        sims[~self._alive[: self._size]] = -np.inf
+        return sims
+
+    def _top_k(self, sims: np.ndarray, top_k: int) -> list[tuple[int, float]]:
+        k = min(top_k, self.size())
+        top = np.argpartition(-sims, k - 1)[:k] if k < len(sims) else np.arange(len(sims))
+        # Ties keep insertion order
+        top = top[np.lexsort((top, -sims[top]))][:k]
+        return [(int(row), float(sims[row])) for row in top]
+
+    def _use_index(self) -> bool:
+        return HAS_FAISS and self.ann_threshold is not None and self.size() >= self.ann_threshold
+
+    def _sync_index(self) -> None:
+        """Build the HNSW index if needed and append rows it has not seen."""
+        if self._index is None:
+            self._index = faiss.IndexHNSWFlat(self.vector_size, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            self._index.hnsw.efSearch = self.hnsw_ef_search
+            self._indexed = 0
+        if self._indexed < self._size:
+            # Dead rows are added too, so index ids stay equal to row numbers
+            self._index.add(np.ascontiguousarray(self._unit[self._indexed : self._size]))
+            self._indexed = self._size
+
+    def _search_index(self, query: np.ndarray, top_k: int) -> list[tuple[int, float]]:
+        self._sync_index()
+        # Over-fetch by the number of tombstones so dead hits can be dropped
+        k = min(top_k + self._dead, self._index.ntotal)
+        sims, rows = self._index.search(self._normalize(query[np.newaxis]), k)
+        hits = [(int(row), float(sim)) for sim, row in zip(sims[0], rows[0], strict=False) if row >= 0]
+        return [(row, sim) for row, sim in hits if self._alive[row]][:top_k]
+
+    def _maybe_compact(self) -> None:
+        if self._size and self._dead / self._size >= self.compact_threshold:
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop deleted rows; the HNSW index is rebuilt on the next search."""
+        if self._dead == 0:
+            return
+        live = np.flatnonzero(self._alive[: self._size])
+        self._raw = self._raw[live]
+        self._unit = self._unit[live]
+        self._alive = np.ones(len(live), dtype=bool)
+        self._keys = [self._keys[row] for row in live]
+        self._row_of = {key: row for row, key in enumerate(self._keys)}
+        self._size = len(live)
+        self._dead = 0
+        self._index = None
+        self._indexed = 0
 
     def delete(self, key: str) -> bool:
         """Delete a vector from the database.
@@ -588,16 +755,27 @@ def delete(self, key: str) -> bool:
         Returns:
             True if deleted, False if not found
         """
-        if key in self.vectors:
-            del self.vectors[key]
-            del self.metadata[key]
-            return True
-        return False
+        row = self._row_of.pop(key, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._dead += 1
+        del self.metadata[key]
+        self._maybe_compact()
+        return True
 
     def clear(self) -> None:
         """Clear all vectors from the database."""
-        self.vectors.clear()
         self.metadata.clear()
+        self._raw = np.zeros((0, self.vector_size), dtype=np.float32)
+        self._unit = np.zeros((0, self.vector_size), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._keys = []
+        self._row_of = {}
+        self._size = 0
+        self._dead = 0
+        self._index = None
+        self._indexed = 0
 
     def size(self) -> int:
         """Get the number of vectors in the database.
@@ -605,4 +783,64 @@ def size(self) -> int:
         Returns:
             Number of vectors
         """
-        return len(self.vectors)
+        return len(self._row_of)
+
+    def save(self, path: str | Path) -> Path:
+        """Persist the database to a directory.
+
+        The HNSW index is saved too once the library has reached
+        ``ann_threshold`` (building it first if needed). Metadata must be
+        JSON-serializable.
+
+        Args:
+            path: Target directory (created if missing)
+
+        Returns:
+            The directory written
+        """
+        self.compact()
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        np.savez(directory / self._VECTORS_FILE, vectors=self._raw[: self._size], keys=np.array(self._keys, dtype=str))
+        payload = {"vector_size": self.vector_size, "metadata": [self.metadata[key] for key in self._keys]}
+        (directory / self._METADATA_FILE).write_text(json.dumps(payload))
+
+        index_path = directory / self._INDEX_FILE
+        if self._use_index():
+            self._sync_index()
+            faiss.write_index(self._index, str(index_path))
+        elif index_path.exists():
+            index_path.unlink()
+        return directory
+
+    @classmethod
+    def load(cls, path: str | Path, **kwargs: Any) -> VectorDatabase:
+        """Load a database written by ``save``.
+
+        Args:
+            path: Directory passed to ``save``
+            **kwargs: Passed to the constructor (index settings)
+
+        Returns:
+            Loaded database
+        """
+        directory = Path(path)
+        with np.load(directory / cls._VECTORS_FILE) as data:
+            vectors = data["vectors"].astype(np.float32)
+            keys = [str(key) for key in data["keys"].tolist()]
+        payload = json.loads((directory / cls._METADATA_FILE).read_text())
+
+        db = cls(vector_size=payload["vector_size"], **kwargs)
+        if keys:
+            db._append(keys, vectors, payload["metadata"])
+
+        index_path = directory / cls._INDEX_FILE
+        if HAS_FAISS and keys and index_path.exists():
+            index = faiss.read_index(str(index_path))
+            if index.ntotal == len(keys):
+                index.hnsw.efSearch = db.hnsw_ef_search
+                db._index, db._indexed = index, len(keys)
+            else:
+                logger.warning(f"Ignoring stale ANN index at {index_path}: {index.ntotal} rows, expected {len(keys)}")
+        return db
@@ -23,6 +23,7 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
 import logging
 import threading
 import uuid
@@ -236,6 +237,13 @@ class EventSubscription:
     filter_fn: Callable[[Event], bool] | None = None
     created_at: datetime = field(default_factory=datetime.now)
     call_count: int = 0
+    is_async: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Detect coroutine handlers once, for async dispatch."""
+        # Async callable objects define ``async def __call__`` on their class
+        handler_call = type(self.handler).__call__ if callable(self.handler) else None
+        self.is_async = inspect.iscoroutinefunction(self.handler) or inspect.iscoroutinefunction(handler_call)
 
     def matches(self, event_type: str) -> bool:
         """Check if event type matches subscription pattern."""
@@ -390,6 +398,118 @@ def __len__(self) -> int:
         return len(self._events)
 
 
+class _TrieNode:
+    """Node of the segment trie for patterns with inner ``*`` segments."""
+
+    __slots__ = ("children", "wildcard", "patterns")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.wildcard: _TrieNode | None = None
+        self.patterns: set[str] = set()
+
+
+class _PatternIndex:
+    """
+    Subscription patterns compiled for lookup by event type.
+
+    Mirrors ``EventSubscription.matches``: patterns without ``*`` are exact
+    keys; patterns ending in ``*`` are string prefixes, looked up by slicing
+    the event type at each distinct prefix length; any other pattern with a
+    ``*`` goes into a trie over ``:``-separated segments where ``*`` matches
+    exactly one segment.
+    """
+
+    def __init__(self) -> None:
+        self._exact: set[str] = set()
+        self._prefixes: dict[str, str] = {}  # prefix -> pattern
+        self._prefix_lengths: dict[int, int] = {}  # prefix length -> number of prefixes
+        self._root = _TrieNode()
+
+    def add(self, pattern: str) -> None:
+        if pattern.endswith("*"):
+            prefix = pattern[:-1]
+            if prefix not in self._prefixes:
+                self._prefixes[prefix] = pattern
+                self._prefix_lengths[len(prefix)] = self._prefix_lengths.get(len(prefix), 0) + 1
+        elif "*" in pattern:
+            node = self._root
+            for part in pattern.split(":"):
+                if part == "*":
+                    if node.wildcard is None:
+                        node.wildcard = _TrieNode()
+                    node = node.wildcard
+                else:
+                    node = node.children.setdefault(part, _TrieNode())
+            node.patterns.add(pattern)
+        else:
+            self._exact.add(pattern)
+
+    def remove(self, pattern: str) -> None:
+        if pattern.endswith("*"):
+            prefix = pattern[:-1]
+            if self._prefixes.pop(prefix, None) is not None:
+                self._prefix_lengths[len(prefix)] -= 1
+                if not self._prefix_lengths[len(prefix)]:
+                    del self._prefix_lengths[len(prefix)]
+        elif "*" in pattern:
+            self._remove_path(self._root, pattern.split(":"), pattern)
+        else:
+            self._exact.discard(pattern)
+
+    def _remove_path(self, node: _TrieNode, parts: list[str], pattern: str) -> bool:
+        """Remove pattern below node; returns True if node is left empty."""
+        if not parts:
+            node.patterns.discard(pattern)
+        else:
+            part, rest = parts[0], parts[1:]
+            if part == "*":
+                if node.wildcard is not None and self._remove_path(node.wildcard, rest, pattern):
+                    node.wildcard = None
+            else:
+                child = node.children.get(part)
+                if child is not None and self._remove_path(child, rest, pattern):
+                    del node.children[part]
+        return not node.patterns and not node.children and node.wildcard is None
+
+    def match(self, event_type: str) -> list[str]:
+        """Patterns matching an event type."""
+        patterns = []
+        if event_type in self._exact:
+            patterns.append(event_type)
+
+        for length in self._prefix_lengths:
+            if length <= len(event_type):
+                pattern = self._prefixes.get(event_type[:length])
+                if pattern is not None:
+                    patterns.append(pattern)
+
+        if self._root.children or self._root.wildcard is not None:
+            nodes = [self._root]
+            for part in event_type.split(":"):
+                next_nodes = []
+                for node in nodes:
+                    child = node.children.get(part)
+                    if child is not None:
+                        next_nodes.append(child)
+                    if node.wildcard is not None:
+                        next_nodes.append(node.wildcard)
+                if not next_nodes:
+                    break
+                nodes = next_nodes
+            else:
+                for node in nodes:
+                    patterns.extend(node.patterns)
+
+        return patterns
+
+    def clear(self) -> None:
+        self._exact.clear()
+        self._prefixes.clear()
+        self._prefix_lengths.clear()
+        self._root = _TrieNode()
+
+
 class EventBus:
     """
     Central event dispatcher with subscription management.
@@ -403,12 +523,21 @@ class EventBus:
     - Middleware pipeline for cross-cutting concerns
     - Event store for sourcing and replay
     - Async and sync emission support
+
+    Patterns are compiled into a ``_PatternIndex`` and the priority-ordered
+    subscriptions for each event type are cached until the next subscribe or
+    unsubscribe, so emit cost depends on the matching handlers rather than
+    on the total number of subscriptions.
     """
 
+    # Event types whose matches are cached; the cache is dropped when full
+    MATCH_CACHE_SIZE = 4096
+
     def __init__(
         self,
         store_events: bool = True,
         max_stored_events: int = 10000,
+        handler_timeout: float | None = None,
     ) -> None:
         """
         Initialize event bus.
@@ -416,9 +545,13 @@ def __init__(
         Args:
             store_events: Whether to store events for replay
             max_stored_events: Maximum events to store
+            handler_timeout: Default per-handler timeout in seconds for emit_async
         """
         self._subscriptions: dict[str, EventSubscription] = {}
-        self._pattern_subscriptions: dict[str, set[str]] = {}
+        self._pattern_subscriptions: dict[str, dict[str, None]] = {}
+        self._pattern_index = _PatternIndex()
+        self._match_cache: dict[str, list[EventSubscription]] = {}
+        self.handler_timeout = handler_timeout
         self._middleware: list[BaseMiddleware] = []
         self._event_store = EventStore(max_stored_events) if store_events else None
         self._lock = threading.RLock()
@@ -469,8 +602,10 @@ def subscribe(
             self._subscriptions[subscription_id] = subscription
 
             if event_pattern not in self._pattern_subscriptions:
-                self._pattern_subscriptions[event_pattern] = set()
-            self._pattern_subscriptions[event_pattern].add(subscription_id)
+                self._pattern_subscriptions[event_pattern] = {}
+                self._pattern_index.add(event_pattern)
+            self._pattern_subscriptions[event_pattern][subscription_id] = None
+            self._match_cache = {}
 
         logger.debug("Subscription created: %s -> %s", subscription_id, event_pattern)
         return subscription_id
@@ -492,10 +627,15 @@ def unsubscribe(self, subscription_id: str) -> bool:
             subscription = self._subscriptions[subscription_id]
             pattern = subscription.event_pattern
 
-            if pattern in self._pattern_subscriptions:
-                self._pattern_subscriptions[pattern].discard(subscription_id)
+            sub_ids = self._pattern_subscriptions.get(pattern)
+            if sub_ids is not None:
+                sub_ids.pop(subscription_id, None)
+                if not sub_ids:
+                    del self._pattern_subscriptions[pattern]
+                    self._pattern_index.remove(pattern)
 
             del self._subscriptions[subscription_id]
+            self._match_cache = {}
 
         logger.debug("Subscription removed: %s", subscription_id)
         return True
@@ -517,6 +657,62 @@ def emit(self, event: Event) -> None:
         Args:
             event: Event to emit
         """
+        processed_event, matching = self._prepare(event)
+
+        # Dispatch to handlers, highest priority first
+        to_unsubscribe = [
+            subscription.subscription_id
+            for subscription in matching
+            if self._deliver(subscription, processed_event) and subscription.once
+        ]
+
+        # Clean up one-time subscriptions
+        for sub_id in to_unsubscribe:
+            self.unsubscribe(sub_id)
+
+    async def emit_async(self, event: Event, handler_timeout: float | None = None) -> None:
+        """
+        Emit an event asynchronously.
+
+        Coroutine handlers run concurrently on the event loop, each bounded by
+        the handler timeout; a handler that times out counts as a handler
+        error. Synchronous handlers run in priority order in a worker thread
+        so they cannot block the loop.
+
+        Args:
+            event: Event to emit
+            handler_timeout: Per-handler timeout in seconds (defaults to the bus setting)
+        """
+        timeout = handler_timeout if handler_timeout is not None else self.handler_timeout
+        processed_event, matching = self._prepare(event)
+
+        async_subs = [s for s in matching if s.is_async]
+        sync_subs = [s for s in matching if not s.is_async]
+
+        async def deliver_within_timeout(subscription: EventSubscription) -> bool:
+            try:
+                async with asyncio.timeout(timeout):
+                    return await self._deliver_async(subscription, processed_event)
+            except TimeoutError as e:
+                self._handler_failed(subscription, processed_event, e)
+                return False
+
+        # Started in priority order; they then run concurrently with the sync batch
+        tasks = [asyncio.ensure_future(deliver_within_timeout(subscription)) for subscription in async_subs]
+        delivered: list[bool] = []
+        if sync_subs:
+            delivered = await asyncio.to_thread(lambda: [self._deliver(s, processed_event) for s in sync_subs])
+        if tasks:
+            delivered_async = await asyncio.gather(*tasks)
+        else:
+            delivered_async = []
+
+        for subscription, ok in zip(sync_subs + async_subs, delivered + list(delivered_async), strict=True):
+            if ok and subscription.once:
+                self.unsubscribe(subscription.subscription_id)
+
+    def _prepare(self, event: Event) -> tuple[Event, list[EventSubscription]]:
+        """Run middleware, store the event and look up its subscriptions."""
         self._stats["events_emitted"] += 1
 
         # Apply middleware pipeline
@@ -526,51 +722,48 @@ def emit(self, event: Event) -> None:
         if self._event_store is not None:
             self._event_store.append(processed_event)
 
-        # Get matching subscriptions
-        matching = self._get_matching_subscriptions(processed_event)
+        return processed_event, self._get_matching_subscriptions(processed_event)
 
-        # Sort by priority (highest first)
-        matching.sort(key=lambda s: s.priority, reverse=True)
+    def _deliver(self, subscription: EventSubscription, event: Event) -> bool:
+        """Call a handler; returns True if the event was delivered."""
+        try:
+            # Apply subscription filter if present
+            if subscription.filter_fn is not None and not subscription.filter_fn(event):
+                return False
 
-        # Dispatch to handlers
-        to_unsubscribe: list[str] = []
+            subscription.handler(event)
+        except Exception as e:
+            self._handler_failed(subscription, event, e)
+            return False
 
-        for subscription in matching:
-            try:
-                # Apply subscription filter if present
-                if subscription.filter_fn is not None:
-                    if not subscription.filter_fn(processed_event):
-                        continue
-
-                subscription.handler(processed_event)
-                subscription.call_count += 1
-                self._stats["events_delivered"] += 1
-
-                if subscription.once:
-                    to_unsubscribe.append(subscription.subscription_id)
-
-            except Exception as e:
-                self._stats["errors"] += 1
-                logger.error(
-                    "Handler error for %s: %s",
-                    subscription.subscription_id,
-                    e,
-                )
-                # Emit error event
-                self._emit_error_event(processed_event, e)
+        subscription.call_count += 1
+        self._stats["events_delivered"] += 1
+        return True
 
-        # Clean up one-time subscriptions
-        for sub_id in to_unsubscribe:
-            self.unsubscribe(sub_id)
+    async def _deliver_async(self, subscription: EventSubscription, event: Event) -> bool:
+        """Await a coroutine handler; returns True if the event was delivered."""
+        try:
+            if subscription.filter_fn is not None and not subscription.filter_fn(event):
+                return False
 
-    async def emit_async(self, event: Event) -> None:
-        """
-        Emit an event asynchronously.
+            await subscription.handler(event)  # type: ignore[misc]
+        except Exception as e:
+            self._handler_failed(subscription, event, e)
+            return False
 
-        Args:
-            event: Event to emit
-        """
-        await asyncio.to_thread(self.emit, event)
+        subscription.call_count += 1
+        self._stats["events_delivered"] += 1
+        return True
+
+    def _handler_failed(self, subscription: EventSubscription, event: Event, error: Exception) -> None:
+        self._stats["errors"] += 1
+        logger.error(
+            "Handler error for %s: %s",
+            subscription.subscription_id,
+            error if str(error) else type(error).__name__,
+        )
+        # Emit error event
+        self._emit_error_event(event, error)
 
     def _apply_middleware(self, event: Event) -> Event:
         """Apply middleware pipeline to event."""
@@ -580,15 +773,23 @@ def _apply_middleware(self, event: Event) -> Event:
         return result
 
     def _get_matching_subscriptions(self, event: Event) -> list[EventSubscription]:
-        """Get all subscriptions matching an event."""
-        matching = []
+        """Get all subscriptions matching an event, highest priority first."""
+        cached = self._match_cache.get(event.type)
+        if cached is not None:
+            return cached
 
         with self._lock:
-            for sub_ids in self._pattern_subscriptions.values():
-                for sub_id in sub_ids:
-                    subscription = self._subscriptions.get(sub_id)
-                    if subscription and subscription.matches(event.type):
-                        matching.append(subscription)
+            matching = [
+                self._subscriptions[sub_id]
+                for pattern in self._pattern_index.match(event.type)
+                for sub_id in self._pattern_subscriptions[pattern]
+            ]
+            # Stable sort: equal priorities keep subscription order within a pattern
+            matching.sort(key=lambda s: s.priority, reverse=True)
+
+            if len(self._match_cache) >= self.MATCH_CACHE_SIZE:
+                self._match_cache = {}
+            self._match_cache[event.type] = matching
 
         return matching
 
@@ -692,6 +893,8 @@ def clear(self) -> None:
         with self._lock:
             self._subscriptions.clear()
             self._pattern_subscriptions.clear()
+            self._pattern_index.clear()
+            self._match_cache = {}
 
         if self._event_store is not None:
             self._event_store.clear()
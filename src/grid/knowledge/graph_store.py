@@ -10,6 +10,10 @@
 
 import logging
 import os
+import queue
+import re
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
@@ -23,16 +27,32 @@
 Neo4jGraphDatabase = Any  # type: ignore[misc]
 
 try:
-    from neo4j import GraphDatabase  # type: ignore[import-not-found]
+    from neo4j import READ_ACCESS, GraphDatabase  # type: ignore[import-not-found]
 
     _GraphDatabase = GraphDatabase
     NEO4J_AVAILABLE = True
 except ImportError:  # pragma: no cover - optional dependency
     _GraphDatabase = None
+    READ_ACCESS = "READ"
     NEO4J_AVAILABLE = False
 
 from ..knowledge.graph_schema import EntityType, RelationType, get_kg_schema
 
+# Characters with special meaning in Lucene query syntax
+_LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def _label(name: str) -> str:
+    """Quote a label, relationship type or property name for interpolation into Cypher."""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _fulltext_query(text: str) -> str:
+    """Build a Lucene query matching any term of ``text`` exactly or as a prefix."""
+    # Prefix queries skip the analyzer, so lowercase terms to match indexed tokens
+    terms = [_LUCENE_SPECIAL.sub(r"\\\1", term.lower()) for term in text.split()]
+    return " OR ".join(f"{term} OR {term}*" for term in terms if term)
+
 
 @dataclass
 class Entity:
@@ -132,11 +152,22 @@ class Neo4jKnowledgeStore:
     - High-performance graph operations with Neo4j
     - Automatic schema validation and constraint management
     - Advanced graph traversal and pattern matching
-    - Semantic search with full-text indexing
+    - Semantic search with full-text and vector indexes
+    - Batched writes with UNWIND
     - Relationship analytics and path finding
     - Transactional guarantees and rollback support
+
+    Every stored entity also carries the ``ENTITY_LABEL`` label, which backs
+    the entity_id uniqueness constraint, the full-text index over name and
+    description, and the vector index over embeddings. Lookups match on that
+    label so they use the indexes instead of scanning all nodes.
     """
 
+    ENTITY_LABEL = "KnowledgeEntity"
+    FULLTEXT_INDEX = "knowledge_entity_text"
+    VECTOR_INDEX = "knowledge_entity_embedding"
+    SYSTEM_PROPERTIES = ("entity_id", "created_at", "updated_at", "embedding")
+
     def __init__(
         self,
         uri: str | None = None,
@@ -146,6 +177,10 @@ def __init__(
         max_connection_lifetime: int = 3600,
         max_connection_pool_size: int = 100,
         connection_acquisition_timeout: int = 60,
+        embed_fn: Callable[[str], Sequence[float]] | None = None,
+        embedding_dimensions: int | None = None,
+        write_batch_size: int = 1000,
+        max_idle_read_sessions: int = 8,
     ):
         """
         Initialize Neo4j knowledge store.
@@ -164,6 +199,10 @@ def __init__(
             max_connection_lifetime: Max connection lifetime in seconds
             max_connection_pool_size: Max connection pool size
             connection_acquisition_timeout: Connection acquisition timeout
+            embed_fn: Dense text embedding function; enables vector search
+            embedding_dimensions: Embedding size (probed from embed_fn if omitted)
+            write_batch_size: Rows per UNWIND statement in batched writes
+            max_idle_read_sessions: Read sessions kept open for reuse
 
         Raises:
             ImportError: If neo4j package is not installed
@@ -195,6 +234,17 @@ def __init__(
         self.max_connection_pool_size = max_connection_pool_size
         self.connection_acquisition_timeout = connection_acquisition_timeout
 
+        # Search and write configuration
+        self.embed_fn = embed_fn
+        self.embedding_dimensions = embedding_dimensions
+        self.write_batch_size = max(1, write_batch_size)
+
+        # Idle read sessions, reused across calls; sessions are not thread-safe,
+        # so each is checked out by one caller at a time
+        self.max_idle_read_sessions = max_idle_read_sessions
+        self._read_sessions: queue.LifoQueue[Session] = queue.LifoQueue()
+        self._bookmarks: Any = None
+
         logger.info(f"Neo4jKnowledgeStore initialized for {database}")
 
     def connect(self) -> None:
@@ -214,9 +264,10 @@ def connect(self) -> None:
             if self.driver is None:
                 raise RuntimeError("Failed to initialize Neo4j driver")
 
-            driver = self._ensure_driver()
+            # Shared so reads on pooled sessions see writes made on other sessions
+            self._bookmarks = _GraphDatabase.bookmark_manager()
 
-            with driver.session(database=self.database) as session:
+            with self.driver.session(database=self.database) as session:
                 result = session.run("RETURN 1 as test")
                 test_value = result.single()["test"]
                 if test_value != 1:
@@ -234,12 +285,58 @@ def connect(self) -> None:
 
     def disconnect(self) -> None:
         """Close Neo4j database connection."""
+        while True:
+            try:
+                self._read_sessions.get_nowait().close()
+            except queue.Empty:
+                break
         if self.driver:
             self.driver.close()
             self.driver = None
             self._initialized = False
             logger.info("Disconnected from Neo4j database")
 
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    def _write_session(self) -> Session:
+        driver = self._ensure_driver()
+        return driver.session(database=self.database, bookmark_manager=self._bookmarks)
+
+    @contextmanager
+    def _read_session(self) -> Iterator[Session]:
+        """Check out a pooled read session, returning it to the pool afterwards."""
+        driver = self._ensure_driver()
+        try:
+            session = self._read_sessions.get_nowait()
+        except queue.Empty:
+            session = driver.session(
+                database=self.database,
+                default_access_mode=READ_ACCESS,
+                bookmark_manager=self._bookmarks,
+            )
+
+        try:
+            yield session
+        except Exception:
+            session.close()  # Don't hand a session in an unknown state to the next caller
+            raise
+
+        if self._read_sessions.qsize() < self.max_idle_read_sessions:
+            self._read_sessions.put(session)
+        else:
+            session.close()
+
+    def _read(self, query: str, params: dict[str, Any]) -> list[Record]:
+        """Run a read query in a managed (retried) transaction and fetch all records."""
+        with self._read_session() as session:
+            return session.execute_read(lambda tx: list(tx.run(query, params)))
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
     def store_entity(self, entity: Entity) -> EntityId:
         """
         Store an entity in the knowledge graph.
@@ -250,40 +347,67 @@ def store_entity(self, entity: Entity) -> EntityId:
         Returns:
             Entity ID
         """
-        driver = self._ensure_driver()
-
-        # Validate entity against schema
-        is_valid, errors = self._schema.validate_entity(entity.entity_type, entity.properties)
-        if not is_valid:
-            raise ValueError(f"Entity validation failed: {errors}")
-
-        with driver.session(database=self.database) as session:
-            # Create entity with labels
-            labels = [entity.entity_type.value] + list(entity.labels or [])
-            label_str = ":".join(labels)
-
-            query = f"""
-            MERGE (e:{label_str} {{entity_id: $entity_id}})
-            SET e += $properties,
-                e.created_at = $created_at,
-                e.updated_at = $updated_at
-            RETURN e.entity_id as entity_id
-            """
+        entity_id = self.store_entities([entity])[0]
+        logger.debug(f"Stored entity {entity_id} of type {entity.entity_type.value}")
+        return entity_id
 
-            result = session.run(
-                query,
-                {
-                    "entity_id": entity.entity_id,
-                    "properties": entity.properties,
-                    "created_at": entity.created_at.isoformat(),
-                    "updated_at": entity.updated_at.isoformat(),
-                },
-            )
+    def store_entities(self, entities: list[Entity]) -> list[EntityId]:
+        """
+        Store entities in batches, one UNWIND statement per label set and batch.
 
-            entity_id = result.single()["entity_id"]
-            logger.debug(f"Stored entity {entity_id} of type {entity.entity_type.value}")
+        Args:
+            entities: Entities to store
 
-            return EntityId(entity_id)
+        Returns:
+            Entity IDs, in input order
+        """
+        # Validate everything before writing anything
+        for entity in entities:
+            is_valid, errors = self._schema.validate_entity(entity.entity_type, entity.properties)
+            if not is_valid:
+                raise ValueError(f"Entity validation failed: {errors}")
+
+        # Labels cannot be parameterized, so group rows by label set
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for entity in entities:
+            labels = (entity.entity_type.value, *sorted(entity.labels or []))
+            row = {
+                "entity_id": entity.entity_id,
+                "properties": {k: v for k, v in entity.properties.items() if k != "embedding"},
+                "created_at": entity.created_at.isoformat(),
+                "updated_at": entity.updated_at.isoformat(),
+                "embedding": self._entity_embedding(entity),
+            }
+            groups.setdefault(labels, []).append(row)
+
+        with self._write_session() as session:
+            for labels, rows in groups.items():
+                label_str = ":".join(_label(label) for label in labels)
+                query = f"""
+                UNWIND $rows AS row
+                MERGE (e:{self.ENTITY_LABEL} {{entity_id: row.entity_id}})
+                SET e:{label_str},
+                    e += row.properties,
+                    e.created_at = row.created_at,
+                    e.updated_at = row.updated_at
+                FOREACH (_ IN CASE WHEN row.embedding IS NULL THEN [] ELSE [1] END |
+                    SET e.embedding = row.embedding)
+                """
+                for start in range(0, len(rows), self.write_batch_size):
+                    batch = rows[start : start + self.write_batch_size]
+                    session.execute_write(lambda tx, q=query, b=batch: tx.run(q, {"rows": b}).consume())
+
+        return [EntityId(entity.entity_id) for entity in entities]
+
+    def _entity_embedding(self, entity: Entity) -> list[float] | None:
+        """Embedding for an entity: an explicit ``embedding`` property, else embed_fn over its text."""
+        embedding = entity.properties.get("embedding")
+        if embedding is not None:
+            return [float(x) for x in embedding]
+        if self.embed_fn is None:
+            return None
+        text = " ".join(str(entity.properties[key]) for key in ("name", "description") if entity.properties.get(key))
+        return [float(x) for x in self.embed_fn(text)] if text else None
 
     def create_relationship(
         self,
@@ -303,37 +427,94 @@ def create_relationship(
 
         Returns:
             Relationship ID
+
+        Raises:
+            ValueError: If either entity does not exist
         """
-        driver = self._ensure_driver()
+        created = self.create_relationships([(from_id, to_id, relationship_type, properties)])
+        if not created:
+            raise ValueError(f"Cannot relate {from_id.value} to {to_id.value}: entity not found")
 
-        relationship_id = str(uuid4())
-        now = datetime.now()
-        with driver.session(database=self.database) as session:
-            query = f"""
-            MATCH (a {{entity_id: $from_id}}), (b {{entity_id: $to_id}})
-            MERGE (a)-[r:{relationship_type.value} {{relationship_id: $relationship_id}}]->(b)
-            SET r += $properties,
-                r.created_at = $created_at,
-                r.updated_at = $updated_at
-            RETURN r.relationship_id as relationship_id
-            """
+        logger.debug(f"Created relationship {created[0].value} from {from_id.value} to {to_id.value}")
+        return created[0]
+
+    def create_relationships(
+        self,
+        relationships: list[tuple[EntityId, EntityId, RelationType, dict[str, Any] | None]],
+    ) -> list[RelationshipId]:
+        """
+        Create relationships in batches, one UNWIND statement per type and batch.
+
+        Args:
+            relationships: (from_id, to_id, relationship_type, properties) tuples
 
-            result = session.run(
-                query,
+        Returns:
+            IDs of the relationships created; pairs whose entities do not exist are skipped
+        """
+        now = datetime.now().isoformat()
+        groups: dict[RelationType, list[dict[str, Any]]] = {}
+        for from_id, to_id, relationship_type, properties in relationships:
+            groups.setdefault(relationship_type, []).append(
                 {
                     "from_id": from_id.value,
                     "to_id": to_id.value,
-                    "relationship_id": relationship_id,
+                    "relationship_id": str(uuid4()),
                     "properties": properties or {},
-                    "created_at": now.isoformat(),
-                    "updated_at": now.isoformat(),
-                },
+                }
             )
 
-            rel_id = result.single()["relationship_id"]
-            logger.debug(f"Created relationship {rel_id} from {from_id.value} to {to_id.value}")
-
-            return RelationshipId(rel_id)
+        created: list[RelationshipId] = []
+        with self._write_session() as session:
+            for relationship_type, rows in groups.items():
+                query = f"""
+                UNWIND $rows AS row
+                MATCH (a:{self.ENTITY_LABEL} {{entity_id: row.from_id}})
+                MATCH (b:{self.ENTITY_LABEL} {{entity_id: row.to_id}})
+                MERGE (a)-[r:{_label(relationship_type.value)} {{relationship_id: row.relationship_id}}]->(b)
+                SET r += row.properties,
+                    r.created_at = $now,
+                    r.updated_at = $now
+                RETURN r.relationship_id AS relationship_id
+                """
+                for start in range(0, len(rows), self.write_batch_size):
+                    batch = rows[start : start + self.write_batch_size]
+                    records = session.execute_write(
+                        lambda tx, q=query, b=batch: list(tx.run(q, {"rows": b, "now": now}))
+                    )
+                    created.extend(RelationshipId(record["relationship_id"]) for record in records)
+
+        return created
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _to_entity(self, node: Any, labels: list[str]) -> Entity | None:
+        """Build an Entity from a node and its labels; None if it has no known entity type."""
+        entity_type = None
+        for label in labels:
+            try:
+                entity_type = EntityType(label)
+                break
+            except ValueError:
+                continue
+
+        if not entity_type:
+            return None
+
+        # Extract properties (excluding system properties)
+        properties = dict(node)
+        for key in self.SYSTEM_PROPERTIES:
+            properties.pop(key, None)
+
+        return Entity(
+            entity_id=node["entity_id"],
+            entity_type=entity_type,
+            properties=properties,
+            created_at=datetime.fromisoformat(node["created_at"]),
+            updated_at=datetime.fromisoformat(node["updated_at"]),
+            labels=set(labels) - {entity_type.value, self.ENTITY_LABEL},
+        )
 
     def get_entity(self, entity_id: EntityId) -> Entity | None:
         """
@@ -345,54 +526,27 @@ def get_entity(self, entity_id: EntityId) -> Entity | None:
         Returns:
             Entity or None if not found
         """
-        driver = self._ensure_driver()
-
-        with driver.session(database=self.database) as session:
-            query = """
-            MATCH (e {entity_id: $entity_id})
-            RETURN e, labels(e) as labels
-            """
+        query = f"""
+        MATCH (e:{self.ENTITY_LABEL} {{entity_id: $entity_id}})
+        RETURN e, labels(e) as labels
+        """
+        records = self._read(query, {"entity_id": entity_id.value})
+        if not records:
+            return None
 
-            result = session.run(query, {"entity_id": entity_id.value})
-            record = result.single()
-
-            if not record:
-                return None
-
-            node = record["e"]
-            labels = record["labels"]
-
-            # Determine entity type from labels
-            entity_type = None
-            for label in labels:
-                try:
-                    entity_type = EntityType(label)
-                    break
-                except ValueError:
-                    continue
-
-            if not entity_type:
-                raise ValueError(f"Unknown entity type for entity {entity_id.value}")
-
-            # Extract properties (excluding system properties)
-            properties = dict(node)
-            properties.pop("entity_id", None)
-            properties.pop("created_at", None)
-            properties.pop("updated_at", None)
-
-            return Entity(
-                entity_id=node["entity_id"],
-                entity_type=entity_type,
-                properties=properties,
-                created_at=datetime.fromisoformat(node["created_at"]),
-                updated_at=datetime.fromisoformat(node["updated_at"]),
-                labels=set(labels) - {entity_type.value},
-            )
+        entity = self._to_entity(records[0]["e"], records[0]["labels"])
+        if entity is None:
+            raise ValueError(f"Unknown entity type for entity {entity_id.value}")
+        return entity
 
     def semantic_search(self, query: str, context: SearchContext) -> list[Entity]:
         """
         Perform semantic search across the knowledge graph.
 
+        Uses the vector index when an embedding function is configured and the
+        full-text index otherwise. Results are ranked by relevance unless
+        ``context.sort_by`` names a property to order by.
+
         Args:
             query: Search query
             context: Search context parameters
@@ -400,76 +554,43 @@ def semantic_search(self, query: str, context: SearchContext) -> list[Entity]:
         Returns:
             List of matching entities
         """
-        driver = self._ensure_driver()
-
-        with driver.session(database=self.database) as session:
-            # Build base query
-            query_parts: list[str] = []
-            params: dict[str, Any] = {"search_term": query}
-
-            # Entity type filtering
-            if context.entity_types:
-                type_filter = " OR ".join([f"e:{etype.value}" for etype in context.entity_types])
-                query_parts.append(f"({type_filter})")
-
-            # Property search
-            query_parts.append(
-                "(toLower(e.name) CONTAINS toLower($search_term) OR "
-                + "toLower(e.description) CONTAINS toLower($search_term))"
-            )
-
-            # Build full query
-            where_clause = " AND ".join(query_parts)
-
-            base_query = f"""
-            MATCH (e)
-            WHERE {where_clause}
-            RETURN e, labels(e) as labels
-            ORDER BY e.{context.sort_by or "created_at"} {context.sort_order}
-            SKIP $offset LIMIT $limit
-            """
-
-            params["offset"] = context.offset
-            params["limit"] = context.limit
-
-            result = session.run(base_query, params)
-            entities = []
-
-            for record in result:
-                node = record["e"]
-                labels = record["labels"]
-
-                # Determine entity type
-                entity_type = None
-                for label in labels:
-                    try:
-                        entity_type = EntityType(label)
-                        break
-                    except ValueError:
-                        continue
-
-                if not entity_type:
-                    continue
-
-                # Extract properties
-                properties = dict(node)
-                properties.pop("entity_id", None)
-                properties.pop("created_at", None)
-                properties.pop("updated_at", None)
-
-                entity = Entity(
-                    entity_id=node["entity_id"],
-                    entity_type=entity_type,
-                    properties=properties,
-                    created_at=datetime.fromisoformat(node["created_at"]),
-                    updated_at=datetime.fromisoformat(node["updated_at"]),
-                    labels=set(labels) - {entity_type.value},
-                )
-
-                entities.append(entity)
+        params: dict[str, Any] = {"offset": context.offset, "limit": context.limit}
+
+        if self.embed_fn is not None:
+            # The vector index returns the k nearest overall, so over-fetch when filtering by type
+            fetch = context.offset + context.limit
+            params["k"] = fetch * 4 if context.entity_types else fetch
+            params["vector"] = [float(x) for x in self.embed_fn(query)]
+            source = f"CALL db.index.vector.queryNodes('{self.VECTOR_INDEX}', $k, $vector) YIELD node AS e, score"
+        else:
+            search_term = _fulltext_query(query)
+            if not search_term:
+                return []
+            params["search_term"] = search_term
+            source = f"CALL db.index.fulltext.queryNodes('{self.FULLTEXT_INDEX}', $search_term) YIELD node AS e, score"
+
+        where_clause = ""
+        if context.entity_types:
+            type_filter = " OR ".join([f"e:{_label(etype.value)}" for etype in context.entity_types])
+            where_clause = f"WHERE {type_filter}"
+
+        direction = "DESC" if context.sort_order.upper() == "DESC" else "ASC"
+        order = f"e.{_label(context.sort_by)} {direction}" if context.sort_by else "score DESC"
+        search_query = f"""
+        {source}
+        {where_clause}
+        RETURN e, labels(e) as labels
+        ORDER BY {order}
+        SKIP $offset LIMIT $limit
+        """
 
-            logger.debug(f"Semantic search returned {len(entities)} entities")
-            return entities
+        entities = [
+            entity
+            for record in self._read(search_query, params)
+            if (entity := self._to_entity(record["e"], record["labels"])) is not None
+        ]
+        logger.debug(f"Semantic search returned {len(entities)} entities")
+        return entities
 
     def find_relationships(
         self,
@@ -490,85 +611,43 @@ def find_relationships(
         Returns:
             List of (relationship, related_entity) tuples
         """
-        driver = self._ensure_driver()
-
-        with driver.session(database=self.database) as session:
-            # Build query based on direction
-            if direction == "outgoing":
-                match_clause = "MATCH (e {entity_id: $entity_id})-[r]->(related)"
-            elif direction == "incoming":
-                match_clause = "MATCH (e {entity_id: $entity_id})<-[r]-(related)"
-            else:  # both
-                match_clause = "MATCH (e {entity_id: $entity_id})-[r]-(related)"
-
-            # Add relationship type filter if specified
-            where_clause = ""
-            if relationship_type:
-                where_clause = f"WHERE type(r) = '{relationship_type.value}'"
-
-            query = f"""
-            {match_clause}
-            {where_clause}
-            RETURN r, related, labels(related) as labels
-            LIMIT $limit
-            """
+        rel = f"[r:{_label(relationship_type.value)}]" if relationship_type else "[r]"
+        anchor = f"(e:{self.ENTITY_LABEL} {{entity_id: $entity_id}})"
+
+        # Build query based on direction
+        if direction == "outgoing":
+            match_clause = f"MATCH {anchor}-{rel}->(related)"
+        elif direction == "incoming":
+            match_clause = f"MATCH {anchor}<-{rel}-(related)"
+        else:  # both
+            match_clause = f"MATCH {anchor}-{rel}-(related)"
+
+        query = f"""
+        {match_clause}
+        RETURN r, type(r) as rel_type, startNode(r).entity_id as from_id, endNode(r).entity_id as to_id,
+               related, labels(related) as labels
+        LIMIT $limit
+        """
 
-            result = session.run(
-                query,
-                {
-                    "entity_id": entity_id.value,
-                    "limit": limit,
-                },
+        relationships = []
+        for record in self._read(query, {"entity_id": entity_id.value, "limit": limit}):
+            related_entity = self._to_entity(record["related"], record["labels"])
+            if related_entity is None:
+                continue
+
+            rel_props = record["r"]
+            relationship = Relationship(
+                relationship_id=rel_props["relationship_id"],
+                from_entity_id=record["from_id"],
+                to_entity_id=record["to_id"],
+                relationship_type=RelationType(record["rel_type"]),
+                properties=dict(rel_props),
+                created_at=datetime.fromisoformat(rel_props["created_at"]),
+                updated_at=datetime.fromisoformat(rel_props["updated_at"]),
             )
+            relationships.append((relationship, related_entity))
 
-            relationships = []
-
-            for record in result:
-                rel = record["r"]
-                related_node = record["related"]
-                labels = record["labels"]
-
-                # Determine related entity type
-                entity_type = None
-                for label in labels:
-                    try:
-                        entity_type = EntityType(label)
-                        break
-                    except ValueError:
-                        continue
-
-                if not entity_type:
-                    continue
-
-                # Create relationship object
-                relationship = Relationship(
-                    relationship_id=rel["relationship_id"],
-                    from_entity_id=rel.start_node["entity_id"],
-                    to_entity_id=rel.end_node["entity_id"],
-                    relationship_type=RelationType(type(rel)),
-                    properties=dict(rel),
-                    created_at=datetime.fromisoformat(rel["created_at"]),
-                    updated_at=datetime.fromisoformat(rel["updated_at"]),
-                )
-
-                # Create related entity
-                properties = dict(related_node)
-                properties.pop("entity_id", None)
-                properties.pop("created_at", None)
-                properties.pop("updated_at", None)
-
-                related_entity = Entity(
-                    entity_id=related_node["entity_id"],
-                    entity_type=entity_type,
-                    properties=properties,
-                    created_at=datetime.fromisoformat(related_node["created_at"]),
-                    updated_at=datetime.fromisoformat(related_node["updated_at"]),
-                    labels=set(labels) - {entity_type.value},
-                )
-
-                relationships.append((relationship, related_entity))
-
-            return relationships
+        return relationships
 
     def find_path(
         self,
@@ -589,76 +668,25 @@ def find_path(
         Returns:
             List of entities in the path
         """
-        driver = self._ensure_driver()
-
-        with driver.session(database=self.database) as session:
-            # Build relationship filter
-            rel_filter = ""
-            if relationship_types:
-                rel_types = "|".join([rt.value for rt in relationship_types])
-                rel_filter = f":{rel_types}"
-
-            query = f"""
-            MATCH path = shortestPath(
-                (start {{entity_id: $from_id}})-[{rel_filter}*1..{max_depth}]-(end {{entity_id: $to_id}})
-            )
-            RETURN [node in nodes(path) | node] as path_nodes
-            """
-
-            result = session.run(
-                query,
-                {
-                    "from_id": from_id.value,
-                    "to_id": to_id.value,
-                },
-            )
-
-            record = result.single()
-            if not record:
-                return []
+        # Build relationship filter
+        rel_filter = ""
+        if relationship_types:
+            rel_types = "|".join([_label(rt.value) for rt in relationship_types])
+            rel_filter = f":{rel_types}"
+
+        query = f"""
+        MATCH (start:{self.ENTITY_LABEL} {{entity_id: $from_id}}), (end:{self.ENTITY_LABEL} {{entity_id: $to_id}})
+        MATCH path = shortestPath((start)-[{rel_filter}*1..{int(max_depth)}]-(end))
+        RETURN [node in nodes(path) | [node, labels(node)]] as path_nodes
+        """
 
-            path_nodes = record["path_nodes"]
-            entities = []
+        records = self._read(query, {"from_id": from_id.value, "to_id": to_id.value})
+        if not records:
+            return []
 
-            for node in path_nodes:
-                # Get entity labels
-                labels_query = """
-                MATCH (e {entity_id: $entity_id})
-                RETURN labels(e) as labels
-                """
-                labels_result = session.run(labels_query, {"entity_id": node["entity_id"]})
-                labels = labels_result.single()["labels"]
-
-                # Determine entity type
-                entity_type = None
-                for label in labels:
-                    try:
-                        entity_type = EntityType(label)
-                        break
-                    except ValueError:
-                        continue
-
-                if not entity_type:
-                    continue
-
-                # Extract properties
-                properties = dict(node)
-                properties.pop("entity_id", None)
-                properties.pop("created_at", None)
-                properties.pop("updated_at", None)
-
-                entity = Entity(
-                    entity_id=node["entity_id"],
-                    entity_type=entity_type,
-                    properties=properties,
-                    created_at=datetime.fromisoformat(node["created_at"]),
-                    updated_at=datetime.fromisoformat(node["updated_at"]),
-                    labels=set(labels) - {entity_type.value},
-                )
-
-                entities.append(entity)
-
-            return entities
+        return [
+            entity for node, labels in records[0]["path_nodes"] if (entity := self._to_entity(node, labels)) is not None
+        ]
 
     def get_graph_statistics(self) -> dict[str, Any]:
         """
@@ -667,67 +695,60 @@ def get_graph_statistics(self) -> dict[str, Any]:
         Returns:
             Dictionary with graph statistics
         """
-        driver = self._ensure_driver()
+        # Count entities by type
+        entity_counts_query = f"""
+        MATCH (e:{self.ENTITY_LABEL})
+        RETURN labels(e) as labels, count(e) as count
+        """
+        entity_counts: dict[str, int] = {}
+        for record in self._read(entity_counts_query, {}):
+            labels = [label for label in record["labels"] if label != self.ENTITY_LABEL]
+            if labels:
+                primary_label = labels[0]  # Assume first label is the entity type
+                entity_counts[primary_label] = entity_counts.get(primary_label, 0) + record["count"]
+
+        # Count relationships by type
+        rel_counts_query = """
+        MATCH ()-[r]->()
+        RETURN type(r) as type, count(r) as count
+        """
+        relationship_counts = {record["type"]: record["count"] for record in self._read(rel_counts_query, {})}
 
-        with driver.session(database=self.database) as session:
-            # Count entities by type
-            entity_counts_query = """
-            MATCH (e)
-            RETURN labels(e) as labels, count(e) as count
-            """
-            entity_result = session.run(entity_counts_query)
-            entity_counts = {}
-            for record in entity_result:
-                labels = record["labels"]
-                if labels:
-                    primary_label = labels[0]  # Assume first label is the entity type
-                    entity_counts[primary_label] = record["count"]
-
-            # Count relationships by type
-            rel_counts_query = """
-            MATCH ()-[r]->()
-            RETURN type(r) as type, count(r) as count
-            """
-            rel_result = session.run(rel_counts_query)
-            relationship_counts = {}
-            for record in rel_result:
-                relationship_counts[record["type"]] = record["count"]
-
-            # Get overall statistics
-            stats_query = """
-            MATCH (n) RETURN count(n) as total_nodes
-            MATCH ()-[r]->() RETURN count(r) as total_relationships
-            """
-            stats_result = session.run(stats_query)
-            stats_records = list(stats_result)
-
-            total_nodes = stats_records[0]["total_nodes"] if len(stats_records) > 0 else 0
-            total_relationships = stats_records[1]["total_relationships"] if len(stats_records) > 1 else 0
-
-            return {
-                "total_entities": total_nodes,
-                "total_relationships": total_relationships,
-                "entity_counts": entity_counts,
-                "relationship_counts": relationship_counts,
-                "database": self.database,
-            }
+        return {
+            "total_entities": sum(entity_counts.values()),
+            "total_relationships": sum(relationship_counts.values()),
+            "entity_counts": entity_counts,
+            "relationship_counts": relationship_counts,
+            "database": self.database,
+        }
 
     def _initialize_schema(self) -> None:
         """Initialize database schema with constraints and indexes."""
-        driver = self._ensure_driver()
-        with driver.session(database=self.database) as session:
+        if self.driver is None:
+            raise RuntimeError("Neo4j driver is not initialized")
+
+        with self.driver.session(database=self.database) as session:
             # Create uniqueness constraints for entity IDs
-            for entity_type in EntityType:
+            for label in (self.ENTITY_LABEL, *EntityType):
                 constraint_query = f"""
-                CREATE CONSTRAINT IF NOT EXISTS FOR (e:{entity_type.value})
+                CREATE CONSTRAINT IF NOT EXISTS FOR (e:{_label(label)})
                 REQUIRE e.entity_id IS UNIQUE
                 """
-                session.run(constraint_query)
+                session.run(constraint_query).consume()
+
+            # Nodes written before the common label existed
+            type_filter = " OR ".join(f"e:{_label(entity_type.value)}" for entity_type in EntityType)
+            migrate_query = f"""
+            MATCH (e)
+            WHERE ({type_filter}) AND e.entity_id IS NOT NULL AND NOT e:{self.ENTITY_LABEL}
+            CALL {{ WITH e SET e:{self.ENTITY_LABEL} }} IN TRANSACTIONS OF 10000 ROWS
+            """
+            session.run(migrate_query).consume()
 
             # Create indexes for common properties
             indexes = [
-                ("Entity", "name"),
-                ("Entity", "created_at"),
+                (self.ENTITY_LABEL, "name"),
+                (self.ENTITY_LABEL, "created_at"),
                 ("Skill", "version"),
                 ("Event", "event_type"),
                 ("Event", "timestamp"),
@@ -737,21 +758,31 @@ def _initialize_schema(self) -> None:
                 index_query = f"""
                 CREATE INDEX IF NOT EXISTS FOR (e:{label}) ON (e.{property})
                 """
-                session.run(index_query)
-
-            # Create full-text search indexes
-            search_indexes = [
-                ("Entity", ["name", "description"]),
-                ("Skill", ["name", "description"]),
-                ("Artifact", ["name", "type"]),
-            ]
+                session.run(index_query).consume()
 
-            for label, properties in search_indexes:
-                search_query = f"""
-                CREATE FULLTEXT INDEX IF NOT EXISTS FOR (e:{label})
-                ON EACH [{", ".join([f"e.{prop}" for prop in properties])}]
+            # Full-text index backing semantic_search
+            search_query = f"""
+            CREATE FULLTEXT INDEX {self.FULLTEXT_INDEX} IF NOT EXISTS FOR (e:{self.ENTITY_LABEL})
+            ON EACH [e.name, e.description]
+            """
+            session.run(search_query).consume()
+
+            # Vector index backing semantic_search when an embedding function is configured
+            if self.embed_fn is not None and self.embedding_dimensions is None:
+                self.embedding_dimensions = len(self.embed_fn("dimension probe"))
+            if self.embedding_dimensions:
+                vector_query = f"""
+                CREATE VECTOR INDEX {self.VECTOR_INDEX} IF NOT EXISTS FOR (e:{self.ENTITY_LABEL})
+                ON (e.embedding)
+                OPTIONS {{indexConfig: {{
+                    `vector.dimensions`: {int(self.embedding_dimensions)},
+                    `vector.similarity_function`: 'cosine'
+                }}}}
                 """
-                session.run(search_query)
+                session.run(vector_query).consume()
+
+            # Queries against an index fail until it is online
+            session.run("CALL db.awaitIndexes(300)").consume()
 
             logger.info("Database schema initialized")
 
@@ -33,7 +33,10 @@
 import html
 import logging
 import re
+import threading
 import unicodedata
+from collections import OrderedDict
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from enum import StrEnum
 from typing import Any
@@ -65,6 +68,14 @@ class ThreatType(StrEnum):
     SUSPICIOUS_PATTERN = "suspicious_pattern"
 
 
+_SEVERITY_RANK: dict[ThreatSeverity, int] = {severity: rank for rank, severity in enumerate(ThreatSeverity)}
+
+
+def _max_severity(current: ThreatSeverity, other: ThreatSeverity) -> ThreatSeverity:
+    """Return the more severe of two severities."""
+    return other if _SEVERITY_RANK[other] > _SEVERITY_RANK[current] else current
+
+
 @dataclass
 class SanitizationResult:
     """Result of input sanitization."""
@@ -113,6 +124,10 @@ class SanitizationConfig:
     log_threats: bool = True
     strict_mode: bool = False  # If True, reject any suspicious input
 
+    # Verdict cache for repeated short strings (0 disables)
+    verdict_cache_size: int = 4096
+    verdict_cache_max_length: int = 256
+
 
 class InputSanitizer:
     """
@@ -186,6 +201,64 @@ class InputSanitizer:
         (r"c:\\windows\\system32", ThreatType.PATH_TRAVERSAL, ThreatSeverity.HIGH),
     ]
 
+    # Literals (lowercase) of which at least one occurs in every match of a
+    # pattern. On ASCII input a pattern whose literals are all absent cannot
+    # match, so it is skipped without running the regex. Patterns without an
+    # entry are always run.
+    PATTERN_ANCHORS: dict[str, tuple[str, ...]] = {
+        r"<script[^>]*>.*?</script>": ("<script",),
+        r"<script[^>]*>": ("<script",),
+        r"javascript\s*:": ("javascript",),
+        r"vbscript\s*:": ("vbscript",),
+        r"data\s*:\s*text/html": ("text/html",),
+        r"on\w+\s*=": ("=",),
+        r"<iframe[^>]*>": ("<iframe",),
+        r"<object[^>]*>": ("<object",),
+        r"<embed[^>]*>": ("<embed",),
+        r"<link[^>]*>": ("<link",),
+        r"<meta[^>]*http-equiv": ("http-equiv",),
+        r"\b(union\s+select|union\s+all\s+select)\b": ("union",),
+        r"\b(select\s+.*\s+from\s+.*\s+where)\b": ("select",),
+        r"\b(insert\s+into|update\s+.*\s+set|delete\s+from)\b": ("insert", "update", "delete"),
+        r"\b(drop\s+table|drop\s+database|truncate\s+table)\b": ("drop", "truncate"),
+        r"\b(alter\s+table|create\s+table)\b": ("table",),
+        r"('\s*or\s+'?\d+'?\s*=\s*'?\d+'?)": ("'",),
+        r"(--\s*$|;\s*--)": ("--",),
+        r"\b(exec\s*\(|execute\s*\()\b": ("exec",),
+        r"\b(xp_cmdshell|sp_executesql)\b": ("xp_cmdshell", "sp_executesql"),
+        r";\s*(rm|del|format|fdisk|mkfs)\s": (";",),
+        r"\|\s*(nc|netcat|telnet|ssh|bash|sh|cmd)\s": ("|",),
+        r"&&\s*(wget|curl|fetch|powershell)\s": ("&&",),
+        r"\$\([^)]+\)": ("$(",),
+        r"`[^`]+`": ("`",),
+        r">\s*/dev/null": ("/dev/null",),
+        r">\s*&\d": (">",),
+        r"\beval\s*\(": ("eval",),
+        r"\bexec\s*\(": ("exec",),
+        r"\bcompile\s*\(": ("compile",),
+        r"\b__import__\s*\(": ("__import__",),
+        r"\bgetattr\s*\(": ("getattr",),
+        r"\bsetattr\s*\(": ("setattr",),
+        r"\bdelattr\s*\(": ("delattr",),
+        r"\bglobals\s*\(\s*\)": ("globals",),
+        r"\blocals\s*\(\s*\)": ("locals",),
+        r"\bvars\s*\(\s*\)": ("vars",),
+        r'\bopen\s*\([^)]*,\s*["\']w': ("open",),
+        r"\bos\.system\s*\(": ("os.system",),
+        r"\bsubprocess\s*\.": ("subprocess",),
+        r"\bimport\s+os\b": ("import",),
+        r"\bimport\s+subprocess\b": ("import",),
+        r"\bimport\s+pickle\b": ("import",),
+        r"\.\./": ("../",),
+        r"\.\.\\": ("..\\",),
+        r"%2e%2e%2f": ("%2e%2e%2f",),
+        r"%2e%2e%5c": ("%2e%2e%5c",),
+        r"%252e%252e%252f": ("%252e%252e%252f",),
+        r"/etc/passwd": ("/etc/passwd",),
+        r"/etc/shadow": ("/etc/shadow",),
+        r"c:\\windows\\system32": ("c:\\windows\\system32",),
+    }
+
     # Characters that are always safe
     SAFE_CHARS: set[str] = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .,!?-_")
 
@@ -198,8 +271,31 @@ def __init__(self, config: SanitizationConfig | None = None) -> None:
         """
         self.config = config or SanitizationConfig()
         self._compiled_patterns: list[tuple[re.Pattern, ThreatType, ThreatSeverity]] = []
+        self._pattern_anchors: list[tuple[str, ...]] = []
         self._compile_patterns()
 
+        # One pass over the lowercased text finds every anchor literal present.
+        # The lookahead makes overlapping occurrences visible too.
+        anchors = sorted({a for group in self._pattern_anchors for a in group}, key=len, reverse=True)
+        self._anchor_scanner = re.compile("(?=(" + "|".join(map(re.escape, anchors)) + "))") if anchors else None
+        # Anchors hidden at the same position by a longer anchor they prefix
+        self._anchor_prefixes = {a: tuple(b for b in anchors if b != a and a.startswith(b)) for a in anchors}
+        # Anchor -> indices of the patterns it gates; unanchored patterns always run
+        self._anchor_patterns: dict[str, list[int]] = {a: [] for a in anchors}
+        self._unanchored: list[int] = []
+        for index, group in enumerate(self._pattern_anchors):
+            for anchor in group:
+                self._anchor_patterns[anchor].append(index)
+            if not group:
+                self._unanchored.append(index)
+
+        # Strings made only of SAFE_CHARS need no normalization or escaping
+        self._safe_text = re.compile("[" + re.escape("".join(sorted(self.SAFE_CHARS))) + "]*")
+        self._scanners: dict[frozenset[ThreatType], re.Pattern] = {}
+
+        self._verdicts: OrderedDict[str, SanitizationResult] = OrderedDict()
+        self._verdicts_lock = threading.Lock()
+
         logger.debug("InputSanitizer initialized with config: %s", self.config)
 
     def _compile_patterns(self) -> None:
@@ -208,9 +304,147 @@ def _compile_patterns(self) -> None:
             try:
                 compiled = re.compile(pattern, re.IGNORECASE | re.DOTALL)
                 self._compiled_patterns.append((compiled, threat_type, severity))
+                self._pattern_anchors.append(self.PATTERN_ANCHORS.get(pattern, ()))
             except re.error as e:
                 logger.error("Failed to compile pattern '%s': %s", pattern, e)
 
+    def _enabled_types(self) -> frozenset[ThreatType]:
+        """Threat types the current configuration checks for."""
+        enabled = []
+        if self.config.remove_scripts:
+            enabled.append(ThreatType.XSS)
+        if self.config.block_sql_injection:
+            enabled.append(ThreatType.SQL_INJECTION)
+        if self.config.block_command_injection:
+            enabled.append(ThreatType.COMMAND_INJECTION)
+        if self.config.block_code_injection:
+            enabled.append(ThreatType.CODE_INJECTION)
+        if self.config.block_path_traversal:
+            enabled.append(ThreatType.PATH_TRAVERSAL)
+        return frozenset(enabled)
+
+    def _scanner(self, types: frozenset[ThreatType]) -> re.Pattern:
+        """
+        Get the combined scanner for a set of threat types.
+
+        The scanner is one alternation of the enabled patterns, so a single
+        ``search`` tells whether any of them matches anywhere in the text.
+        It gates text the anchor check cannot handle (non-ASCII input).
+
+        Args:
+            types: Threat types to include
+
+        Returns:
+            Compiled alternation (never matches if no pattern is included)
+        """
+        scanner = self._scanners.get(types)
+        if scanner is None:
+            alternatives = [
+                f"(?:{compiled.pattern})"
+                for compiled, threat_type, _ in self._compiled_patterns
+                if threat_type in types
+            ]
+            scanner = re.compile("|".join(alternatives) or "(?!)", re.IGNORECASE | re.DOTALL)
+            self._scanners[types] = scanner
+        return scanner
+
+    def _anchors_in(self, text: str) -> set[str] | None:
+        """
+        Find the anchor literals present in ASCII text.
+
+        Returns:
+            Set of anchors found, or None if the text is not ASCII (case-insensitive
+            matching then reaches beyond ``str.lower``, so anchors cannot rule
+            out a pattern)
+        """
+        if not text.isascii():
+            return None
+        if self._anchor_scanner is None:
+            return set()
+        found = set(self._anchor_scanner.findall(text.lower()))
+        for anchor in list(found):
+            found.update(self._anchor_prefixes[anchor])
+        return found
+
+    def _candidates(
+        self,
+        found: set[str] | None,
+        types: frozenset[ThreatType] | None = None,
+        start: int = 0,
+    ) -> list[int]:
+        """
+        Get the indices, in order, of patterns that may match.
+
+        Args:
+            found: Anchors present in the text, or None to consider every pattern
+            types: Threat types to include (all if None)
+            start: Skip patterns before this index
+
+        Returns:
+            Sorted pattern indices
+        """
+        if found is None:
+            indices: Iterable[int] = range(len(self._compiled_patterns))
+        else:
+            selected = set(self._unanchored)
+            for anchor in found:
+                selected.update(self._anchor_patterns[anchor])
+            indices = sorted(selected)
+        return [
+            index
+            for index in indices
+            if index >= start and (types is None or self._compiled_patterns[index][1] in types)
+        ]
+
+    def _remove_threats(
+        self,
+        text: str,
+        types: frozenset[ThreatType],
+        found: set[str] | None,
+    ) -> tuple[str, list[dict[str, Any]], list[str], ThreatSeverity]:
+        """
+        Detect and remove dangerous patterns, one pattern at a time in order.
+
+        Removal of one pattern can expose or hide matches of a later one, so
+        patterns are applied sequentially and the anchors are re-read after
+        every removal.
+
+        Args:
+            text: Text to clean
+            types: Threat types to check
+            found: Anchors present in ``text`` (see :meth:`_anchors_in`)
+
+        Returns:
+            Tuple of (text, threats, modifications, max severity)
+        """
+        threats: list[dict[str, Any]] = []
+        modifications: list[str] = []
+        max_severity = ThreatSeverity.NONE
+
+        candidates = self._candidates(found, types)
+        while candidates:
+            index = candidates.pop(0)
+            compiled_pattern, threat_type, severity = self._compiled_patterns[index]
+
+            matches = compiled_pattern.findall(text)
+            if matches:
+                threats.append(
+                    {
+                        "type": threat_type.value,
+                        "severity": severity.value,
+                        "matches": matches[:5],  # Limit logged matches
+                        "match_count": len(matches),
+                    }
+                )
+                max_severity = _max_severity(max_severity, severity)
+
+                # Remove dangerous patterns
+                text = compiled_pattern.sub("", text)
+                modifications.append(f"removed_{threat_type.value}")
+                candidates = self._candidates(self._anchors_in(text), types, index + 1)
+
+        return text, threats, modifications, max_severity
+
     def sanitize_text(self, text: str) -> str:
         """
         Sanitize text input with full protection.
@@ -228,6 +462,9 @@ def sanitize_text_full(self, text: str) -> SanitizationResult:
         """
         Sanitize text input with detailed result.
 
+        Verdicts for short strings are cached, so repeated values (JSON keys,
+        enum-like fields) are only scanned once.
+
         Args:
             text: Input text to sanitize
 
@@ -237,7 +474,58 @@ def sanitize_text_full(self, text: str) -> SanitizationResult:
         if not isinstance(text, str):
             text = str(text)
 
+        cacheable = 0 < self.config.verdict_cache_size and len(text) <= self.config.verdict_cache_max_length
+        if cacheable:
+            with self._verdicts_lock:
+                cached = self._verdicts.get(text)
+                if cached is not None:
+                    self._verdicts.move_to_end(text)
+            if cached is not None:
+                self._log_threats(cached)
+                return _copy_result(cached)
+
+        result = self._sanitize_text_uncached(text)
+        self._log_threats(result)
+
+        if cacheable:
+            with self._verdicts_lock:
+                self._verdicts[text] = _copy_result(result)
+                if len(self._verdicts) > self.config.verdict_cache_size:
+                    self._verdicts.popitem(last=False)
+
+        return result
+
+    def clear_cache(self) -> None:
+        """Drop cached verdicts, e.g. after changing ``config``."""
+        with self._verdicts_lock:
+            self._verdicts.clear()
+        self._scanners.clear()
+
+    def _log_threats(self, result: SanitizationResult) -> None:
+        """Log detected threats if configured."""
+        if result.threats_detected and self.config.log_threats:
+            logger.warning(
+                "Threats detected in input: %d threats, max severity: %s",
+                len(result.threats_detected),
+                result.severity.value,
+            )
+
+    def _sanitize_text_uncached(self, text: str) -> SanitizationResult:
+        """Run the sanitization steps on one string."""
         original_length = len(text)
+        types = self._enabled_types()
+
+        # Fast path: plain words and punctuation are unchanged by normalization
+        # and escaping; only the patterns whose anchors occur need checking
+        found = self._anchors_in(text)
+        if original_length <= self.config.max_text_length and self._safe_text.fullmatch(text):
+            if not self._candidates(found, types):
+                return SanitizationResult(
+                    original_length=original_length,
+                    sanitized_length=original_length,
+                    sanitized_content=text,
+                )
+
         threats: list[dict[str, Any]] = []
         modifications: list[str] = []
         max_severity = ThreatSeverity.NONE
@@ -258,41 +546,20 @@ def sanitize_text_full(self, text: str) -> SanitizationResult:
                     "details": f"Input length {len(text)} exceeds limit {self.config.max_text_length}",
                 }
             )
-            max_severity = max(max_severity, ThreatSeverity.MEDIUM, key=lambda x: list(ThreatSeverity).index(x))
+            max_severity = _max_severity(max_severity, ThreatSeverity.MEDIUM)
 
             if self.config.truncate_oversized:
                 text = text[: self.config.max_text_length] + "... [truncated]"
                 modifications.append("truncated")
 
-        # Step 3: Detect dangerous patterns
-        for compiled_pattern, threat_type, severity in self._compiled_patterns:
-            # Check if this pattern type should be blocked
-            should_check = (
-                (threat_type == ThreatType.XSS and self.config.remove_scripts)
-                or (threat_type == ThreatType.SQL_INJECTION and self.config.block_sql_injection)
-                or (threat_type == ThreatType.COMMAND_INJECTION and self.config.block_command_injection)
-                or (threat_type == ThreatType.CODE_INJECTION and self.config.block_code_injection)
-                or (threat_type == ThreatType.PATH_TRAVERSAL and self.config.block_path_traversal)
-            )
-
-            if not should_check:
-                continue
-
-            matches = compiled_pattern.findall(text)
-            if matches:
-                threats.append(
-                    {
-                        "type": threat_type.value,
-                        "severity": severity.value,
-                        "matches": matches[:5],  # Limit logged matches
-                        "match_count": len(matches),
-                    }
-                )
-                max_severity = max(max_severity, severity, key=lambda x: list(ThreatSeverity).index(x))
-
-                # Remove dangerous patterns
-                text = compiled_pattern.sub("", text)
-                modifications.append(f"removed_{threat_type.value}")
+        # Step 3: Detect dangerous patterns, gated by one anchor or combined scan
+        if modifications:
+            found = self._anchors_in(text)
+        if found is not None or self._scanner(types).search(text) is not None:
+            text, pattern_threats, pattern_mods, pattern_severity = self._remove_threats(text, types, found)
+            threats.extend(pattern_threats)
+            modifications.extend(pattern_mods)
+            max_severity = _max_severity(max_severity, pattern_severity)
 
         # Step 4: HTML entity encoding
         if self.config.encode_html:
@@ -301,14 +568,6 @@ def sanitize_text_full(self, text: str) -> SanitizationResult:
                 modifications.append("html_encoded")
                 text = encoded
 
-        # Log threats if configured
-        if threats and self.config.log_threats:
-            logger.warning(
-                "Threats detected in input: %d threats, max severity: %s",
-                len(threats),
-                max_severity.value,
-            )
-
         # Determine if input is safe
         is_safe = max_severity in [ThreatSeverity.NONE, ThreatSeverity.LOW]
         if self.config.strict_mode:
@@ -366,7 +625,7 @@ def sanitize_json_full(self, data: dict[str, Any]) -> SanitizationResult:
             # Update max severity
             for threat in structure_threats:
                 threat_severity = ThreatSeverity(threat.get("severity", "none"))
-                max_severity = max(max_severity, threat_severity, key=lambda x: list(ThreatSeverity).index(x))
+                max_severity = _max_severity(max_severity, threat_severity)
 
         except RecursionError:
             threats.append(
@@ -521,8 +780,12 @@ def detect_threats(self, text: str) -> list[dict[str, Any]]:
             List of detected threats
         """
         threats: list[dict[str, Any]] = []
+        found = self._anchors_in(text)
+        if found is None and self._scanner(frozenset(ThreatType)).search(text) is None:
+            return threats
 
-        for compiled_pattern, threat_type, severity in self._compiled_patterns:
+        for index in self._candidates(found):
+            compiled_pattern, threat_type, severity = self._compiled_patterns[index]
             matches = compiled_pattern.findall(text)
             if matches:
                 threats.append(
@@ -554,7 +817,7 @@ def get_max_severity(self, threats: list[dict[str, Any]]) -> ThreatSeverity:
         for threat in threats:
             try:
                 severity = ThreatSeverity(threat.get("severity", "none"))
-                max_sev = max(max_sev, severity, key=lambda x: list(ThreatSeverity).index(x))
+                max_sev = _max_severity(max_sev, severity)
             except ValueError:
                 pass
 
@@ -591,6 +854,19 @@ def escape_for_sql(text: str) -> str:
         return text.replace("'", "''").replace("\\", "\\\\")
 
 
+def _copy_result(result: SanitizationResult) -> SanitizationResult:
+    """Copy a text result so cached verdicts are not shared with callers."""
+    return SanitizationResult(
+        original_length=result.original_length,
+        sanitized_length=result.sanitized_length,
+        sanitized_content=result.sanitized_content,
+        threats_detected=[dict(threat) for threat in result.threats_detected],
+        modifications_made=list(result.modifications_made),
+        severity=result.severity,
+        is_safe=result.is_safe,
+    )
+
+
 # ─────────────────────────────────────────────────────────────
 # Factory Functions
 # ─────────────────────────────────────────────────────────────
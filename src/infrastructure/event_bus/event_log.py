@@ -0,0 +1,274 @@
+"""
+Segmented append-only log for event persistence.
+
+Records are JSON lines in segment files named after the offset of their first
+record (``00000000000000000000.log``). Offsets are dense and start at 0.
+Appends from concurrent publishers are group-committed: while one batch is
+being written and fsynced in a worker thread, later appends queue up and go
+out together in the next write, so the number of fsyncs tracks disk latency
+rather than the publish rate.
+
+Each segment keeps a sparse in-memory index of byte positions (one mark every
+``index_interval`` records) so reading from an offset seeks close to it
+instead of scanning the segment from the start.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import threading
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".log"
+
+
+@dataclass
+class LogSegment:
+    """One segment file and its sparse offset index."""
+
+    base_offset: int
+    path: Path
+    size: int = 0  # Committed bytes; readers never read past this
+    count: int = 0
+    marks: list[tuple[int, int]] = field(default_factory=list)  # (offset, byte position)
+
+    @property
+    def next_offset(self) -> int:
+        return self.base_offset + self.count
+
+    def position_for(self, offset: int) -> tuple[int, int]:
+        """Closest indexed (offset, position) at or before offset."""
+        i = bisect.bisect_right(self.marks, (offset, float("inf"))) - 1
+        return self.marks[i] if i >= 0 else (self.base_offset, 0)
+
+
+class SegmentedEventLog:
+    """
+    Append-only, segmented JSON-lines log with group-commit fsync.
+
+    Args:
+        directory: Directory holding the segment files (created on first use)
+        segment_bytes: Roll to a new segment once the active one reaches this size
+        index_interval: Records between sparse index marks
+        fsync: fsync each committed batch (disable only for tests and benchmarks)
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        segment_bytes: int = 64 * 1024 * 1024,
+        index_interval: int = 1024,
+        fsync: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.index_interval = max(1, index_interval)
+        self.fsync = fsync
+
+        self._segments: list[LogSegment] = []
+        self._opened = False
+        self._open_lock = threading.Lock()
+        self._next_offset = 0
+
+        self._pending: list[dict[str, Any]] = []
+        self._pending_commit: asyncio.Future[int] | None = None
+        self._commit_task: asyncio.Task | None = None
+
+        # Metrics
+        self.commits = 0
+        self.records_written = 0
+
+    @property
+    def next_offset(self) -> int:
+        """Offset the next committed record will get."""
+        self._open()
+        return self._next_offset
+
+    @property
+    def segments(self) -> list[LogSegment]:
+        """Segments in offset order."""
+        self._open()
+        return list(self._segments)
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    async def open(self) -> None:
+        """Create the directory and recover existing segments in a worker thread."""
+        await asyncio.to_thread(self._open)
+
+    def _open(self) -> None:
+        """Load segment metadata from disk, truncating a torn final record."""
+        if self._opened:
+            return
+        with self._open_lock:
+            if self._opened:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            for path in sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}")):
+                try:
+                    base = int(path.stem)
+                except ValueError:
+                    continue
+                self._segments.append(self._scan_segment(LogSegment(base_offset=base, path=path)))
+
+            if self._segments:
+                self._next_offset = self._segments[-1].next_offset
+            self._opened = True
+
+    def _scan_segment(self, segment: LogSegment) -> LogSegment:
+        position = 0
+        with open(segment.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    json.loads(line)
+                except ValueError:
+                    break
+                if segment.count % self.index_interval == 0:
+                    segment.marks.append((segment.next_offset, position))
+                segment.count += 1
+                position += len(line)
+
+        if position < segment.path.stat().st_size:
+            logger.warning(f"Truncating torn record at byte {position} of {segment.path}")
+            with open(segment.path, "r+b") as f:
+                f.truncate(position)
+        segment.size = position
+        return segment
+
+    # ------------------------------------------------------------------
+    # Appends
+    # ------------------------------------------------------------------
+
+    async def append(self, record: dict[str, Any]) -> int:
+        """
+        Append a record and wait until the batch containing it is committed.
+
+        Returns:
+            Offset assigned to the record
+        """
+        self._open()
+        index = len(self._pending)
+        self._pending.append(record)
+
+        if self._pending_commit is None:
+            self._pending_commit = asyncio.get_running_loop().create_future()
+        commit = self._pending_commit
+        if self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.create_task(self._commit_loop())
+
+        # Offsets are assigned at write time so a failed batch leaves no gap
+        return await asyncio.shield(commit) + index
+
+    async def _commit_loop(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending, []
+            commit, self._pending_commit = self._pending_commit, None
+            assert commit is not None
+            try:
+                first = await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                logger.error(f"Event log commit of {len(batch)} records failed: {e}")
+                commit.set_exception(e)
+                commit.exception()  # Appenders re-raise it; don't warn about it being unretrieved
+                continue
+            commit.set_result(first)
+
+    def _write_batch(self, batch: list[dict[str, Any]]) -> int:
+        first = self._next_offset
+        segment = self._segments[-1] if self._segments else None
+        rolled = segment is None or (segment.size >= self.segment_bytes and segment.count > 0)
+        if rolled:
+            segment = LogSegment(base_offset=first, path=self.directory / f"{first:020d}{SEGMENT_SUFFIX}")
+
+        lines = []
+        marks = []
+        position = segment.size
+        for offset, record in enumerate(batch, start=first):
+            line = json.dumps({"offset": offset, "record": record}, separators=(",", ":"), default=str).encode()
+            if (offset - segment.base_offset) % self.index_interval == 0:
+                marks.append((offset, position))
+            lines.append(line + b"\n")
+            position += len(line) + 1
+
+        with open(segment.path, "ab") as f:
+            try:
+                f.write(b"".join(lines))
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            except Exception:
+                f.truncate(segment.size)  # Drop a partial write so the segment stays line-aligned
+                raise
+
+        # Publish the new records to readers only once they are on disk
+        if rolled:
+            self._segments.append(segment)
+        segment.marks.extend(marks)
+        segment.count += len(batch)
+        segment.size = position
+        self._next_offset += len(batch)
+        self.commits += 1
+        self.records_written += len(batch)
+        return first
+
+    async def flush(self) -> None:
+        """Wait for every record appended so far to be committed."""
+        while self._commit_task is not None and not self._commit_task.done():
+            await asyncio.shield(self._commit_task)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read(self, from_offset: int = 0) -> Iterator[tuple[int, dict[str, Any]]]:
+        """
+        Iterate committed records from an offset, one segment at a time.
+
+        Blocking; use ``stream`` from async code.
+        """
+        self._open()
+        bases = [s.base_offset for s in self._segments]
+        start = max(bisect.bisect_right(bases, from_offset) - 1, 0)
+        for segment in self._segments[start:]:
+            if segment.next_offset <= from_offset:
+                continue
+            offset, position = segment.position_for(from_offset)
+            end = segment.size
+            with open(segment.path, "rb") as f:
+                f.seek(position)
+                while position < end:
+                    line = f.readline()
+                    position += len(line)
+                    if offset >= from_offset:
+                        yield offset, json.loads(line)["record"]
+                    offset += 1
+
+    async def stream(self, from_offset: int = 0, chunk_size: int = 512) -> AsyncIterator[tuple[int, dict[str, Any]]]:
+        """Async iteration over committed records, reading chunks in a worker thread."""
+        iterator = self.read(from_offset)
+
+        def next_chunk() -> list[tuple[int, dict[str, Any]]]:
+            chunk = []
+            for item in iterator:
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    break
+            return chunk
+
+        while chunk := await asyncio.to_thread(next_chunk):
+            for item in chunk:
+                yield item
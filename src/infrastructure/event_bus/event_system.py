@@ -7,13 +7,14 @@
 """
 
 import asyncio
+import bisect
 import json
 import logging
 import time
 import uuid
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from collections.abc import Callable
+from collections import OrderedDict, defaultdict
+from collections.abc import AsyncIterator, Callable
 from dataclasses import asdict, dataclass, field
 from enum import IntEnum, StrEnum
 from pathlib import Path
@@ -23,6 +24,8 @@
 import redis.asyncio as redis
 from aio_pika import DeliveryMode, ExchangeType, Message
 
+from .event_log import SegmentedEventLog
+
 try:
     from prometheus_client import REGISTRY, Counter, Gauge
 
@@ -169,27 +172,108 @@ def name(self) -> str:
 
 
 class EventStore:
-    """Event store for persistence and replay."""
+    """
+    Event store for persistence and replay.
+
+    Events and results are appended to a segmented, append-only log under
+    ``{storage_path}/log`` with group-commit fsync, so concurrent publishers
+    share writes instead of queueing on a store-wide lock. The most recent
+    ``max_events`` events and results stay in memory with indexes by type,
+    by source and by timestamp; older ones are only on disk and are read back
+    with ``replay_from``.
+    """
 
-    def __init__(self, storage_path: str = "events"):
+    def __init__(
+        self,
+        storage_path: str = "events",
+        max_events: int = 10000,
+        segment_bytes: int = 64 * 1024 * 1024,
+        fsync: bool = True,
+    ):
         self.storage_path = storage_path
-        self.events: dict[str, Event] = {}
-        self.results: dict[str, EventResult] = {}
-        self._lock = asyncio.Lock()
+        self.max_events = max_events
+        self.events: OrderedDict[str, Event] = OrderedDict()
+        self.results: OrderedDict[str, EventResult] = OrderedDict()
+        self.log = SegmentedEventLog(Path(storage_path) / "log", segment_bytes=segment_bytes, fsync=fsync)
+
+        # Index entries are (timestamp, seq, event_id), kept sorted by timestamp.
+        # Evicted events are skipped on read and dropped when the indexes are compacted.
+        self._by_type: dict[str, list[tuple[float, int, str]]] = defaultdict(list)
+        self._by_source: dict[str, list[tuple[float, int, str]]] = defaultdict(list)
+        self._timeline: list[tuple[float, int, str]] = []
+        self._seqs: dict[str, int] = {}  # event ID -> seq of its live index entries
+        self._seq = 0
+        self._stale = 0
+        self.evicted = 0
 
     async def store_event(self, event: Event) -> bool:
         """Store an event."""
-        async with self._lock:
-            self.events[event.id] = event
-            await self._persist_event(event)
-            return True
+        self._index_event(event)
+        try:
+            await self.log.append({"kind": "event", "event": event.to_dict()})
+        except Exception as e:
+            logging.error(f"Failed to persist event: {e}")
+        return True
 
     async def store_result(self, result: EventResult) -> bool:
         """Store event result."""
-        async with self._lock:
-            self.results[result.event_id] = result
-            await self._persist_result(result)
-            return True
+        self.results[result.event_id] = result
+        self.results.move_to_end(result.event_id)
+        while len(self.results) > self.max_events:
+            self.results.popitem(last=False)
+        try:
+            await self.log.append({"kind": "result", "result": asdict(result)})
+        except Exception as e:
+            logging.error(f"Failed to persist result: {e}")
+        return True
+
+    def _index_event(self, event: Event) -> None:
+        if event.id in self.events:
+            self._stale += 1  # The old index entries for this ID are superseded
+        self.events[event.id] = event
+        self.events.move_to_end(event.id)
+
+        entry = (event.timestamp, self._seq, event.id)
+        self._seqs[event.id] = self._seq
+        self._seq += 1
+        for index in (self._by_type[event.type], self._by_source[event.source], self._timeline):
+            # Events usually arrive in timestamp order, so this is an append
+            if index and index[-1] > entry:
+                bisect.insort(index, entry)
+            else:
+                index.append(entry)
+
+        while len(self.events) > self.max_events:
+            evicted_id, _ = self.events.popitem(last=False)
+            del self._seqs[evicted_id]
+            self.evicted += 1
+            self._stale += 1
+        if self._stale > self.max_events:
+            self._compact()
+
+    def _live(self, entry: tuple[float, int, str]) -> bool:
+        return self._seqs.get(entry[2]) == entry[1]
+
+    def _compact(self) -> None:
+        """Drop index entries for evicted or superseded events."""
+        for indexes in (self._by_type, self._by_source):
+            for key in list(indexes):
+                live = [entry for entry in indexes[key] if self._live(entry)]
+                if live:
+                    indexes[key] = live
+                else:
+                    del indexes[key]
+        self._timeline = [entry for entry in self._timeline if self._live(entry)]
+        self._stale = 0
+
+    def _latest(self, index: list[tuple[float, int, str]], limit: int) -> list[Event]:
+        events = []
+        for entry in reversed(index):
+            if len(events) >= limit:
+                break
+            if self._live(entry):
+                events.append(self.events[entry[2]])
+        return events
 
     async def get_event(self, event_id: str) -> Event | None:
         """Get an event by ID."""
@@ -201,47 +285,38 @@ async def get_result(self, event_id: str) -> EventResult | None:
 
     async def get_events_by_type(self, event_type: str, limit: int = 100) -> list[Event]:
         """Get events by type."""
-        events = [event for event in self.events.values() if event.type == event_type]
-        events.sort(key=lambda e: e.timestamp, reverse=True)
-        return events[:limit]
+        return self._latest(self._by_type.get(event_type, []), limit)
 
     async def get_events_by_source(self, source: str, limit: int = 100) -> list[Event]:
         """Get events by source."""
-        events = [event for event in self.events.values() if event.source == source]
-        events.sort(key=lambda e: e.timestamp, reverse=True)
-        return events[:limit]
+        return self._latest(self._by_source.get(source, []), limit)
+
+    async def get_events_between(self, start: float, end: float) -> list[Event]:
+        """Get retained events with start <= timestamp <= end, oldest first."""
+        lo = bisect.bisect_left(self._timeline, (start,))
+        hi = bisect.bisect_right(self._timeline, (end, float("inf")))
+        return [self.events[entry[2]] for entry in self._timeline[lo:hi] if self._live(entry)]
 
     async def replay_events(self, event_type: str | None = None) -> list[Event]:
         """Replay events for recovery."""
-        events = list(self.events.values())
-
-        if event_type:
-            events = [e for e in events if e.type == event_type]
-
-        events.sort(key=lambda e: e.timestamp)
-        return events
-
-    async def _persist_event(self, event: Event):
-        """Persist event to disk."""
-        try:
-            import aiofiles
-
-            filename = f"{self.storage_path}/events/{event.id}.json"
-            async with aiofiles.open(filename, "w") as f:
-                await f.write(json.dumps(event.to_dict(), indent=2))
-        except Exception as e:
-            logging.error(f"Failed to persist event: {e}")
-
-    async def _persist_result(self, result: EventResult):
-        """Persist result to disk."""
-        try:
-            import aiofiles
-
-            filename = f"{self.storage_path}/results/{result.event_id}.json"
-            async with aiofiles.open(filename, "w") as f:
-                await f.write(json.dumps(asdict(result), indent=2))
-        except Exception as e:
-            logging.error(f"Failed to persist result: {e}")
+        if self.evicted:
+            # Part of the history is only on disk
+            events = [event async for _, event in self.replay_from(0, event_type)]
+            events.sort(key=lambda e: e.timestamp)
+            return events
+
+        index = self._by_type.get(event_type, []) if event_type else self._timeline
+        return [self.events[entry[2]] for entry in index if self._live(entry)]
+
+    async def replay_from(self, offset: int = 0, event_type: str | None = None) -> AsyncIterator[tuple[int, Event]]:
+        """Stream persisted events in log order from a log offset, yielding (offset, event)."""
+        await self.log.flush()
+        async for record_offset, record in self.log.stream(offset):
+            if record.get("kind") != "event":
+                continue
+            if event_type and record["event"].get("type") != event_type:
+                continue
+            yield record_offset, Event.from_dict(record["event"])
 
 
 class EventRouter:
@@ -386,9 +461,8 @@ async def start(self):
         except Exception as e:
             logging.error(f"Failed to connect to RabbitMQ: {e}")
 
-        # Create storage directories (non-blocking)
-        await asyncio.to_thread(Path(f"{self.event_store.storage_path}/events").mkdir, parents=True, exist_ok=True)
-        await asyncio.to_thread(Path(f"{self.event_store.storage_path}/results").mkdir, parents=True, exist_ok=True)
+        # Open the event log, recovering existing segments (non-blocking)
+        await self.event_store.log.open()
 
         self.running = True
         logging.info("Event bus started")
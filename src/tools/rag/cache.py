@@ -1,14 +1,24 @@
 """Query-response caching for RAG system.
 
-Implements an LRU cache with TTL for caching RAG query responses.
-Detects index changes via context hashing to avoid stale answers.
+Implements an LRU cache with TTL for caching RAG query responses, in two tiers:
+
+- Exact tier: keyed by query text, top_k and a hash of the retrieved source
+  IDs, so index changes are detected after retrieval.
+- Semantic tier: keyed by the query embedding, so a repeated or paraphrased
+  question can skip retrieval and generation entirely. Entries are stamped
+  with an index generation counter that the engine advances whenever it
+  writes to the index; entries from an older generation never match.
 """
 
 import hashlib
+import json
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+import numpy as np
+
 
 @dataclass
 class CacheEntry:
@@ -18,6 +28,24 @@ class CacheEntry:
     sources: list[dict[str, Any]]
     created_at: datetime
     context_hash: str
+    size_bytes: int = 0
+
+
+@dataclass
+class SemanticCacheEntry:
+    """A cached query response addressed by query embedding."""
+
+    answer: str
+    sources: list[dict[str, Any]]
+    created_at: datetime
+    top_k: int
+    generation: int
+    size_bytes: int = 0
+
+
+def _entry_size(answer: str, sources: list[dict[str, Any]]) -> int:
+    """Approximate memory held by a cached response, in bytes."""
+    return len(answer.encode("utf-8")) + len(json.dumps(sources, default=str).encode("utf-8"))
 
 
 class QueryCache:
@@ -25,30 +53,64 @@ class QueryCache:
 
     Caches query responses keyed by query text, top_k, and context hash.
     Context hash includes sorted source IDs and collection count to detect
-    when the index has changed and cached answers are stale.
+    when the index has changed and cached answers are stale. Both tiers are
+    bounded by entry count and by the approximate bytes of cached answers
+    and sources; the least recently used entries are evicted first.
 
     Environment variables:
         RAG_CACHE_ENABLED: Enable caching (default: true)
         RAG_CACHE_SIZE: Maximum cache entries (default: 100)
         RAG_CACHE_TTL: Time-to-live in seconds (default: 3600)
+        RAG_CACHE_MAX_MB: Maximum cached bytes per tier (default: 64)
+        RAG_CACHE_SEMANTIC_THRESHOLD: Cosine similarity for a semantic hit,
+            0 disables the semantic tier (default: 0.95)
     """
 
-    def __init__(self, max_size: int = 100, ttl_seconds: int = 3600, collection_name: str = ""):
+    def __init__(
+        self,
+        max_size: int = 100,
+        ttl_seconds: int = 3600,
+        collection_name: str = "",
+        max_bytes: int = 64 * 1024 * 1024,
+        semantic_threshold: float = 0.95,
+    ):
         """Initialize query cache.
 
         Args:
             max_size: Maximum number of entries to cache
             ttl_seconds: Time-to-live for cache entries in seconds
             collection_name: Name of the vector store collection (for cache key)
+            max_bytes: Maximum approximate size of cached responses per tier
+            semantic_threshold: Minimum cosine similarity between query
+                embeddings for a semantic hit (0 disables the semantic tier)
         """
-        self.cache: dict[str, CacheEntry] = {}
+        self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self.max_size = max_size
+        self.max_bytes = max_bytes
         self.ttl = timedelta(seconds=ttl_seconds)
         self.collection_name = collection_name
+        self.size_bytes = 0
+
+        # Semantic tier: entries plus a row-aligned matrix of normalised query embeddings
+        self.semantic_threshold = semantic_threshold
+        self.generation = 0
+        self._semantic: OrderedDict[int, SemanticCacheEntry] = OrderedDict()
+        self._semantic_vectors: dict[int, np.ndarray] = {}
+        self._semantic_matrix: np.ndarray | None = None
+        self._semantic_keys: list[int] = []
+        self._semantic_bytes = 0
+        self._next_semantic_key = 0
 
         # Stats
         self.hits = 0
         self.misses = 0
+        self.semantic_hits = 0
+        self.semantic_misses = 0
+        self.evictions = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.semantic_threshold > 0
 
     def _make_context_hash(self, source_ids: list[str], chunk_count: int) -> str:
         """Create a hash from source IDs and chunk count to detect index changes.
@@ -94,13 +156,13 @@ def get(self, query: str, top_k: int, source_ids: list[str], chunk_count: int) -
         context_hash = self._make_context_hash(source_ids, chunk_count)
         key = self._make_cache_key(query, top_k, context_hash)
 
-        if key in self.cache:
-            entry = self.cache[key]
-            now = datetime.now(UTC)
-            age = now - entry.created_at
+        entry = self.cache.get(key)
+        if entry is not None:
+            age = datetime.now(UTC) - entry.created_at
 
             # Check TTL
             if age < self.ttl:
+                self.cache.move_to_end(key)
                 self.hits += 1
                 return {
                     "answer": entry.answer,
@@ -110,7 +172,7 @@ def get(self, query: str, top_k: int, source_ids: list[str], chunk_count: int) -
                 }
 
             # Expired - remove from cache
-            del self.cache[key]
+            self._remove(key)
 
         self.misses += 1
         return None
@@ -134,22 +196,145 @@ def set(
             answer: The generated answer
             sources: The source documents
         """
-        # LRU eviction if at capacity
-        if len(self.cache) >= self.max_size:
-            # Remove oldest entry
-            oldest_key = min(self.cache, key=lambda k: self.cache[k].created_at)
-            del self.cache[oldest_key]
-
         context_hash = self._make_context_hash(source_ids, chunk_count)
         key = self._make_cache_key(query, top_k, context_hash)
+        if key in self.cache:
+            self._remove(key)
+
+        size = _entry_size(answer, sources)
+        if size > self.max_bytes:
+            return
 
         self.cache[key] = CacheEntry(
-            answer=answer, sources=sources, created_at=datetime.now(UTC), context_hash=context_hash
+            answer=answer,
+            sources=sources,
+            created_at=datetime.now(UTC),
+            context_hash=context_hash,
+            size_bytes=size,
         )
+        self.size_bytes += size
+
+        # LRU eviction: the front of the OrderedDict is least recently used
+        while len(self.cache) > self.max_size or self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self.cache)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self.cache.pop(key)
+        self.size_bytes -= entry.size_bytes
+
+    # ------------------------------------------------------------------
+    # Semantic tier
+    # ------------------------------------------------------------------
+
+    def advance_generation(self) -> None:
+        """Mark the index as changed; semantic entries cached before now stop matching."""
+        self.generation += 1
+        self._semantic.clear()
+        self._semantic_vectors.clear()
+        self._semantic_matrix = None
+        self._semantic_bytes = 0
+
+    @staticmethod
+    def _normalize(embedding: Any) -> np.ndarray | None:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else None
+
+    def get_semantic(self, query_embedding: Any, top_k: int) -> dict[str, Any] | None:
+        """Get a cached response for a sufficiently similar earlier query.
+
+        Args:
+            query_embedding: Embedding of the query text
+            top_k: Number of results requested
+
+        Returns:
+            Cached response dict (as from :meth:`get`, plus 'cache_similarity'),
+            or None if no entry of the current generation is similar enough
+        """
+        if not self.semantic_enabled:
+            return None
+        vector = self._normalize(query_embedding)
+        if vector is None or not self._semantic:
+            self.semantic_misses += 1
+            return None
+
+        if self._semantic_matrix is None:
+            self._semantic_keys = list(self._semantic_vectors)
+            self._semantic_matrix = np.stack([self._semantic_vectors[k] for k in self._semantic_keys])
+        if self._semantic_matrix.shape[1] != vector.shape[0]:
+            self.semantic_misses += 1
+            return None
+
+        similarities = self._semantic_matrix @ vector
+        now = datetime.now(UTC)
+        for row in np.argsort(-similarities):
+            similarity = float(similarities[row])
+            if similarity < self.semantic_threshold:
+                break
+            key = self._semantic_keys[row]
+            entry = self._semantic[key]
+            age = now - entry.created_at
+            if entry.top_k != top_k or entry.generation != self.generation or age >= self.ttl:
+                continue
+            self._semantic.move_to_end(key)
+            self.semantic_hits += 1
+            return {
+                "answer": entry.answer,
+                "sources": entry.sources,
+                "cached": True,
+                "cache_age_seconds": age.total_seconds(),
+                "cache_similarity": similarity,
+            }
+
+        self.semantic_misses += 1
+        return None
+
+    def set_semantic(
+        self, query_embedding: Any, top_k: int, answer: str, sources: list[dict[str, Any]], generation: int
+    ) -> None:
+        """Cache a query response under its query embedding.
+
+        Args:
+            query_embedding: Embedding of the query text
+            top_k: Number of results requested
+            answer: The generated answer
+            sources: The source documents
+            generation: Value of :attr:`generation` when retrieval started; a
+                response computed against an older index is not cached
+        """
+        if not self.semantic_enabled or generation != self.generation:
+            return
+        vector = self._normalize(query_embedding)
+        size = _entry_size(answer, sources) + (vector.nbytes if vector is not None else 0)
+        if vector is None or size > self.max_bytes:
+            return
+
+        key = self._next_semantic_key
+        self._next_semantic_key += 1
+        self._semantic[key] = SemanticCacheEntry(
+            answer=answer,
+            sources=sources,
+            created_at=datetime.now(UTC),
+            top_k=top_k,
+            generation=generation,
+            size_bytes=size,
+        )
+        self._semantic_vectors[key] = vector
+        self._semantic_bytes += size
+        self._semantic_matrix = None
+
+        while len(self._semantic) > self.max_size or self._semantic_bytes > self.max_bytes:
+            oldest, entry = self._semantic.popitem(last=False)
+            del self._semantic_vectors[oldest]
+            self._semantic_bytes -= entry.size_bytes
+            self.evictions += 1
 
     def invalidate(self) -> None:
         """Clear all cached entries."""
         self.cache.clear()
+        self.size_bytes = 0
+        self.advance_generation()
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics.
@@ -159,12 +344,22 @@ def get_stats(self) -> dict[str, Any]:
         """
         total = self.hits + self.misses
         hit_rate = (self.hits / total * 100) if total > 0 else 0.0
+        semantic_total = self.semantic_hits + self.semantic_misses
+        semantic_hit_rate = (self.semantic_hits / semantic_total * 100) if semantic_total > 0 else 0.0
 
         return {
             "size": len(self.cache),
             "max_size": self.max_size,
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
             "hits": self.hits,
             "misses": self.misses,
             "hit_rate_percent": round(hit_rate, 2),
+            "semantic_size": len(self._semantic),
+            "semantic_hits": self.semantic_hits,
+            "semantic_misses": self.semantic_misses,
+            "semantic_hit_rate_percent": round(semantic_hit_rate, 2),
+            "generation": self.generation,
+            "evictions": self.evictions,
             "ttl_seconds": self.ttl.total_seconds(),
         }
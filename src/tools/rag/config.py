@@ -77,6 +77,13 @@ class RAGConfig:
     cache_enabled: bool = True
     cache_size: int = 100
     cache_ttl: int = 3600  # seconds
+    cache_max_mb: int = 64
+    cache_semantic_threshold: float = 0.95  # Query-embedding similarity for a semantic hit (0 disables)
+
+    # Embedding cache configuration (shared by indexer, chat and on-demand engine)
+    embedding_cache_enabled: bool = True
+    embedding_cache_path: str | None = None  # Default: <vector_store_path>/embedding_cache.sqlite
+    embedding_cache_max_mb: int = 512
 
     # Hybrid search configuration (enabled by default for better recall)
     use_hybrid: bool = True
@@ -86,6 +93,9 @@ class RAGConfig:
     reranker_type: str = "cross_encoder"  # Options: cross_encoder, ollama
     cross_encoder_model: str = "cross-encoder/ms-marco-MiniLM-L6-v2"
     reranker_top_k: int = 20  # Max candidates to rerank
+    reranker_mode: str = "listwise"  # Ollama reranker: listwise (one prompt per group) or pointwise
+    reranker_cache_size: int = 4096  # Cached (query, chunk) scores
+    reranker_early_exit_margin: float = 0.0  # Skip reranking when the top_k distance gap is this large (0 = off)
 
     # Concurrency configuration
     max_concurrent_embeddings: int = 4
@@ -144,12 +154,21 @@ def from_env(cls) -> "RAGConfig":
             cache_enabled=os.getenv("RAG_CACHE_ENABLED", "true").lower() == "true",
             cache_size=int(os.getenv("RAG_CACHE_SIZE", "100")),
             cache_ttl=int(os.getenv("RAG_CACHE_TTL", "3600")),
+            cache_max_mb=int(os.getenv("RAG_CACHE_MAX_MB", "64")),
+            cache_semantic_threshold=float(os.getenv("RAG_CACHE_SEMANTIC_THRESHOLD", "0.95")),
+            # Embedding cache config
+            embedding_cache_enabled=os.getenv("RAG_EMBEDDING_CACHE_ENABLED", "true").lower() == "true",
+            embedding_cache_path=os.getenv("RAG_EMBEDDING_CACHE_PATH"),
+            embedding_cache_max_mb=int(os.getenv("RAG_EMBEDDING_CACHE_MAX_MB", "512")),
             # Hybrid/Reranker config
             use_hybrid=os.getenv("RAG_USE_HYBRID", "true").lower() == "true",
             use_reranker=os.getenv("RAG_USE_RERANKER", "true").lower() == "true",
             reranker_type=os.getenv("RAG_RERANKER_TYPE", "cross_encoder"),
             cross_encoder_model=os.getenv("RAG_CROSS_ENCODER_MODEL", "cross-encoder/ms-marco-MiniLM-L6-v2"),
             reranker_top_k=int(os.getenv("RAG_RERANKER_TOP_K", "20")),
+            reranker_mode=os.getenv("RAG_RERANKER_MODE", "listwise"),
+            reranker_cache_size=int(os.getenv("RAG_RERANKER_CACHE_SIZE", "4096")),
+            reranker_early_exit_margin=float(os.getenv("RAG_RERANKER_EARLY_EXIT_MARGIN", "0.0")),
             # Concurrency config
             max_concurrent_embeddings=int(os.getenv("RAG_MAX_CONCURRENT_EMBEDDINGS", "4")),
             embedding_batch_size=int(os.getenv("RAG_EMBEDDING_BATCH_SIZE", "20")),
@@ -1,6 +1,7 @@
 """Embedding providers for RAG."""
 
 from .base import BaseEmbeddingProvider
+from .cache import CachedEmbeddingProvider, EmbeddingCache, get_embedding_cache
 from .factory import EmbeddingProviderType, get_embedding_provider
 from .huggingface import HuggingFaceEmbeddingProvider
 from .nomic_v2 import OllamaEmbeddingProvider
@@ -14,6 +15,9 @@
 
 __all__ = [
     "BaseEmbeddingProvider",
+    "CachedEmbeddingProvider",
+    "EmbeddingCache",
+    "get_embedding_cache",
     "OllamaEmbeddingProvider",
     "HuggingFaceEmbeddingProvider",
     "SimpleEmbedding",
@@ -0,0 +1,326 @@
+"""Content-addressed embedding cache.
+
+Embeddings are keyed by ``(model, dimension, sha256(text))`` and stored as
+float32 blobs in SQLite, so the same chunk text is embedded once no matter
+whether it was reached through the indexer, the chat engine or the on-demand
+engine, and survives process restarts and rebuilds. Entries carry a
+last-used timestamp; once the stored vectors exceed ``max_bytes`` the least
+recently used ones are evicted.
+
+Usage:
+    provider = CachedEmbeddingProvider(OllamaEmbeddingProvider(), get_embedding_cache(".rag_db/embeddings.sqlite"))
+    provider.embed_batch(texts)  # only texts never seen before reach Ollama
+    provider.get_stats()["hit_rate_percent"]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .base import BaseEmbeddingProvider
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Keep IN (...) lists well under SQLite's bound-parameter limit
+_QUERY_CHUNK = 500
+
+# Eviction frees down to this fraction of the cap so it does not run on every insert
+_EVICT_TO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    id INTEGER PRIMARY KEY,
+    model TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    text_hash BLOB NOT NULL,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL,
+    UNIQUE (model, dim, text_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used);
+"""
+
+
+def text_key(text: str) -> bytes:
+    """SHA-256 digest identifying a text in the cache."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """SQLite-backed LRU store of embedding vectors with a size cap.
+
+    Safe to share between threads. Several processes may open the same file;
+    WAL mode lets readers proceed while one of them writes.
+    """
+
+    def __init__(self, path: str | Path = ":memory:", max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Initialize embedding cache.
+
+        Args:
+            path: SQLite database file (``":memory:"`` for a process-local cache)
+            max_bytes: Cap on the total size of stored vectors
+        """
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._bytes, self._entries = self._conn.execute(
+            "SELECT COALESCE(SUM(length(vector)), 0), COUNT(*) FROM embeddings"
+        ).fetchone()
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return int(self._entries)
+
+    def get_many(self, model: str, dim: int | None, keys: list[bytes]) -> dict[bytes, np.ndarray]:
+        """Look up vectors by text key, marking the ones found as recently used.
+
+        With ``dim=None`` vectors of any dimension stored for ``model`` match.
+        """
+        found: dict[bytes, np.ndarray] = {}
+        used: list[tuple[float, str, int, bytes]] = []
+        dim_clause = "" if dim is None else "AND dim = ? "
+        dim_params = () if dim is None else (dim,)
+        with self._lock:
+            now = time.time()
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start : start + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, dim, vector FROM embeddings WHERE model = ? {dim_clause}"  # noqa: S608
+                    f"AND text_hash IN ({placeholders})",
+                    (model, *dim_params, *chunk),
+                ).fetchall()
+                for key, row_dim, blob in rows:
+                    found[bytes(key)] = np.frombuffer(blob, dtype=np.float32)
+                    used.append((now, model, row_dim, key))
+
+            if used:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND dim = ? AND text_hash = ?", used
+                )
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model: str, dim: int, items: list[tuple[bytes, Any]]) -> None:
+        """Store vectors by text key, evicting least recently used entries if over the cap."""
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, vector in items:
+            blob = np.asarray(vector, dtype=np.float32).tobytes()
+            rows.append((model, dim, key, blob, now))
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, dim, text_hash, vector, last_used) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            inserted = self._conn.total_changes - before
+            self._entries += inserted
+            self._bytes += inserted * len(rows[0][3])
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Another process may share the file, so re-read the real totals first
+        self._bytes, self._entries = self._conn.execute(
+            "SELECT COALESCE(SUM(length(vector)), 0), COUNT(*) FROM embeddings"
+        ).fetchone()
+        target = int(self.max_bytes * _EVICT_TO)
+        while self._bytes > target and self._entries > 0:
+            average = self._bytes / self._entries
+            count = max(1, int((self._bytes - target) / average) + 1)
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE id IN (SELECT id FROM embeddings ORDER BY last_used LIMIT ?)",
+                (count,),
+            )
+            self._conn.commit()
+            self.evictions += min(count, self._entries)
+            self._bytes, self._entries = self._conn.execute(
+                "SELECT COALESCE(SUM(length(vector)), 0), COUNT(*) FROM embeddings"
+            ).fetchone()
+        logger.debug(f"Embedding cache evicted down to {self._entries} entries ({self._bytes} bytes)")
+
+    def clear(self) -> None:
+        """Remove every cached vector."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._bytes = self._entries = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with cache stats
+        """
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total > 0 else 0.0
+
+        return {
+            "entries": int(self._entries),
+            "bytes": int(self._bytes),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate_percent": round(hit_rate, 2),
+        }
+
+
+_shared_caches: dict[str, EmbeddingCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_embedding_cache(path: str | Path, max_bytes: int = DEFAULT_MAX_BYTES) -> EmbeddingCache:
+    """Return the process-wide cache for ``path``, opening it on first use."""
+    key = str(Path(path).resolve())
+    with _shared_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = _shared_caches[key] = EmbeddingCache(key, max_bytes=max_bytes)
+        return cache
+
+
+class CachedEmbeddingProvider(BaseEmbeddingProvider):
+    """Wraps any embedding provider so only cache misses reach the backend.
+
+    Batch calls look up every text at once, de-duplicate the misses, embed
+    them with one ``embed_batch`` call on the wrapped provider and store the
+    results. Entries are namespaced by the provider's current model, read on
+    every call so a provider that falls back to another model stores under
+    that model, and by the dimension of the vectors it actually returned.
+    Zero vectors (the fallback some providers return for inputs they could
+    not embed) and vectors of another dimension are not cached.
+    """
+
+    def __init__(
+        self, provider: BaseEmbeddingProvider, cache: EmbeddingCache | None = None, model: str | None = None
+    ) -> None:
+        """Initialize cached embedding provider.
+
+        Args:
+            provider: Provider that computes embeddings on a cache miss
+            cache: Backing cache (default: a new in-memory cache)
+            model: Fixed cache namespace (default: provider class and its current model name)
+        """
+        self.provider = provider
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self._namespace_override = model
+        # Dimension observed per namespace, learned from returned or cached vectors
+        self._dims: dict[str, int] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not defined on the wrapper
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    @property
+    def model(self) -> str:
+        """Cache namespace for the wrapped provider's current model."""
+        if self._namespace_override is not None:
+            return self._namespace_override
+        model_name = getattr(self.provider, "model", None) or getattr(self.provider, "model_name", None) or ""
+        return f"{type(self.provider).__name__}:{model_name}"
+
+    @property
+    def dimension(self) -> int:
+        """Return the dimension of embeddings produced by the wrapped provider."""
+        return self._dims.get(self.model) or int(self.provider.dimension)
+
+    def _lookup(self, texts: list[str]) -> tuple[list[bytes], dict[bytes, Any], dict[bytes, str]]:
+        keys = [text_key(t) for t in texts]
+        unique = list(dict.fromkeys(keys))
+        model = self.model
+        dim = self._dims.get(model)
+        vectors = self.cache.get_many(model, dim, unique)
+        if dim is None and vectors:
+            # Nothing embedded yet under this model: trust the most common stored dimension
+            dim = Counter(len(v) for v in vectors.values()).most_common(1)[0][0]
+            self._dims[model] = dim
+        found: dict[bytes, Any] = {key: vector.tolist() for key, vector in vectors.items() if len(vector) == dim}
+        missing = {key: text for key, text in zip(keys, texts, strict=True) if key not in found}
+        return keys, found, missing
+
+    def _store(self, found: dict[bytes, Any], missing: dict[bytes, str], vectors: list[Any]) -> None:
+        # Read after the provider ran: it may have switched to a fallback model
+        model = self.model
+        arrays = []
+        for key, vector in zip(missing, vectors, strict=True):
+            found[key] = vector
+            array = np.asarray(vector, dtype=np.float32)
+            if array.ndim == 1 and np.any(array):
+                arrays.append((key, array))
+        if not arrays:
+            return
+        # The provider's output is authoritative, even over a dimension learned from the cache
+        dim = self._dims[model] = Counter(len(a) for _, a in arrays).most_common(1)[0][0]
+        self.cache.put_many(model, dim, [(key, array) for key, array in arrays if len(array) == dim])
+
+    def embed(self, text: str) -> list[float] | Any:
+        """Generate embedding for text, serving repeats from the cache."""
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float] | Any]:
+        """Generate embeddings for multiple texts; only cache misses reach the provider."""
+        if not texts:
+            return []
+        keys, found, missing = self._lookup(texts)
+        if missing:
+            self._store(found, missing, self.provider.embed_batch(list(missing.values())))
+        return [found[key] for key in keys]
+
+    async def async_embed(self, text: str) -> list[float] | Any:
+        """Generate embedding for text (async), serving repeats from the cache."""
+        return (await self.async_embed_batch([text]))[0]
+
+    async def async_embed_batch(self, texts: list[str]) -> list[list[float] | Any]:
+        """Generate embeddings for multiple texts (async); only cache misses reach the provider."""
+        if not texts:
+            return []
+        keys, found, missing = self._lookup(texts)
+        if missing:
+            self._store(found, missing, await self.provider.async_embed_batch(list(missing.values())))
+        return [found[key] for key in keys]
+
+    def clear_cache(self) -> None:
+        """Clear the embedding cache."""
+        self.cache.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit/miss statistics of the backing cache."""
+        return self.cache.get_stats()
@@ -1,9 +1,11 @@
 """Factory for creating embedding providers."""
 
 from enum import StrEnum
+from pathlib import Path
 
 from ..config import RAGConfig
 from .base import BaseEmbeddingProvider
+from .cache import CachedEmbeddingProvider, get_embedding_cache
 
 
 class EmbeddingProviderType(StrEnum):
@@ -23,7 +25,8 @@ def get_embedding_provider(provider_type: str | None = None, config: RAGConfig |
         config: RAG configuration (optional)
 
     Returns:
-        Embedding provider instance
+        Embedding provider instance, wrapped in a persistent embedding cache
+        when ``config.embedding_cache_enabled`` is set
     """
     if config is None:
         config = RAGConfig.from_env()
@@ -39,6 +42,17 @@ def get_embedding_provider(provider_type: str | None = None, config: RAGConfig |
             "Import directly from tools.rag.embeddings.test_provider in test modules only."
         )
 
+    provider = _create_provider(provider_type, config)
+    if not config.embedding_cache_enabled or provider_type == EmbeddingProviderType.SIMPLE.value:
+        # The word-frequency fallback is cheaper to recompute than to look up
+        return provider
+
+    cache_path = config.embedding_cache_path or str(Path(config.vector_store_path) / "embedding_cache.sqlite")
+    cache = get_embedding_cache(cache_path, max_bytes=config.embedding_cache_max_mb * 1024 * 1024)
+    return CachedEmbeddingProvider(provider, cache)
+
+
+def _create_provider(provider_type: str, config: RAGConfig) -> BaseEmbeddingProvider:
     if provider_type == EmbeddingProviderType.OLLAMA.value:
         from .nomic_v2 import OllamaEmbeddingProvider
 
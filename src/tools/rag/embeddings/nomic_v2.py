@@ -1,5 +1,9 @@
 """Nomic Embed Text V2 embedding provider using Ollama."""
 
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import cast
 
 import httpx
@@ -7,6 +11,23 @@
 
 from .base import BaseEmbeddingProvider
 
+# Rough characters-per-token ratio used to pack batches without a tokenizer.
+# Deliberately low so packed requests stay under the model's context window.
+_CHARS_PER_TOKEN = 3
+
+# Below this length a text that still overflows the context is embedded as zeros
+_MIN_SPLIT_CHARS = 20
+
+_CONTEXT_ERROR_MARKERS = ("context length", "exceeds", "too long", "too large")
+
+
+class _ContextLengthError(Exception):
+    """Ollama rejected a request because an input exceeded the context window."""
+
+
+class _ModelNotFoundError(Exception):
+    """Ollama does not have the requested model (404)."""
+
 
 class OllamaEmbeddingProvider(BaseEmbeddingProvider):
     """Ollama-based embedding provider supporting various models (Nomic V1, V2, etc.).
@@ -16,7 +37,13 @@ class OllamaEmbeddingProvider(BaseEmbeddingProvider):
     """
 
     def __init__(
-        self, model: str = "nomic-embed-text-v2-moe:latest", base_url: str = "http://localhost:11434", timeout: int = 30
+        self,
+        model: str = "nomic-embed-text-v2-moe:latest",
+        base_url: str = "http://localhost:11434",
+        timeout: int = 30,
+        batch_token_budget: int = 8192,
+        max_batch_size: int = 64,
+        max_in_flight: int = 4,
     ):
         """Initialize Nomic Embedding V2 provider.
 
@@ -24,12 +51,60 @@ def __init__(
             model: Model name (default: nomic-embed-text-v2-moe:latest)
             base_url: Ollama base URL (default: http://localhost:11434)
             timeout: Request timeout in seconds
+            batch_token_budget: Estimated tokens packed into one /api/embed request
+            max_batch_size: Maximum texts per /api/embed request
+            max_in_flight: Maximum concurrent /api/embed requests per batch call
         """
         self.model = model
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self._dimension: int | None = None
         self.max_text_length = 6000  # Conservative limit for nomic models (~8192 tokens)
+        self.batch_token_budget = batch_token_budget
+        self.max_batch_size = max_batch_size
+        self.max_in_flight = max(1, max_in_flight)
+
+        # Pooled keep-alive clients, created lazily. httpx.AsyncClient is bound
+        # to the event loop it first ran on, so async clients are kept per loop.
+        self._http: httpx.Client | None = None
+        self._http_lock = threading.Lock()
+        self._async_http: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _create_client(self) -> httpx.Client:
+        limits = httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight)
+        return httpx.Client(timeout=self.timeout, limits=limits)
+
+    def _create_async_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight)
+        return httpx.AsyncClient(timeout=self.timeout, limits=limits)
+
+    def _client(self) -> httpx.Client:
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = self._create_client()
+        return self._http
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_http.get(loop)
+        if client is None:
+            client = self._async_http[loop] = self._create_async_client()
+        return client
+
+    def close(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP client for the running event loop."""
+        client = self._async_http.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
 
     def _truncate_text(self, text: str, max_chars: int | None = None) -> str:
         """Truncate text to fit within model's context window.
@@ -66,8 +141,7 @@ def embed(self, text: str) -> list[float]:
         if len(text) < original_length:
             pass  # print(f"Warning: Text truncated from {original_length} to {len(text)} characters")
 
-        # STRICT MODE: Only use the configured model. No fallbacks.
-        models_to_try = [self.model]
+        models_to_try = self._models_to_try()
 
         last_error = None
 
@@ -92,10 +166,7 @@ def embed(self, text: str) -> list[float]:
                     #     print(f"DEBUG: Embedding is empty/None for {model_name}. Response keys/attrs: {dir(response)}")
 
                     if embedding:
-                        if model_name != self.model:
-                            print(f"Info: Using model '{model_name}' instead of '{self.model}'")
-                        self._dimension = len(embedding)
-                        self.model = model_name  # Update to working model
+                        self._use_model(model_name, len(embedding))
                         return cast(list[float], embedding)
                 except ImportError:
                     # Fallback to HTTP API
@@ -124,44 +195,39 @@ def embed(self, text: str) -> list[float]:
                     continue
 
                 # Use HTTP API
-                with httpx.Client(timeout=self.timeout) as client:
-                    response = client.post(
-                        f"{self.base_url}/api/embeddings", json={"model": model_name, "prompt": text}
-                    )
-                    if response.status_code == 404:
-                        last_error = Exception(f"Model '{model_name}' not found (404)")
-                        continue  # Try next model
-                    if response.status_code == 500:
-                        # Check if it's a context length error
-                        error_text = response.text.lower() if hasattr(response, "text") else ""
-                        if any(m in error_text for m in ["context length", "exceeds", "too long", "too large"]):
-                            # Aggressively truncate and retry
-                            text = self._truncate_text(text, max_chars=min(len(text) // 2, 4000))
-                            if len(text) < 20:
-                                return [0.0] * (self._dimension or 768)
-                            continue  # Retry with shorter text
-
-                    response.raise_for_status()
-                    data = response.json()
-
-                    # Handle different Ollama API response formats (embedding vs embeddings)
-                    embedding = data.get("embedding")
-                    if not embedding and "embeddings" in data:
-                        embs = data.get("embeddings", [])
-                        if embs and isinstance(embs, list):
-                            embedding = embs[0]
-
-                    if not embedding:
-                        # Handle empty or whitespace strings gracefully
-                        if not text.strip():
+                client = self._client()
+                response = client.post(f"{self.base_url}/api/embeddings", json={"model": model_name, "prompt": text})
+                if response.status_code == 404:
+                    last_error = Exception(f"Model '{model_name}' not found (404)")
+                    continue  # Try next model
+                if response.status_code == 500:
+                    # Check if it's a context length error
+                    error_text = response.text.lower() if hasattr(response, "text") else ""
+                    if any(m in error_text for m in ["context length", "exceeds", "too long", "too large"]):
+                        # Aggressively truncate and retry
+                        text = self._truncate_text(text, max_chars=min(len(text) // 2, 4000))
+                        if len(text) < 20:
                             return [0.0] * (self._dimension or 768)
-                        raise ValueError(f"No embedding returned from Ollama for model {model_name}. Response: {data}")
+                        continue  # Retry with shorter text
+
+                response.raise_for_status()
+                data = response.json()
 
-                    if model_name != self.model:
-                        print(f"Info: Using model '{model_name}' instead of '{self.model}'")
-                    self._dimension = len(embedding)
-                    self.model = model_name  # Update to working model
-                    return cast(list[float], embedding)
+                # Handle different Ollama API response formats (embedding vs embeddings)
+                embedding = data.get("embedding")
+                if not embedding and "embeddings" in data:
+                    embs = data.get("embeddings", [])
+                    if embs and isinstance(embs, list):
+                        embedding = embs[0]
+
+                if not embedding:
+                    # Handle empty or whitespace strings gracefully
+                    if not text.strip():
+                        return [0.0] * (self._dimension or 768)
+                    raise ValueError(f"No embedding returned from Ollama for model {model_name}. Response: {data}")
+
+                self._use_model(model_name, len(embedding))
+                return cast(list[float], embedding)
 
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 404:
@@ -189,9 +255,24 @@ def embed(self, text: str) -> list[float]:
                 continue
 
         # If we get here, all models failed
+        raise self._embedding_failed(models_to_try, last_error) from last_error
+
+    def _models_to_try(self) -> list[str]:
+        """Models tried in order by both the single and the batched path."""
+        # STRICT MODE: Only use the configured model. No fallbacks.
+        return [self.model]
+
+    def _use_model(self, model_name: str, dimension: int | None) -> None:
+        if model_name != self.model:
+            print(f"Info: Using model '{model_name}' instead of '{self.model}'")
+            self.model = model_name  # Update to working model
+        if dimension:
+            self._dimension = dimension
+
+    def _embedding_failed(self, models: list[str], last_error: Exception | None) -> RuntimeError:
         error_msg = str(last_error) if last_error else "Unknown error"
-        raise RuntimeError(
-            f"Failed to get embedding from Ollama. Tried models: {', '.join(models_to_try)}\n"
+        return RuntimeError(
+            f"Failed to get embedding from Ollama. Tried models: {', '.join(models)}\n"
             f"Error: {error_msg}\n\n"
             f"To fix this, run one of these commands:\n"
             f"  ollama pull nomic-embed-text-v2-moe:latest\n"
@@ -200,46 +281,153 @@ def embed(self, text: str) -> list[float]:
             f"  OR\n"
             f"  ollama pull nomic-embed-text\n\n"
             f"Then verify with: ollama list"
-        ) from last_error
+        )
 
-    async def async_embed(self, text: str) -> list[float]:
-        """Generate embedding using native async Ollama client."""
-        from grid.services.embeddings.embedding_client import OllamaEmbeddingClient
+    # ------------------------------------------------------------------
+    # Batched /api/embed path
+    # ------------------------------------------------------------------
 
-        text = self._truncate_text(text)
-        client = OllamaEmbeddingClient(host=self.base_url)
-        resp = await client.embed([text], model=self.model)
-        if not resp.embeddings:
-            raise RuntimeError(f"No embedding returned from native client for model {self.model}")
-        embedding = resp.embeddings[0]
-        self._dimension = len(embedding)
-        return cast(list[float], embedding)
+    def _pack_batches(self, texts: list[str]) -> list[list[int]]:
+        """Group text positions into requests bounded by token budget and size.
+
+        Blank texts are left out; they embed to zeros without a round trip.
+        """
+        batches: list[list[int]] = []
+        current: list[int] = []
+        used = 0
+        for i, text in enumerate(texts):
+            if not text.strip():
+                continue
+            cost = len(text) // _CHARS_PER_TOKEN + 1
+            if current and (used + cost > self.batch_token_budget or len(current) >= self.max_batch_size):
+                batches.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _parse_embed_response(self, response: httpx.Response, count: int, model_name: str) -> list[list[float]]:
+        if response.status_code == 404:
+            raise _ModelNotFoundError(f"Model '{model_name}' not found (404)")
+        if response.status_code >= 400:
+            error_text = response.text.lower()
+            if any(m in error_text for m in _CONTEXT_ERROR_MARKERS):
+                raise _ContextLengthError(error_text)
+        response.raise_for_status()
+        embeddings = response.json().get("embeddings") or []
+        if len(embeddings) != count:
+            raise ValueError(f"Ollama returned {len(embeddings)} embeddings for {count} inputs (model {model_name})")
+        return cast(list[list[float]], embeddings)
+
+    def _split_for_retry(self, texts: list[str]) -> list[list[str]] | None:
+        """Halve a request that overflowed the context window.
+
+        A multi-text request is split into two; a single text is cut in half.
+        Returns None once a single text is too short to shrink further.
+        """
+        if len(texts) > 1:
+            mid = len(texts) // 2
+            return [texts[:mid], texts[mid:]]
+        if len(texts[0]) < 2 * _MIN_SPLIT_CHARS:
+            return None
+        return [[texts[0][: len(texts[0]) // 2]]]
+
+    def _assemble(
+        self, texts: list[str], batches: list[list[int]], results: list[list[list[float]]]
+    ) -> list[list[float]]:
+        """Scatter per-request results back to input order; blank texts get zeros."""
+        embeddings: list[list[float] | None] = [None] * len(texts)
+        for positions, vectors in zip(batches, results, strict=True):
+            for position, vector in zip(positions, vectors, strict=True):
+                embeddings[position] = vector
+        dim = self._dimension or 768
+        return [vector if vector is not None else [0.0] * dim for vector in embeddings]
+
+    def _embed_request(self, texts: list[str]) -> list[list[float]]:
+        models = self._models_to_try()
+        last_error: Exception | None = None
+        for model_name in models:
+            try:
+                response = self._client().post(f"{self.base_url}/api/embed", json={"model": model_name, "input": texts})
+                embeddings = self._parse_embed_response(response, len(texts), model_name)
+            except _ModelNotFoundError as e:
+                last_error = e
+                continue  # Try next model
+            except _ContextLengthError:
+                parts = self._split_for_retry(texts)
+                if parts is None:
+                    return [[0.0] * (self._dimension or 768)]
+                return [vector for part in parts for vector in self._embed_request(part)]
+            self._use_model(model_name, len(embeddings[0]) if embeddings else None)
+            return embeddings
+        raise self._embedding_failed(models, last_error) from last_error
+
+    async def _async_embed_request(self, texts: list[str]) -> list[list[float]]:
+        models = self._models_to_try()
+        last_error: Exception | None = None
+        for model_name in models:
+            try:
+                response = await self._async_client().post(
+                    f"{self.base_url}/api/embed", json={"model": model_name, "input": texts}
+                )
+                embeddings = self._parse_embed_response(response, len(texts), model_name)
+            except _ModelNotFoundError as e:
+                last_error = e
+                continue  # Try next model
+            except _ContextLengthError:
+                parts = self._split_for_retry(texts)
+                if parts is None:
+                    return [[0.0] * (self._dimension or 768)]
+                vectors: list[list[float]] = []
+                for part in parts:
+                    vectors.extend(await self._async_embed_request(part))
+                return vectors
+            self._use_model(model_name, len(embeddings[0]) if embeddings else None)
+            return embeddings
+        raise self._embedding_failed(models, last_error) from last_error
+
+    async def async_embed(self, text: str) -> list[float]:
+        """Generate embedding using the pooled async HTTP client."""
+        return cast(list[float], (await self.async_embed_batch([text]))[0])
 
     async def async_embed_batch(self, texts: list[str]) -> list[list[float] | np.ndarray]:
-        """Generate embeddings for multiple texts using native async batch API."""
-        from grid.services.embeddings.embedding_client import OllamaEmbeddingClient
-
-        truncated_texts = [self._truncate_text(t) for t in texts]
-        client = OllamaEmbeddingClient(host=self.base_url)
-        resp = await client.embed(truncated_texts, model=self.model)
-        if len(resp.embeddings) != len(texts):
-            return await super().async_embed_batch(texts)
-        if resp.embeddings:
-            self._dimension = len(resp.embeddings[0])
-        return cast(list[list[float] | np.ndarray], resp.embeddings)
+        """Generate embeddings for multiple texts with concurrent /api/embed requests."""
+        truncated = [self._truncate_text(t) for t in texts]
+        batches = self._pack_batches(truncated)
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async def run(positions: list[int]) -> list[list[float]]:
+            async with semaphore:
+                return await self._async_embed_request([truncated[i] for i in positions])
+
+        results = await asyncio.gather(*(run(positions) for positions in batches))
+        return cast(list[list[float] | np.ndarray], self._assemble(truncated, batches, list(results)))
 
     def embed_batch(self, texts: list[str]) -> list[list[float] | np.ndarray]:
-        """Generate embeddings for multiple texts using batch API if available.
+        """Generate embeddings for multiple texts using the /api/embed batch API.
+
+        Texts are packed into requests of at most ``batch_token_budget``
+        estimated tokens and ``max_batch_size`` inputs, with up to
+        ``max_in_flight`` requests running concurrently over the pooled client.
+        A request that overflows the context window is split and retried.
 
         Args:
             texts: List of input texts
 
         Returns:
-            List of dense embedding vectors
+            List of dense embedding vectors, in input order
         """
-        # but we can optimize with async if needed later
-        results = [self.embed(text) for text in texts]
-        return cast(list[list[float] | np.ndarray], results)
+        truncated = [self._truncate_text(t) for t in texts]
+        batches = self._pack_batches(truncated)
+        requests = [[truncated[i] for i in positions] for positions in batches]
+        if len(requests) <= 1 or self.max_in_flight == 1:
+            results = [self._embed_request(r) for r in requests]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(requests))) as pool:
+                results = list(pool.map(self._embed_request, requests))
+        return cast(list[list[float] | np.ndarray], self._assemble(truncated, batches, results))
 
     @property
     def dimension(self) -> int:
@@ -1,6 +1,8 @@
 """File tracking for incremental RAG indexing.
 
 Tracks file hashes to detect changes and enable selective re-indexing.
+Files whose size and modification time match the tracked state are treated
+as unchanged without being read; only the rest are hashed.
 Uses atomic writes and file locking to prevent corruption.
 """
 
@@ -31,6 +33,8 @@ class FileState:
     indexed_at: str
     file_size: int
     chunk_count: int = 0
+    mtime_ns: int = 0  # 0 = unknown (state written before stat tracking)
+    stat_size: int = -1  # On-disk size in bytes at index time
 
 
 @dataclass
@@ -51,14 +55,11 @@ def compute_file_hash(path: Path) -> str:
     Returns:
         Hex digest of file hash
     """
-    hasher = hashlib.sha256()
     try:
         # Security: Validate path is within allowed base directory
         # Note: This should be called with validated paths from FileTracker
         with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+            return hashlib.file_digest(f, "sha256").hexdigest()
     except Exception:
         return ""
 
@@ -79,6 +80,7 @@ def __init__(self, persist_dir: str = ".rag_db"):
         self.persist_dir = Path(persist_dir)
         self.tracker_file = self.persist_dir / "file_tracker.json"
         self.state = TrackerState()
+        self.stat_hits = 0  # Files skipped without hashing by the last get_changed_files()
         self._load()
 
     def _load(self) -> None:
@@ -145,7 +147,15 @@ def get_file_state(self, path: str) -> FileState | None:
         """
         return self.state.files.get(path)
 
-    def update_file(self, path: str, file_hash: str, file_size: int, chunk_count: int) -> None:
+    def update_file(
+        self,
+        path: str,
+        file_hash: str,
+        file_size: int,
+        chunk_count: int,
+        mtime_ns: int = 0,
+        stat_size: int = -1,
+    ) -> None:
         """Update tracked state for a file.
 
         Args:
@@ -153,6 +163,8 @@ def update_file(self, path: str, file_hash: str, file_size: int, chunk_count: in
             file_hash: SHA-256 hash of file contents
             file_size: Size of file in bytes
             chunk_count: Number of chunks created from this file
+            mtime_ns: ``st_mtime_ns`` of the file when it was hashed
+            stat_size: ``st_size`` of the file when it was hashed
         """
         self.state.files[path] = FileState(
             path=path,
@@ -160,6 +172,8 @@ def update_file(self, path: str, file_hash: str, file_size: int, chunk_count: in
             indexed_at=datetime.now(UTC).isoformat(),
             file_size=file_size,
             chunk_count=chunk_count,
+            mtime_ns=mtime_ns,
+            stat_size=stat_size,
         )
 
     def remove_file(self, path: str) -> None:
@@ -181,15 +195,27 @@ def get_changed_files(self, repo_path: Path, current_files: list[Path]) -> list[
             List of modified or new file paths
         """
         changed = []
+        self.stat_hits = 0
 
         for file_path in current_files:
             try:
                 rel_path = str(file_path.relative_to(repo_path))
-                current_hash = compute_file_hash(file_path)
-
                 tracked = self.get_file_state(rel_path)
-                if tracked is None or tracked.file_hash != current_hash:
+                if tracked is None:
+                    changed.append(file_path)
+                    continue
+
+                st = file_path.stat()
+                if tracked.mtime_ns and tracked.mtime_ns == st.st_mtime_ns and tracked.stat_size == st.st_size:
+                    self.stat_hits += 1
+                    continue
+
+                if tracked.file_hash != compute_file_hash(file_path):
                     changed.append(file_path)
+                else:
+                    # Touched but identical: remember the new stat so the next run skips hashing
+                    tracked.mtime_ns = st.st_mtime_ns
+                    tracked.stat_size = st.st_size
             except Exception:
                 # If we can't process a file, consider it changed
                 changed.append(file_path)
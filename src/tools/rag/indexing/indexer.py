@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import os
+import time
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timezone
 from pathlib import Path
@@ -11,6 +13,7 @@
 from ..embeddings.base import BaseEmbeddingProvider
 from ..utils import get_agent_ignore_patterns
 from ..vector_store.base import BaseVectorStore
+from .pipeline import IndexingPipeline, PreparedFile, iter_prepared_files
 from .semantic_chunker import SemanticChunker
 
 if TYPE_CHECKING:
@@ -21,7 +24,7 @@
 class IndexingMetrics:
     """Track indexing performance and quality metrics."""
 
-    start_time: datetime = field(default_factory=datetime.now)
+    start_time: datetime = field(default_factory=lambda: datetime.now(UTC))
     end_time: datetime | None = None
     files_processed: int = 0
     files_skipped: int = 0
@@ -30,10 +33,39 @@ class IndexingMetrics:
     total_bytes: int = 0
     skip_reasons: dict[str, int] = field(default_factory=dict)
 
+    # Per pipeline stage: seconds spent working and items handled
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    stage_items: dict[str, int] = field(default_factory=dict)
+
+    # Per queue: depth observed after each put
+    queue_depth_max: dict[str, int] = field(default_factory=dict)
+    queue_depth_total: dict[str, int] = field(default_factory=dict)
+    queue_depth_samples: dict[str, int] = field(default_factory=dict)
+
     def add_skip_reason(self, reason: str) -> None:
         """Track why a file was skipped."""
         self.skip_reasons[reason] = self.skip_reasons.get(reason, 0) + 1
 
+    def record_stage(self, stage: str, seconds: float, items: int) -> None:
+        """Add busy time and item count for a pipeline stage."""
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+        self.stage_items[stage] = self.stage_items.get(stage, 0) + items
+
+    def record_queue_depth(self, queue_name: str, depth: int) -> None:
+        """Sample the depth of a pipeline queue."""
+        self.queue_depth_max[queue_name] = max(self.queue_depth_max.get(queue_name, 0), depth)
+        self.queue_depth_total[queue_name] = self.queue_depth_total.get(queue_name, 0) + depth
+        self.queue_depth_samples[queue_name] = self.queue_depth_samples.get(queue_name, 0) + 1
+
+    def stage_throughput(self, stage: str) -> float:
+        """Items per busy second for a pipeline stage."""
+        seconds = self.stage_seconds.get(stage, 0.0)
+        return self.stage_items.get(stage, 0) / seconds if seconds > 0 else 0.0
+
+    def mean_queue_depth(self, queue_name: str) -> float:
+        samples = self.queue_depth_samples.get(queue_name, 0)
+        return self.queue_depth_total.get(queue_name, 0) / samples if samples else 0.0
+
     @property
     def duration_seconds(self) -> float:
         """Calculate indexing duration."""
@@ -67,6 +99,24 @@ def report(self) -> str:
             f"Throughput:         {self.chunks_per_second:.2f} chunks/s",
         ]
 
+        if self.stage_seconds:
+            report_lines.append("")
+            report_lines.append("Stages (busy time, throughput):")
+            for stage, seconds in self.stage_seconds.items():
+                report_lines.append(
+                    f"  - {stage:<8} {self.stage_items.get(stage, 0):>7} items  {seconds:8.2f}s  "
+                    f"{self.stage_throughput(stage):10.2f}/s"
+                )
+
+        if self.queue_depth_samples:
+            report_lines.append("")
+            report_lines.append("Queue Depth:")
+            report_lines.extend(
+                f"  - {queue_name:<8} max {self.queue_depth_max[queue_name]:>3}  "
+                f"mean {self.mean_queue_depth(queue_name):6.2f}"
+                for queue_name in self.queue_depth_samples
+            )
+
         if self.skip_reasons:
             report_lines.append("")
             report_lines.append("Skip Reasons:")
@@ -173,9 +223,16 @@ def index_repository(
     files: list[str] | None = None,
     quality_threshold: float = 0.0,
     quiet: bool = False,
+    workers: int | None = None,
+    embed_batch_size: int = 32,
+    queue_size: int = 8,
 ) -> BaseVectorStore:
     """Index a repository into a vector store.
 
+    Runs as a streaming pipeline (see :mod:`.pipeline`): the tree walk feeds a
+    process pool that reads, hashes and chunks files, a bounded queue feeds a
+    batching embedder, and a single writer commits to the vector store.
+
     Args:
         repo_path: Path to the repository to index
         store_path: Path to save/load the vector store (deprecated, use vector_store)
@@ -186,6 +243,9 @@ def index_repository(
         exclude_dirs: Directory names to exclude
         include_patterns: File patterns to include (glob patterns)
         vector_store: Vector store instance to use (if None, creates ChromaDB store)
+        workers: Processes for reading and chunking (default: CPU count, capped at 8)
+        embed_batch_size: Chunks per embedding batch
+        queue_size: Capacity of the embed and write queues, in batches
 
     Returns:
         VectorStore with indexed documents
@@ -338,150 +398,83 @@ def index_repository(
     # Initialize metrics
     metrics = IndexingMetrics()
 
-    # Walk the repository or use provided file list
-    chunk_ids = []
-    chunk_texts = []
-    chunk_metadatas = []
-
-    if files:
-        print(f"Indexing {len(files)} specific files from manifest...")
-        file_iterator = []
-        seen: set[str] = set()
-        for f in files:
-            # Normalize separators to reduce Windows '\\' vs '/' duplication.
-            f_norm = str(f).replace("\\\\", "/")
-            p = Path(f_norm)
-            if not p.is_absolute():
-                p = repo / p
-            try:
-                p_resolved = p.resolve()
-            except Exception:
-                p_resolved = p
+    def walk() -> Iterator[str]:
+        """Yield candidate files, applying the cheap name, extension and size filters."""
+        if files:
+            print(f"Indexing {len(files)} specific files from manifest...")
+            seen: set[str] = set()
+            for f in files:
+                # Normalize separators to reduce Windows '\\' vs '/' duplication.
+                f_norm = str(f).replace("\\\\", "/")
+                p = Path(f_norm)
+                if not p.is_absolute():
+                    p = repo / p
+                try:
+                    p_resolved = p.resolve()
+                except Exception:
+                    p_resolved = p
 
-            key = os.path.normcase(os.path.normpath(str(p_resolved)))
-            if key in seen:
-                continue
-            seen.add(key)
-            file_iterator.append(str(p_resolved))
-    else:
-        file_iterator = []
-        for root, dirs, f_list in os.walk(repo):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if d not in exclude_dirs_set]
-            for f in f_list:
-                file_iterator.append(str(Path(root) / f))
-
-    for file_str in file_iterator:
-        file_path = Path(file_str)
-        if debug:
-            print(f"DEBUG: Processing {file_path}")
+                key = os.path.normcase(os.path.normpath(str(p_resolved)))
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield from _filter(p_resolved)
+        else:
+            for root, dirs, f_list in os.walk(repo):
+                # Skip excluded directories
+                dirs[:] = [d for d in dirs if d not in exclude_dirs_set]
+                for f in f_list:
+                    yield from _filter(Path(root) / f)
 
+    def _filter(file_path: Path) -> Iterator[str]:
         if not file_path.exists():
             if debug:
                 print(f"DEBUG: File not found: {file_path}")
-            continue
+            return
 
         # Check if file matches include patterns
         if include_patterns:
             if not any(file_path.match(pattern) for pattern in include_patterns):
-                continue
+                return
 
         # Check if it's a text file and not too large
         if file_path.name in exclude_files:
-            continue
+            return
 
         if not is_text_file(file_path, text_extensions):
             if debug:
                 print(f"DEBUG: Not a text file: {file_path.name}, suffix: {file_path.suffix}")
-            continue
+            return
 
         # Skip files larger than 1MB to avoid indexing huge artifacts
         try:
             if file_path.stat().st_size > 1024 * 1024:
                 print(f"Skipping large file: {file_path}")
-                continue
-        except Exception:  # noqa: S112 intentional skip on error
-            continue
-
-        # Read file content
-        if debug:
-            print(f"DEBUG: Reading content for {file_path}")
-        content = read_file_content(file_path)
-        if content is None:
-            if debug:
-                print(f"DEBUG: Content is None for {file_path}")
-            metrics.files_skipped += 1
-            metrics.add_skip_reason("Failed to read")
-            continue
-        if not content.strip():
-            if debug:
-                print(f"DEBUG: Content is empty for {file_path}")
-            metrics.files_skipped += 1
-            metrics.add_skip_reason("Empty file")
-            continue
-
-        # Quality scoring (if threshold > 0)
-        if quality_threshold > 0.0:
-            from ..quality import should_index_file
-
-            should_index, quality = should_index_file(file_path, quality_threshold, content)
-            if not should_index:
-                if debug:
-                    print(f"DEBUG: Skipping {file_path}: quality={quality.score:.2f}, reasons={quality.reasons}")
-                metrics.files_skipped += 1
-                metrics.add_skip_reason(f"Low quality ({quality.score:.2f})")
-                continue
-
-        # Track file processing
-        metrics.files_processed += 1
-        metrics.total_bytes += len(content)
-
-        # Create relative path
-        try:
-            rel_path = file_path.resolve().relative_to(repo_resolved)
+                return
         except Exception:
-            try:
-                rel_path = file_path.relative_to(repo)
-            except Exception:
-                rel_path = Path(file_path.name)
-
-        rel_path_str = rel_path.as_posix()
-
-        # Chunk the document semantically
-        chunker = SemanticChunker(min_chunk_size=50, max_chunk_size=chunk_size, chunk_overlap=overlap)
-        semantic_chunks = chunker.chunk_file(content, rel_path_str)
-
-        for i, sc in enumerate(semantic_chunks):
-            chunk_id = f"{rel_path_str}#{i}"
-            chunk_ids.append(chunk_id)
-            chunk_texts.append(sc.content)
-
-            # Merge chunker metadata with standard metadata
-            metadata = {"path": rel_path_str, "chunk_index": i, "type": "chunk", "file_size": len(content)}
-            metadata.update(sc.metadata)
-
-            chunk_metadatas.append(metadata)
-            metrics.chunks_created += 1
-
-    total_chunks = len(chunk_texts)
-    if total_chunks > 50000:
-        print(f"\n⚠️  WARNING: {total_chunks:,} chunks detected!")
-        print("   This is unusually high. Recommended: < 20,000")
-        print("   Consider:")
-        print(f"   - Increasing chunk_size (current: {chunk_size})")
-        print("   - Using --curate flag for selective indexing")
-        print("   - Adding more exclude directories")
-
-        # Non-interactive mode: just warn and continue
-        print("Continuing with warning...")
-
-    print(f"Created {total_chunks} chunks from repository")
+            return
+
+        yield str(file_path)
+
+    def timed_walk() -> Iterator[str]:
+        walked = 0
+        busy = 0.0
+        paths = walk()
+        while True:
+            start = time.perf_counter()
+            path = next(paths, None)
+            busy += time.perf_counter() - start
+            if path is None:
+                break
+            walked += 1
+            yield path
+        metrics.record_stage("walk", busy, walked)
 
     # Initialize progress tracker
     from ..progress import IndexProgress
 
     progress = IndexProgress()
-    progress.start(total_chunks)
+    progress.start(0)
 
     # Generate embeddings
     if embedding_provider is None:
@@ -492,128 +485,58 @@ def index_repository(
     if not quiet:
         print(f"Generating embeddings using {embedding_provider.__class__.__name__}...")
 
-    # Filter out chunks that are too long (will be handled by embedding provider, but warn)
-    # Using 4000 as a safe upper bound for Nomic V1, or the provided max_chunk_size
-    limit = 4000
-    long_chunks = [i for i, text in enumerate(chunk_texts) if len(text) > limit]
-    if long_chunks:
-        print(f"Warning: {len(long_chunks)} chunks exceed recommended length ({limit} chars) and will be truncated")
-
-    # Generate embeddings with batch support for performance
-    embeddings_list = []
-    valid_indices = []
-
-    # Check if provider supports batch embeddings
-    has_batch = hasattr(embedding_provider, "embed_batch")
-    batch_size = 32 if has_batch else 1
-
-    if has_batch and total_chunks > 1:
-        # Use batch embedding for better performance
-        print(f"Using batch embedding (batch_size={batch_size}) for {total_chunks} chunks...")
-
-        for batch_start in range(0, total_chunks, batch_size):
-            batch_end = min(batch_start + batch_size, total_chunks)
-            batch_texts = chunk_texts[batch_start:batch_end]
-
-            try:
-                batch_embs = embedding_provider.embed_batch(batch_texts)
-
-                for j, emb in enumerate(batch_embs):
-                    idx = batch_start + j
-                    if isinstance(emb, list):
-                        embeddings_list.append(emb)
-                    else:
-                        embeddings_list.append(emb.tolist() if hasattr(emb, "tolist") else list(emb))
-                    valid_indices.append(idx)
-
-            except Exception as e:
-                error_str = str(e).lower()
-                if "context length" in error_str or "exceeds" in error_str:
-                    # Fall back to sequential for this batch
-                    print(
-                        f"Warning: Batch embedding failed, falling back to sequential for batch {batch_start}-{batch_end}"
-                    )
-                    for j, text in enumerate(batch_texts):
-                        idx = batch_start + j
-                        try:
-                            emb = embedding_provider.embed(text)
-                            if isinstance(emb, list):
-                                embeddings_list.append(emb)
-                            else:
-                                embeddings_list.append(emb.tolist() if hasattr(emb, "tolist") else list(emb))
-                            valid_indices.append(idx)
-                        except Exception as inner_e:
-                            inner_error_str = str(inner_e).lower()
-                            if "context length" in inner_error_str or "exceeds" in inner_error_str:
-                                print(f"Warning: Skipping chunk {idx} (length: {len(text)} chars) - too long")
-                                metrics.chunks_failed += 1
-                                metrics.chunks_created -= 1
-                                continue
-                            else:
-                                raise
-                else:
-                    raise
-
-            if (batch_end // batch_size) % 5 == 0:
-                progress.tick(batch_end - progress.completed)
-                if not quiet and progress.should_report():
-                    print(f"Embedded {progress.format()}")
-    else:
-        # Sequential embedding (fallback)
-        if not quiet:
-            print(f"Using sequential embedding for {total_chunks} chunks...")
-        for i, text in enumerate(chunk_texts):
-            try:
-                emb = embedding_provider.embed(text)
-                if isinstance(emb, list):
-                    embeddings_list.append(emb)
-                else:
-                    # Convert numpy array to list
-                    embeddings_list.append(emb.tolist() if hasattr(emb, "tolist") else list(emb))
-                valid_indices.append(i)
-                progress.tick()
-                if not quiet and progress.should_report():
-                    print(f"Embedded {progress.format()}")
-            except Exception as e:
-                error_str = str(e).lower()
-                if "context length" in error_str or "exceeds" in error_str:
-                    print(f"Warning: Skipping chunk {i} (length: {len(text)} chars) - too long even after truncation")
-                    # Skip this chunk - don't add to valid_indices
-                    metrics.chunks_failed += 1
-                    metrics.chunks_created -= 1  # Decrement since we counted it earlier
-                    continue
-                else:
-                    raise  # Re-raise other errors
-
-    # Filter lists to only include valid chunks
-    if not quiet:
-        print(f"DEBUG: Total chunks: {len(chunk_texts)}, Valid: {len(valid_indices)}", flush=True)
-
-    if len(valid_indices) < len(chunk_texts):
-        print(f"Info: Processed {len(valid_indices)}/{len(chunk_texts)} chunks successfully")
-        chunk_ids = [chunk_ids[i] for i in valid_indices]
-        chunk_texts = [chunk_texts[i] for i in valid_indices]
-        chunk_metadatas = [chunk_metadatas[i] for i in valid_indices]
-
-    # Add to vector store in batches to avoid memory issues
-    batch_size = 100
-    for i in range(0, len(chunk_ids), batch_size):
-        batch_ids = chunk_ids[i : i + batch_size]
-        batch_texts = chunk_texts[i : i + batch_size]
-        batch_embeddings = embeddings_list[i : i + batch_size]
-        batch_metadatas = chunk_metadatas[i : i + batch_size]
-
-        if not quiet:
-            print(f"DEBUG: Adding batch {i // batch_size + 1} ({len(batch_ids)} items) to store...", flush=True)
-
-        vector_store.add(ids=batch_ids, documents=batch_texts, embeddings=batch_embeddings, metadatas=batch_metadatas)
+    def on_file(item: PreparedFile) -> None:
+        if item.skip_reason is not None:
+            if debug:
+                print(f"DEBUG: Skipping {item.path}: {item.skip_reason}")
+            metrics.files_skipped += 1
+            metrics.add_skip_reason(item.skip_reason)
+            return
+        # Track file processing
+        metrics.files_processed += 1
+        metrics.total_bytes += item.size
+        metrics.chunks_created += len(item.ids)
+        progress.total += len(item.ids)
+
+    def on_embedded(count: int) -> None:
+        progress.tick(count)
+        if not quiet and progress.should_report():
+            print(f"Embedded {progress.format()}")
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, 8)
+
+    pipeline = IndexingPipeline(
+        embedding_provider,
+        vector_store,
+        metrics,
+        embed_batch_size=embed_batch_size,
+        queue_size=queue_size,
+        on_embedded=on_embedded,
+    )
+    prepared = iter_prepared_files(
+        timed_walk(),
+        repo_resolved,
+        chunk_size=chunk_size,
+        overlap=overlap,
+        quality_threshold=quality_threshold,
+        workers=workers,
+    )
+    written = pipeline.run(prepared, on_file=on_file)
+    metrics.chunks_failed += pipeline.chunks_failed
+    metrics.chunks_created -= pipeline.chunks_failed
 
-        if not quiet:
-            print(f"DEBUG: Current store count: {vector_store.count()}", flush=True)
+    total_chunks = metrics.chunks_created + metrics.chunks_failed
+    if total_chunks > 50000:
+        print(f"\n⚠️  WARNING: {total_chunks:,} chunks detected!")
+        print("   This is unusually high. Recommended: < 20,000")
+        print("   Consider:")
+        print(f"   - Increasing chunk_size (current: {chunk_size})")
+        print("   - Using --curate flag for selective indexing")
+        print("   - Adding more exclude directories")
 
-        if (i // batch_size + 1) % 10 == 0:
-            if not quiet:
-                print(f"Indexed {min(i + batch_size, len(chunk_ids))} chunks...")
+    if written < total_chunks:
+        print(f"Info: Processed {written}/{total_chunks} chunks successfully")
 
     if not quiet:
         print(f"Indexing completed. Total documents: {vector_store.count()}")
@@ -1042,6 +965,12 @@ def update_index(
         except Exception:  # noqa: S110 intentional silent handling
             pass  # May not exist
 
+        # Stat before reading so a write racing with indexing is seen as a change next run
+        try:
+            st: os.stat_result | None = file_path.stat()
+        except OSError:
+            st = None
+
         # Read and chunk file
         content = read_file_content(file_path)
         if content is None or not content.strip():
@@ -1103,7 +1032,14 @@ def update_index(
             vector_store.add(
                 ids=chunk_ids, documents=chunk_texts, embeddings=embeddings_list, metadatas=chunk_metadatas
             )
-            tracker.update_file(rel_path, file_hash, len(content), len(chunk_ids))
+            tracker.update_file(
+                rel_path,
+                file_hash,
+                len(content),
+                len(chunk_ids),
+                mtime_ns=st.st_mtime_ns if st else 0,
+                stat_size=st.st_size if st else -1,
+            )
             print(f"Indexed {len(chunk_ids)} chunks from {rel_path}")
 
     # Save tracker state after successful indexing
@@ -0,0 +1,379 @@
+"""Staged streaming pipeline for repository indexing.
+
+    walk (caller) ─▶ prepare (process pool) ─▶ batch ─▶ [embed queue] ─▶ embed ─▶ [write queue] ─▶ write
+
+The caller supplies an iterator of candidate paths. Reading, hashing and
+chunking run in a process pool with a bounded number of files in flight;
+prepared files come back in walk order and are packed into embedding batches.
+One thread embeds batches and one thread commits them to the vector store, so
+embedding the next batch overlaps with writing the previous one. Both queues
+are bounded, so a slow stage applies backpressure instead of buffering the
+whole repository in memory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .semantic_chunker import SemanticChunker
+
+if TYPE_CHECKING:
+    from ..embeddings.base import BaseEmbeddingProvider
+    from ..vector_store.base import BaseVectorStore
+    from .indexer import IndexingMetrics
+
+logger = logging.getLogger(__name__)
+
+# Below this many candidate files, worker start-up costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+_MAX_FILE_SIZE = 1024 * 1024
+_POLL_SECONDS = 0.1
+
+
+@dataclass
+class PreparedFile:
+    """Result of reading, hashing and chunking one file."""
+
+    path: str
+    rel_path: str = ""
+    skip_reason: str | None = None
+    file_hash: str = ""
+    size: int = 0
+    mtime_ns: int = 0
+    ids: list[str] = field(default_factory=list)
+    texts: list[str] = field(default_factory=list)
+    metadatas: list[dict[str, Any]] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+@dataclass
+class EmbeddedBatch:
+    """Chunks with their embeddings, ready to be written."""
+
+    ids: list[str]
+    texts: list[str]
+    metadatas: list[dict[str, Any]]
+    embeddings: list[list[float]]
+
+
+def _relative_path(file_path: Path, repo_root: Path) -> str:
+    try:
+        return file_path.resolve().relative_to(repo_root).as_posix()
+    except Exception:
+        try:
+            return file_path.relative_to(repo_root).as_posix()
+        except Exception:
+            return file_path.name
+
+
+def prepare_file(path: str, repo_root: str, chunk_size: int, overlap: int, quality_threshold: float) -> PreparedFile:
+    """Read, hash and chunk one file. Runs in a worker process.
+
+    The file is read once: the SHA-256 is taken over the raw bytes and the
+    text is decoded from the same buffer.
+    """
+    start = time.perf_counter()
+    file_path = Path(path)
+    result = PreparedFile(path=path)
+    try:
+        st = file_path.stat()
+        if st.st_size > _MAX_FILE_SIZE:
+            result.skip_reason = "Failed to read"
+            return result
+        data = file_path.read_bytes()
+    except Exception:
+        result.skip_reason = "Failed to read"
+        return result
+
+    # Match Path.read_text(errors="ignore"): universal newlines, undecodable bytes dropped
+    content = data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+    if not content.strip():
+        result.skip_reason = "Empty file"
+        return result
+
+    if quality_threshold > 0.0:
+        from ..quality import should_index_file
+
+        should_index, quality = should_index_file(file_path, quality_threshold, content)
+        if not should_index:
+            result.skip_reason = f"Low quality ({quality.score:.2f})"
+            return result
+
+    result.rel_path = _relative_path(file_path, Path(repo_root))
+    result.file_hash = hashlib.sha256(data).hexdigest()
+    result.size = len(content)
+    result.mtime_ns = st.st_mtime_ns
+
+    chunker = SemanticChunker(min_chunk_size=50, max_chunk_size=chunk_size, chunk_overlap=overlap)
+    for i, sc in enumerate(chunker.chunk_file(content, result.rel_path)):
+        result.ids.append(f"{result.rel_path}#{i}")
+        result.texts.append(sc.content)
+        metadata = {
+            "path": result.rel_path,
+            "chunk_index": i,
+            "type": "chunk",
+            "file_size": len(content),
+            "file_hash": result.file_hash,
+        }
+        metadata.update(sc.metadata)
+        result.metadatas.append(metadata)
+
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _pool_context() -> Any:
+    # Forking a process that already runs embedder/writer threads can copy held
+    # locks, so workers are started from a clean forkserver (spawn on Windows).
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def iter_prepared_files(
+    paths: Iterable[str],
+    repo_root: Path,
+    chunk_size: int,
+    overlap: int,
+    quality_threshold: float,
+    workers: int,
+) -> Iterator[PreparedFile]:
+    """Prepare files in walk order, in a process pool when there are enough of them."""
+    paths = iter(paths)
+    head = list(itertools.islice(paths, PARALLEL_MIN_FILES))
+    args = (str(repo_root), chunk_size, overlap, quality_threshold)
+
+    if workers <= 1 or len(head) < PARALLEL_MIN_FILES:
+        for path in itertools.chain(head, paths):
+            yield prepare_file(path, *args)
+        return
+
+    # At most a few files per worker in flight keeps memory bounded on huge trees
+    max_in_flight = workers * 4
+    pending: deque[tuple[str, Future[PreparedFile]]] = deque()
+    remaining = itertools.chain(head, paths)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+            for path in remaining:
+                pending.append((path, pool.submit(prepare_file, path, *args)))
+                if len(pending) >= max_in_flight:
+                    yield pending[0][1].result()
+                    pending.popleft()
+            while pending:
+                yield pending[0][1].result()
+                pending.popleft()
+    except (BrokenProcessPool, OSError) as e:
+        # Workers cannot start when __main__ is not importable (stdin, some
+        # embedded interpreters) or process creation is restricted.
+        logger.warning(f"Process pool unavailable ({e}); preparing remaining files in-process")
+        for path in itertools.chain((p for p, _ in pending), remaining):
+            yield prepare_file(path, *args)
+
+
+def _is_context_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return "context length" in message or "exceeds" in message
+
+
+def _as_list(embedding: Any) -> list[float]:
+    if isinstance(embedding, list):
+        return embedding
+    return embedding.tolist() if hasattr(embedding, "tolist") else list(embedding)
+
+
+class IndexingPipeline:
+    """Runs the batch, embed and write stages for prepared files.
+
+    Args:
+        embedding_provider: Provider used by the embed stage
+        vector_store: Store the write stage commits to
+        metrics: Metrics updated with per-stage timings and queue depths
+        embed_batch_size: Chunks per ``embed_batch`` call
+        queue_size: Capacity of the embed and write queues, in batches
+        on_embedded: Called with the number of chunks after each embedded batch
+    """
+
+    def __init__(
+        self,
+        embedding_provider: BaseEmbeddingProvider,
+        vector_store: BaseVectorStore,
+        metrics: IndexingMetrics,
+        embed_batch_size: int = 32,
+        queue_size: int = 8,
+        on_embedded: Callable[[int], None] | None = None,
+    ) -> None:
+        self.embedding_provider = embedding_provider
+        self.vector_store = vector_store
+        self.metrics = metrics
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.on_embedded = on_embedded
+
+        self._embed_queue: queue.Queue[tuple[list[str], list[str], list[dict[str, Any]]] | None] = queue.Queue(
+            maxsize=queue_size
+        )
+        self._write_queue: queue.Queue[EmbeddedBatch | None] = queue.Queue(maxsize=queue_size)
+        self._failed = threading.Event()
+        self._errors: list[BaseException] = []
+        self.chunks_written = 0
+        self.chunks_failed = 0
+
+    # ------------------------------------------------------------------
+    # Queue helpers
+    # ------------------------------------------------------------------
+
+    def _put(self, q: queue.Queue[Any], item: Any, name: str) -> None:
+        while True:
+            if self._failed.is_set():
+                raise RuntimeError("Indexing pipeline stage failed")
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                self.metrics.record_queue_depth(name, q.qsize())
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue[Any]) -> Any:
+        while True:
+            if self._failed.is_set():
+                raise RuntimeError("Indexing pipeline stage failed")
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+    def _run_stage(self, target: Callable[[], None]) -> None:
+        try:
+            target()
+        except BaseException as e:  # noqa: BLE001 re-raised on the calling thread
+            self._errors.append(e)
+            self._failed.set()
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def _embed_batch(self, ids: list[str], texts: list[str], metadatas: list[dict[str, Any]]) -> EmbeddedBatch:
+        batch = EmbeddedBatch([], [], [], [])
+        try:
+            vectors = self.embedding_provider.embed_batch(texts)
+            for chunk_id, text, metadata, vector in zip(ids, texts, metadatas, vectors, strict=True):
+                batch.ids.append(chunk_id)
+                batch.texts.append(text)
+                batch.metadatas.append(metadata)
+                batch.embeddings.append(_as_list(vector))
+            return batch
+        except Exception as e:
+            if not _is_context_error(e):
+                raise
+            print(f"Warning: Batch embedding failed, falling back to sequential for {len(texts)} chunks")
+
+        for chunk_id, text, metadata in zip(ids, texts, metadatas, strict=True):
+            try:
+                vector = self.embedding_provider.embed(text)
+            except Exception as e:
+                if not _is_context_error(e):
+                    raise
+                print(f"Warning: Skipping chunk {chunk_id} (length: {len(text)} chars) - too long")
+                self.chunks_failed += 1
+                continue
+            batch.ids.append(chunk_id)
+            batch.texts.append(text)
+            batch.metadatas.append(metadata)
+            batch.embeddings.append(_as_list(vector))
+        return batch
+
+    def _embed_stage(self) -> None:
+        busy = 0.0
+        items = 0
+        try:
+            while (work := self._get(self._embed_queue)) is not None:
+                start = time.perf_counter()
+                batch = self._embed_batch(*work)
+                busy += time.perf_counter() - start
+                items += len(work[0])
+                if self.on_embedded is not None:
+                    self.on_embedded(len(work[0]))
+                if batch.ids:
+                    self._put(self._write_queue, batch, "write")
+        finally:
+            self.metrics.record_stage("embed", busy, items)
+            if not self._failed.is_set():
+                self._put(self._write_queue, None, "write")
+
+    def _write_stage(self) -> None:
+        busy = 0.0
+        try:
+            while (batch := self._get(self._write_queue)) is not None:
+                start = time.perf_counter()
+                self.vector_store.add(
+                    ids=batch.ids, documents=batch.texts, embeddings=batch.embeddings, metadatas=batch.metadatas
+                )
+                busy += time.perf_counter() - start
+                self.chunks_written += len(batch.ids)
+        finally:
+            self.metrics.record_stage("write", busy, self.chunks_written)
+
+    def run(self, prepared: Iterable[PreparedFile], on_file: Callable[[PreparedFile], None] | None = None) -> int:
+        """Feed prepared files through the embed and write stages.
+
+        Args:
+            prepared: Prepared files, typically from :func:`iter_prepared_files`
+            on_file: Called on the calling thread for every prepared file,
+                including skipped ones
+
+        Returns:
+            Number of chunks written to the vector store
+        """
+        embedder = threading.Thread(target=self._run_stage, args=(self._embed_stage,), name="rag-index-embed")
+        writer = threading.Thread(target=self._run_stage, args=(self._write_stage,), name="rag-index-write")
+        embedder.start()
+        writer.start()
+
+        ids: list[str] = []
+        texts: list[str] = []
+        metadatas: list[dict[str, Any]] = []
+        prepare_busy = 0.0
+        files = 0
+        try:
+            for item in prepared:
+                files += 1
+                prepare_busy += item.seconds
+                if on_file is not None:
+                    on_file(item)
+                if item.skip_reason is not None:
+                    continue
+                ids.extend(item.ids)
+                texts.extend(item.texts)
+                metadatas.extend(item.metadatas)
+                while len(ids) >= self.embed_batch_size:
+                    n = self.embed_batch_size
+                    self._put(self._embed_queue, (ids[:n], texts[:n], metadatas[:n]), "embed")
+                    del ids[:n], texts[:n], metadatas[:n]
+            if ids:
+                self._put(self._embed_queue, (ids, texts, metadatas), "embed")
+            self._put(self._embed_queue, None, "embed")
+        except BaseException as e:
+            if not self._errors:
+                self._errors.append(e)
+            self._failed.set()
+        finally:
+            self.metrics.record_stage("prepare", prepare_busy, files)
+            embedder.join()
+            writer.join()
+
+        if self._errors:
+            raise self._errors[0]
+        return self.chunks_written
@@ -4,6 +4,7 @@
 
 import logging
 import os
+import time
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
@@ -160,6 +161,37 @@ def track_query(
             raise
 
 
+def active_run_id() -> str | None:
+    """Get the ID of the active MLflow run, so a background task can log to it later.
+
+    Returns:
+        Run ID, or None when MLflow is disabled or no run is active
+    """
+    if not mlflow_enabled():
+        return None
+
+    import mlflow
+
+    run = mlflow.active_run()
+    return run.info.run_id if run is not None else None
+
+
+def _log_metrics(metrics: dict[str, float], run_id: str | None) -> None:
+    """Log metrics to the given run, or to the active run when run_id is None."""
+    import mlflow
+
+    if run_id is None:
+        mlflow.log_metrics(metrics)
+        return
+
+    from mlflow.entities import Metric
+
+    timestamp = int(time.time() * 1000)
+    mlflow.MlflowClient().log_batch(
+        run_id, metrics=[Metric(key, float(value), timestamp, 0) for key, value in metrics.items()]
+    )
+
+
 def log_model_routing(
     query: str,
     embedding_provider: str,
@@ -200,6 +232,7 @@ def log_retrieval_metrics(
     avg_distance: float,
     min_distance: float,
     max_distance: float,
+    run_id: str | None = None,
 ):
     """Log retrieval metrics to MLflow.
 
@@ -208,37 +241,37 @@ def log_retrieval_metrics(
         avg_distance: Average distance score
         min_distance: Minimum distance score
         max_distance: Maximum distance score
+        run_id: Run to log to (default: the active run)
     """
     if not mlflow_enabled():
         return
 
-    import mlflow
-
-    mlflow.log_metrics(
+    _log_metrics(
         {
             "retrieval_count": num_retrieved,
             "retrieval_avg_distance": avg_distance,
             "retrieval_min_distance": min_distance,
             "retrieval_max_distance": max_distance,
-        }
+        },
+        run_id,
     )
 
 
-def log_answer_metrics(answer_length: int, generation_time_seconds: float):
+def log_answer_metrics(answer_length: int, generation_time_seconds: float, run_id: str | None = None):
     """Log answer generation metrics to MLflow.
 
     Args:
         answer_length: Length of generated answer
         generation_time_seconds: Time taken to generate answer
+        run_id: Run to log to (default: the active run)
     """
     if not mlflow_enabled():
         return
 
-    import mlflow
-
-    mlflow.log_metrics(
+    _log_metrics(
         {
             "answer_length": answer_length,
             "generation_time_seconds": generation_time_seconds,
-        }
+        },
+        run_id,
     )
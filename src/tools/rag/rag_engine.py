@@ -1,7 +1,10 @@
 """Unified RAG engine orchestrating embedding, retrieval, and generation."""
 
+import asyncio
 import logging
 import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from typing import Any
 
 from .config import ModelMode, RAGConfig
@@ -10,7 +13,13 @@
 from .embeddings.factory import get_embedding_provider
 from .indexer import index_repository
 from .llm.factory import get_llm_provider
-from .mlflow_tracking import log_answer_metrics, log_retrieval_metrics, track_indexing, track_query
+from .mlflow_tracking import (
+    active_run_id,
+    log_answer_metrics,
+    log_retrieval_metrics,
+    track_indexing,
+    track_query,
+)
 from .vector_store.base import BaseVectorStore
 
 # Optional ChromaDB dependency
@@ -26,6 +35,28 @@
     DatabricksVectorStore = None  # type: ignore[misc,assignment]
 
 
+@dataclass
+class _PreparedQuery:
+    """Retrieval output and prompt for a query that still needs an answer generated."""
+
+    results: dict[str, Any]
+    sources: list[dict[str, Any]]
+    context: str
+    prompt: str
+    source_ids: list[str]
+    chunk_count: int
+    query_embedding: Any
+    generation: int
+
+
+def _discard_task(task: asyncio.Task[Any]) -> None:
+    """Cancel a helper task that is no longer needed, or consume its outcome if it finished."""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()
+
+
 class RAGEngine:
     """Unified RAG engine for querying project knowledge base.
 
@@ -150,7 +181,11 @@ def __init__(self, config: RAGConfig | None = None) -> None:
             from .cache import QueryCache
 
             self._cache = QueryCache(
-                max_size=config.cache_size, ttl_seconds=config.cache_ttl, collection_name=config.collection_name
+                max_size=config.cache_size,
+                ttl_seconds=config.cache_ttl,
+                collection_name=config.collection_name,
+                max_bytes=config.cache_max_mb * 1024 * 1024,
+                semantic_threshold=config.cache_semantic_threshold,
             )
 
         # Initialize hybrid retriever if enabled
@@ -162,6 +197,13 @@ def __init__(self, config: RAGConfig | None = None) -> None:
                 vector_store=self.vector_store, embedding_provider=self.embedding_provider, config=config
             )
 
+        # Writes made through the engine keep the BM25 index current
+        self._write_store = self.vector_store
+        if self._hybrid_retriever is not None and self.vector_store is not None:
+            from .retrieval.hybrid_retriever import BM25SyncedStore
+
+            self._write_store = BM25SyncedStore(self.vector_store, self._hybrid_retriever)
+
         # Initialize reranker if enabled
         self._reranker = None
         if config.use_reranker:
@@ -178,6 +220,7 @@ def __init__(self, config: RAGConfig | None = None) -> None:
         from .evaluation import RAGEvaluator
 
         self._evaluator = RAGEvaluator(embedding_provider=self.embedding_provider)
+        self._background_tasks: set[asyncio.Task[Any]] = set()
 
         # Initialize intelligent orchestrator for Phase 3 reasoning
         self._intelligent_orchestrator = None
@@ -239,87 +282,115 @@ def index(
                 embedding_provider=self.embedding_provider,
                 exclude_dirs=exclude_dirs,
                 include_patterns=include_patterns,
-                vector_store=self.vector_store,
+                vector_store=self._write_store,
                 files=files,
                 quality_threshold=quality_threshold,
                 quiet=quiet,
             )
+        self._index_changed()
+        if self._hybrid_retriever is not None:
+            self._hybrid_retriever.flush()
+
+    def _index_changed(self) -> None:
+        """Stop serving semantic cache hits computed against the previous index."""
+        if self._cache is not None:
+            self._cache.advance_generation()
+
+    async def _search(self, query_text: str, top_k: int, query_embedding: Any = None) -> dict[str, Any] | None:
+        """First-stage retrieval; returns None when no vector store is available."""
+        # Use hybrid retriever if enabled, otherwise standard vector search
+        if self._hybrid_retriever is not None:
+            # Assuming hybrid retriever search is or will be async
+            if hasattr(self._hybrid_retriever, "async_search"):
+                return await self._hybrid_retriever.async_search(query=query_text, top_k=top_k)
+            return self._hybrid_retriever.search(query=query_text, top_k=top_k)
+
+        if self.vector_store is None:
+            return None
+
+        # Generate query embedding using async method
+        if query_embedding is None:
+            query_embedding = await self.embedding_provider.async_embed(query_text)
+
+        # Check if vector store query is async
+        async_query_fn = getattr(self.vector_store, "async_query", None)
+        if async_query_fn is not None and callable(async_query_fn):
+            return await async_query_fn(query_embedding=query_embedding, n_results=top_k)  # type: ignore[misc]
+        return self.vector_store.query(query_embedding=query_embedding, n_results=top_k)
+
+    async def _rerank(self, query_text: str, top_k: int, results: dict[str, Any]) -> dict[str, Any]:
+        """Reorder first-stage results by reranker score."""
+        reranked_indices = await self._reranker.async_rerank(
+            query=query_text,
+            documents=results["documents"],
+            top_k=top_k,
+            ids=results.get("ids"),
+            distances=results.get("distances"),
+        )
 
-    async def query(
-        self, query_text: str, top_k: int | None = None, temperature: float = 0.7, include_sources: bool = True
-    ) -> dict[str, Any]:
-        """Query the RAG system (async).
-
-        Args:
-            query_text: Query text
-            top_k: Number of documents to retrieve (default: from config)
-            temperature: LLM temperature
-            include_sources: Whether to include source documents
-
-        Returns:
-            Dictionary with 'answer', 'sources', 'context', optionally 'cached'
+        new_ids = []
+        new_docs = []
+        new_metas = []
+        new_dists = []
+
+        for idx, score in reranked_indices:
+            new_ids.append(results["ids"][idx])
+            new_docs.append(results["documents"][idx])
+            new_metas.append(results["metadatas"][idx])
+            # Convert 0-10 score to a distance-like value (0.0 is best)
+            new_dists.append(1.0 - (score / 10.0))
+
+        return {"ids": new_ids, "documents": new_docs, "metadatas": new_metas, "distances": new_dists}
+
+    async def _prepare_query(
+        self, query_text: str, top_k: int, include_sources: bool
+    ) -> dict[str, Any] | _PreparedQuery:
+        """Run everything before generation.
+
+        Independent lookups run concurrently: the chunk count for the cache
+        key is read in a worker thread while retrieval runs, and with the
+        hybrid retriever the search starts alongside the semantic cache
+        lookup. Returns a finished result instead when no generation is
+        needed (cache hit, nothing retrieved, no vector store).
         """
-        top_k = top_k or self.config.top_k
-        llm_model: str = (
-            self.config.llm_model_local if self.config.llm_mode.value == "local" else self.config.llm_model_cloud
-        ) or "default"
+        generation = self._cache.generation if self._cache is not None else 0
+        count_task = None
+        if self._cache is not None and self.vector_store is not None:
+            count_task = asyncio.create_task(asyncio.to_thread(self.vector_store.count))
+        search_task = None
 
-        with track_query(
-            query_text=query_text,
-            top_k=top_k,
-            embedding_model=self.config.embedding_model,
-            llm_model=llm_model,
-            temperature=temperature,
-        ):
-            # Use hybrid retriever if enabled, otherwise standard vector search
-            if self._hybrid_retriever is not None:
-                # Assuming hybrid retriever search is or will be async
-                if hasattr(self._hybrid_retriever, "async_search"):
-                    results = await self._hybrid_retriever.async_search(query=query_text, top_k=top_k)
-                else:
-                    results = self._hybrid_retriever.search(query=query_text, top_k=top_k)
-            else:
-                # Generate query embedding using async method
+        try:
+            # Semantic cache tier: a near-identical earlier question skips retrieval and generation
+            query_embedding = None
+            if self._cache is not None and self._cache.semantic_enabled:
+                if self._hybrid_retriever is not None:
+                    # The hybrid retriever embeds on its own, so it need not wait for the lookup
+                    search_task = asyncio.create_task(self._search(query_text, top_k))
                 query_embedding = await self.embedding_provider.async_embed(query_text)
+                cached_result = self._cache.get_semantic(query_embedding, top_k=top_k)
+                if cached_result is not None:
+                    cached_result["context"] = ""
+                    if not include_sources:
+                        cached_result.pop("sources", None)
+                    return cached_result
 
-                # Retrieve relevant documents
-                if self.vector_store is None:
-                    return {"answer": "Error: Vector store is not available.", "sources": [], "context": ""}
-
-                # Check if vector store query is async
-                async_query_fn = getattr(self.vector_store, "async_query", None)
-                if async_query_fn is not None and callable(async_query_fn):
-                    results = await async_query_fn(query_embedding=query_embedding, n_results=top_k)  # type: ignore[misc]
-                else:
-                    results = self.vector_store.query(query_embedding=query_embedding, n_results=top_k)
+            if search_task is not None:
+                results = await search_task
+            else:
+                results = await self._search(query_text, top_k, query_embedding)
 
+            if results is None:
+                return {"answer": "Error: Vector store is not available.", "sources": [], "context": ""}
             if not results["documents"]:
                 return {"answer": "No relevant documents found in the knowledge base.", "sources": [], "context": ""}
 
             # Rerank if enabled (after initial retrieval)
             if self._reranker is not None:
-                reranked_indices = await self._reranker.async_rerank(
-                    query=query_text, documents=results["documents"], top_k=top_k
-                )
-
-                # Reorder results based on reranker scores
-                new_ids = []
-                new_docs = []
-                new_metas = []
-                new_dists = []
-
-                for idx, score in reranked_indices:
-                    new_ids.append(results["ids"][idx])
-                    new_docs.append(results["documents"][idx])
-                    new_metas.append(results["metadatas"][idx])
-                    # Convert 0-10 score to a distance-like value (0.0 is best)
-                    new_dists.append(1.0 - (score / 10.0))
-
-                results = {"ids": new_ids, "documents": new_docs, "metadatas": new_metas, "distances": new_dists}
+                results = await self._rerank(query_text, top_k, results)
 
             # Extract source IDs and chunk count for cache key
             source_ids = results.get("ids", [])
-            chunk_count = self.vector_store.count() if self.vector_store else 0
+            chunk_count = await count_task if count_task is not None else 0
 
             # Check cache if enabled
             if self._cache is not None:
@@ -330,35 +401,26 @@ async def query(
                     # Return cached response (sources may be stale but context hash should prevent this)
                     cached_result["context"] = "" if not include_sources else cached_result.get("context", "")
                     return cached_result
+        finally:
+            for task in (count_task, search_task):
+                if task is not None:
+                    _discard_task(task)
 
-            # Build context from retrieved documents
-            context_parts = []
-            sources = []
+        # Build context from retrieved documents
+        context_parts = []
+        sources = []
 
-            for i, (doc, metadata, distance) in enumerate(
-                zip(results["documents"], results["metadatas"], results["distances"], strict=False)
-            ):
-                source_info = {"index": i + 1, "distance": distance, "metadata": metadata}
-                sources.append(source_info)
-
-                context_parts.append(f"[{i + 1}] {doc}")
-
-            context = "\n\n".join(context_parts)
+        for i, (doc, metadata, distance) in enumerate(
+            zip(results["documents"], results["metadatas"], results["distances"], strict=False)
+        ):
+            source_info = {"index": i + 1, "distance": distance, "metadata": metadata}
+            sources.append(source_info)
 
-            # Evaluate retrieval quality
-            eval_metrics = self._evaluator.evaluate_retrieval(query=query_text, retrieved_docs=results["documents"])
+            context_parts.append(f"[{i + 1}] {doc}")
 
-            # Log retrieval metrics
-            if results["distances"]:
-                log_retrieval_metrics(
-                    num_retrieved=len(results["documents"]),
-                    avg_distance=sum(results["distances"]) / len(results["distances"]),
-                    min_distance=min(results["distances"]),
-                    max_distance=max(results["distances"]),
-                )
+        context = "\n\n".join(context_parts)
 
-            # Generate answer using LLM
-            prompt = f"""Based on the following context from the project knowledge base, please answer the query.
+        prompt = f"""Based on the following context from the project knowledge base, please answer the query.
 
 Context:
 {context}
@@ -367,35 +429,198 @@ async def query(
 
 Answer:"""
 
+        return _PreparedQuery(
+            results=results,
+            sources=sources,
+            context=context,
+            prompt=prompt,
+            source_ids=source_ids,
+            chunk_count=chunk_count,
+            query_embedding=query_embedding,
+            generation=generation,
+        )
+
+    def _evaluate_and_log(self, query_text: str, results: dict[str, Any], run_id: str | None) -> dict[str, float]:
+        """Evaluate retrieval quality and log retrieval metrics (blocking)."""
+        eval_metrics = self._evaluator.evaluate_retrieval(query=query_text, retrieved_docs=results["documents"])
+
+        if results["distances"]:
+            log_retrieval_metrics(
+                num_retrieved=len(results["documents"]),
+                avg_distance=sum(results["distances"]) / len(results["distances"]),
+                min_distance=min(results["distances"]),
+                max_distance=max(results["distances"]),
+                run_id=run_id,
+            )
+        return eval_metrics
+
+    def _start_evaluation(self, query_text: str, results: dict[str, Any]) -> asyncio.Task[dict[str, float]]:
+        """Run retrieval evaluation and metric logging in the background, off the generation path."""
+        task = asyncio.create_task(asyncio.to_thread(self._evaluate_and_log, query_text, results, active_run_id()))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_task_done)
+        return task
+
+    def _background_task_done(self, task: asyncio.Task[Any]) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background retrieval evaluation failed: {task.exception()}")
+
+    async def drain_background_tasks(self) -> None:
+        """Wait for pending background evaluation and metric logging to finish."""
+        while self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+    def _finish_query(
+        self,
+        query_text: str,
+        top_k: int,
+        prepared: _PreparedQuery,
+        answer: str,
+        include_sources: bool,
+    ) -> dict[str, Any]:
+        """Build the result for a generated answer and cache it."""
+        result: dict[str, Any] = {
+            "answer": answer,
+            "context": prepared.context if include_sources else "",
+            "cached": False,
+        }
+
+        if include_sources:
+            result["sources"] = prepared.sources
+
+        # Cache the result if enabled
+        if self._cache is not None:
+            self._cache.set(
+                query=query_text,
+                top_k=top_k,
+                source_ids=prepared.source_ids,
+                chunk_count=prepared.chunk_count,
+                answer=answer,
+                sources=prepared.sources,
+            )
+            if prepared.query_embedding is not None:
+                self._cache.set_semantic(
+                    prepared.query_embedding,
+                    top_k=top_k,
+                    answer=answer,
+                    sources=prepared.sources,
+                    generation=prepared.generation,
+                )
+
+        return result
+
+    def _llm_model_name(self) -> str:
+        return (
+            self.config.llm_model_local if self.config.llm_mode.value == "local" else self.config.llm_model_cloud
+        ) or "default"
+
+    async def query(
+        self, query_text: str, top_k: int | None = None, temperature: float = 0.7, include_sources: bool = True
+    ) -> dict[str, Any]:
+        """Query the RAG system (async).
+
+        Args:
+            query_text: Query text
+            top_k: Number of documents to retrieve (default: from config)
+            temperature: LLM temperature
+            include_sources: Whether to include source documents
+
+        Returns:
+            Dictionary with 'answer', 'sources', 'context', optionally 'cached'
+        """
+        top_k = top_k or self.config.top_k
+
+        with track_query(
+            query_text=query_text,
+            top_k=top_k,
+            embedding_model=self.config.embedding_model,
+            llm_model=self._llm_model_name(),
+            temperature=temperature,
+        ):
+            prepared = await self._prepare_query(query_text, top_k, include_sources)
+            if isinstance(prepared, dict):
+                return prepared
+
+            # Evaluation overlaps with generation instead of delaying it
+            eval_task = self._start_evaluation(query_text, prepared.results)
+
+            # Generate answer using LLM
             start_time = time.time()
-            answer = await self.llm_provider.async_generate(prompt=prompt, temperature=temperature)
+            answer = await self.llm_provider.async_generate(prompt=prepared.prompt, temperature=temperature)
             generation_time = time.time() - start_time
 
             # Log answer metrics
             log_answer_metrics(answer_length=len(answer), generation_time_seconds=generation_time)
 
-            result = {
-                "answer": answer,
-                "context": context if include_sources else "",
-                "cached": False,
-                "evaluation_metrics": eval_metrics,
-            }
+            result = self._finish_query(query_text, top_k, prepared, answer, include_sources)
+            try:
+                result["evaluation_metrics"] = await eval_task
+            except Exception:
+                result["evaluation_metrics"] = {}
+            return result
+
+    async def astream_query(
+        self, query_text: str, top_k: int | None = None, temperature: float = 0.7, include_sources: bool = True
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Query the RAG system, yielding the answer as the LLM produces it.
+
+        Events are dicts with 'type' and 'data':
+
+        - ``sources``: ``{"sources": [...]}`` once retrieval is done (only
+          with include_sources)
+        - ``token``: ``{"text": ...}`` for each chunk of the answer
+        - ``done``: the full result as returned by :meth:`query`;
+          'evaluation_metrics' is included only if the background
+          evaluation has already finished
+
+        Cached answers and early exits yield their whole answer as a single
+        token. Retrieval evaluation and metric logging never delay the first
+        token; use :meth:`drain_background_tasks` to wait for them.
+
+        Args:
+            query_text: Query text
+            top_k: Number of documents to retrieve (default: from config)
+            temperature: LLM temperature
+            include_sources: Whether to include source documents
+        """
+        top_k = top_k or self.config.top_k
+
+        with track_query(
+            query_text=query_text,
+            top_k=top_k,
+            embedding_model=self.config.embedding_model,
+            llm_model=self._llm_model_name(),
+            temperature=temperature,
+        ):
+            prepared = await self._prepare_query(query_text, top_k, include_sources)
+            if isinstance(prepared, dict):
+                if include_sources and prepared.get("sources"):
+                    yield {"type": "sources", "data": {"sources": prepared["sources"]}}
+                yield {"type": "token", "data": {"text": prepared.get("answer", "")}}
+                yield {"type": "done", "data": prepared}
+                return
 
             if include_sources:
-                result["sources"] = sources
+                yield {"type": "sources", "data": {"sources": prepared.sources}}
 
-            # Cache the result if enabled
-            if self._cache is not None:
-                self._cache.set(
-                    query=query_text,
-                    top_k=top_k,
-                    source_ids=source_ids,
-                    chunk_count=chunk_count,
-                    answer=answer,
-                    sources=sources,
-                )
+            eval_task = self._start_evaluation(query_text, prepared.results)
 
-            return result
+            start_time = time.time()
+            parts: list[str] = []
+            async for text in self.llm_provider.async_stream(prompt=prepared.prompt, temperature=temperature):
+                if text:
+                    parts.append(text)
+                    yield {"type": "token", "data": {"text": text}}
+            generation_time = time.time() - start_time
+
+            answer = "".join(parts)
+            log_answer_metrics(answer_length=len(answer), generation_time_seconds=generation_time)
+
+            result = self._finish_query(query_text, top_k, prepared, answer, include_sources)
+            if eval_task.done() and not eval_task.cancelled() and eval_task.exception() is None:
+                result["evaluation_metrics"] = eval_task.result()
+            yield {"type": "done", "data": result}
 
     def add_documents(
         self, documents: list[str], ids: list[str] | None = None, metadatas: list[dict[str, Any]] | None = None
@@ -414,8 +639,9 @@ def add_documents(
         embeddings = self.embedding_provider.embed_batch(documents)
 
         # Add to vector store
-        if self.vector_store:
-            self.vector_store.add(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
+        if self._write_store is not None:
+            self._write_store.add(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
+            self._index_changed()
         else:
             raise RuntimeError("Cannot add documents: Vector store not available.")
 
@@ -0,0 +1,329 @@
+"""Incremental BM25 inverted index with numpy scoring.
+
+Replaces rebuilding ``rank_bm25.BM25Okapi`` from the whole corpus: chunks are
+added and deleted by id, postings are appended in place, and query scoring is
+a handful of vectorized operations per query term.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import re
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Pre-compile regex for performance
+TOKEN_PATTERN = re.compile(r"\b\w+\b")
+
+BM25_INDEX_FORMAT_VERSION = 1
+
+
+def tokenize(text: str) -> list[str]:
+    """Simple regex tokenizer for stable punctuation handling."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _pack_strings(items: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    encoded = [item.encode("utf-8") for item in items]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(blob: np.ndarray, offsets: np.ndarray) -> list[str]:
+    raw = blob.tobytes()
+    bounds = offsets.tolist()
+    return [raw[start:end].decode("utf-8") for start, end in zip(bounds[:-1], bounds[1:], strict=True)]
+
+
+class _TermPostings:
+    """Rows and term frequencies for one term: a frozen array part plus an append tail.
+
+    The BM25 term-frequency component of every posting depends only on the
+    corpus length statistics, so it is cached until those change.
+    """
+
+    __slots__ = ("_rows", "_tfs", "_tail_rows", "_tail_tfs", "_weights", "_weights_version")
+
+    def __init__(self, rows: np.ndarray | None = None, tfs: np.ndarray | None = None) -> None:
+        self._rows = rows if rows is not None else np.zeros(0, dtype=np.int64)
+        self._tfs = tfs if tfs is not None else np.zeros(0, dtype=np.float32)
+        self._tail_rows: list[int] = []
+        self._tail_tfs: list[int] = []
+        self._weights: np.ndarray | None = None
+        self._weights_version = -1
+
+    def append(self, row: int, tf: int) -> None:
+        self._tail_rows.append(row)
+        self._tail_tfs.append(tf)
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._tail_rows:
+            self._rows = np.concatenate([self._rows, np.asarray(self._tail_rows, dtype=np.int64)])
+            self._tfs = np.concatenate([self._tfs, np.asarray(self._tail_tfs, dtype=np.float32)])
+            self._tail_rows.clear()
+            self._tail_tfs.clear()
+        return self._rows, self._tfs
+
+    def weights(self, norm: np.ndarray, k1: float, version: int) -> tuple[np.ndarray, np.ndarray]:
+        """Rows and ``tf * (k1 + 1) / (tf + norm)`` for each posting."""
+        rows, tfs = self.arrays()
+        if self._weights is None or self._weights_version != version:
+            self._weights = tfs * (k1 + 1.0) / (tfs + norm[rows])
+            self._weights_version = version
+        return rows, self._weights
+
+
+class BM25Index:
+    """Okapi BM25 over an append-only inverted index.
+
+    Rows are never reused: deleting a chunk marks its row dead and decrements
+    the live document frequencies of its terms. Once more than
+    ``compact_threshold`` of the rows are dead the postings are rewritten
+    without them. The IDF uses the non-negative ``log(1 + (N - df + 0.5) /
+    (df + 0.5))`` variant so very common terms never subtract from a score.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, compact_threshold: float = 0.25) -> None:
+        self.k1 = k1
+        self.b = b
+        self.compact_threshold = compact_threshold
+
+        self._ids: list[str] = []
+        self._texts: list[str] = []
+        self._row_of: dict[str, int] = {}
+        self._doc_len: list[int] = []
+        self._alive: list[bool] = []
+        self._postings: dict[str, _TermPostings] = {}
+        self._df: Counter[str] = Counter()
+        self._total_len = 0
+        self._dead = 0
+        # Bumped whenever document lengths or the live set change
+        self._version = 0
+
+        # Per-row arrays derived from the lists above; rebuilt when stale
+        self._array_rows = -1
+        self._array_dead = -1
+        self._alive_array = np.zeros(0, dtype=bool)
+        self._len_array = np.zeros(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._ids) - self._dead
+
+    def __contains__(self, chunk_id: object) -> bool:
+        return chunk_id in self._row_of
+
+    @property
+    def ids(self) -> list[str]:
+        """Ids of the live chunks."""
+        return list(self._row_of)
+
+    def text(self, chunk_id: str) -> str | None:
+        row = self._row_of.get(chunk_id)
+        return self._texts[row] if row is not None else None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add(self, ids: Iterable[str], texts: Iterable[str]) -> None:
+        """Index chunks; an id that is already present is replaced."""
+        ids = list(ids)
+        texts = list(texts)
+        if len(ids) != len(texts):
+            raise ValueError("ids and texts must have same length")
+
+        self.delete(i for i in ids if i in self._row_of)
+        touched: set[str] = set()
+        for chunk_id, text in zip(ids, texts, strict=True):
+            row = len(self._ids)
+            counts = Counter(tokenize(text))
+            length = sum(counts.values())
+            self._ids.append(chunk_id)
+            self._texts.append(text)
+            self._doc_len.append(length)
+            self._alive.append(True)
+            self._row_of[chunk_id] = row
+            self._total_len += length
+            for term, tf in counts.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _TermPostings()
+                postings.append(row, tf)
+            self._df.update(counts.keys())
+            touched.update(counts)
+
+        # Fold the appended postings into arrays once per batch rather than
+        # on the first query that touches each term.
+        for term in touched:
+            self._postings[term].arrays()
+        self._version += 1
+
+    def delete(self, ids: Iterable[str]) -> None:
+        """Remove chunks by id; unknown ids are ignored."""
+        for chunk_id in list(ids):
+            row = self._row_of.pop(chunk_id, None)
+            if row is None:
+                continue
+            self._alive[row] = False
+            self._dead += 1
+            self._total_len -= self._doc_len[row]
+            self._df.subtract(set(tokenize(self._texts[row])))
+            self._version += 1
+
+        if self._ids and self._dead / len(self._ids) > self.compact_threshold:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite rows and postings without the deleted chunks."""
+        if self._dead == 0:
+            return
+        alive = np.asarray(self._alive, dtype=bool)
+        remap = np.cumsum(alive) - 1
+        live = np.flatnonzero(alive)
+
+        postings: dict[str, _TermPostings] = {}
+        for term, old in self._postings.items():
+            rows, tfs = old.arrays()
+            keep = alive[rows]
+            if keep.any():
+                postings[term] = _TermPostings(remap[rows[keep]], tfs[keep])
+
+        self._ids = [self._ids[i] for i in live]
+        self._texts = [self._texts[i] for i in live]
+        self._doc_len = [self._doc_len[i] for i in live]
+        self._alive = [True] * len(live)
+        self._row_of = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+        self._postings = postings
+        self._df = +self._df  # drop terms whose live df reached zero
+        self._dead = 0
+        self._array_rows = -1
+        self._version += 1
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def _row_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._array_rows != len(self._ids) or self._array_dead != self._dead:
+            self._alive_array = np.asarray(self._alive, dtype=bool)
+            self._len_array = np.asarray(self._doc_len, dtype=np.float32)
+            self._array_rows = len(self._ids)
+            self._array_dead = self._dead
+        return self._alive_array, self._len_array
+
+    def get_scores(self, query_tokens: list[str]) -> np.ndarray:
+        """BM25 score of every row (dead rows score 0)."""
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        n_live = len(self)
+        if n_live == 0:
+            return scores
+
+        alive, doc_len = self._row_arrays()
+        avgdl = self._total_len / n_live or 1.0
+        norm = self.k1 * (1.0 - self.b + self.b * doc_len / avgdl)
+
+        for term, qtf in Counter(query_tokens).items():
+            df = self._df.get(term, 0)
+            postings = self._postings.get(term)
+            if df <= 0 or postings is None:
+                continue
+            idf = math.log(1.0 + (n_live - df + 0.5) / (df + 0.5))
+            rows, weights = postings.weights(norm, self.k1, self._version)
+            scores[rows] += (qtf * idf) * weights
+
+        scores[~alive] = 0.0
+        return scores
+
+    def top_k(self, query_tokens: list[str], k: int) -> list[tuple[str, float]]:
+        """Best ``k`` live chunks with a positive score, highest first."""
+        scores = self.get_scores(query_tokens)
+        candidates = np.flatnonzero(scores > 0)
+        if k <= 0 or len(candidates) == 0:
+            return []
+        if k < len(candidates):
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self._ids[i], float(scores[i])) for i in candidates]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str | Path) -> None:
+        """Write the index to ``path`` (an ``.npz`` file) atomically."""
+        self.compact()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        terms = list(self._postings)
+        term_ptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        rows_parts, tfs_parts = [], []
+        for i, term in enumerate(terms):
+            rows, tfs = self._postings[term].arrays()
+            rows_parts.append(rows)
+            tfs_parts.append(tfs)
+            term_ptr[i + 1] = term_ptr[i] + len(rows)
+
+        ids_blob, ids_offsets = _pack_strings(self._ids)
+        texts_blob, texts_offsets = _pack_strings(self._texts)
+        terms_blob, terms_offsets = _pack_strings(terms)
+
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                format_version=np.int64(BM25_INDEX_FORMAT_VERSION),
+                params=np.asarray([self.k1, self.b], dtype=np.float64),
+                doc_len=np.asarray(self._doc_len, dtype=np.int64),
+                ids_blob=ids_blob,
+                ids_offsets=ids_offsets,
+                texts_blob=texts_blob,
+                texts_offsets=texts_offsets,
+                terms_blob=terms_blob,
+                terms_offsets=terms_offsets,
+                term_ptr=term_ptr,
+                post_rows=np.concatenate(rows_parts) if rows_parts else np.zeros(0, dtype=np.int64),
+                post_tfs=np.concatenate(tfs_parts) if tfs_parts else np.zeros(0, dtype=np.float32),
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> BM25Index:
+        """Read an index written by :meth:`save`.
+
+        Raises:
+            ValueError: If the file was written by an incompatible version
+        """
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != BM25_INDEX_FORMAT_VERSION:
+                raise ValueError(f"Unsupported BM25 index format {int(data['format_version'])} in {path}")
+            k1, b = data["params"].tolist()
+            index = cls(k1=k1, b=b)
+            index._ids = _unpack_strings(data["ids_blob"], data["ids_offsets"])
+            index._texts = _unpack_strings(data["texts_blob"], data["texts_offsets"])
+            index._doc_len = data["doc_len"].tolist()
+            terms = _unpack_strings(data["terms_blob"], data["terms_offsets"])
+            term_ptr = data["term_ptr"]
+            post_rows = data["post_rows"]
+            post_tfs = data["post_tfs"]
+
+        index._alive = [True] * len(index._ids)
+        index._row_of = {chunk_id: row for row, chunk_id in enumerate(index._ids)}
+        index._total_len = int(sum(index._doc_len))
+        bounds = term_ptr.tolist()
+        for i, term in enumerate(terms):
+            start, end = bounds[i], bounds[i + 1]
+            index._postings[term] = _TermPostings(post_rows[start:end], post_tfs[start:end])
+            index._df[term] = end - start
+        return index
@@ -4,7 +4,7 @@
 """
 
 import logging
-from typing import Optional
+from typing import Any, Optional
 
 from .reranker import BaseReranker
 
@@ -41,7 +41,7 @@ def __init__(
         self.max_candidates = max_candidates
         self.model_name = model_name
 
-    def rerank(self, query: str, documents: list[str], top_k: int = 5) -> list[tuple[int, float]]:
+    def rerank(self, query: str, documents: list[str], top_k: int = 5, **kwargs: Any) -> list[tuple[int, float]]:
         """Rerank documents using cross-encoder scoring."""
         if not documents:
             return []
@@ -59,7 +59,9 @@ def rerank(self, query: str, documents: list[str], top_k: int = 5) -> list[tuple
         indexed_scores = [(i, float(score)) for i, score in enumerate(scores)]
         return sorted(indexed_scores, key=lambda x: x[1], reverse=True)[:top_k]
 
-    async def async_rerank(self, query: str, documents: list[str], top_k: int = 5) -> list[tuple[int, float]]:
+    async def async_rerank(
+        self, query: str, documents: list[str], top_k: int = 5, **kwargs: Any
+    ) -> list[tuple[int, float]]:
         """Async wrapper - cross-encoder is CPU-bound, so we run in executor."""
         import asyncio
 
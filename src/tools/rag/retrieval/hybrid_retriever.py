@@ -5,27 +5,25 @@
 """
 
 import logging
-import re
 import time
+from pathlib import Path
 from typing import Any, cast
 
-# Pre-compile regex for performance
-TOKEN_PATTERN = re.compile(r"\b\w+\b")
-logger = logging.getLogger(__name__)
+from ..vector_store.base import BaseVectorStore
+from .bm25_index import TOKEN_PATTERN, BM25Index, tokenize
 
-# BM25 is optional - graceful fallback if not installed
-try:
-    from rank_bm25 import BM25Okapi
+logger = logging.getLogger(__name__)
 
-    HAS_BM25 = True
-except ImportError:
-    HAS_BM25 = False
-    BM25Okapi = Any  # type: ignore
+__all__ = ["TOKEN_PATTERN", "BM25SyncedStore", "HybridRetriever", "create_hybrid_retriever", "tokenize"]
 
+# Batch size for paging ids/documents out of a Chroma collection
+_FETCH_BATCH = 1000
 
-def tokenize(text: str) -> list[str]:
-    """Simple regex tokenizer for stable punctuation handling."""
-    return TOKEN_PATTERN.findall(text.lower())
+# Incremental changes are written out once this many chunks are pending or
+# this many seconds have passed since the last save. The vector store stays
+# the source of truth: a stale file is caught up by the id diff on load.
+_PERSIST_AFTER_CHANGES = 1000
+_PERSIST_INTERVAL = 300.0
 
 
 class HybridRetriever:
@@ -43,19 +41,34 @@ def __init__(
         bm25_retriever: Any | None = None,
         alpha: float = 0.5,
         reranker: Any | None = None,
+        index_path: str | Path | None = None,
+        persist_after: int = _PERSIST_AFTER_CHANGES,
+        persist_interval: float = _PERSIST_INTERVAL,
     ) -> None:
-        """Initialize hybrid retriever."""
+        """Initialize hybrid retriever.
+
+        Args:
+            index_path: Optional ``.npz`` path where the BM25 index is persisted
+                so restarts load it instead of re-tokenizing the collection.
+            persist_after: Pending chunk changes that trigger a save.
+            persist_interval: Seconds after which pending changes are saved
+                on the next update; call :meth:`flush` to save immediately.
+        """
         self.vector_store = vector_store
         self.embedding_provider = embedding_provider
         self.k = k
         self.alpha = alpha
         self.reranker = reranker
-
-        # BM25 index - built lazily from vector store documents
+        self.index_path = Path(index_path) if index_path else None
+        self.persist_after = persist_after
+        self.persist_interval = persist_interval
+        self._pending_changes = 0
+        self._last_persist = time.monotonic()
+
+        # BM25 index - loaded from disk or built lazily from vector store
+        # documents, then kept in sync incrementally by chunk id
         self._bm25 = bm25_retriever
         self.bm25_retriever = bm25_retriever  # Alias for tests
-        self._chunk_ids: list[str] = []
-        self._chunk_texts: list[str] = []
         self._is_initialized = bm25_retriever is not None
         self._last_doc_count: int = 0
         self._last_count_time: float = 0
@@ -76,50 +89,128 @@ def _get_doc_count(self) -> int:
         except Exception:
             return self._cached_count
 
+    def _load_persisted_index(self) -> BM25Index | None:
+        if self.index_path is None or not self.index_path.exists():
+            return None
+        try:
+            index = BM25Index.load(self.index_path)
+            logger.info(f"Loaded BM25 index with {len(index)} chunks from {self.index_path}")
+            return index
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable BM25 index at {self.index_path}: {e}")
+            return None
+
+    def _persist_index(self) -> None:
+        if self.index_path is None or not isinstance(self._bm25, BM25Index):
+            return
+        try:
+            self._bm25.save(self.index_path)
+            self._pending_changes = 0
+            self._last_persist = time.monotonic()
+        except OSError as e:
+            logger.warning(f"Could not persist BM25 index to {self.index_path}: {e}")
+
+    def _mark_dirty(self, changes: int, force: bool = False) -> None:
+        """Record ``changes`` unsaved chunks and save once enough have piled up.
+
+        Saving compacts and rewrites the whole file, so single-chunk updates
+        are batched instead of paying O(corpus) I/O each.
+        """
+        if self.index_path is None:
+            return
+        self._pending_changes += changes
+        if (
+            force
+            or self._pending_changes >= self.persist_after
+            or time.monotonic() - self._last_persist >= self.persist_interval
+        ):
+            self._persist_index()
+
+    def flush(self) -> None:
+        """Save pending BM25 index changes now."""
+        if self._pending_changes:
+            self._persist_index()
+
+    @staticmethod
+    def _fetch_collection_ids(collection: Any, count: int) -> list[str]:
+        ids: list[str] = []
+        for offset in range(0, max(count, 1), _FETCH_BATCH):
+            results = collection.get(include=[], offset=offset, limit=_FETCH_BATCH)
+            batch = (results or {}).get("ids") or []
+            ids.extend(batch)
+            if len(batch) < _FETCH_BATCH:
+                break
+        return ids
+
     def _ensure_bm25_index(self) -> bool:
-        """Build BM25 index from vector store if not already built."""
-        if not HAS_BM25:
-            return False
+        """Bring the BM25 index in line with the vector store.
+
+        Only the chunk ids are listed from the store; documents are fetched
+        and tokenized just for chunks the index has not seen, and chunks that
+        disappeared from the store are deleted from the postings.
+        """
+        if not isinstance(self._bm25, BM25Index):
+            loaded = self._load_persisted_index()
+            if loaded is not None:
+                self._bm25 = loaded
+                self._is_initialized = True
+                self._last_doc_count = len(loaded)
 
         current_count = self._get_doc_count()
-        needs_rebuild = not self._is_initialized or current_count != self._last_doc_count
-        if not needs_rebuild:
-            return True
+        if self._is_initialized and current_count == self._last_doc_count:
+            return self._has_index()
+
+        collection = getattr(self.vector_store, "collection", None)
+        if not collection:
+            return self._has_index()
 
-        # Fetch documents from vector store
         try:
-            # Check for collection (ChromaDB) or get_all (Generic)
-            collection = getattr(self.vector_store, "collection", None)
-
-            all_ids = []
-            all_texts = []
-
-            if collection:
-                if current_count > 10000:
-                    chunk_size = 1000
-                    for offset in range(0, current_count, chunk_size):
-                        results = collection.get(include=["documents"], offset=offset, limit=chunk_size)
-                        if results and results.get("ids"):
-                            all_ids.extend(results["ids"])
-                            all_texts.extend(results.get("documents", []))
-                else:
-                    results = collection.get(include=["documents"])
-                    if results and results.get("ids"):
-                        all_ids = results["ids"]
-                        all_texts = results.get("documents", [])
-
-            if all_texts:
-                tokenized = [tokenize(t) for t in all_texts]
-                self._bm25 = BM25Okapi(tokenized)
-                self._chunk_ids = all_ids
-                self._chunk_texts = all_texts
-                self._is_initialized = True
-                self._last_doc_count = len(all_ids)
-                return True
+            index = self._bm25 if isinstance(self._bm25, BM25Index) else BM25Index()
+            store_ids = self._fetch_collection_ids(collection, current_count)
+            store_id_set = set(store_ids)
+
+            removed = [chunk_id for chunk_id in index.ids if chunk_id not in store_id_set]
+            added = [chunk_id for chunk_id in store_ids if chunk_id not in index]
+
+            index.delete(removed)
+            for start in range(0, len(added), _FETCH_BATCH):
+                results = collection.get(ids=added[start : start + _FETCH_BATCH], include=["documents"])
+                index.add(results.get("ids", []), [doc or "" for doc in results.get("documents", [])])
+
+            self._bm25 = index
+            self._last_doc_count = current_count
+            self._is_initialized = True
+            if added or removed:
+                logger.debug(f"BM25 index synced: +{len(added)} -{len(removed)} chunks")
+                # A first build is saved right away so the next start can load it
+                first_build = self.index_path is not None and not self.index_path.exists()
+                self._mark_dirty(len(added) + len(removed), force=first_build)
         except Exception as e:
-            logger.warning(f"Could not build BM25 index: {e}")
-
-        return False
+            logger.warning(f"Could not sync BM25 index: {e}")
+
+        return self._has_index()
+
+    def _has_index(self) -> bool:
+        return isinstance(self._bm25, BM25Index) and len(self._bm25) > 0
+
+    def add_chunks(self, ids: list[str], texts: list[str]) -> None:
+        """Index chunks that were just written to the vector store."""
+        if not isinstance(self._bm25, BM25Index):
+            self._bm25 = self._load_persisted_index()
+        index = self._bm25 if isinstance(self._bm25, BM25Index) else BM25Index()
+        index.add(ids, texts)
+        self._bm25 = index
+        self._is_initialized = True
+        self._last_doc_count = self._cached_count = len(index)
+        self._mark_dirty(len(ids))
+
+    def remove_chunks(self, ids: list[str]) -> None:
+        """Drop chunks that were just deleted from the vector store."""
+        if not isinstance(self._bm25, BM25Index):
+            return
+        self._bm25.delete(ids)
+        self._last_doc_count = self._cached_count = len(self._bm25)
+        self._mark_dirty(len(ids))
 
     async def async_search(self, query: str, top_k: int = 10) -> dict[str, Any]:
         """Perform hybrid search asynchronously."""
@@ -170,7 +261,7 @@ def hybrid_search(self, query: str, k: int = 10) -> list[Any]:
         scores = res.get("hybrid_scores", res.get("distances", [0.0] * len(docs)))
         ids = res.get("ids", [""] * len(docs))
 
-        from .types import ScoredChunk
+        from ..types import ScoredChunk
 
         return [
             ScoredChunk(id=ids[i], text=docs[i], doc_id=ids[i], score=scores[i], metadata=metas[i])
@@ -187,7 +278,7 @@ def vector_only_search(self, query: str, k: int = 10) -> list[Any]:
         distances = res.get("distances", [0.0] * len(docs))
         ids = res.get("ids", [""] * len(docs))
 
-        from .types import ScoredChunk
+        from ..types import ScoredChunk
 
         return [
             ScoredChunk(id=ids[i], text=docs[i], doc_id=ids[i], score=1.0 / (1.0 + distances[i]), metadata=metas[i])
@@ -201,13 +292,10 @@ def _fuse_results(self, query: str, vec_results: dict[str, Any], top_k: int) ->
         vec_metas = vec_results.get("metadatas", [])
         vec_dists = vec_results.get("distances", [])
 
-        # Get BM25 scores
-        query_tokens = tokenize(query)
-        bm25_scores = cast(Any, self._bm25).get_scores(query_tokens)
-
         # Rank BM25
         limit = min(top_k * 2, 50)
-        bm25_ranked = sorted(zip(self._chunk_ids, bm25_scores, strict=False), key=lambda x: -x[1])[:limit]
+        bm25 = cast(BM25Index, self._bm25)
+        bm25_ranked = bm25.top_k(tokenize(query), limit)
 
         # Fusion
         rrf_scores: dict[str, float] = {}
@@ -224,8 +312,6 @@ def _fuse_results(self, query: str, vec_results: dict[str, Any], top_k: int) ->
             doc_id: (doc, meta, dist)
             for doc_id, doc, meta, dist in zip(vec_ids, vec_docs, vec_metas, vec_dists, strict=False)
         }
-        bm25_lookup = dict(zip(self._chunk_ids, self._chunk_texts, strict=False))
-
         for doc_id, score in fused_ranking:
             res_ids.append(doc_id)
             res_hybrid.append(score)
@@ -234,8 +320,8 @@ def _fuse_results(self, query: str, vec_results: dict[str, Any], top_k: int) ->
                 res_docs.append(doc)
                 res_metas.append(meta)
                 res_dists.append(dist)
-            elif doc_id in bm25_lookup:
-                res_docs.append(bm25_lookup[doc_id])
+            elif doc_id in bm25:
+                res_docs.append(bm25.text(doc_id))
                 res_metas.append({"source": "bm25"})
                 res_dists.append(1.0)
 
@@ -249,25 +335,85 @@ def _fuse_results(self, query: str, vec_results: dict[str, Any], top_k: int) ->
         }
 
     def invalidate_cache(self) -> None:
-        """Invalidate the BM25 index."""
+        """Drop the in-memory BM25 index; the next search reloads and resyncs it."""
         self._bm25 = None
-        self._chunk_ids = []
-        self._chunk_texts = []
         self._is_initialized = False
+        self._pending_changes = 0  # Recounted by the resync against the store
+
+
+class BM25SyncedStore(BaseVectorStore):
+    """Vector store proxy that pushes chunk writes into a retriever's BM25 index.
+
+    Adds and deletes go to the wrapped store first and are then applied to the
+    BM25 postings, so indexing never leaves the keyword index to be rebuilt by
+    the count check. Everything else is forwarded to the wrapped store.
+    """
+
+    def __init__(self, store: BaseVectorStore, retriever: HybridRetriever) -> None:
+        self.store = store
+        self.retriever = retriever
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.store, name)
+
+    def add(
+        self,
+        ids: list[str],
+        documents: list[str],
+        embeddings: list[list[float]],
+        metadatas: list[dict[str, Any]] | None = None,
+    ) -> None:
+        self.store.add(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
+        self.retriever.add_chunks(ids, documents)
+
+    def query(
+        self,
+        query_embedding: list[float],
+        n_results: int = 5,
+        where: dict[str, Any] | None = None,
+        include: list[str] | None = None,
+    ) -> dict[str, Any]:
+        return self.store.query(query_embedding, n_results=n_results, where=where, include=include)
+
+    def delete(self, ids: list[str] | None = None, where: dict[str, Any] | None = None) -> None:
+        if ids is None and where is not None:
+            ids = self._ids_matching(where)
+        self.store.delete(ids=ids, where=where)
+        if ids is not None:
+            self.retriever.remove_chunks(ids)
+        else:
+            # Unknown which chunks went away; the id diff on the next search finds them
+            self.retriever.invalidate_cache()
+
+    def count(self) -> int:
+        return self.store.count()
+
+    def reset(self) -> None:
+        reset_fn = getattr(self.store, "reset", None)
+        if callable(reset_fn):
+            reset_fn()
+        self.retriever.invalidate_cache()
+
+    def _ids_matching(self, where: dict[str, Any]) -> list[str] | None:
+        collection = getattr(self.store, "collection", None)
+        if collection is None:
+            return None
+        try:
+            return list(collection.get(where=where, include=[]).get("ids", []))
+        except Exception as e:
+            logger.debug(f"Could not resolve chunk ids for {where}: {e}")
+            return None
 
 
 def create_hybrid_retriever(vector_store: Any, embedding_provider: Any, config: Any = None) -> HybridRetriever | None:
     """Factory function."""
     if config is None:
-        from .config import RAGConfig
+        from ..config import RAGConfig
 
         config = RAGConfig.from_env()
 
     if not config.use_hybrid:
         return None
 
-    if not HAS_BM25:
-        logger.warning("Hybrid search requested but rank_bm25 not installed.")
-        return None
-
-    return HybridRetriever(vector_store=vector_store, embedding_provider=embedding_provider)
+    index_path = Path(config.vector_store_path) / f"{config.collection_name}.bm25.npz"
+    return HybridRetriever(vector_store=vector_store, embedding_provider=embedding_provider, index_path=index_path)
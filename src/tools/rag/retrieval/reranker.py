@@ -1,7 +1,11 @@
 import asyncio
+import hashlib
+import json
 import logging
 import re
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
 
 import httpx
 
@@ -9,35 +13,85 @@
 
 
 class BaseReranker(ABC):
-    """Base class for rerankers."""
+    """Base class for rerankers.
+
+    ``ids`` and ``distances`` describe the first-stage results aligned with
+    ``documents``; rerankers that cannot use them ignore them.
+    """
 
     @abstractmethod
-    def rerank(self, query: str, documents: list[str], top_k: int = 5) -> list[tuple[int, float]]:
+    def rerank(
+        self,
+        query: str,
+        documents: list[str],
+        top_k: int = 5,
+        *,
+        ids: list[str] | None = None,
+        distances: list[float] | None = None,
+    ) -> list[tuple[int, float]]:
         """Rerank documents by relevance to query."""
         pass
 
     @abstractmethod
-    async def async_rerank(self, query: str, documents: list[str], top_k: int = 5) -> list[tuple[int, float]]:
+    async def async_rerank(
+        self,
+        query: str,
+        documents: list[str],
+        top_k: int = 5,
+        *,
+        ids: list[str] | None = None,
+        distances: list[float] | None = None,
+    ) -> list[tuple[int, float]]:
         """Rerank documents asynchronously."""
         pass
 
 
 class OllamaReranker(BaseReranker):
-    """Uses Ollama LLM to score query-document relevance with connection pooling."""
+    """Uses Ollama LLM to score query-document relevance with connection pooling.
+
+    Modes:
+        listwise: candidates are scored in groups of ``listwise_batch_size``
+            with one prompt per group (default, one or two LLM calls per query)
+        pointwise: one prompt per candidate
+
+    Scores are cached in an LRU keyed by (model, query hash, chunk id), so
+    repeated queries only send unseen candidates to the model. When
+    ``early_exit_margin`` is set and the first-stage distance gap at the
+    top_k boundary is at least that large, the first-stage order is kept
+    and the LLM is not called at all.
+    """
 
     MAX_CANDIDATES = 20
     TIMEOUT = 10.0
+    MAX_DOC_CHARS = 500
 
     def __init__(
         self,
         model: str = "mistral-nemo:latest",
         base_url: str = "http://localhost:11434",
         max_candidates: int | None = None,
+        mode: str = "listwise",
+        listwise_batch_size: int = 10,
+        cache_size: int = 4096,
+        early_exit_margin: float = 0.0,
     ):
+        if mode not in ("listwise", "pointwise"):
+            raise ValueError(f"Unknown rerank mode: {mode}. Use 'listwise' or 'pointwise'.")
         self.model = model
         self.base_url = base_url
         self.max_candidates = max_candidates or self.MAX_CANDIDATES
+        self.mode = mode
+        self.listwise_batch_size = max(1, listwise_batch_size)
+        self.cache_size = cache_size
+        self.early_exit_margin = early_exit_margin
         self._client: httpx.AsyncClient | None = None
+        self._score_cache: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+
+        # Stats
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.llm_calls = 0
+        self.early_exits = 0
 
     def _get_client(self) -> httpx.AsyncClient:
         """Get or create shared async client for connection pooling."""
@@ -49,55 +103,181 @@ def _get_client(self) -> httpx.AsyncClient:
             )
         return self._client
 
-    async def _async_score_document(self, client: httpx.AsyncClient, query: str, document: str) -> float:
-        """Score a single document asynchronously."""
+    # ------------------------------------------------------------------
+    # Score cache
+    # ------------------------------------------------------------------
+
+    def _cache_key(self, query_hash: str, chunk_id: str | None, document: str) -> tuple[str, str, str]:
+        # The content hash keeps a re-indexed chunk that reuses its id from serving a stale score
+        content_hash = hashlib.sha256(document.encode("utf-8")).hexdigest()[:16]
+        return (self.model, query_hash, f"{chunk_id}:{content_hash}" if chunk_id else content_hash)
+
+    def _cache_get(self, key: tuple[str, str, str]) -> float | None:
+        score = self._score_cache.get(key)
+        if score is None:
+            self.cache_misses += 1
+            return None
+        self._score_cache.move_to_end(key)
+        self.cache_hits += 1
+        return score
+
+    def _cache_set(self, key: tuple[str, str, str], score: float) -> None:
+        if self.cache_size <= 0:
+            return
+        self._score_cache[key] = score
+        self._score_cache.move_to_end(key)
+        while len(self._score_cache) > self.cache_size:
+            self._score_cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Drop all cached scores."""
+        self._score_cache.clear()
+
+    # ------------------------------------------------------------------
+    # LLM scoring
+    # ------------------------------------------------------------------
+
+    async def _generate(self, client: httpx.AsyncClient, prompt: str, json_format: bool = False) -> str | None:
+        """Run one non-streaming generation; returns None on failure."""
+        payload: dict[str, Any] = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {"temperature": 0.0},
+        }
+        if json_format:
+            payload["format"] = "json"
+        self.llm_calls += 1
+        resp = await client.post("/api/generate", json=payload)
+        if resp.status_code != 200:
+            logger.debug(f"Rerank request failed with status {resp.status_code}")
+            return None
+        return str(resp.json().get("response", "")).strip()
+
+    async def _async_score_document(self, client: httpx.AsyncClient, query: str, document: str) -> float | None:
+        """Score a single document asynchronously; returns None if no score could be obtained."""
         try:
-            doc_text = document[:500] if len(document) > 500 else document
             prompt = (
                 f"Rate 0-10 how relevant this document is to the query. "
                 f"Output ONLY a number.\n\n"
                 f"Query: {query}\n\n"
-                f"Document: {doc_text}\n\n"
+                f"Document: {document}\n\n"
                 f"Score:"
             )
-
-            resp = await client.post(
-                "/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {"temperature": 0.0},
-                },
-            )
-
-            if resp.status_code == 200:
-                response_text = resp.model_dump_json().get("response", "0").strip()
+            response_text = await self._generate(client, prompt)
+            if response_text:
                 match = re.search(r"\d+(?:\.\d+)?", response_text)
                 if match:
-                    return min(max(float(match.group()), 0), 10)
-            return 0.0
+                    return _clamp_score(float(match.group()))
+            return None
         except Exception as e:
             logger.debug(f"Rerank score error: {e}")
-            return 0.0
+            return None
 
-    async def async_rerank(self, query: str, documents: list[str], top_k: int = 5) -> list[tuple[int, float]]:
-        """Rerank documents in parallel using the shared client."""
-        candidates = documents[: self.max_candidates]
+    async def _async_score_listwise(
+        self, client: httpx.AsyncClient, query: str, documents: list[str]
+    ) -> dict[int, float]:
+        """Score a group of documents with one prompt; returns scores by position in ``documents``."""
+        try:
+            numbered = "\n\n".join(f"[{i + 1}] {doc}" for i, doc in enumerate(documents))
+            prompt = (
+                f"Rate 0-10 how relevant each document is to the query. "
+                f"Output ONLY a JSON object mapping every document number to its score, "
+                f'for example {{"1": 7, "2": 0}}.\n\n'
+                f"Query: {query}\n\n"
+                f"Documents:\n\n{numbered}\n\n"
+                f"Scores:"
+            )
+            response_text = await self._generate(client, prompt, json_format=True)
+            return _parse_listwise_scores(response_text or "", len(documents))
+        except Exception as e:
+            logger.debug(f"Listwise rerank error: {e}")
+            return {}
+
+    async def _score_uncached(self, query: str, documents: list[str]) -> list[float | None]:
+        """Score documents with the LLM, concurrently across groups/documents."""
+        client = self._get_client()
+        if self.mode == "pointwise":
+            return list(await asyncio.gather(*(self._async_score_document(client, query, d) for d in documents)))
+
+        groups = [
+            list(range(start, min(start + self.listwise_batch_size, len(documents))))
+            for start in range(0, len(documents), self.listwise_batch_size)
+        ]
+        results = await asyncio.gather(
+            *(self._async_score_listwise(client, query, [documents[i] for i in group]) for group in groups)
+        )
+        scores: list[float | None] = [None] * len(documents)
+        for group, group_scores in zip(groups, results, strict=True):
+            for position, score in group_scores.items():
+                scores[group[position]] = score
+
+        # Anything the listwise answer left out is scored individually
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            retried = await asyncio.gather(*(self._async_score_document(client, query, documents[i]) for i in missing))
+            for i, score in zip(missing, retried, strict=True):
+                scores[i] = score
+        return scores
+
+    def _early_exit(self, count: int, top_k: int, distances: list[float] | None) -> list[tuple[int, float]] | None:
+        """First-stage ranking when its top_k boundary is decisive, else None."""
+        if self.early_exit_margin <= 0 or not distances or len(distances) < count or count <= top_k:
+            return None
+        order = sorted(range(count), key=lambda i: distances[i])
+        if distances[order[top_k]] - distances[order[top_k - 1]] < self.early_exit_margin:
+            return None
+        self.early_exits += 1
+        # Express first-stage distances on the reranker's 0-10 scale
+        return [(i, _clamp_score(10.0 * (1.0 - distances[i]))) for i in order[:top_k]]
+
+    async def async_rerank(
+        self,
+        query: str,
+        documents: list[str],
+        top_k: int = 5,
+        *,
+        ids: list[str] | None = None,
+        distances: list[float] | None = None,
+    ) -> list[tuple[int, float]]:
+        """Rerank documents, scoring only candidates without a cached score."""
+        candidates = [doc[: self.MAX_DOC_CHARS] for doc in documents[: self.max_candidates]]
         if not candidates:
             return []
 
-        client = self._get_client()
-        tasks = [self._async_score_document(client, query, doc) for doc in candidates]
+        early = self._early_exit(len(candidates), top_k, distances)
+        if early is not None:
+            return early
+
+        query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()[:16]
+        keys = [
+            self._cache_key(query_hash, ids[i] if ids and i < len(ids) else None, doc)
+            for i, doc in enumerate(candidates)
+        ]
+        scores: list[float | None] = [self._cache_get(key) for key in keys]
 
-        # Run all scoring tasks in parallel
-        scores = await asyncio.gather(*tasks)
+        uncached = [i for i, score in enumerate(scores) if score is None]
+        if uncached:
+            fresh = await self._score_uncached(query, [candidates[i] for i in uncached])
+            for i, score in zip(uncached, fresh, strict=True):
+                if score is not None:
+                    self._cache_set(keys[i], score)
+                scores[i] = score
 
-        indexed_scores = [(i, float(score)) for i, score in enumerate(scores)]
+        indexed_scores = [(i, float(score or 0.0)) for i, score in enumerate(scores)]
         return sorted(indexed_scores, key=lambda x: x[1], reverse=True)[:top_k]
 
-    def rerank(self, query: str, documents: list[str], top_k: int = 5) -> list[tuple[int, float]]:
+    def rerank(
+        self,
+        query: str,
+        documents: list[str],
+        top_k: int = 5,
+        *,
+        ids: list[str] | None = None,
+        distances: list[float] | None = None,
+    ) -> list[tuple[int, float]]:
         """Synchronous wrapper for async_rerank."""
+        coro_args = {"query": query, "documents": documents, "top_k": top_k, "ids": ids, "distances": distances}
         try:
             loop = asyncio.get_event_loop()
             if loop.is_running():
@@ -105,9 +285,24 @@ def rerank(self, query: str, documents: list[str], top_k: int = 5) -> list[tuple
                 import nest_asyncio
 
                 nest_asyncio.apply()
-            return loop.run_until_complete(self.async_rerank(query, documents, top_k))
+            return loop.run_until_complete(self.async_rerank(**coro_args))
         except Exception:
-            return asyncio.run(self.async_rerank(query, documents, top_k))
+            return asyncio.run(self.async_rerank(**coro_args))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get reranker cache and call statistics."""
+        total = self.cache_hits + self.cache_misses
+        hit_rate = (self.cache_hits / total * 100) if total > 0 else 0.0
+        return {
+            "mode": self.mode,
+            "cache_size": len(self._score_cache),
+            "cache_max_size": self.cache_size,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "hit_rate_percent": round(hit_rate, 2),
+            "llm_calls": self.llm_calls,
+            "early_exits": self.early_exits,
+        }
 
     async def close(self):
         """Close the underlying HTTP client."""
@@ -115,20 +310,56 @@ async def close(self):
             await self._client.aclose()
 
 
+def _clamp_score(score: float) -> float:
+    return min(max(score, 0.0), 10.0)
+
+
+def _parse_listwise_scores(text: str, count: int) -> dict[int, float]:
+    """Parse a listwise answer into {0-based position: score}, ignoring unknown numbers.
+
+    Accepts the requested JSON object, a JSON list of scores in document
+    order, or loose "1: 7" style lines.
+    """
+    pairs: list[tuple[Any, Any]] = []
+    try:
+        parsed = json.loads(text)
+        if isinstance(parsed, dict) and isinstance(parsed.get("scores"), dict | list):
+            parsed = parsed["scores"]
+        if isinstance(parsed, dict):
+            pairs = list(parsed.items())
+        elif isinstance(parsed, list):
+            pairs = [(i + 1, value) for i, value in enumerate(parsed)]
+    except (json.JSONDecodeError, TypeError):
+        pairs = re.findall(r"\[?(\d+)\]?\s*[:=]\s*(\d+(?:\.\d+)?)", text)
+
+    scores: dict[int, float] = {}
+    for raw_position, raw_score in pairs:
+        match = re.search(r"\d+", str(raw_position))
+        try:
+            score = float(raw_score)
+        except (TypeError, ValueError):
+            continue
+        if match and 1 <= int(match.group()) <= count:
+            scores[int(match.group()) - 1] = _clamp_score(score)
+    return scores
+
+
 class NoOpReranker(BaseReranker):
     """Passthrough reranker."""
 
-    async def async_rerank(self, query: str, documents: list[str], top_k: int = 5) -> list[tuple[int, float]]:
+    async def async_rerank(
+        self, query: str, documents: list[str], top_k: int = 5, **kwargs: Any
+    ) -> list[tuple[int, float]]:
         return [(i, 1.0 / (i + 1)) for i in range(min(len(documents), top_k))]
 
-    def rerank(self, query: str, documents: list[str], top_k: int = 5) -> list[tuple[int, float]]:
+    def rerank(self, query: str, documents: list[str], top_k: int = 5, **kwargs: Any) -> list[tuple[int, float]]:
         return [(i, 1.0 / (i + 1)) for i in range(min(len(documents), top_k))]
 
 
 def create_reranker(config=None) -> BaseReranker | None:
     """Factory function."""
     if config is None:
-        from .config import RAGConfig
+        from ..config import RAGConfig
 
         config = RAGConfig.from_env()
 
@@ -136,5 +367,10 @@ def create_reranker(config=None) -> BaseReranker | None:
         return None
 
     return OllamaReranker(
-        model=config.llm_model_local, base_url=config.ollama_base_url, max_candidates=config.reranker_top_k
+        model=config.llm_model_local,
+        base_url=config.ollama_base_url,
+        max_candidates=config.reranker_top_k,
+        mode=config.reranker_mode,
+        cache_size=config.reranker_cache_size,
+        early_exit_margin=config.reranker_early_exit_margin,
     )
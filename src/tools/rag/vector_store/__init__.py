@@ -2,6 +2,7 @@
 
 from .base import BaseVectorStore
 from .in_memory_dense import InMemoryDenseVectorStore
+from .snapshot import SnapshotError
 
 # Backward compatibility alias
 InMemoryDenseStore = InMemoryDenseVectorStore
@@ -31,4 +32,5 @@
     "InMemoryDenseStore",  # Backward compatibility alias
     "DatabricksVectorStore",
     "PineconeVectorStore",
+    "SnapshotError",
 ]
@@ -1,28 +1,168 @@
 from __future__ import annotations
 
-import math
+import logging
+import threading
+from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 from .base import BaseVectorStore
+from .snapshot import MappedStrings, read_snapshot, write_snapshot
 
 try:
     import faiss
-    import numpy as np
 
     HAS_FAISS = True
 except ImportError:
     HAS_FAISS = False
 
+logger = logging.getLogger(__name__)
+
+ANN_INDEX_TYPES = ("hnsw", "ivf")
+
+# Below this fraction of live rows a filtered query gathers the candidate rows
+# before the matmul; above it, scoring the whole matrix and masking is cheaper.
+_GATHER_FRACTION = 0.25
+
+# Rebuilds a foreground compaction attempts outside the lock before it
+# rebuilds under the lock instead, when writes keep landing mid-rebuild.
+_COMPACT_ATTEMPTS = 3
+
+
+class _Postings:
+    """Append-only row list for one metadata (key, value) pair."""
+
+    __slots__ = ("rows", "_array")
+
+    def __init__(self) -> None:
+        self.rows: list[int] = []
+        self._array: np.ndarray | None = None
+
+    def append(self, row: int) -> None:
+        self.rows.append(row)
+
+    def array(self) -> np.ndarray:
+        if self._array is None or len(self._array) != len(self.rows):
+            self._array = np.fromiter(self.rows, dtype=np.int64, count=len(self.rows))
+        return self._array
+
 
 class InMemoryDenseVectorStore(BaseVectorStore):
-    def __init__(self, embedding_dim: int | None = None) -> None:
-        self._ids: list[str] = []
-        self._documents: list[str] = []
-        self._embeddings: list[list[float]] = []
-        self._metadatas: list[dict[str, Any]] = []
-        self._index = None
-        self._dirty = False
+    """Dense cosine-similarity store backed by a contiguous float32 matrix.
+
+    Embeddings are L2-normalised on insert and appended to a pre-allocated
+    matrix that grows geometrically. The FAISS index (when available) is kept
+    in sync by appending only rows it has not seen yet, so adding a batch never
+    triggers a full rebuild. Deletes mark rows as tombstones; once the dead
+    fraction crosses ``compact_threshold`` the live rows are compacted on a
+    background thread and swapped in atomically.
+
+    Above ``ann_threshold`` live rows the flat index is replaced by an HNSW or
+    IVF index (``ann_index``), trading a little recall for sub-linear search.
+
+    Metadata is indexed column-wise: every hashable ``(key, value)`` pair maps
+    to a sorted postings list of rows, so ``where`` filters resolve to a
+    candidate row set by intersection instead of a scan over every metadata
+    dict.
+
+    ``save_snapshot``/``load_snapshot`` persist the live rows in the binary
+    layout described in :mod:`.snapshot`; a float32 snapshot is memory-mapped
+    on load so worker processes share the page cache instead of re-adding.
+    """
+
+    def __init__(
+        self,
+        embedding_dim: int | None = None,
+        *,
+        ann_index: str | None = "hnsw",
+        ann_threshold: int = 50_000,
+        hnsw_m: int = 32,
+        hnsw_ef_search: int = 64,
+        ivf_nprobe: int = 16,
+        compact_threshold: float = 0.25,
+        initial_capacity: int = 1024,
+    ) -> None:
+        if ann_index is not None and ann_index not in ANN_INDEX_TYPES:
+            raise ValueError(f"ann_index must be one of {ANN_INDEX_TYPES} or None, got {ann_index!r}")
+
         self.embedding_dim = embedding_dim
+        self.ann_index = ann_index
+        self.ann_threshold = ann_threshold
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivf_nprobe = ivf_nprobe
+        self.compact_threshold = compact_threshold
+        self._initial_capacity = max(1, initial_capacity)
+
+        self._ids: list[str] | MappedStrings = []
+        self._documents: list[str] | MappedStrings = []
+        self._metadatas: list[dict[str, Any]] | MappedStrings = []
+        self._id_to_row: dict[str, int] = {}
+        # None means "not built yet"; built lazily on the first filtered query
+        self._postings: dict[str, dict[Any, _Postings]] | None = {}
+
+        self._matrix: np.ndarray | None = None
+        self._alive: np.ndarray = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._dead = 0
+
+        self._index: Any = None
+        self._index_kind: str | None = None
+        self._indexed = 0
+
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._compaction_thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    @property
+    def _embeddings(self) -> np.ndarray:
+        """Normalised embeddings of the live rows."""
+        if self._matrix is None:
+            return np.zeros((0, self.embedding_dim or 0), dtype=np.float32)
+        return self._matrix[: self._size][self._alive[: self._size]]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+    def _as_matrix(self, embeddings: list[list[float]] | np.ndarray) -> np.ndarray:
+        try:
+            data = np.array(embeddings, dtype=np.float32)
+        except ValueError as e:
+            raise ValueError("all embeddings must have the same dimension") from e
+        if data.ndim != 2:
+            raise ValueError("embeddings must be a 2-D sequence of vectors")
+        return self._normalize(data)
+
+    def _reserve(self, extra: int, dim: int) -> None:
+        if self._matrix is None:
+            capacity = max(self._initial_capacity, extra)
+            self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+            self._alive = np.zeros(capacity, dtype=bool)
+            return
+
+        needed = self._size + extra
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        # A memory-mapped snapshot matrix is read-only and exactly full, so
+        # the first add after loading lands here and copies it out.
+        capacity = max(capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        matrix = np.zeros((capacity, dim), dtype=np.float32)
+        matrix[: self._size] = self._matrix[: self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        self._matrix = matrix
+        self._alive = alive
 
     def add(
         self,
@@ -35,30 +175,342 @@ def add(
             raise ValueError("ids, documents, and embeddings must have same length")
 
         if metadatas is None:
-            metadatas = [{}] * len(documents)
+            metadatas = [{} for _ in documents]
         elif len(metadatas) != len(documents):
             raise ValueError("metadatas must have same length as documents")
 
-        self._ids.extend(ids)
-        self._documents.extend(documents)
-        self._embeddings.extend(embeddings)
-        self._metadatas.extend(metadatas)
-        self._dirty = True
-
-    def _rebuild_index(self) -> None:
-        """Rebuild FAISS index from stored embeddings."""
-        if not HAS_FAISS or not self._embeddings:
-            self._index = None
-            self._dirty = False
+        if not ids:
             return
 
-        dim = len(self._embeddings[0])
-        # Using IndexFlatIP with normalized vectors for cosine similarity
-        self._index = faiss.IndexFlatIP(dim)
-        data = np.array(self._embeddings).astype("float32")
-        faiss.normalize_L2(data)
-        self._index.add(data)
-        self._dirty = False
+        data = self._as_matrix(embeddings)
+        dim = data.shape[1]
+
+        # An id repeated within the batch keeps only its last occurrence
+        last = {doc_id: i for i, doc_id in enumerate(ids)}
+        if len(last) < len(ids):
+            keep = sorted(last.values())
+            ids = [ids[i] for i in keep]
+            documents = [documents[i] for i in keep]
+            metadatas = [metadatas[i] for i in keep]
+            data = data[keep]
+
+        with self._lock:
+            if self._matrix is not None and self._matrix.shape[1] != dim:
+                raise ValueError(f"embedding dimension {dim} does not match store dimension {self._matrix.shape[1]}")
+            if self._matrix is None:
+                self.embedding_dim = dim
+
+            # Re-adding an id replaces the previous row (upsert semantics).
+            replaced = [self._id_to_row[i] for i in ids if i in self._id_to_row]
+            self._tombstone(replaced)
+
+            self._reserve(len(ids), dim)
+            start = self._size
+            end = start + len(ids)
+            self._matrix[start:end] = data
+            self._alive[start:end] = True
+            self._size = end
+
+            self._ids.extend(ids)
+            self._documents.extend(documents)
+            self._metadatas.extend(metadatas)
+            for offset, (doc_id, metadata) in enumerate(zip(ids, metadatas, strict=True)):
+                self._id_to_row[doc_id] = start + offset
+                self._index_metadata(start + offset, metadata)
+            self._generation += 1
+            if replaced:
+                self._maybe_schedule_compaction()
+
+    def delete(self, ids: list[str] | None = None, where: dict[str, Any] | None = None) -> None:
+        if ids is None and where is None:
+            raise ValueError("Must provide either ids or where filter")
+
+        with self._lock:
+            rows: list[int] = []
+            if ids is not None:
+                rows.extend(self._id_to_row[i] for i in ids if i in self._id_to_row)
+            if where is not None:
+                rows.extend(self._filter_rows(where).tolist())
+            if not rows:
+                return
+            self._tombstone(rows)
+            self._generation += 1
+            self._maybe_schedule_compaction()
+
+    def _tombstone(self, rows: list[int]) -> None:
+        for row in rows:
+            if self._alive[row]:
+                self._alive[row] = False
+                self._dead += 1
+                self._id_to_row.pop(self._ids[row], None)
+
+    def count(self) -> int:
+        return self._size - self._dead
+
+    # ------------------------------------------------------------------
+    # Metadata index
+    # ------------------------------------------------------------------
+
+    def _index_metadata(self, row: int, metadata: dict[str, Any]) -> None:
+        if self._postings is None:
+            return
+        for key, value in metadata.items():
+            try:
+                postings = self._postings.setdefault(key, {}).setdefault(value, _Postings())
+            except TypeError:
+                continue  # unhashable values are matched by scanning
+            postings.append(row)
+
+    def _rebuild_metadata_index(self) -> None:
+        self._postings = {}
+        for row, metadata in enumerate(self._metadatas):
+            self._index_metadata(row, metadata)
+
+    def _filter_rows(self, where: dict[str, Any]) -> np.ndarray:
+        """Live rows whose metadata matches every ``where`` item."""
+        if self._postings is None:
+            self._rebuild_metadata_index()
+        candidates: list[np.ndarray] = []
+        for key, value in where.items():
+            try:
+                postings = self._postings.get(key, {}).get(value)
+            except TypeError:
+                return self._scan_rows(where)
+            if postings is None:
+                return np.zeros(0, dtype=np.int64)
+            candidates.append(postings.array())
+
+        if not candidates:
+            return np.flatnonzero(self._alive[: self._size])
+
+        candidates.sort(key=len)
+        rows = candidates[0]
+        for other in candidates[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows[self._alive[rows]]
+
+    def _scan_rows(self, where: dict[str, Any]) -> np.ndarray:
+        return np.array(
+            [
+                i
+                for i in np.flatnonzero(self._alive[: self._size])
+                if all(self._metadatas[i].get(k) == v for k, v in where.items())
+            ],
+            dtype=np.int64,
+        )
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def _maybe_schedule_compaction(self) -> None:
+        if self._size == 0 or self._dead / self._size < self.compact_threshold:
+            return
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(
+            target=self._compact, kwargs={"background": True}, name="dense-store-compaction", daemon=True
+        )
+        self._compaction_thread.start()
+
+    def compact(self) -> None:
+        """Drop tombstoned rows and rebuild the index over the live rows."""
+        self._compact(background=False)
+
+    def _compact(self, background: bool) -> None:
+        for _ in range(_COMPACT_ATTEMPTS):
+            with self._lock:
+                if self._matrix is None or self._dead == 0:
+                    return
+                generation = self._generation
+                live = np.flatnonzero(self._alive[: self._size])
+                matrix = self._matrix[live]
+
+            # Building the new index is the expensive part; do it outside the lock
+            # so readers and writers are not blocked while it runs.
+            index, kind = self._build_index(matrix)
+
+            with self._lock:
+                # A write since the snapshot would be lost by swapping it in
+                if generation == self._generation:
+                    self._swap_compacted(live, matrix, index, kind)
+                    return
+            if background:
+                logger.debug("Dense store changed during compaction; will retry on next delete")
+                return
+
+        # Writers kept landing during the rebuild; finish under the lock
+        with self._lock:
+            if self._matrix is None or self._dead == 0:
+                return
+            live = np.flatnonzero(self._alive[: self._size])
+            matrix = self._matrix[live]
+            index, kind = self._build_index(matrix)
+            self._swap_compacted(live, matrix, index, kind)
+
+    def _swap_compacted(self, live: np.ndarray, matrix: np.ndarray, index: Any, kind: str | None) -> None:
+        """Replace the storage with the compacted live rows (lock held)."""
+        self._matrix = matrix
+        self._alive = np.ones(len(live), dtype=bool)
+        self._size = len(live)
+        self._dead = 0
+        self._ids = [self._ids[i] for i in live]
+        self._documents = [self._documents[i] for i in live]
+        self._metadatas = [self._metadatas[i] for i in live]
+        self._id_to_row = {doc_id: row for row, doc_id in enumerate(self._ids)}
+        self._postings = None
+        self._index, self._index_kind = index, kind
+        self._indexed = self._size if index is not None else 0
+        self._generation += 1
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def save_snapshot(self, root: str | Path, *, dtype: str = "float32", keep: int = 2) -> Path:
+        """Persist the live rows as a new snapshot version under ``root``.
+
+        Args:
+            root: Snapshot root directory
+            dtype: On-disk embedding dtype ("float32", "float16" or "int8")
+            keep: Number of most recent versions to retain
+
+        Returns:
+            Path of the published version directory
+        """
+        with self._lock:
+            live = np.flatnonzero(self._alive[: self._size])
+            if self._matrix is None:
+                embeddings = np.zeros((0, self.embedding_dim or 0), dtype=np.float32)
+            else:
+                embeddings = self._matrix[live]
+            ids = [self._ids[i] for i in live]
+            documents = [self._documents[i] for i in live]
+            metadatas = [self._metadatas[i] for i in live]
+
+        return write_snapshot(root, embeddings, ids, documents, metadatas, dtype=dtype, keep=keep)
+
+    @classmethod
+    def load_snapshot(cls, root: str | Path, *, mmap: bool = True, **kwargs: Any) -> InMemoryDenseVectorStore:
+        """Open the current snapshot under ``root`` as a new store.
+
+        Args:
+            root: Snapshot root directory
+            mmap: Memory-map the snapshot files instead of reading them
+            **kwargs: Passed to the constructor (index settings)
+
+        Raises:
+            SnapshotError: If no readable snapshot exists
+        """
+        data = read_snapshot(root, mmap=mmap)
+        store = cls(embedding_dim=data.manifest["dim"] or None, **kwargs)
+        rows = data.manifest["rows"]
+        if rows == 0:
+            return store
+
+        store._matrix = data.embeddings
+        store._alive = np.ones(rows, dtype=bool)
+        store._size = rows
+        # Ids are small and needed for every upsert/delete, so decode them up
+        # front; documents and metadata stay mapped and decode on access.
+        store._ids = data.ids.tolist()
+        store._documents = data.documents
+        store._metadatas = data.metadatas
+        store._id_to_row = {doc_id: row for row, doc_id in enumerate(store._ids)}
+        store._postings = None
+        return store
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _wanted_index_kind(self, live_rows: int) -> str:
+        if self.ann_index is not None and live_rows >= self.ann_threshold:
+            return self.ann_index
+        return "flat"
+
+    def _new_index(self, kind: str, dim: int, train: np.ndarray) -> Any:
+        if kind == "hnsw":
+            index = faiss.IndexHNSWFlat(dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = self.hnsw_ef_search
+            return index
+        if kind == "ivf":
+            nlist = max(1, min(int(np.sqrt(len(train))), len(train) // 39 or 1))
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(train)
+            index.nprobe = min(self.ivf_nprobe, nlist)
+            return index
+        return faiss.IndexFlatIP(dim)
+
+    def _build_index(self, matrix: np.ndarray) -> tuple[Any, str | None]:
+        if not HAS_FAISS or len(matrix) == 0:
+            return None, None
+        kind = self._wanted_index_kind(len(matrix))
+        index = self._new_index(kind, matrix.shape[1], matrix)
+        index.add(np.ascontiguousarray(matrix))
+        return index, kind
+
+    def _sync_index(self) -> None:
+        """Bring the FAISS index up to date, appending only unseen rows."""
+        if not HAS_FAISS or self._matrix is None or self._size == 0:
+            return
+
+        kind = self._wanted_index_kind(self.count())
+        if self._index is None or kind != self._index_kind:
+            # First build, or promotion from flat to ANN. Dead rows are kept so
+            # that FAISS ids stay equal to matrix row numbers.
+            self._index = self._new_index(kind, self._matrix.shape[1], self._matrix[: self._size])
+            self._index_kind = kind
+            self._indexed = 0
+
+        if self._indexed < self._size:
+            self._index.add(np.ascontiguousarray(self._matrix[self._indexed : self._size]))
+            self._indexed = self._size
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def _query_vector(self, query_embedding: list[float]) -> np.ndarray:
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        if query.shape[1] != self._matrix.shape[1]:
+            raise ValueError(f"query dimension {query.shape[1]} does not match store dimension {self._matrix.shape[1]}")
+        return self._normalize(query.copy())
+
+    def _search_index(self, query: np.ndarray, n_results: int) -> list[tuple[int, float]]:
+        # Over-fetch by the number of tombstones so dead hits can be dropped
+        k = min(n_results + self._dead, self._index.ntotal)
+        sims, rows = self._index.search(query, k)
+        hits = [(int(row), float(sim)) for sim, row in zip(sims[0], rows[0], strict=False) if row >= 0]
+        return [(row, sim) for row, sim in hits if self._alive[row]][:n_results]
+
+    @staticmethod
+    def _top_k(sims: np.ndarray, k: int) -> np.ndarray:
+        if k < len(sims):
+            top = np.argpartition(-sims, k - 1)[:k]
+        else:
+            top = np.arange(len(sims))
+        return top[np.argsort(-sims[top], kind="stable")]
+
+    def _search_matrix(self, query: np.ndarray, rows: np.ndarray | None, n_results: int) -> list[tuple[int, float]]:
+        """Exact top-k over the normalised matrix, optionally restricted to ``rows``."""
+        if rows is not None and len(rows) < _GATHER_FRACTION * self._size:
+            sims = self._matrix[rows] @ query[0]
+            top = self._top_k(sims, min(n_results, len(rows)))
+            return [(int(rows[i]), float(sims[i])) for i in top]
+
+        sims = self._matrix[: self._size] @ query[0]
+        if rows is None:
+            sims[~self._alive[: self._size]] = -np.inf
+            k = min(n_results, self.count())
+        else:
+            masked = np.full_like(sims, -np.inf)
+            masked[rows] = sims[rows]
+            sims = masked
+            k = min(n_results, len(rows))
+        top = self._top_k(sims, k)
+        return [(int(i), float(sims[i])) for i in top]
 
     def query(
         self,
@@ -70,135 +522,32 @@ def query(
         if include is None:
             include = ["documents", "metadatas", "distances"]
 
-        if not self._embeddings:
-            return {"ids": [], "documents": [], "metadatas": [], "distances": []}
-
-        # If there's a filter, we might prefer brute force or filtering FAISS results
-        # For simplicity, use FAISS if no filter and available, else fallback
-        if HAS_FAISS and where is None:
-            if self._dirty or self._index is None:
-                self._rebuild_index()
-
-            if self._index:
-                query_vec = np.array([query_embedding]).astype("float32")
-                faiss.normalize_L2(query_vec)
-
-                # Search FAISS
-                # Fetching slightly more to ensure we have enough even with duplicates (idempotency)
-                k = min(n_results, self._index.ntotal)
-                distances, indices = self._index.search(query_vec, k)
-
-                # FAISS IndexFlatIP returns similarity, we want distance = 1 - similarity
-                final_ids = []
-                final_docs = []
-                final_metas = []
-                final_dists = []
-
-                for dist, idx in zip(distances[0], indices[0], strict=False):
-                    if idx < 0:
-                        continue
-                    final_ids.append(self._ids[idx])
-                    if "documents" in include:
-                        final_docs.append(self._documents[idx])
-                    if "metadatas" in include:
-                        final_metas.append(self._metadatas[idx])
-                    final_dists.append(float(1.0 - dist))
-
-                return {
-                    "ids": final_ids,
-                    "documents": final_docs,
-                    "metadatas": final_metas,
-                    "distances": final_dists,
-                }
-
-        # Fallback to vectorized numpy or original loop
-        if where is None:
-            candidate_indices = list(range(len(self._documents)))
-        else:
-            candidate_indices = [
-                i for i, meta in enumerate(self._metadatas) if all(meta.get(k) == v for k, v in where.items())
-            ]
-
-        if not candidate_indices:
-            return {"ids": [], "documents": [], "metadatas": [], "distances": []}
-
-        # Optimized brute force with numpy
-        if HAS_FAISS:  # We have numpy if we have faiss
-            embeddings = np.array([self._embeddings[i] for i in candidate_indices]).astype("float32")
-            query = np.array(query_embedding).astype("float32")
-
-            # Normalize for cosine distance
-            faiss.normalize_L2(embeddings)
-            query_norm = np.linalg.norm(query)
-            if query_norm > 0:
-                query = query / query_norm
-
-            similarities = np.dot(embeddings, query)
-            dists = 1.0 - similarities
-
-            # Sort and pick top K
-            scored = sorted(zip(candidate_indices, dists, strict=False), key=lambda x: x[1])
-        else:
-            # Original slow loop fallback
-            scored = []
-            for i in candidate_indices:
-                dist = self._cosine_distance(query_embedding, self._embeddings[i])
-                scored.append((i, dist))
-            scored.sort(key=lambda x: x[1])
-
-        scored = scored[: max(0, min(n_results, len(scored)))]
-
-        ids = [self._ids[i] for i, _ in scored]
-        documents = [self._documents[i] for i, _ in scored]
-        metadatas = [self._metadatas[i] for i, _ in scored]
-        distances = [d for _, d in scored]
-
-        return {
-            "ids": ids,
-            "documents": documents if "documents" in include else [],
-            "metadatas": metadatas if "metadatas" in include else [],
-            "distances": distances if "distances" in include else [],
-        }
-
-    def delete(self, ids: list[str] | None = None, where: dict[str, Any] | None = None) -> None:
-        if ids is None and where is None:
-            raise ValueError("Must provide either ids or where filter")
-
-        keep: list[int] = []
-        for i, doc_id in enumerate(self._ids):
-            if ids is not None and doc_id in ids:
-                continue
-            if where is not None and all(self._metadatas[i].get(k) == v for k, v in where.items()):
-                continue
-            keep.append(i)
-
-        self._ids = [self._ids[i] for i in keep]
-        self._documents = [self._documents[i] for i in keep]
-        self._embeddings = [self._embeddings[i] for i in keep]
-        self._metadatas = [self._metadatas[i] for i in keep]
-        self._dirty = True
-
-    def count(self) -> int:
-        return len(self._documents)
-
-    @staticmethod
-    def _cosine_distance(a: list[float], b: list[float]) -> float:
-        if len(a) == 0 or len(b) == 0:
-            return 1.0
-        n = min(len(a), len(b))
-        dot = 0.0
-        na = 0.0
-        nb = 0.0
-        for i in range(n):
-            av = float(a[i])
-            bv = float(b[i])
-            dot += av * bv
-            na += av * av
-            nb += bv * bv
-        if na == 0.0 or nb == 0.0:
-            return 1.0
-        sim = dot / (math.sqrt(na) * math.sqrt(nb))
-        return 1.0 - sim
+        empty: dict[str, Any] = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+
+        with self._lock:
+            if self.count() == 0 or n_results <= 0:
+                return empty
+
+            query = self._query_vector(query_embedding)
+
+            if where is None and HAS_FAISS:
+                self._sync_index()
+                scored = self._search_index(query, n_results)
+            elif where is None:
+                scored = self._search_matrix(query, None, n_results)
+            else:
+                rows = self._filter_rows(where)
+                if len(rows) == 0:
+                    return empty
+                scored = self._search_matrix(query, rows, n_results)
+
+            return {
+                "ids": [self._ids[i] for i, _ in scored],
+                "documents": [self._documents[i] for i, _ in scored] if "documents" in include else [],
+                "metadatas": [self._metadatas[i] for i, _ in scored] if "metadatas" in include else [],
+                # Cosine distance = 1 - similarity
+                "distances": [1.0 - sim for _, sim in scored] if "distances" in include else [],
+            }
 
 
 # Backward compatibility alias
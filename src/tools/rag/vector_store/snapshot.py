@@ -0,0 +1,324 @@
+"""Versioned binary snapshots for dense vector stores.
+
+A snapshot root holds numbered version directories plus a ``CURRENT`` pointer
+file naming the active one::
+
+    <root>/
+        CURRENT                 # "v000003"
+        v000003/
+            manifest.json       # format version, dtype, row count, dimension
+            embeddings.npy      # (rows, dim) float32 | float16 | int8
+            ids.bin, ids.idx.npy               # UTF-8 blob + int64 offsets
+            documents.bin, documents.idx.npy
+            metadata.bin, metadata.idx.npy     # one JSON object per row
+
+Versions are written to a temporary directory, fsynced, renamed into place and
+only then published by atomically replacing ``CURRENT``. Numbering, renaming
+and publishing happen under a writer lock on the root (``.lock``), so
+concurrent writers get distinct versions and ``CURRENT`` only moves forward. Readers that already
+mapped an older version keep a valid view until they reopen, so several
+processes can share one page-cached copy while a writer swaps in a new one.
+
+float32 embeddings are memory-mapped directly. float16 and int8 snapshots are
+smaller on disk but are dequantized into process memory on load; int8 rows
+are re-normalised after dequantizing so cosine scores stay unbiased.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    # Windows doesn't have fcntl
+    HAS_FCNTL = False
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_DTYPES = ("float32", "float16", "int8")
+CURRENT_POINTER = "CURRENT"
+WRITER_LOCK = ".lock"
+
+_INT8_SCALE = 127.0
+
+# Serializes writers in this process; the flock on WRITER_LOCK covers other processes
+_writer_lock = threading.Lock()
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, corrupt or of an unsupported version."""
+
+
+class MappedStrings(Sequence[Any]):
+    """Read-only view over an offsets-indexed UTF-8 blob, with an append-only tail.
+
+    Items are decoded on access, so opening a snapshot does not touch every
+    document. ``extend`` appends to an in-memory tail, letting a store loaded
+    from a snapshot accept new rows without materialising the mapped part.
+    """
+
+    def __init__(
+        self,
+        blob: np.ndarray,
+        offsets: np.ndarray,
+        decode: Callable[[str], Any] | None = None,
+    ) -> None:
+        self._blob = blob
+        self._offsets = offsets
+        self._decode = decode
+        self._base = len(offsets) - 1
+        self._tail: list[Any] = []
+
+    def __len__(self) -> int:
+        return self._base + len(self._tail)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index >= self._base:
+            return self._tail[index - self._base]
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        text = bytes(self._blob[start:end]).decode("utf-8")
+        return self._decode(text) if self._decode else text
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def extend(self, items: Iterable[Any]) -> None:
+        self._tail.extend(items)
+
+    def tolist(self) -> list[Any]:
+        """Decode every item in one pass over the blob."""
+        raw = self._blob.tobytes()
+        bounds = self._offsets.tolist()
+        items = [raw[start:end].decode("utf-8") for start, end in zip(bounds[:-1], bounds[1:], strict=True)]
+        if self._decode:
+            items = [self._decode(item) for item in items]
+        return items + self._tail
+
+
+@dataclass
+class SnapshotData:
+    """Arrays and sequences read from one snapshot version."""
+
+    path: Path
+    manifest: dict[str, Any]
+    embeddings: np.ndarray
+    ids: MappedStrings
+    documents: MappedStrings
+    metadatas: MappedStrings
+
+
+def _fsync_path(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # directories cannot be fsynced on every platform
+    finally:
+        os.close(fd)
+
+
+def _write_strings(directory: Path, name: str, items: Iterable[str]) -> None:
+    encoded = [item.encode("utf-8") for item in items]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    with open(directory / f"{name}.bin", "wb") as f:
+        f.write(b"".join(encoded))
+        f.flush()
+        os.fsync(f.fileno())
+    np.save(directory / f"{name}.idx.npy", offsets)
+
+
+def _read_strings(directory: Path, name: str, mmap: bool, decode: Callable[[str], Any] | None = None) -> MappedStrings:
+    blob_path = directory / f"{name}.bin"
+    offsets = np.load(directory / f"{name}.idx.npy", mmap_mode="r" if mmap else None)
+    if blob_path.stat().st_size == 0:
+        blob = np.zeros(0, dtype=np.uint8)
+    elif mmap:
+        blob = np.memmap(blob_path, dtype=np.uint8, mode="r")
+    else:
+        blob = np.fromfile(blob_path, dtype=np.uint8)
+    return MappedStrings(blob, offsets, decode)
+
+
+def _version_dirs(root: Path) -> list[Path]:
+    return sorted(p for p in root.glob("v[0-9]*") if p.is_dir())
+
+
+@contextmanager
+def _writer_locked(root: Path) -> Iterator[None]:
+    """Hold the snapshot writer lock for ``root``."""
+    with _writer_lock, open(root / WRITER_LOCK, "a") as f:
+        if HAS_FCNTL:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # Released when the file is closed
+        yield
+
+
+def _publish(root: Path, tmp: Path, keep: int) -> str:
+    """Rename ``tmp`` to the next free version, point ``CURRENT`` at it and prune."""
+    with _writer_locked(root):
+        while True:
+            existing = _version_dirs(root)
+            name = f"v{int(existing[-1].name[1:]) + 1 if existing else 1:06d}"
+            try:
+                os.rename(tmp, root / name)
+                break
+            except OSError:
+                # Taken by a writer that could not lock (no fcntl); try the next number
+                if not (root / name).exists():
+                    raise
+
+        pointer_tmp = root / f".{CURRENT_POINTER}.{uuid.uuid4().hex[:8]}"
+        pointer_tmp.write_text(name, encoding="utf-8")
+        os.replace(pointer_tmp, root / CURRENT_POINTER)
+        _fsync_path(root)
+
+        for old in _version_dirs(root)[: -max(1, keep)]:
+            shutil.rmtree(old, ignore_errors=True)
+    return name
+
+
+def current_snapshot(root: str | Path) -> Path | None:
+    """Return the directory of the active snapshot version, if any."""
+    root = Path(root)
+    pointer = root / CURRENT_POINTER
+    if not pointer.exists():
+        return None
+    return root / pointer.read_text(encoding="utf-8").strip()
+
+
+def write_snapshot(
+    root: str | Path,
+    embeddings: np.ndarray,
+    ids: Sequence[str],
+    documents: Sequence[str],
+    metadatas: Sequence[dict[str, Any]],
+    *,
+    dtype: str = "float32",
+    keep: int = 2,
+) -> Path:
+    """Write a new snapshot version and atomically make it current.
+
+    Args:
+        root: Snapshot root directory (created if missing)
+        embeddings: L2-normalised ``(rows, dim)`` float32 matrix
+        ids: Row ids
+        documents: Row document texts
+        metadatas: Row metadata dicts (must be JSON-serialisable)
+        dtype: On-disk embedding dtype, one of ``SNAPSHOT_DTYPES``
+        keep: Number of most recent versions to retain
+
+    Returns:
+        Path of the newly published version directory
+    """
+    if dtype not in SNAPSHOT_DTYPES:
+        raise ValueError(f"dtype must be one of {SNAPSHOT_DTYPES}, got {dtype!r}")
+    if not (len(embeddings) == len(ids) == len(documents) == len(metadatas)):
+        raise ValueError("embeddings, ids, documents and metadatas must have same length")
+
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    tmp = root / f".tmp-{uuid.uuid4().hex}"
+    tmp.mkdir()
+
+    try:
+        if dtype == "int8":
+            stored = np.clip(np.rint(embeddings * _INT8_SCALE), -127, 127).astype(np.int8)
+        else:
+            stored = np.ascontiguousarray(embeddings, dtype=dtype)
+        np.save(tmp / "embeddings.npy", stored)
+
+        _write_strings(tmp, "ids", ids)
+        _write_strings(tmp, "documents", documents)
+        _write_strings(tmp, "metadata", (json.dumps(m, separators=(",", ":"), default=str) for m in metadatas))
+
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "dtype": dtype,
+            "rows": int(len(ids)),
+            "dim": int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+            "created_at": time.time(),
+        }
+        (tmp / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+        for path in tmp.iterdir():
+            _fsync_path(path)
+        name = _publish(root, tmp, keep)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    logger.info(f"Published dense store snapshot {root / name} ({len(ids)} rows, {dtype})")
+    return root / name
+
+
+def read_snapshot(root: str | Path, *, mmap: bool = True) -> SnapshotData:
+    """Open the current snapshot version under ``root``.
+
+    Args:
+        root: Snapshot root directory
+        mmap: Memory-map embeddings and blobs instead of reading them into memory
+
+    Raises:
+        SnapshotError: If there is no snapshot or its format is unsupported
+    """
+    path = current_snapshot(root)
+    if path is None or not path.is_dir():
+        raise SnapshotError(f"No snapshot found under {root}")
+
+    try:
+        manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        raise SnapshotError(f"Unreadable snapshot manifest in {path}: {e}") from e
+
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(
+            f"Unsupported snapshot format {manifest.get('format_version')!r} in {path} "
+            f"(expected {SNAPSHOT_FORMAT_VERSION})"
+        )
+
+    dtype = manifest["dtype"]
+    embeddings = np.load(path / "embeddings.npy", mmap_mode="r" if mmap and dtype == "float32" else None)
+    if dtype == "int8":
+        embeddings = embeddings.astype(np.float32)
+        if embeddings.ndim == 2:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.where(norms > 0, norms, 1.0)
+    elif dtype == "float16":
+        embeddings = embeddings.astype(np.float32)
+
+    ids = _read_strings(path, "ids", mmap)
+    if len(ids) != manifest["rows"] or len(embeddings) != manifest["rows"]:
+        raise SnapshotError(f"Snapshot {path} is truncated: manifest says {manifest['rows']} rows")
+
+    return SnapshotData(
+        path=path,
+        manifest=manifest,
+        embeddings=embeddings,
+        ids=ids,
+        documents=_read_strings(path, "documents", mmap),
+        metadatas=_read_strings(path, "metadata", mmap, decode=json.loads),
+    )
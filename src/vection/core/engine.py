@@ -23,6 +23,7 @@
 from threading import Lock
 from typing import Any, TypeVar
 
+from vection.core.timer_wheel import TimerWheel
 from vection.schemas.context_state import Anchor, ContextStatus, VectionContext
 from vection.schemas.emergence_signal import EmergenceSignal
 from vection.schemas.velocity_vector import DirectionCategory, VelocityVector
@@ -41,6 +42,8 @@ class SessionState:
     last_directions: deque[str] = field(default_factory=lambda: deque(maxlen=10))
     topic_frequency: dict[str, int] = field(default_factory=dict)
     intent_sequence: list[str] = field(default_factory=list)
+    # Epoch seconds of the last establish() call; decay does not move it
+    last_interaction_at: float = field(default_factory=time.time)
 
 
 class Vection:
@@ -62,7 +65,8 @@ def __init__(self) -> None:
         self._started_at: datetime = datetime.now()
         self._total_interactions: int = 0
         self._decay_interval: float = 300.0  # 5 minutes
-        self._last_decay: float = time.time()
+        # Each session's next decay, so a pass only touches the sessions that are due
+        self._decay_timers: TimerWheel[str] = TimerWheel(resolution=5.0, slots=128, start=time.time())
 
         logger.info("VECTION engine initialized")
 
@@ -103,6 +107,7 @@ async def establish(self, session_id: str, event: Any) -> VectionContext:
 
         # Get or create session state
         state = self._get_or_create_session(session_id)
+        state.last_interaction_at = time.time()
 
         # Extract event data
         event_data = self._extract_event_data(event)
@@ -213,6 +218,7 @@ async def dissolve(self, session_id: str) -> bool:
 
         state.context.dissolve()
         del self._sessions[session_id]
+        self._decay_timers.cancel(session_id)
 
         logger.info(f"Session {session_id} dissolved")
         return True
@@ -266,6 +272,7 @@ def _get_or_create_session(self, session_id: str) -> SessionState:
         if session_id not in self._sessions:
             context = VectionContext.create(session_id)
             self._sessions[session_id] = SessionState(context=context)
+            self._decay_timers.schedule(session_id, time.time() + self._decay_interval)
             logger.debug(f"Created new session: {session_id}")
 
         return self._sessions[session_id]
@@ -664,22 +671,29 @@ async def _detect_correlations(self, state: SessionState) -> None:
                 self._global_signals.append(signal)
 
     async def _maybe_decay(self) -> None:
-        """Apply periodic decay to all sessions."""
+        """Apply periodic decay to the sessions whose decay interval has elapsed."""
         now = time.time()
-        if now - self._last_decay < self._decay_interval:
+        due = self._decay_timers.advance(now)
+        if not due:
             return
 
-        self._last_decay = now
+        for session_id in due:
+            state = self._sessions.get(session_id)
+            if state is None:
+                continue
 
-        for session_id, state in list(self._sessions.items()):
+            # Not context.last_updated: decay_all() touches that on every pass
+            idle_seconds = now - state.last_interaction_at
             state.context.decay_all(factor=0.05)
 
             # Remove dissolved or very stale sessions
             if state.context.status == ContextStatus.DISSOLVED:
                 del self._sessions[session_id]
-            elif state.context.staleness > 3600:  # 1 hour
+            elif idle_seconds > 3600:  # 1 hour
                 state.context.dissolve()
                 del self._sessions[session_id]
                 logger.info(f"Session {session_id} expired and dissolved")
+            else:
+                self._decay_timers.schedule(session_id, now + self._decay_interval)
 
-        logger.debug(f"Decay applied. Active sessions: {len(self._sessions)}")
+        logger.debug(f"Decay applied to {len(due)} sessions. Active sessions: {len(self._sessions)}")
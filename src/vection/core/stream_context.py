@@ -10,6 +10,13 @@
 - Thread anchor management with automatic promotion/demotion
 - Cross-session signal sharing
 - Context flow and continuity
+
+Sessions are spread over shards by hash of the session ID. Each shard has
+its own lock, keeps its sessions and each session's threads in LRU order so
+eviction is O(1), and files session and thread deadlines in a TimerWheel so
+cleanup only visits entries that are due instead of sweeping everything.
+Sessions, threads, retained histories and shared signals all have hard
+budgets, and evictions and expirations are counted in get_stats().
 """
 
 from __future__ import annotations
@@ -17,13 +24,15 @@
 import hashlib
 import logging
 import time
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict, deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import islice
 from threading import Lock
 from typing import Any, TypeVar
 
+from vection.core.timer_wheel import TimerWheel
 from vection.schemas.context_state import Anchor, AnchorType, ContextStatus, VectionContext
 from vection.schemas.emergence_signal import EmergenceSignal, SignalType
 
@@ -31,6 +40,12 @@
 
 T = TypeVar("T")
 
+# Snapshots kept per session
+MAX_SNAPSHOTS = 100
+
+# Staleness timers are checked at this granularity
+TIMER_RESOLUTION_SECONDS = 60.0
+
 
 @dataclass
 class ThreadState:
@@ -119,6 +134,28 @@ def to_dict(self) -> dict[str, Any]:
         }
 
 
+def _timer_wheel() -> TimerWheel[Any]:
+    return TimerWheel(TIMER_RESOLUTION_SECONDS, start=time.time())
+
+
+@dataclass
+class _SessionShard:
+    """One hash partition of the sessions, guarded by its own lock.
+
+    Sessions and each session's threads are kept least recently used
+    first. Timers hold each session's and thread's next staleness check.
+    """
+
+    max_sessions: int
+    lock: Lock = field(default_factory=Lock)
+    sessions: OrderedDict[str, VectionContext] = field(default_factory=OrderedDict)
+    threads: dict[str, OrderedDict[str, ThreadState]] = field(default_factory=dict)
+    history: OrderedDict[str, deque[SessionSnapshot]] = field(default_factory=OrderedDict)
+    session_timers: TimerWheel[str] = field(default_factory=lambda: _timer_wheel())
+    thread_timers: TimerWheel[tuple[str, str]] = field(default_factory=lambda: _timer_wheel())
+    metrics: Counter[str] = field(default_factory=Counter)
+
+
 class StreamContext:
     """Session and thread context manager.
 
@@ -132,6 +169,10 @@ class StreamContext:
     - Anchor promotion from thread to session level
     - Cross-session signal sharing
     - Session history and snapshots
+    - Hash-sharded sessions with per-shard locks and O(1) LRU eviction
+
+    Event hooks run after the shard lock is released, so they may call
+    back into the StreamContext.
     """
 
     _instance: StreamContext | None = None
@@ -144,20 +185,30 @@ def __init__(
         session_ttl_hours: float = 24.0,
         thread_ttl_hours: float = 4.0,
         snapshot_interval_minutes: float = 5.0,
+        shard_count: int = 16,
+        max_shared_signals: int = 500,
     ) -> None:
         """Initialize the StreamContext manager.
 
         Args:
-            max_sessions: Maximum number of concurrent sessions.
+            max_sessions: Maximum number of concurrent sessions. The budget
+                is split evenly across shards, and each shard evicts its
+                least recently used session when its share is full.
             max_threads_per_session: Maximum threads per session.
             session_ttl_hours: Session time-to-live in hours.
             thread_ttl_hours: Thread time-to-live in hours.
             snapshot_interval_minutes: Interval between automatic snapshots.
+            shard_count: Number of independently locked session shards.
+            max_shared_signals: Maximum number of shared signals retained.
         """
-        self._sessions: dict[str, VectionContext] = {}
-        self._threads: dict[str, dict[str, ThreadState]] = defaultdict(dict)
-        self._session_history: dict[str, list[SessionSnapshot]] = defaultdict(list)
-        self._shared_signals: dict[str, EmergenceSignal] = {}
+        shard_count = max(1, min(shard_count, max_sessions))
+        per_shard = -(-max_sessions // shard_count)
+        self._shards = [_SessionShard(max_sessions=per_shard) for _ in range(shard_count)]
+
+        self._shared_signals: OrderedDict[str, EmergenceSignal] = OrderedDict()
+        self._signals_lock = Lock()
+        self._max_shared_signals = max_shared_signals
+        self._signals_dropped = 0
 
         self._max_sessions = max_sessions
         self._max_threads_per_session = max_threads_per_session
@@ -171,7 +222,7 @@ def __init__(
         self._event_hooks: dict[str, list[Callable[..., Any]]] = defaultdict(list)
 
         logger.info(
-            f"StreamContext initialized: max_sessions={max_sessions}, "
+            f"StreamContext initialized: max_sessions={max_sessions}, shards={shard_count}, "
             f"session_ttl={session_ttl_hours}h, thread_ttl={thread_ttl_hours}h"
         )
 
@@ -211,18 +262,33 @@ def create_session(
         if session_id is None:
             session_id = self._generate_session_id()
 
-        if session_id in self._sessions:
+        shard = self._shard(session_id)
+        evicted: tuple[str, VectionContext] | None = None
+        with shard.lock:
+            existing = shard.sessions.get(session_id)
+            if existing is not None:
+                shard.sessions.move_to_end(session_id)
+            else:
+                # Enforce max sessions
+                if len(shard.sessions) >= shard.max_sessions:
+                    evicted_id = next(iter(shard.sessions))
+                    evicted = evicted_id, self._drop_session(shard, evicted_id)
+                    shard.metrics["sessions_evicted"] += 1
+
+                context = VectionContext.create(session_id, metadata)
+                shard.sessions[session_id] = context
+                shard.threads[session_id] = OrderedDict()
+                self._reset_history(shard, session_id)
+                shard.session_timers.schedule(session_id, time.time() + self._session_ttl_seconds)
+                shard.metrics["sessions_created"] += 1
+
+        if existing is not None:
             logger.warning(f"Session {session_id} already exists, returning existing")
-            return self._sessions[session_id]
-
-        # Enforce max sessions
-        if len(self._sessions) >= self._max_sessions:
-            self._evict_oldest_session()
+            return existing
 
-        context = VectionContext.create(session_id, metadata)
-        self._sessions[session_id] = context
-        self._threads[session_id] = {}
-        self._session_history[session_id] = []
+        if evicted is not None:
+            self._finish_dissolve(*evicted)
+            logger.info(f"Evicted least recently used session: {evicted[0]}")
 
         self._emit("session_created", session_id, context)
         logger.debug(f"Created session: {session_id}")
@@ -238,7 +304,12 @@ def get_session(self, session_id: str) -> VectionContext | None:
         Returns:
             VectionContext or None if not found.
         """
-        return self._sessions.get(session_id)
+        shard = self._shard(session_id)
+        with shard.lock:
+            context = shard.sessions.get(session_id)
+            if context is not None:
+                shard.sessions.move_to_end(session_id)
+        return context
 
     def get_or_create_session(
         self,
@@ -254,8 +325,9 @@ def get_or_create_session(
         Returns:
             VectionContext for the session.
         """
-        if session_id in self._sessions:
-            return self._sessions[session_id]
+        context = self.get_session(session_id)
+        if context is not None:
+            return context
         return self.create_session(session_id, metadata)
 
     def dissolve_session(self, session_id: str) -> bool:
@@ -267,31 +339,28 @@ def dissolve_session(self, session_id: str) -> bool:
         Returns:
             True if session was dissolved.
         """
-        if session_id not in self._sessions:
-            return False
-
-        context = self._sessions[session_id]
-        context.dissolve()
+        shard = self._shard(session_id)
+        with shard.lock:
+            if session_id not in shard.sessions:
+                return False
+            context = self._drop_session(shard, session_id)
 
-        # Clean up threads
-        if session_id in self._threads:
-            del self._threads[session_id]
-
-        # Keep history for a while (don't delete immediately)
-        del self._sessions[session_id]
-
-        self._emit("session_dissolved", session_id)
+        self._finish_dissolve(session_id, context)
         logger.info(f"Dissolved session: {session_id}")
 
         return True
 
     def list_sessions(self) -> list[str]:
         """Get all active session IDs."""
-        return list(self._sessions.keys())
+        session_ids: list[str] = []
+        for shard in self._shards:
+            with shard.lock:
+                session_ids.extend(shard.sessions)
+        return session_ids
 
     def get_session_count(self) -> int:
         """Get number of active sessions."""
-        return len(self._sessions)
+        return sum(len(shard.sessions) for shard in self._shards)
 
     # =========================================================================
     # Thread Management
@@ -313,24 +382,37 @@ def create_thread(
         Returns:
             ThreadState or None if session doesn't exist.
         """
-        if session_id not in self._sessions:
-            logger.warning(f"Cannot create thread: session {session_id} not found")
-            return None
-
         if thread_id is None:
             thread_id = self._generate_thread_id(session_id)
 
-        # Enforce max threads
-        if len(self._threads[session_id]) >= self._max_threads_per_session:
-            self._evict_oldest_thread(session_id)
+        shard = self._shard(session_id)
+        evicted_id: str | None = None
+        with shard.lock:
+            threads = shard.threads.get(session_id)
+            if threads is not None:
+                # Enforce max threads
+                if thread_id not in threads and len(threads) >= self._max_threads_per_session:
+                    evicted_id = next(iter(threads))
+                    self._drop_thread(shard, session_id, evicted_id)
+                    shard.metrics["threads_evicted"] += 1
+
+                thread = ThreadState(
+                    thread_id=thread_id,
+                    session_id=session_id,
+                    metadata=metadata or {},
+                )
+                threads[thread_id] = thread
+                threads.move_to_end(thread_id)
+                shard.thread_timers.schedule((session_id, thread_id), time.time() + self._thread_ttl_seconds)
+
+        if threads is None:
+            logger.warning(f"Cannot create thread: session {session_id} not found")
+            return None
 
-        thread = ThreadState(
-            thread_id=thread_id,
-            session_id=session_id,
-            metadata=metadata or {},
-        )
+        if evicted_id is not None:
+            self._emit("thread_dissolved", session_id, evicted_id)
+            logger.info(f"Evicted least recently used thread: {evicted_id} from {session_id}")
 
-        self._threads[session_id][thread_id] = thread
         self._emit("thread_created", session_id, thread_id, thread)
 
         logger.debug(f"Created thread: {thread_id} in session {session_id}")
@@ -346,7 +428,13 @@ def get_thread(self, session_id: str, thread_id: str) -> ThreadState | None:
         Returns:
             ThreadState or None if not found.
         """
-        return self._threads.get(session_id, {}).get(thread_id)
+        shard = self._shard(session_id)
+        with shard.lock:
+            threads = shard.threads.get(session_id)
+            thread = threads.get(thread_id) if threads else None
+            if thread is not None:
+                threads.move_to_end(thread_id)
+        return thread
 
     def get_or_create_thread(
         self,
@@ -371,7 +459,9 @@ def get_or_create_thread(
 
     def list_threads(self, session_id: str) -> list[str]:
         """Get all thread IDs for a session."""
-        return list(self._threads.get(session_id, {}).keys())
+        shard = self._shard(session_id)
+        with shard.lock:
+            return list(shard.threads.get(session_id, ()))
 
     def dissolve_thread(self, session_id: str, thread_id: str) -> bool:
         """Dissolve a thread.
@@ -383,21 +473,12 @@ def dissolve_thread(self, session_id: str, thread_id: str) -> bool:
         Returns:
             True if thread was dissolved.
         """
-        if session_id not in self._threads:
-            return False
-
-        if thread_id not in self._threads[session_id]:
-            return False
-
-        # Promote important anchors to session level before dissolving
-        thread = self._threads[session_id][thread_id]
-        session = self._sessions.get(session_id)
-        if session:
-            for anchor in thread.get_dominant_anchors(limit=2):
-                if anchor.effective_weight > 0.6:
-                    session.add_anchor(anchor)
+        shard = self._shard(session_id)
+        with shard.lock:
+            if thread_id not in shard.threads.get(session_id, ()):
+                return False
+            self._drop_thread(shard, session_id, thread_id)
 
-        del self._threads[session_id][thread_id]
         self._emit("thread_dissolved", session_id, thread_id)
 
         logger.debug(f"Dissolved thread: {thread_id} from session {session_id}")
@@ -421,7 +502,7 @@ def add_anchor_to_session(
         Returns:
             True if anchor was added.
         """
-        session = self._sessions.get(session_id)
+        session = self.get_session(session_id)
         if session is None:
             return False
 
@@ -468,7 +549,7 @@ def promote_anchor(
             True if anchor was promoted.
         """
         thread = self.get_thread(session_id, thread_id)
-        session = self._sessions.get(session_id)
+        session = self.get_session(session_id)
 
         if thread is None or session is None:
             return False
@@ -495,7 +576,7 @@ def get_session_anchors(
         Returns:
             List of anchors.
         """
-        session = self._sessions.get(session_id)
+        session = self.get_session(session_id)
         if session is None:
             return []
 
@@ -522,12 +603,16 @@ def share_signal(self, signal: EmergenceSignal) -> None:
         except ImportError:
             pass
 
-        self._shared_signals[signal.signal_id] = signal
-        self._emit("signal_shared", signal)
+        with self._signals_lock:
+            self._shared_signals[signal.signal_id] = signal
+            self._shared_signals.move_to_end(signal.signal_id)
 
-        # Enforce size limit
-        if len(self._shared_signals) > 500:
-            self._prune_shared_signals()
+            # Enforce size limit, oldest first; expired signals are pruned by cleanup()
+            while len(self._shared_signals) > self._max_shared_signals:
+                self._shared_signals.popitem(last=False)
+                self._signals_dropped += 1
+
+        self._emit("signal_shared", signal)
 
     def get_shared_signals(
         self,
@@ -543,8 +628,11 @@ def get_shared_signals(
         Returns:
             List of matching signals.
         """
+        with self._signals_lock:
+            shared = list(self._shared_signals.values())
+
         signals = []
-        for signal in self._shared_signals.values():
+        for signal in shared:
             if signal.effective_salience < min_salience:
                 continue
             if signal_type is not None and signal.signal_type != signal_type:
@@ -566,7 +654,9 @@ def take_snapshot(self, session_id: str) -> SessionSnapshot | None:
         Returns:
             SessionSnapshot or None if session not found.
         """
-        session = self._sessions.get(session_id)
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.sessions.get(session_id)
         if session is None:
             return None
 
@@ -583,11 +673,11 @@ def take_snapshot(self, session_id: str) -> SessionSnapshot | None:
             interaction_count=session.interaction_count,
         )
 
-        self._session_history[session_id].append(snapshot)
-
-        # Keep only recent history
-        if len(self._session_history[session_id]) > 100:
-            self._session_history[session_id] = self._session_history[session_id][-100:]
+        with shard.lock:
+            history = shard.history.get(session_id)
+            if history is None:
+                history = self._reset_history(shard, session_id)
+            history.append(snapshot)
 
         return snapshot
 
@@ -605,8 +695,10 @@ def get_session_history(
         Returns:
             List of snapshots (newest first).
         """
-        history = self._session_history.get(session_id, [])
-        return list(reversed(history[-limit:]))
+        shard = self._shard(session_id)
+        with shard.lock:
+            history = shard.history.get(session_id, ())
+            return list(islice(reversed(history), limit))
 
     # =========================================================================
     # Maintenance
@@ -615,6 +707,9 @@ def get_session_history(
     async def cleanup(self) -> dict[str, int]:
         """Run cleanup of stale sessions and threads.
 
+        Only sessions and threads whose staleness timer has come due are
+        examined; those that saw activity since are rescheduled.
+
         Returns:
             Dictionary with cleanup statistics.
         """
@@ -625,25 +720,26 @@ async def cleanup(self) -> dict[str, int]:
             "signals_pruned": 0,
         }
 
-        # Clean up stale sessions
-        for session_id in list(self._sessions.keys()):
-            session = self._sessions[session_id]
-            if session.staleness > self._session_ttl_seconds:
-                self.dissolve_session(session_id)
-                stats["sessions_dissolved"] += 1
-
-        # Clean up stale threads
-        for session_id in list(self._threads.keys()):
-            for thread_id in list(self._threads[session_id].keys()):
-                thread = self._threads[session_id][thread_id]
-                if thread.idle_seconds > self._thread_ttl_seconds:
-                    self.dissolve_thread(session_id, thread_id)
-                    stats["threads_dissolved"] += 1
+        for shard in self._shards:
+            with shard.lock:
+                sessions, threads = self._expire(shard, now)
+
+            # Clean up stale sessions
+            for session_id, context in sessions:
+                self._finish_dissolve(session_id, context)
+                logger.info(f"Dissolved session: {session_id}")
+            stats["sessions_dissolved"] += len(sessions)
+
+            # Clean up stale threads
+            for session_id, thread_id in threads:
+                self._emit("thread_dissolved", session_id, thread_id)
+            stats["threads_dissolved"] += len(threads)
 
         # Prune shared signals
-        before_count = len(self._shared_signals)
-        self._prune_shared_signals()
-        stats["signals_pruned"] = before_count - len(self._shared_signals)
+        with self._signals_lock:
+            before_count = len(self._shared_signals)
+            self._prune_shared_signals()
+            stats["signals_pruned"] = before_count - len(self._shared_signals)
 
         self._last_cleanup = now
         logger.debug(f"Cleanup completed: {stats}")
@@ -657,16 +753,32 @@ async def maybe_cleanup(self) -> None:
 
     def get_stats(self) -> dict[str, Any]:
         """Get StreamContext statistics."""
-        total_threads = sum(len(threads) for threads in self._threads.values())
-        total_anchors = sum(len(s.thread_anchors) for s in self._sessions.values())
+        active_sessions = total_threads = total_anchors = retained_histories = 0
+        metrics: Counter[str] = Counter()
+        for shard in self._shards:
+            with shard.lock:
+                active_sessions += len(shard.sessions)
+                total_threads += sum(len(threads) for threads in shard.threads.values())
+                total_anchors += sum(len(s.thread_anchors) for s in shard.sessions.values())
+                retained_histories += len(shard.history)
+                metrics.update(shard.metrics)
 
         return {
-            "active_sessions": len(self._sessions),
+            "active_sessions": active_sessions,
             "total_threads": total_threads,
             "total_anchors": total_anchors,
             "shared_signals": len(self._shared_signals),
             "max_sessions": self._max_sessions,
             "session_ttl_hours": self._session_ttl_seconds / 3600,
+            "shards": len(self._shards),
+            "retained_histories": retained_histories,
+            "sessions_created": metrics["sessions_created"],
+            "sessions_evicted": metrics["sessions_evicted"],
+            "sessions_expired": metrics["sessions_expired"],
+            "threads_evicted": metrics["threads_evicted"],
+            "threads_expired": metrics["threads_expired"],
+            "histories_dropped": metrics["histories_dropped"],
+            "signals_dropped": self._signals_dropped,
         }
 
     # =========================================================================
@@ -711,37 +823,90 @@ def _generate_session_id(self) -> str:
 
     def _generate_thread_id(self, session_id: str) -> str:
         """Generate a unique thread ID."""
-        thread_count = len(self._threads.get(session_id, {}))
+        thread_count = len(self._shard(session_id).threads.get(session_id, ()))
         hash_input = f"thread:{session_id}:{thread_count}:{time.time()}"
         return f"thr_{hashlib.md5(hash_input.encode()).hexdigest()[:10]}"  # noqa: S324 non-cryptographic use
 
-    def _evict_oldest_session(self) -> None:
-        """Evict the oldest session to make room."""
-        if not self._sessions:
-            return
+    def _shard(self, session_id: str) -> _SessionShard:
+        """Get the shard owning a session."""
+        return self._shards[hash(session_id) % len(self._shards)]
 
-        oldest_id = min(
-            self._sessions.keys(),
-            key=lambda sid: self._sessions[sid].established_at,
-        )
-        self.dissolve_session(oldest_id)
-        logger.info(f"Evicted oldest session: {oldest_id}")
-
-    def _evict_oldest_thread(self, session_id: str) -> None:
-        """Evict the oldest thread in a session."""
-        threads = self._threads.get(session_id, {})
-        if not threads:
-            return
-
-        oldest_id = min(
-            threads.keys(),
-            key=lambda tid: threads[tid].created_at,
-        )
-        self.dissolve_thread(session_id, oldest_id)
-        logger.info(f"Evicted oldest thread: {oldest_id} from {session_id}")
+    def _drop_session(self, shard: _SessionShard, session_id: str) -> VectionContext:
+        """Remove a session and its threads from a shard (shard lock held).
+
+        History is kept until the shard's history budget pushes it out.
+        """
+        context = shard.sessions.pop(session_id)
+        shard.session_timers.cancel(session_id)
+        for thread_id in shard.threads.pop(session_id, ()):
+            shard.thread_timers.cancel((session_id, thread_id))
+        return context
+
+    def _finish_dissolve(self, session_id: str, context: VectionContext) -> None:
+        """Dissolve a removed session's context and notify hooks (shard lock released)."""
+        context.dissolve()
+        self._emit("session_dissolved", session_id)
+
+    def _drop_thread(self, shard: _SessionShard, session_id: str, thread_id: str) -> ThreadState:
+        """Remove a thread, promoting its important anchors (shard lock held)."""
+        thread = shard.threads[session_id].pop(thread_id)
+        shard.thread_timers.cancel((session_id, thread_id))
+
+        # Promote important anchors to session level before dissolving
+        session = shard.sessions.get(session_id)
+        if session:
+            for anchor in thread.get_dominant_anchors(limit=2):
+                if anchor.effective_weight > 0.6:
+                    session.add_anchor(anchor)
+        return thread
+
+    def _reset_history(self, shard: _SessionShard, session_id: str) -> deque[SessionSnapshot]:
+        """Start an empty history for a session within the shard's budget (shard lock held)."""
+        history: deque[SessionSnapshot] = deque(maxlen=MAX_SNAPSHOTS)
+        shard.history[session_id] = history
+        shard.history.move_to_end(session_id)
+        while len(shard.history) > shard.max_sessions:
+            shard.history.popitem(last=False)
+            shard.metrics["histories_dropped"] += 1
+        return history
+
+    def _expire(
+        self, shard: _SessionShard, now: float
+    ) -> tuple[list[tuple[str, VectionContext]], list[tuple[str, str]]]:
+        """Remove the shard's sessions and threads whose timers are due and idle past their TTL (shard lock held).
+
+        Returns:
+            Removed (session_id, context) pairs and (session_id, thread_id) pairs.
+        """
+        sessions: list[tuple[str, VectionContext]] = []
+        for session_id in shard.session_timers.advance(now):
+            context = shard.sessions.get(session_id)
+            if context is None:
+                continue
+            deadline = context.last_updated.timestamp() + self._session_ttl_seconds
+            if deadline > now:
+                shard.session_timers.schedule(session_id, deadline)
+                continue
+            sessions.append((session_id, self._drop_session(shard, session_id)))
+
+        threads: list[tuple[str, str]] = []
+        for session_id, thread_id in shard.thread_timers.advance(now):
+            thread = shard.threads.get(session_id, {}).get(thread_id)
+            if thread is None:
+                continue
+            deadline = thread.last_active.timestamp() + self._thread_ttl_seconds
+            if deadline > now:
+                shard.thread_timers.schedule((session_id, thread_id), deadline)
+                continue
+            self._drop_thread(shard, session_id, thread_id)
+            threads.append((session_id, thread_id))
+
+        shard.metrics["sessions_expired"] += len(sessions)
+        shard.metrics["threads_expired"] += len(threads)
+        return sessions, threads
 
     def _prune_shared_signals(self) -> None:
-        """Remove expired shared signals."""
+        """Remove expired shared signals (signals lock held)."""
         to_remove = []
         for signal_id, signal in self._shared_signals.items():
             if signal.is_expired() or signal.effective_salience < 0.1:
@@ -0,0 +1,108 @@
+"""TimerWheel - Hashed timer wheel for deadline-driven maintenance.
+
+Sessions, threads and decay schedules each carry a deadline. Rather than
+sweeping every entry on each maintenance pass, entries are filed into the
+wheel slot of their deadline, and advancing the wheel only visits the slots
+whose time has passed.
+
+Deadlines further out than one revolution stay in their slot until a later
+lap reaches them. Callers typically reschedule lazily: when an entry fires,
+they check the owner's real last-activity time and either expire it or
+schedule it again, so activity itself never has to touch the wheel.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable
+
+
+class TimerWheel[K: Hashable]:
+    """Hashed timer wheel keyed by arbitrary hashable keys.
+
+    Scheduling, rescheduling and cancelling are O(1). Advancing is
+    proportional to the slots passed (at most one revolution) plus the
+    entries filed in them.
+    """
+
+    def __init__(self, resolution: float = 60.0, slots: int = 1024, start: float | None = None) -> None:
+        """Initialize the wheel.
+
+        Args:
+            resolution: Seconds covered by each slot.
+            slots: Number of slots in one revolution.
+            start: Time the wheel starts at (defaults to 0, so the first
+                advance catches up to the current time).
+        """
+        self._resolution = resolution
+        self._slots: list[dict[K, float]] = [{} for _ in range(slots)]
+        self._slot_of: dict[K, int] = {}
+        # Last slot collected; everything before start counts as elapsed
+        self._tick = int((start or 0.0) // resolution) - 1
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slot_of
+
+    def schedule(self, key: K, deadline: float) -> None:
+        """Schedule (or reschedule) a key to fire at a deadline.
+
+        Args:
+            key: Entry key.
+            deadline: Epoch seconds at which the key becomes due.
+        """
+        self.cancel(key)
+        # Deadlines in slots already passed go in the next slot to elapse
+        slot = max(int(deadline // self._resolution), self._tick + 1) % len(self._slots)
+        self._slots[slot][key] = deadline
+        self._slot_of[key] = slot
+
+    def cancel(self, key: K) -> bool:
+        """Remove a key from the wheel.
+
+        Returns:
+            True if the key was scheduled.
+        """
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        del self._slots[slot][key]
+        return True
+
+    def advance(self, now: float) -> list[K]:
+        """Advance the wheel to a time and collect the keys that are due.
+
+        Due keys are removed from the wheel. Keys fire once the slot holding
+        their deadline has elapsed, up to one resolution late.
+
+        Args:
+            now: Current epoch seconds.
+
+        Returns:
+            Keys whose deadline is at or before now.
+        """
+        # Only slots that have fully elapsed are collected, so a key fires
+        # at most one resolution after its deadline
+        target = int(now // self._resolution) - 1
+        if target <= self._tick:
+            return []
+
+        due: list[K] = []
+        first = self._tick + 1
+        for tick in range(max(first, target - len(self._slots) + 1), target + 1):
+            bucket = self._slots[tick % len(self._slots)]
+            expired = [key for key, deadline in bucket.items() if deadline <= now]
+            for key in expired:
+                del bucket[key]
+                del self._slot_of[key]
+            due.extend(expired)
+
+        self._tick = target
+        return due
+
+    def clear(self) -> None:
+        """Remove all scheduled keys."""
+        for bucket in self._slots:
+            bucket.clear()
+        self._slot_of.clear()
@@ -5,12 +5,13 @@
 per operation type and session.
 
 Features:
-- Sliding window algorithm for smooth rate limiting
+- Sliding window counter: O(1) checks and three numbers of state per
+  session and operation, however high the request rate
 - Per-session, per-operation tracking
 - Configurable limits for different operation types
 - Clear feedback when limits are exceeded
 - Integration with audit logging
-- Thread-safe implementation
+- Thread-safe implementation with sharded locks
 - Automatic cleanup of stale entries
 
 Usage:
@@ -35,9 +36,9 @@ async def create_signal(session_id: str, ...):
 from __future__ import annotations
 
 import functools
+import math
 import threading
 import time
-from collections import defaultdict
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import StrEnum
@@ -141,6 +142,7 @@ class RateLimitConfig:
         global_window_seconds: Window for global limit.
         cleanup_interval_seconds: How often to clean stale entries.
         enable_logging: Whether to log rate limit events.
+        lock_shards: Number of independently locked session shards.
     """
 
     default_limit: int = 100
@@ -151,6 +153,7 @@ class RateLimitConfig:
     global_window_seconds: float = 60.0
     cleanup_interval_seconds: float = 300.0
     enable_logging: bool = True
+    lock_shards: int = 16
 
     def __post_init__(self) -> None:
         """Set default operation limits."""
@@ -169,30 +172,52 @@ def __post_init__(self) -> None:
                 self.operation_limits[op] = limit
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitEntry:
-    """A single rate limit tracking entry.
+    """Sliding window counter for one session and operation.
+
+    Counts requests in fixed windows and estimates the sliding window count
+    by weighting the previous window by how much of it still overlaps:
+    ``previous * (1 - elapsed / window) + current``. While the previous
+    window is empty the estimate is the exact count.
 
     Attributes:
-        timestamps: List of request timestamps in the current window.
-        window_start: Start of the current window.
+        window_start: Monotonic start time of the current fixed window.
+        current: Requests counted in the current fixed window.
+        previous: Requests counted in the previous fixed window.
     """
 
-    timestamps: list[float] = field(default_factory=list)
-    window_start: float = field(default_factory=time.time)
+    window_start: float = field(default_factory=time.monotonic)
+    current: int = 0
+    previous: int = 0
 
-    def cleanup_old(self, window_seconds: float) -> None:
-        """Remove timestamps outside the current window.
+    def _advance(self, now: float, window_seconds: float) -> float:
+        """Roll the fixed windows forward to ``now``.
 
-        Args:
-            window_seconds: Window size in seconds.
+        Returns:
+            Fraction of the current window that has elapsed.
         """
-        cutoff = time.time() - window_seconds
-        self.timestamps = [ts for ts in self.timestamps if ts > cutoff]
+        elapsed = now - self.window_start
+        if elapsed >= window_seconds:
+            windows = int(elapsed // window_seconds)
+            self.previous = self.current if windows == 1 else 0
+            self.current = 0
+            self.window_start += windows * window_seconds
+            elapsed -= windows * window_seconds
+        return elapsed / window_seconds
+
+    def estimate(self, window_seconds: float, now: float | None = None) -> float:
+        """Get the estimated request count over the sliding window.
 
-    def add_request(self) -> None:
-        """Record a new request."""
-        self.timestamps.append(time.time())
+        Args:
+            window_seconds: Window size.
+            now: Monotonic time (defaults to now).
+
+        Returns:
+            Weighted request count.
+        """
+        fraction = self._advance(time.monotonic() if now is None else now, window_seconds)
+        return self.previous * (1.0 - fraction) + self.current
 
     def get_count(self, window_seconds: float) -> int:
         """Get request count in current window.
@@ -201,18 +226,46 @@ def get_count(self, window_seconds: float) -> int:
             window_seconds: Window size.
 
         Returns:
-            Number of requests in window.
+            Number of requests in window (estimate rounded up).
         """
-        self.cleanup_old(window_seconds)
-        return len(self.timestamps)
+        return math.ceil(self.estimate(window_seconds))
 
-    def get_oldest_timestamp(self) -> float | None:
-        """Get the oldest timestamp in the window.
+    def add_request(self) -> None:
+        """Record a new request."""
+        self.current += 1
+
+    def retry_after(self, limit: int, window_seconds: float, now: float | None = None) -> float:
+        """Get the seconds until the estimate drops below ``limit``.
+
+        Args:
+            limit: Maximum allowed requests.
+            window_seconds: Window size.
+            now: Monotonic time (defaults to now).
 
         Returns:
-            Oldest timestamp or None if empty.
+            Seconds to wait (0 if a request would be allowed now).
         """
-        return min(self.timestamps) if self.timestamps else None
+        now = time.monotonic() if now is None else now
+        fraction = self._advance(now, window_seconds)
+        excess = self.previous * (1.0 - fraction) + self.current - limit
+        if excess < 0:
+            return 0.0
+        remaining = (1.0 - fraction) * window_seconds
+
+        # The previous window's weight decays within the current window
+        if self.previous and self.current < limit:
+            wait = excess / self.previous * window_seconds
+            if wait < remaining:
+                return wait
+
+        # Otherwise wait for the current window to become the previous one
+        if self.current <= 0 or limit <= 0:
+            return remaining
+        return remaining + max(0.0, 1.0 - limit / self.current) * window_seconds
+
+    def is_stale(self, window_seconds: float, now: float) -> bool:
+        """Check whether both fixed windows have expired."""
+        return now - self.window_start >= 2 * window_seconds
 
 
 @dataclass
@@ -267,14 +320,28 @@ def to_headers(self) -> dict[str, str]:
         }
 
 
+@dataclass(slots=True)
+class _RateLimitShard:
+    """One lock-protected partition of the per-session entries."""
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Structure: {session_id: {operation: RateLimitEntry}}
+    entries: dict[str, dict[str, RateLimitEntry]] = field(default_factory=dict)
+    last_cleanup: float = field(default_factory=time.monotonic)
+    requests: int = 0
+    blocked: int = 0
+
+
 class RateLimiter:
     """Sliding window rate limiter.
 
     Provides rate limiting for VECTION operations with configurable
-    limits per operation type and session. Uses sliding window algorithm
-    for smooth rate limiting behavior.
+    limits per operation type and session. Uses a sliding window counter
+    for smooth rate limiting behavior in constant time and memory.
 
-    Thread-safe and suitable for concurrent use.
+    Thread-safe and suitable for concurrent use. Sessions are spread over
+    ``config.lock_shards`` independently locked shards, so threads checking
+    different sessions rarely contend.
 
     Usage:
         limiter = RateLimiter()
@@ -298,23 +365,65 @@ def __init__(self, config: RateLimitConfig | None = None) -> None:
             config: Rate limit configuration.
         """
         self.config = config or RateLimitConfig()
-        self._lock = threading.Lock()
 
-        # Per-session, per-operation tracking
-        # Structure: {session_id: {operation: RateLimitEntry}}
-        self._entries: dict[str, dict[str, RateLimitEntry]] = defaultdict(dict)
+        # Per-session, per-operation tracking, sharded by session
+        self._shards = [_RateLimitShard() for _ in range(max(1, self.config.lock_shards))]
 
         # Global tracking (across all sessions)
+        self._global_lock = threading.Lock()
         self._global_entries: dict[str, RateLimitEntry] = {}
 
-        # Statistics
-        self._total_requests = 0
-        self._total_blocked = 0
-        self._last_cleanup = time.time()
-
         # Audit logger (lazy loaded)
         self._audit_logger: Any = None
 
+    def _shard_for(self, session_id: str) -> _RateLimitShard:
+        """Get the shard holding a session's entries."""
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def _limits_for(self, operation: str) -> tuple[int, float]:
+        """Get the (limit, window) configured for an operation."""
+        return (
+            self.config.operation_limits.get(operation, self.config.default_limit),
+            self.config.operation_windows.get(operation, self.config.default_window_seconds),
+        )
+
+    @staticmethod
+    def _evaluate(
+        entry: RateLimitEntry,
+        limit: int,
+        window: float,
+        now: float,
+        consume: bool,
+    ) -> RateLimitStatus:
+        """Check an entry against its limit and optionally consume quota."""
+        estimate = entry.estimate(window, now)
+        current_count = math.ceil(estimate)
+        allowed = estimate < limit
+
+        # Calculate retry_after if blocked
+        retry_after = 0.0 if allowed else entry.retry_after(limit, window, now)
+
+        # Calculate remaining
+        remaining = max(0, limit - current_count - (1 if allowed and consume else 0))
+
+        # Calculate utilization
+        utilization = (current_count / limit * 100) if limit > 0 else 0
+
+        # Consume quota if allowed and requested
+        if allowed and consume:
+            entry.add_request()
+            current_count += 1
+
+        return RateLimitStatus(
+            allowed=allowed,
+            current_count=current_count,
+            limit=limit,
+            remaining=remaining,
+            window_seconds=window,
+            retry_after=retry_after,
+            utilization_percent=utilization,
+        )
+
     def allow(
         self,
         session_id: str,
@@ -350,76 +459,49 @@ def check(
         Returns:
             RateLimitStatus with full details.
         """
-        with self._lock:
-            self._maybe_cleanup()
-            self._total_requests += 1
+        # Get limits for this operation
+        limit, window = self._limits_for(operation)
+        shard = self._shard_for(session_id)
 
-            # Get limits for this operation
-            limit = self.config.operation_limits.get(operation, self.config.default_limit)
-            window = self.config.operation_windows.get(operation, self.config.default_window_seconds)
+        with shard.lock:
+            now = time.monotonic()
+            self._maybe_cleanup(shard, now)
+            shard.requests += 1
 
             # Get or create entry
-            if operation not in self._entries[session_id]:
-                self._entries[session_id][operation] = RateLimitEntry()
-
-            entry = self._entries[session_id][operation]
-
-            # Get current count
-            current_count = entry.get_count(window)
-
-            # Check if allowed
-            allowed = current_count < limit
-
-            # Calculate retry_after if blocked
-            retry_after = 0.0
-            if not allowed:
-                oldest = entry.get_oldest_timestamp()
-                if oldest:
-                    retry_after = max(0, (oldest + window) - time.time())
-
-            # Calculate remaining
-            remaining = max(0, limit - current_count - (1 if allowed and consume else 0))
+            operations = shard.entries.get(session_id)
+            if operations is None:
+                operations = shard.entries[session_id] = {}
+            entry = operations.get(operation)
+            if entry is None:
+                entry = operations[operation] = RateLimitEntry(window_start=now)
 
-            # Calculate utilization
-            utilization = (current_count / limit * 100) if limit > 0 else 0
-
-            # Consume quota if allowed and requested
-            if allowed and consume:
-                entry.add_request()
-                current_count += 1
+            status = self._evaluate(entry, limit, window, now, consume)
 
             # Check global limit if configured
-            if allowed and self.config.global_limit is not None:
+            if status.allowed and self.config.global_limit is not None:
                 global_status = self._check_global(session_id, operation, consume)
                 if not global_status.allowed:
-                    allowed = False
-                    retry_after = global_status.retry_after
-
-            # Log the event
-            if self.config.enable_logging:
-                self._log_rate_limit_event(
-                    session_id=session_id,
-                    operation=operation,
-                    allowed=allowed,
-                    current_count=current_count,
-                    limit=limit,
-                    window=window,
-                )
+                    status.allowed = False
+                    status.retry_after = global_status.retry_after
 
             # Update stats
-            if not allowed:
-                self._total_blocked += 1
+            if not status.allowed:
+                shard.blocked += 1
 
-            return RateLimitStatus(
-                allowed=allowed,
-                current_count=current_count,
+        # Log the event
+        if self.config.enable_logging:
+            self._log_rate_limit_event(
+                session_id=session_id,
+                operation=operation,
+                allowed=status.allowed,
+                current_count=status.current_count,
                 limit=limit,
-                remaining=remaining,
-                window_seconds=window,
-                retry_after=retry_after,
-                utilization_percent=utilization,
+                window=window,
             )
 
+        return status
+
     def _check_global(
         self,
         session_id: str,
@@ -446,37 +528,20 @@ def _check_global(
             )
 
         key = f"global:{operation}"
-        if key not in self._global_entries:
-            self._global_entries[key] = RateLimitEntry()
-
-        entry = self._global_entries[key]
         window = self.config.global_window_seconds
         limit = self.config.global_limit
 
-        current_count = entry.get_count(window)
-        allowed = current_count < limit
+        with self._global_lock:
+            now = time.monotonic()
+            entry = self._global_entries.get(key)
+            if entry is None:
+                entry = self._global_entries[key] = RateLimitEntry(window_start=now)
 
-        retry_after = 0.0
-        if not allowed:
-            oldest = entry.get_oldest_timestamp()
-            if oldest:
-                retry_after = max(0, (oldest + window) - time.time())
+            status = self._evaluate(entry, limit, window, now, consume)
 
-        if allowed and consume:
-            entry.add_request()
-            current_count += 1
-
-        remaining = max(0, limit - current_count)
-
-        return RateLimitStatus(
-            allowed=allowed,
-            current_count=current_count,
-            limit=limit,
-            remaining=remaining,
-            window_seconds=window,
-            retry_after=retry_after,
-            utilization_percent=(current_count / limit * 100) if limit > 0 else 0,
-        )
+        status.remaining = max(0, limit - status.current_count)
+        status.utilization_percent = (status.current_count / limit * 100) if limit > 0 else 0
+        return status
 
     def require(
         self,
@@ -571,17 +636,20 @@ def reset(self, session_id: str, operation: str | None = None) -> None:
             session_id: Session identifier.
             operation: Specific operation to reset (None for all).
         """
-        with self._lock:
-            if session_id in self._entries:
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            if session_id in shard.entries:
                 if operation is None:
-                    del self._entries[session_id]
-                elif operation in self._entries[session_id]:
-                    del self._entries[session_id][operation]
+                    del shard.entries[session_id]
+                elif operation in shard.entries[session_id]:
+                    del shard.entries[session_id][operation]
 
     def reset_all(self) -> None:
         """Reset all rate limits."""
-        with self._lock:
-            self._entries.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+        with self._global_lock:
             self._global_entries.clear()
 
     def get_session_status(self, session_id: str) -> dict[str, RateLimitStatus]:
@@ -593,15 +661,17 @@ def get_session_status(self, session_id: str) -> dict[str, RateLimitStatus]:
         Returns:
             Dictionary mapping operation to status.
         """
-        with self._lock:
-            result: dict[str, RateLimitStatus] = {}
+        result: dict[str, RateLimitStatus] = {}
+        shard = self._shard_for(session_id)
 
-            if session_id in self._entries:
-                for operation in self._entries[session_id]:
-                    # Check without consuming
-                    result[operation] = self.check(session_id, operation, consume=False)
+        with shard.lock:
+            now = time.monotonic()
+            for operation, entry in shard.entries.get(session_id, {}).items():
+                # Check without consuming
+                limit, window = self._limits_for(operation)
+                result[operation] = self._evaluate(entry, limit, window, now, consume=False)
 
-            return result
+        return result
 
     def get_stats(self) -> dict[str, Any]:
         """Get rate limiter statistics.
@@ -609,55 +679,54 @@ def get_stats(self) -> dict[str, Any]:
         Returns:
             Dictionary with statistics.
         """
-        with self._lock:
-            total_sessions = len(self._entries)
-            total_operations = sum(len(ops) for ops in self._entries.values())
-
-            return {
-                "total_requests": self._total_requests,
-                "total_blocked": self._total_blocked,
-                "block_rate_percent": (
-                    round((self._total_blocked / self._total_requests) * 100, 2) if self._total_requests > 0 else 0
-                ),
-                "active_sessions": total_sessions,
-                "active_operations": total_operations,
-                "config": {
-                    "default_limit": self.config.default_limit,
-                    "default_window_seconds": self.config.default_window_seconds,
-                    "global_limit": self.config.global_limit,
-                },
-            }
-
-    def _maybe_cleanup(self) -> None:
-        """Cleanup stale entries if interval has passed."""
-        now = time.time()
-        if now - self._last_cleanup < self.config.cleanup_interval_seconds:
+        total_requests = total_blocked = total_sessions = total_operations = 0
+        for shard in self._shards:
+            with shard.lock:
+                total_requests += shard.requests
+                total_blocked += shard.blocked
+                total_sessions += len(shard.entries)
+                total_operations += sum(len(ops) for ops in shard.entries.values())
+
+        return {
+            "total_requests": total_requests,
+            "total_blocked": total_blocked,
+            "block_rate_percent": (round((total_blocked / total_requests) * 100, 2) if total_requests > 0 else 0),
+            "active_sessions": total_sessions,
+            "active_operations": total_operations,
+            "config": {
+                "default_limit": self.config.default_limit,
+                "default_window_seconds": self.config.default_window_seconds,
+                "global_limit": self.config.global_limit,
+                "lock_shards": len(self._shards),
+            },
+        }
+
+    def _maybe_cleanup(self, shard: _RateLimitShard, now: float) -> None:
+        """Cleanup a shard's stale entries if interval has passed.
+
+        Called with the shard's lock held.
+        """
+        if now - shard.last_cleanup < self.config.cleanup_interval_seconds:
             return
 
-        self._last_cleanup = now
-        max_window = max(
-            self.config.default_window_seconds,
-            self.config.global_window_seconds,
-            *self.config.operation_windows.values(),
-        )
+        shard.last_cleanup = now
 
         # Cleanup session entries
-        for session_id in list(self._entries.keys()):
-            for operation in list(self._entries[session_id].keys()):
-                entry = self._entries[session_id][operation]
-                entry.cleanup_old(max_window)
-                if not entry.timestamps:
-                    del self._entries[session_id][operation]
+        for session_id in list(shard.entries.keys()):
+            operations = shard.entries[session_id]
+            for operation in list(operations.keys()):
+                _, window = self._limits_for(operation)
+                if operations[operation].is_stale(window, now):
+                    del operations[operation]
 
-            if not self._entries[session_id]:
-                del self._entries[session_id]
+            if not operations:
+                del shard.entries[session_id]
 
         # Cleanup global entries
-        for key in list(self._global_entries.keys()):
-            entry = self._global_entries[key]
-            entry.cleanup_old(self.config.global_window_seconds)
-            if not entry.timestamps:
-                del self._global_entries[key]
+        with self._global_lock:
+            for key in list(self._global_entries.keys()):
+                if self._global_entries[key].is_stale(self.config.global_window_seconds, now):
+                    del self._global_entries[key]
 
     def _log_rate_limit_event(
         self,
@@ -9,6 +9,12 @@
 - Temporal: Events occurring in bursts
 - Session-based: Patterns within sessions
 - Cross-session: Patterns across users/sessions
+
+Centroids are kept in a CentroidIndex as fixed-width rows of hashed feature
+values and hashed keywords, so an observation is scored against every
+centroid, and centroids against each other for merging, with batched numpy
+comparisons. Each cluster keeps per-feature value counts that are updated as
+members join and leave, instead of recounting its members on every add.
 """
 
 from __future__ import annotations
@@ -18,17 +24,23 @@
 import logging
 import math
 import time
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import StrEnum
 from typing import Any
 
+import numpy as np
+
 from vection.schemas.emergence_signal import EmergenceSignal, SignalType
 
 logger = logging.getLogger(__name__)
 
+SCALAR_FEATURES = ("action", "type", "intent", "topic", "category", "domain")
+MAX_KEYWORDS = 5
+MAX_CLUSTER_MEMBERS = 100
+
 
 class ClusterType(StrEnum):
     """Types of clusters detected."""
@@ -64,6 +76,8 @@ class Cluster:
     last_updated: float = field(default_factory=time.time)
     stability_score: float = 0.0
     metadata: dict[str, Any] = field(default_factory=dict)
+    _value_counts: dict[str, Counter[Any]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _distance_total: float = field(default=0.0, init=False, repr=False, compare=False)
 
     @property
     def size(self) -> int:
@@ -92,26 +106,39 @@ def add_member(self, member: ClusterMember) -> None:
         """Add a member to the cluster."""
         self.members.append(member)
         self.last_updated = time.time()
-        self._update_centroid()
-        self._update_stability()
+        changed = self._count(member, 1)
 
         # Cap members
-        if len(self.members) > 100:
-            self.members = self.members[-100:]
-
-    def _update_centroid(self) -> None:
-        """Update centroid from members."""
-        if not self.members:
-            return
+        if len(self.members) > MAX_CLUSTER_MEMBERS:
+            for dropped in self.members[:-MAX_CLUSTER_MEMBERS]:
+                changed |= self._count(dropped, -1)
+            self.members = self.members[-MAX_CLUSTER_MEMBERS:]
 
-        # Aggregate feature counts
-        feature_counts: dict[str, dict[Any, int]] = defaultdict(lambda: defaultdict(int))
-        for member in self.members:
-            for key, value in member.features.items():
-                feature_counts[key][value] += 1
+        self._update_centroid(changed)
+        self._update_stability()
 
-        # Centroid is most common value for each feature
-        self.centroid = {key: max(values.items(), key=lambda x: x[1])[0] for key, values in feature_counts.items()}
+    def _count(self, member: ClusterMember, delta: int) -> set[str]:
+        """Add delta to the member's feature value counts; returns the features touched."""
+        for key, value in member.features.items():
+            counts = self._value_counts.setdefault(key, Counter())
+            counts[value] += delta
+            if counts[value] <= 0:
+                del counts[value]
+        self._distance_total += delta * member.distance_to_centroid
+        return set(member.features)
+
+    def _update_centroid(self, keys: set[str] | None = None) -> None:
+        """Update the centroid's value for the given features (all if None) from the value counts."""
+        centroid = dict(self.centroid)
+        for key in self._value_counts if keys is None else keys:
+            counts = self._value_counts.get(key)
+            if counts:
+                # Centroid is most common value for each feature
+                centroid[key] = max(counts.items(), key=lambda x: x[1])[0]
+            else:
+                self._value_counts.pop(key, None)
+                centroid.pop(key, None)
+        self.centroid = centroid
 
     def _update_stability(self) -> None:
         """Update stability score."""
@@ -120,8 +147,7 @@ def _update_stability(self) -> None:
             return
 
         # Calculate average distance to centroid
-        total_distance = sum(m.distance_to_centroid for m in self.members)
-        avg_distance = total_distance / len(self.members)
+        avg_distance = self._distance_total / len(self.members)
 
         # Lower distance = higher stability (inverse)
         self.stability_score = max(0.0, 1.0 - avg_distance)
@@ -142,6 +168,150 @@ class EventFeatures:
     raw_data: dict[str, Any] = field(default_factory=dict)
 
 
+def _feature_hash(value: Any) -> int:
+    """Nonzero hash of a feature value; 0 marks an absent feature."""
+    return hash(value) or 1
+
+
+def _similarity_matrix(
+    values_a: np.ndarray,
+    keywords_a: np.ndarray,
+    values_b: np.ndarray,
+    keywords_b: np.ndarray,
+) -> np.ndarray:
+    """Clusterer._calculate_similarity between every column of block a and every column of block b.
+
+    Blocks hold one encoded feature set per column: values (len(SCALAR_FEATURES), m)
+    and keywords (MAX_KEYWORDS, m). Returns an (m, n) array.
+    """
+    va, vb = values_a[:, :, None], values_b[:, None, :]
+    matches = ((va == vb) & (va != 0)).sum(axis=0)
+    keys = ((va != 0) | (vb != 0)).sum(axis=0)
+
+    # Keyword sets: Jaccard similarity of the nonzero hashes
+    ka = keywords_a[:, None, :, None]
+    shared = ((ka == keywords_b[None, :, None, :]) & (ka != 0)).sum(axis=(0, 1))
+    count_a = np.count_nonzero(keywords_a, axis=0)[:, None]
+    count_b = np.count_nonzero(keywords_b, axis=0)[None, :]
+    has_a, has_b = count_a > 0, count_b > 0
+    jaccard = np.where(has_a & has_b, shared / np.maximum(count_a + count_b - shared, 1), 0.0)
+    keys = keys + (has_a | has_b)
+
+    return np.where(keys > 0, (matches + jaccard) / np.maximum(keys, 1), 0.0)
+
+
+class CentroidIndex:
+    """Cluster centroids and confidence inputs in contiguous arrays for batched scoring.
+
+    Column i describes cluster_ids[i]: the hashed value of each of
+    SCALAR_FEATURES (0 where absent), up to MAX_KEYWORDS distinct hashed
+    keywords, and the cluster's size, stability and last update time.
+    Similarities equal Clusterer._calculate_similarity on extracted features
+    up to hash collisions. Removing a cluster moves the last column into its
+    place.
+    """
+
+    BLOCK_COLUMNS = 64  # Clusters per block when scoring all pairs
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.cluster_ids: list[str] = []
+        self._columns: dict[str, int] = {}
+        self._values = np.zeros((len(SCALAR_FEATURES), capacity), dtype=np.int64)
+        self._keywords = np.zeros((MAX_KEYWORDS, capacity), dtype=np.int64)
+        self._sizes = np.zeros(capacity, dtype=np.int64)
+        self._stability = np.zeros(capacity)
+        self._updated = np.zeros(capacity)
+
+    def __len__(self) -> int:
+        return len(self.cluster_ids)
+
+    @staticmethod
+    def encode(features: dict[str, Any]) -> tuple[np.ndarray, np.ndarray]:
+        """Encode a feature set as (scalar value hashes, keyword hashes)."""
+        values = np.array(
+            [_feature_hash(features[key]) if features.get(key) is not None else 0 for key in SCALAR_FEATURES],
+            dtype=np.int64,
+        )
+        keywords = np.zeros(MAX_KEYWORDS, dtype=np.int64)
+        hashed = list(dict.fromkeys(_feature_hash(word) for word in features.get("keywords") or ()))[:MAX_KEYWORDS]
+        keywords[: len(hashed)] = hashed
+        return values, keywords
+
+    def set(self, cluster: Cluster) -> None:
+        """Add or update a cluster."""
+        column = self._columns.get(cluster.cluster_id)
+        if column is None:
+            column = len(self.cluster_ids)
+            if column == self._sizes.size:
+                self._grow()
+            self._columns[cluster.cluster_id] = column
+            self.cluster_ids.append(cluster.cluster_id)
+        self._values[:, column], self._keywords[:, column] = self.encode(cluster.centroid)
+        self._sizes[column] = cluster.size
+        self._stability[column] = cluster.stability_score
+        self._updated[column] = cluster.last_updated
+
+    def _grow(self) -> None:
+        self._values = np.concatenate([self._values, np.zeros_like(self._values)], axis=1)
+        self._keywords = np.concatenate([self._keywords, np.zeros_like(self._keywords)], axis=1)
+        self._sizes = np.concatenate([self._sizes, np.zeros_like(self._sizes)])
+        self._stability = np.concatenate([self._stability, np.zeros_like(self._stability)])
+        self._updated = np.concatenate([self._updated, np.zeros_like(self._updated)])
+
+    def remove(self, cluster_id: str) -> None:
+        """Remove a cluster if indexed."""
+        column = self._columns.pop(cluster_id, None)
+        if column is None:
+            return
+        last = len(self.cluster_ids) - 1
+        if column != last:
+            moved = self.cluster_ids[last]
+            self.cluster_ids[column] = moved
+            self._columns[moved] = column
+            for array in (self._values, self._keywords):
+                array[:, column] = array[:, last]
+            for array in (self._sizes, self._stability, self._updated):
+                array[column] = array[last]
+        self.cluster_ids.pop()
+
+    def clear(self) -> None:
+        self.cluster_ids.clear()
+        self._columns.clear()
+
+    def similarities(self, features: dict[str, Any]) -> np.ndarray:
+        """Similarity of a feature set to every centroid, in cluster_ids order."""
+        values, keywords = self.encode(features)
+        n = len(self.cluster_ids)
+        return _similarity_matrix(values[:, None], keywords[:, None], self._values[:, :n], self._keywords[:, :n])[0]
+
+    def similar_pairs(self, threshold: float) -> list[tuple[str, str]]:
+        """Cluster ID pairs with similarity above threshold, in column order."""
+        n = len(self.cluster_ids)
+        pairs: list[tuple[str, str]] = []
+        for start in range(0, n, self.BLOCK_COLUMNS):
+            stop = min(start + self.BLOCK_COLUMNS, n)
+            block = _similarity_matrix(
+                self._values[:, start:stop], self._keywords[:, start:stop], self._values[:, :n], self._keywords[:, :n]
+            )
+            # Upper triangle only: column > global row
+            rows, cols = np.nonzero(np.triu(block > threshold, k=start + 1))
+            pairs.extend((self.cluster_ids[start + r], self.cluster_ids[c]) for r, c in zip(rows, cols, strict=True))
+        return pairs
+
+    def weakest(self) -> str | None:
+        """ID of the cluster with the lowest confidence, the stalest among ties."""
+        n = len(self.cluster_ids)
+        if not n:
+            return None
+        # Cluster.confidence over all columns
+        staleness = time.time() - self._updated[:n]
+        size_factor = np.minimum(1.0, np.log1p(self._sizes[:n]) / 3.0)
+        recency_factor = np.maximum(0.0, 1.0 - staleness / 600.0)
+        confidence = size_factor * 0.4 + self._stability[:n] * 0.4 + recency_factor * 0.2
+        tied = np.flatnonzero(confidence == confidence.min())
+        return self.cluster_ids[tied[staleness[tied].argmax()]]
+
+
 class Clusterer:
     """Background worker for request stream clustering.
 
@@ -185,6 +355,7 @@ def __init__(
 
         self._observations: deque[EventFeatures] = deque(maxlen=max_observations)
         self._clusters: dict[str, Cluster] = {}
+        self._index = CentroidIndex()
         self._emitted_signals: deque[EmergenceSignal] = deque(maxlen=200)
         self._emitted_cluster_ids: set[str] = set()
 
@@ -366,6 +537,7 @@ def reset(self) -> None:
         """Reset clusterer state."""
         self._observations.clear()
         self._clusters.clear()
+        self._index.clear()
         self._emitted_signals.clear()
         self._emitted_cluster_ids.clear()
         self._feature_vocabulary.clear()
@@ -415,11 +587,13 @@ def _assign_to_cluster(self, observation: EventFeatures) -> None:
         best_similarity = 0.0
 
         # Find best matching cluster
-        for cluster in self._clusters.values():
-            similarity = self._calculate_similarity(observation.features, cluster.centroid)
-            if similarity > best_similarity and similarity >= self._similarity_threshold:
+        if self._index:
+            similarities = self._index.similarities(observation.features)
+            row = int(similarities.argmax())
+            similarity = float(similarities[row])
+            if similarity > 0.0 and similarity >= self._similarity_threshold:
                 best_similarity = similarity
-                best_cluster = cluster
+                best_cluster = self._clusters[self._index.cluster_ids[row]]
 
         if best_cluster:
             # Add to existing cluster
@@ -431,6 +605,7 @@ def _assign_to_cluster(self, observation: EventFeatures) -> None:
                 distance_to_centroid=1.0 - best_similarity,
             )
             best_cluster.add_member(member)
+            self._index.set(best_cluster)
 
             # Track session-cluster association
             if best_cluster.cluster_id not in self._session_clusters[observation.session_id]:
@@ -473,6 +648,7 @@ def _create_cluster(self, observation: EventFeatures) -> Cluster:
         cluster.add_member(member)
 
         self._clusters[cluster_id] = cluster
+        self._index.set(cluster)
         self._session_clusters[observation.session_id].append(cluster_id)
 
         logger.debug(f"Created cluster: {cluster_id} ({label})")
@@ -512,36 +688,34 @@ async def _decay_clusters(self) -> None:
                 to_remove.append(cluster_id)
 
         for cluster_id in to_remove:
-            del self._clusters[cluster_id]
+            self._remove_cluster(cluster_id)
             logger.debug(f"Removed stale cluster: {cluster_id}")
 
     async def _merge_clusters(self) -> None:
         """Merge highly similar clusters."""
-        cluster_list = list(self._clusters.values())
         merged = set()
 
-        for i, cluster_a in enumerate(cluster_list):
-            if cluster_a.cluster_id in merged:
+        # Very high similarity threshold for merge
+        for id_a, id_b in self._index.similar_pairs(0.9):
+            if id_a in merged or id_b in merged:
                 continue
 
-            for cluster_b in cluster_list[i + 1 :]:
-                if cluster_b.cluster_id in merged:
-                    continue
+            # Earlier merges in this pass may have moved the centroids
+            cluster_a, cluster_b = self._clusters[id_a], self._clusters[id_b]
+            if self._calculate_similarity(cluster_a.centroid, cluster_b.centroid) <= 0.9:
+                continue
 
-                similarity = self._calculate_similarity(cluster_a.centroid, cluster_b.centroid)
-                if similarity > 0.9:  # Very high similarity threshold for merge
-                    # Merge smaller into larger
-                    if cluster_a.size >= cluster_b.size:
-                        self._merge_into(cluster_b, cluster_a)
-                        merged.add(cluster_b.cluster_id)
-                    else:
-                        self._merge_into(cluster_a, cluster_b)
-                        merged.add(cluster_a.cluster_id)
+            # Merge smaller into larger
+            if cluster_a.size >= cluster_b.size:
+                self._merge_into(cluster_b, cluster_a)
+                merged.add(id_b)
+            else:
+                self._merge_into(cluster_a, cluster_b)
+                merged.add(id_a)
 
         # Remove merged clusters
         for cluster_id in merged:
-            if cluster_id in self._clusters:
-                del self._clusters[cluster_id]
+            self._remove_cluster(cluster_id)
 
     def _merge_into(self, source: Cluster, target: Cluster) -> None:
         """Merge source cluster into target.
@@ -552,25 +726,24 @@ def _merge_into(self, source: Cluster, target: Cluster) -> None:
         """
         for member in source.members:
             target.add_member(member)
+        self._index.set(target)
 
         logger.debug(f"Merged cluster {source.cluster_id} into {target.cluster_id}")
 
     def _evict_weakest_cluster(self) -> None:
         """Evict the weakest cluster to make room."""
-        if not self._clusters:
+        weakest_id = self._index.weakest()
+        if weakest_id is None:
             return
 
-        weakest_id = min(
-            self._clusters.keys(),
-            key=lambda cid: (
-                self._clusters[cid].confidence,
-                -self._clusters[cid].staleness_seconds,
-            ),
-        )
-
-        del self._clusters[weakest_id]
+        self._remove_cluster(weakest_id)
         logger.debug(f"Evicted weak cluster: {weakest_id}")
 
+    def _remove_cluster(self, cluster_id: str) -> None:
+        """Drop a cluster and its centroid row."""
+        self._clusters.pop(cluster_id, None)
+        self._index.remove(cluster_id)
+
     def _extract_features(self, event_data: dict[str, Any]) -> dict[str, Any]:
         """Extract clustering features from event data.
 
@@ -583,7 +756,7 @@ def _extract_features(self, event_data: dict[str, Any]) -> dict[str, Any]:
         features: dict[str, Any] = {}
 
         # Key fields to extract
-        for key in ("action", "type", "intent", "topic", "category", "domain"):
+        for key in SCALAR_FEATURES:
             if key in event_data and event_data[key]:
                 features[key] = str(event_data[key]).lower()
 
@@ -592,7 +765,7 @@ def _extract_features(self, event_data: dict[str, Any]) -> dict[str, Any]:
         if isinstance(content, str) and content:
             words = [w.lower() for w in content.split() if len(w) > 4 and w.isalpha()]
             if words:
-                features["keywords"] = tuple(sorted(words[:5]))
+                features["keywords"] = tuple(sorted(words[:MAX_KEYWORDS]))
 
         return features
 
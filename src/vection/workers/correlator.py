@@ -10,6 +10,14 @@
 - Causal: Events that seem to trigger other events
 - Semantic: Events with similar content/meaning
 - Behavioral: Events reflecting similar user behavior
+
+Temporal pairs and session sequences are counted as events arrive, so a
+processing tick only folds the accumulated counts into candidates:
+- Temporal: a sliding window keeps per-event-type counts and timestamp sums,
+  so a new event is paired with every windowed event of a type at once
+  (the proximity boosts of n events sum to n - (n*t - sum(t_i)) / window).
+- Sequence: each session keeps counts of its adjacent event-type pairs over
+  its last 20 events, updated on append, plus totals over all sessions.
 """
 
 from __future__ import annotations
@@ -18,7 +26,7 @@
 import hashlib
 import logging
 import time
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
@@ -29,6 +37,8 @@
 
 logger = logging.getLogger(__name__)
 
+SEQUENCE_LENGTH = 20  # Events per session considered for sequence correlation
+
 
 class CorrelationType(StrEnum):
     """Types of correlation detected."""
@@ -76,6 +86,12 @@ def add_occurrence(self, confidence_boost: float = 0.1) -> None:
         self.last_seen = time.time()
         self.confidence_accumulator += confidence_boost
 
+    def add_occurrences(self, count: int, confidence_total: float) -> None:
+        """Record several occurrences at once, with their summed confidence boosts."""
+        self.occurrence_count += count
+        self.last_seen = time.time()
+        self.confidence_accumulator += confidence_total
+
     def should_emit(self, threshold: float = 0.5) -> bool:
         """Check if this candidate should become a signal."""
         return self.confidence >= threshold and self.occurrence_count >= 3
@@ -93,6 +109,14 @@ class EventObservation:
     data: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class _Tally:
+    """A count and a running sum."""
+
+    count: int = 0
+    total: float = 0.0
+
+
 class Correlator:
     """Background worker for cross-request correlation detection.
 
@@ -135,7 +159,20 @@ def __init__(
         self._candidates: dict[str, CorrelationCandidate] = {}
         self._emitted_signals: deque[EmergenceSignal] = deque(maxlen=200)
         self._co_occurrence_matrix: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        self._sequence_tracker: dict[str, list[str]] = defaultdict(list)
+        self._sequence_tracker: dict[str, deque[str]] = defaultdict(lambda: deque(maxlen=SEQUENCE_LENGTH))
+
+        # Temporal window: observations in arrival order, with count and timestamp sum per
+        # event type and per (session, event type); timestamps are relative to _epoch
+        self._epoch = time.time()
+        self._window: deque[EventObservation] = deque()
+        self._window_by_type: dict[str, _Tally] = {}
+        self._window_by_session_type: dict[tuple[str, str], _Tally] = {}
+        self._pending_temporal: dict[tuple[str, str], _Tally] = {}
+
+        # Adjacent event-type pair counts per session, and for each pair the number of
+        # sessions where it repeats (count >= 2) with their summed counts
+        self._session_pairs: dict[str, Counter[tuple[str, str]]] = defaultdict(Counter)
+        self._repeated_pairs: dict[tuple[str, str], _Tally] = {}
 
         self._running = False
         self._task: asyncio.Task[None] | None = None
@@ -222,10 +259,11 @@ def observe(
         # Update co-occurrence matrix immediately
         self._update_co_occurrence(observation)
 
+        # Pair with the temporal window
+        self._update_temporal(observation)
+
         # Update sequence tracker
-        self._sequence_tracker[session_id].append(event_type)
-        if len(self._sequence_tracker[session_id]) > 20:
-            self._sequence_tracker[session_id] = self._sequence_tracker[session_id][-20:]
+        self._update_sequence(session_id, observation.event_type)
 
         logger.debug(f"Observed event: {event_type} in session {session_id}")
 
@@ -292,6 +330,12 @@ def reset(self) -> None:
         self._emitted_signals.clear()
         self._co_occurrence_matrix.clear()
         self._sequence_tracker.clear()
+        self._window.clear()
+        self._window_by_type.clear()
+        self._window_by_session_type.clear()
+        self._pending_temporal.clear()
+        self._session_pairs.clear()
+        self._repeated_pairs.clear()
         self._total_observations = 0
         self._total_correlations_found = 0
         logger.info("Correlator reset")
@@ -327,69 +371,22 @@ async def _process_correlations(self) -> None:
             await self._decay_candidates()
 
     async def _detect_temporal_correlations(self) -> None:
-        """Detect temporally correlated events."""
-        recent = [o for o in self._observations if time.time() - o.timestamp < self._temporal_window]
+        """Fold temporal pairs counted since the last run into candidates."""
+        pending, self._pending_temporal = self._pending_temporal, {}
 
-        if len(recent) < 2:
-            return
-
-        # Find pairs occurring within time window
-        for i, obs_a in enumerate(recent):
-            for obs_b in recent[i + 1 :]:
-                time_diff = abs(obs_b.timestamp - obs_a.timestamp)
-                if time_diff > self._temporal_window:
-                    continue
-
-                # Same type events in same session
-                if obs_a.event_type == obs_b.event_type and obs_a.session_id == obs_b.session_id:
-                    continue
-
-                candidate_id = self._make_candidate_id(
-                    CorrelationType.TEMPORAL,
-                    obs_a.event_type,
-                    obs_b.event_type,
-                )
-
-                candidate = self._get_or_create_candidate(
-                    candidate_id,
-                    CorrelationType.TEMPORAL,
-                    obs_a.event_type,
-                    obs_b.event_type,
-                )
-
-                # Closer in time = higher confidence
-                proximity_boost = 0.1 * (1.0 - time_diff / self._temporal_window)
-                candidate.add_occurrence(proximity_boost)
+        for (type_a, type_b), tally in pending.items():
+            candidate_id = self._make_candidate_id(CorrelationType.TEMPORAL, type_a, type_b)
+            candidate = self._get_or_create_candidate(candidate_id, CorrelationType.TEMPORAL, type_a, type_b)
+            # Closer in time = higher confidence
+            candidate.add_occurrences(tally.count, tally.total)
 
     async def _detect_sequence_correlations(self) -> None:
         """Detect sequence patterns in sessions."""
-        for sequence in self._sequence_tracker.values():
-            if len(sequence) < 3:
-                continue
-
-            # Find repeated pairs
-            pairs: dict[tuple[str, str], int] = defaultdict(int)
-            for i in range(len(sequence) - 1):
-                pair = (sequence[i], sequence[i + 1])
-                if pair[0] != pair[1]:  # Skip self-loops
-                    pairs[pair] += 1
-
-            for pair, count in pairs.items():
-                if count >= 2:
-                    candidate_id = self._make_candidate_id(
-                        CorrelationType.SEQUENCE,
-                        pair[0],
-                        pair[1],
-                    )
-
-                    candidate = self._get_or_create_candidate(
-                        candidate_id,
-                        CorrelationType.SEQUENCE,
-                        pair[0],
-                        pair[1],
-                    )
-
-                    candidate.add_occurrence(0.1 * count)
+        for (type_a, type_b), repeated in self._repeated_pairs.items():
+            candidate_id = self._make_candidate_id(CorrelationType.SEQUENCE, type_a, type_b)
+            candidate = self._get_or_create_candidate(candidate_id, CorrelationType.SEQUENCE, type_a, type_b)
+            # One occurrence per session repeating the pair, boosted by its repeat count
+            candidate.add_occurrences(repeated.count, 0.1 * repeated.total)
 
     async def _promote_candidates(self) -> None:
         """Promote qualifying candidates to signals."""
@@ -460,6 +457,79 @@ def _update_co_occurrence(self, observation: EventObservation) -> None:
                 self._co_occurrence_matrix[key_a][key_b] += 1
                 self._co_occurrence_matrix[key_b][key_a] += 1
 
+    def _update_temporal(self, observation: EventObservation) -> None:
+        """Pair an observation with every earlier one in the temporal window."""
+        now = observation.timestamp - self._epoch
+        while self._window and (
+            now - (self._window[0].timestamp - self._epoch) >= self._temporal_window
+            or len(self._window) >= self._max_observations
+        ):
+            self._leave_window(self._window.popleft())
+
+        event_type, window = observation.event_type, self._temporal_window
+        for other_type, tally in self._window_by_type.items():
+            count, total = tally.count, tally.total
+            if other_type == event_type:
+                # Same type events in same session
+                same_session = self._window_by_session_type.get((observation.session_id, event_type))
+                if same_session is not None:
+                    count, total = count - same_session.count, total - same_session.total
+            if count <= 0:
+                continue
+            pending = self._pending_temporal.setdefault((other_type, event_type), _Tally())
+            pending.count += count
+            pending.total += 0.1 * (count - (count * now - total) / window)
+
+        self._window.append(observation)
+        for key, tallies in (
+            (event_type, self._window_by_type),
+            ((observation.session_id, event_type), self._window_by_session_type),
+        ):
+            tally = tallies.setdefault(key, _Tally())
+            tally.count += 1
+            tally.total += now
+
+    def _leave_window(self, observation: EventObservation) -> None:
+        """Remove an observation from the temporal window tallies."""
+        offset = observation.timestamp - self._epoch
+        for key, tallies in (
+            (observation.event_type, self._window_by_type),
+            ((observation.session_id, observation.event_type), self._window_by_session_type),
+        ):
+            tally = tallies[key]
+            tally.count -= 1
+            tally.total -= offset
+            if not tally.count:
+                del tallies[key]
+
+    def _update_sequence(self, session_id: str, event_type: str) -> None:
+        """Append to a session's sequence, keeping its pair counts in step."""
+        sequence = self._sequence_tracker[session_id]
+        if len(sequence) == sequence.maxlen:
+            self._count_pair(session_id, sequence[0], sequence[1], -1)
+        if sequence:
+            self._count_pair(session_id, sequence[-1], event_type, 1)
+        sequence.append(event_type)
+
+    def _count_pair(self, session_id: str, type_a: str, type_b: str, delta: int) -> None:
+        """Adjust a session's count of an adjacent pair and the cross-session repeat totals."""
+        if type_a == type_b:  # Skip self-loops
+            return
+        pair = (type_a, type_b)
+        counts = self._session_pairs[session_id]
+        before = counts[pair]
+        after = before + delta
+        if after:
+            counts[pair] = after
+        else:
+            del counts[pair]
+
+        repeated = self._repeated_pairs.setdefault(pair, _Tally())
+        repeated.count += (after >= 2) - (before >= 2)
+        repeated.total += (after if after >= 2 else 0) - (before if before >= 2 else 0)
+        if not repeated.count:
+            del self._repeated_pairs[pair]
+
     def _make_candidate_id(
         self,
         correlation_type: CorrelationType,
@@ -0,0 +1,299 @@
+"""Tests for the pure-ASGI Mothership middleware pipeline."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from application.mothership.middleware import install_middleware_plan, setup_middleware
+from application.mothership.middleware.pipeline import (
+    ASGIPipelineMiddleware,
+    ErrorHandlingStage,
+    PipelineStage,
+    RateLimitStage,
+    RequestContext,
+    RequestIDStage,
+    RequestSizeLimitStage,
+    SecurityEnforcerStage,
+    SecurityHeadersStage,
+    TimingStage,
+    VersioningStage,
+)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/items")
+    async def items(request: Request):
+        return {"request_id": getattr(request.state, "request_id", None)}
+
+    @app.post("/api/v1/echo")
+    async def echo(request: Request):
+        return {"body": (await request.json()), "sanitized": getattr(request.state, "sanitized_body", False)}
+
+    @app.get("/api/v1/boom")
+    async def boom():
+        raise RuntimeError("kaboom")
+
+    @app.get("/api/v1/stream")
+    async def stream():
+        return StreamingResponse(iter([b"a", b"b"]))
+
+    return app
+
+
+def _client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app, raise_app_exceptions=False), base_url="http://t")
+
+
+class _Recorder(PipelineStage):
+    """Records which hooks ran, in order."""
+
+    def __init__(self, name: str, calls: list[str]) -> None:
+        self.name = name
+        self.calls = calls
+
+    async def on_request(self, ctx: RequestContext):
+        self.calls.append(f"{self.name}.request")
+
+    def on_response_start(self, ctx: RequestContext, headers) -> None:
+        self.calls.append(f"{self.name}.response")
+
+    async def on_complete(self, ctx: RequestContext) -> None:
+        self.calls.append(f"{self.name}.complete:{ctx.status_code}")
+
+
+class TestASGIPipeline:
+    async def test_stages_share_context_and_patch_headers(self):
+        stages = [RequestIDStage(), TimingStage(), VersioningStage(), SecurityHeadersStage()]
+        async with _client(ASGIPipelineMiddleware(_app(), stages)) as client:
+            response = await client.get("/api/v1/items", headers={"X-Request-ID": "req-1"})
+
+        assert response.json() == {"request_id": "req-1"}
+        assert response.headers["X-Request-ID"] == "req-1"
+        assert response.headers["X-Correlation-ID"] == "req-1"
+        assert response.headers["X-API-Version"] == "v1"
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert float(response.headers["X-Process-Time"]) >= 0
+
+    async def test_hooks_run_nested(self):
+        calls: list[str] = []
+        stages = [_Recorder("outer", calls), _Recorder("inner", calls)]
+        async with _client(ASGIPipelineMiddleware(_app(), stages)) as client:
+            await client.get("/api/v1/items")
+
+        assert calls == [
+            "outer.request",
+            "inner.request",
+            "inner.response",
+            "outer.response",
+            "inner.complete:200",
+            "outer.complete:200",
+        ]
+
+    async def test_short_circuit_skips_inner_stages(self):
+        calls: list[str] = []
+        stages = [RequestIDStage(), RequestSizeLimitStage(max_size_bytes=4), _Recorder("inner", calls)]
+        async with _client(ASGIPipelineMiddleware(_app(), stages)) as client:
+            response = await client.post("/api/v1/echo", json={"payload": "too large"})
+
+        assert response.status_code == 413
+        assert "X-Request-ID" in response.headers
+        assert calls == []
+
+    async def test_body_is_read_once_and_sanitized_body_reaches_handler(self):
+        app = _app()
+        received = bytearray()
+
+        async def counting_app(scope, receive, send):
+            async def counted():
+                message = await receive()
+                if message["type"] == "http.request":
+                    received.extend(message.get("body", b""))
+                return message
+
+            await pipeline(scope, counted, send)
+
+        enforcer = SecurityEnforcerStage(strict_mode=False, enforce_https=False, enforce_auth=False)
+        pipeline = ASGIPipelineMiddleware(app, [RequestIDStage(), enforcer])
+        payload = b'{"name": "<script>alert(1)</script>"}'
+        async with _client(counting_app) as client:
+            response = await client.post("/api/v1/echo", content=payload, headers={"Content-Type": "application/json"})
+
+        assert response.status_code == 200
+        assert response.json() == {"body": {"name": ""}, "sanitized": True}
+        assert response.headers["X-Security-Enforced"] == "true"
+        # The client body was pulled off the channel exactly once
+        assert bytes(received) == payload
+        assert enforcer.policy.metrics.sanitized_requests == 1
+
+    async def test_error_stage_builds_response_for_outer_stages(self):
+        calls: list[str] = []
+        app = _app()
+        # Installed like production, inside Starlette's ServerErrorMiddleware
+        app.add_middleware(
+            ASGIPipelineMiddleware, stages=[_Recorder("outer", calls), RequestIDStage(), ErrorHandlingStage()]
+        )
+        async with _client(app) as client:
+            response = await client.get("/api/v1/boom", headers={"X-Request-ID": "req-err"})
+
+        assert response.status_code == 500
+        assert response.json()["error"]["code"] == "INTERNAL_ERROR"
+        assert response.json()["request_id"] == "req-err"
+        assert calls[-1] == "outer.complete:500"
+
+    async def test_unhandled_error_propagates(self):
+        pipeline = ASGIPipelineMiddleware(_app(), [RequestIDStage()])
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=pipeline), base_url="http://t") as client:
+            with pytest.raises(RuntimeError, match="kaboom"):
+                await client.get("/api/v1/boom")
+
+    async def test_streaming_responses_pass_through(self):
+        async with _client(ASGIPipelineMiddleware(_app(), [TimingStage(), SecurityHeadersStage()])) as client:
+            response = await client.get("/api/v1/stream")
+
+        assert response.content == b"ab"
+        assert "X-Process-Time" in response.headers
+
+    async def test_rate_limit_stage(self):
+        stage = RateLimitStage(requests_per_minute=2, burst_size=2)
+        async with _client(ASGIPipelineMiddleware(_app(), [stage])) as client:
+            statuses = [(await client.get("/api/v1/items")).status_code for _ in range(3)]
+            limited = await client.get("/api/v1/items")
+
+        assert statuses == [200, 200, 429]
+        assert limited.json()["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+
+
+def _settings(asgi_pipeline: bool) -> SimpleNamespace:
+    security = SimpleNamespace(
+        parasite_guard_enabled=False,
+        circuit_breaker_enabled=False,
+        strict_mode=False,
+        input_sanitization_enabled=True,
+        max_request_size_bytes=1024,
+        block_insecure_transport=False,
+        rate_limit_enabled=True,
+        rate_limit_requests=100,
+    )
+    return SimpleNamespace(
+        debug_enabled=False,
+        security=security,
+        telemetry=SimpleNamespace(enabled=False),
+        server=SimpleNamespace(asgi_pipeline=asgi_pipeline),
+        is_production=False,
+    )
+
+
+class TestSetupMiddleware:
+    def test_pipeline_flag_installs_single_middleware(self):
+        app = _app()
+        setup_middleware(app, _settings(asgi_pipeline=True))
+
+        assert [m.cls for m in app.user_middleware] == [ASGIPipelineMiddleware]
+        stages = app.user_middleware[0].kwargs["stages"]
+        assert type(stages[0]).__name__ == "RateLimitStage"
+        assert type(stages[-1]).__name__ == "ErrorHandlingStage"
+
+    async def test_pipeline_and_legacy_chains_match(self):
+        responses = {}
+        for asgi_pipeline in (False, True):
+            app = _app()
+            setup_middleware(app, _settings(asgi_pipeline))
+            async with _client(app) as client:
+                responses[asgi_pipeline] = await client.get("/api/v1/items", headers={"X-Request-ID": "same"})
+
+        legacy, pipeline = responses[False], responses[True]
+        assert pipeline.status_code == legacy.status_code == 200
+        assert pipeline.json() == legacy.json()
+        volatile = {"x-process-time", "x-process-time-ms", "content-length"}
+        assert set(pipeline.headers) - volatile == set(legacy.headers) - volatile
+
+    def test_stage_less_middleware_keeps_its_position(self):
+        class Between:
+            def __init__(self, app):
+                self.app = app
+
+        app = FastAPI()
+        plan = [
+            (type("TimingMiddleware", (), {}), {}),
+            (Between, {}),
+            (type("RequestIDMiddleware", (), {}), {}),
+            (type("VersioningMiddleware", (), {}), {}),
+        ]
+        stages = install_middleware_plan(app, plan, asgi_pipeline=True)
+
+        assert [m.cls for m in app.user_middleware] == [ASGIPipelineMiddleware, Between, ASGIPipelineMiddleware]
+        outer, inner = app.user_middleware[0].kwargs["stages"], app.user_middleware[2].kwargs["stages"]
+        assert [type(s) for s in outer] == [VersioningStage, RequestIDStage]
+        assert [type(s) for s in inner] == [TimingStage]
+        assert stages == outer + inner
+
+    def test_optional_middleware_that_fails_is_skipped(self):
+        broken = type("TimingMiddleware", (), {})
+        plan = [(broken, {"unknown_option": True}), (type("RequestIDMiddleware", (), {}), {})]
+
+        with pytest.raises(TypeError):
+            install_middleware_plan(FastAPI(), plan, asgi_pipeline=True)
+
+        app = FastAPI()
+        stages = install_middleware_plan(app, plan, asgi_pipeline=True, optional={broken})
+        assert [type(s) for s in stages] == [RequestIDStage]
+
+
+class TestPortedStages:
+    def _app(self) -> FastAPI:
+        app = _app()
+
+        @app.get("/api/v1/unavailable")
+        async def unavailable():
+            return JSONResponse({"detail": "down"}, status_code=503)
+
+        return app
+
+    async def _both(self, middleware_class, path: str, **kwargs):
+        responses = []
+        for asgi_pipeline in (False, True):
+            app = self._app()
+            install_middleware_plan(app, [(middleware_class, kwargs)], asgi_pipeline=asgi_pipeline)
+            async with _client(app) as client:
+                responses.append(await client.get(path, headers={"X-Correlation-ID": "corr-1"}))
+        return responses
+
+    async def test_data_corruption_stage_matches_middleware(self):
+        from application.mothership.middleware.data_corruption import DataCorruptionDetectionMiddleware
+        from grid.resilience.data_corruption_penalty import DataCorruptionPenaltyTracker
+
+        legacy, pipeline = await self._both(
+            DataCorruptionDetectionMiddleware, "/api/v1/unavailable", tracker=DataCorruptionPenaltyTracker()
+        )
+
+        assert pipeline.status_code == legacy.status_code == 503
+        for header in ("X-Data-Penalty-Score", "X-Data-Penalty-Correlation-ID"):
+            assert pipeline.headers[header] == legacy.headers[header]
+        assert pipeline.headers["X-Data-Penalty-Correlation-ID"] == "corr-1"
+
+    async def test_drt_stage_matches_middleware(self):
+        from application.mothership.middleware.drt_middleware_unified import UnifiedDRTMiddleware
+
+        legacy, pipeline = await self._both(UnifiedDRTMiddleware, "/api/v1/items")
+
+        assert pipeline.status_code == legacy.status_code == 200
+        drt = {k: v for k, v in legacy.headers.items() if k.startswith("x-drt-")}
+        assert drt["x-drt-monitored"] == "true"
+        assert {k: v for k, v in pipeline.headers.items() if k.startswith("x-drt-")} == drt
+
+    async def test_accountability_contract_stage_matches_middleware(self):
+        from application.mothership.middleware.accountability_contract import AccountabilityContractMiddleware
+
+        legacy, pipeline = await self._both(AccountabilityContractMiddleware, "/api/v1/items")
+
+        assert pipeline.status_code == legacy.status_code == 200
+        accountability = {k: v for k, v in legacy.headers.items() if k.startswith("x-accountability-")}
+        assert accountability["x-accountability-status"] == "monitored"
+        assert {k: v for k, v in pipeline.headers.items() if k.startswith("x-accountability-")} == accountability
@@ -0,0 +1,139 @@
+"""Tests for the bounded two-tier response cache and the cache_json decorator."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from application.mothership.utils import cache as cache_module
+from application.mothership.utils.cache import GlobalCache, MemoryCache, TieredCache, cache_json, make_cache_key
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", fake.monotonic)
+    return fake
+
+
+class TestMemoryCache:
+    def test_evicts_least_recently_used_beyond_max_entries(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        assert cache.get("a") == "1"  # a is now more recent than b
+        cache.set("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1" and cache.get("c") == "3"
+        assert cache.stats()["evictions"] == 1
+
+    def test_evicts_beyond_max_bytes(self):
+        cache = MemoryCache(max_bytes=10)
+        cache.set("a", "x" * 6)
+        cache.set("b", "y" * 6)
+
+        assert len(cache) == 1 and cache.size_bytes == 6
+        assert not cache.set("c", "z" * 11)  # Larger than the whole cache
+
+    def test_stale_window_after_expiry(self, clock):
+        cache = MemoryCache()
+        cache.set("k", "v", expire=5, stale=10)
+
+        clock.now += 6
+        assert cache.get("k") is None
+        assert cache.get_entry("k") == ("v", False)
+
+        clock.now += 10
+        assert cache.get_entry("k") is None
+        assert len(cache) == 0 and cache.stats()["expirations"] == 1
+
+
+class TestTieredCache:
+    async def test_concurrent_misses_compute_once(self):
+        cache = TieredCache(MemoryCache())
+        calls = 0
+
+        async def compute() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(cache.get_or_compute("k", compute, expire=60) for _ in range(20)))
+
+        assert results == ["value"] * 20
+        assert calls == 1 and cache.coalesced == 19
+
+    async def test_failed_computation_is_not_cached(self):
+        cache = TieredCache(MemoryCache())
+
+        async def fail() -> str:
+            raise RuntimeError("boom")
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await cache.get_or_compute("k", fail, expire=60)
+        assert cache.local.get("k") is None
+
+    async def test_stale_value_served_while_refreshing(self, clock):
+        cache = TieredCache(MemoryCache())
+        values = iter(["old", "new"])
+
+        async def compute() -> str:
+            return next(values)
+
+        assert await cache.get_or_compute("k", compute, expire=5, stale=30) == "old"
+        clock.now += 10
+        assert await cache.get_or_compute("k", compute, expire=5, stale=30) == "old"
+        await asyncio.sleep(0)  # Let the background refresh run
+        await asyncio.sleep(0)
+        assert await cache.get_or_compute("k", compute, expire=5, stale=30) == "new"
+
+
+async def _handler(limit: int = 10, service: object = None) -> dict:
+    return {"limit": limit}
+
+
+class TestCacheKeys:
+    def test_keyword_order_does_not_change_key(self):
+        key = make_cache_key(_handler, "k", (), {"a": 1, "b": 2})
+        assert key == make_cache_key(_handler, "k", (), {"b": 2, "a": 1})
+
+    def test_opaque_arguments_do_not_vary_key(self):
+        key_a = make_cache_key(_handler, "k", (), {"limit": 1, "service": object()})
+        key_b = make_cache_key(_handler, "k", (), {"limit": 1, "service": object()})
+        assert key_a == key_b
+        assert key_a != make_cache_key(_handler, "k", (), {"limit": 2, "service": object()})
+
+
+class TestCacheJson:
+    @pytest.fixture(autouse=True)
+    def fresh_global_cache(self, monkeypatch):
+        monkeypatch.setattr(GlobalCache, "_instance", TieredCache(MemoryCache()))
+
+    async def test_results_are_cached_per_arguments(self):
+        calls = []
+
+        @cache_json("test", expire=60)
+        async def handler(limit: int = 10) -> dict:
+            calls.append(limit)
+            return {"limit": limit}
+
+        assert await handler(limit=1) == {"limit": 1}
+        assert await handler(limit=1) == {"limit": 1}
+        assert await handler(limit=2) == {"limit": 2}
+        assert calls == [1, 2]
+
+    def test_wrapper_keeps_signature(self):
+        wrapped = cache_json("test")(_handler)
+        assert list(wrapped.__signature__.parameters) == ["limit", "service"]
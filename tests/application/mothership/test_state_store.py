@@ -0,0 +1,118 @@
+"""Tests for StateStore sharded locking, secondary indexes and the SQLite backend."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from application.mothership.models.cockpit import Session, SessionState, Task, TaskResult, TaskStatus
+from application.mothership.models.subscription import UsageRecord
+from application.mothership.repositories import (
+    SessionRepository,
+    SQLiteBackend,
+    StateStore,
+    TaskRepository,
+    UnitOfWork,
+)
+from application.mothership.repositories.usage import UsageRepository
+
+
+class TestShardedLocking:
+    async def test_transactions_on_different_collections_do_not_block(self):
+        store = StateStore()
+        async with store.transaction("sessions"):
+            await asyncio.wait_for(TaskRepository(store).add(Task(id="t1", name="t", task_type="x")), timeout=1)
+
+    async def test_whole_store_transaction_excludes_collection_transactions(self):
+        store = StateStore()
+        async with store.transaction():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(asyncio.create_task(_enter(store, "tasks")), timeout=0.05)
+
+    async def test_nested_transactions_reuse_held_locks(self):
+        uow = UnitOfWork(StateStore())
+        async with uow.transaction():
+            await asyncio.wait_for(uow.tasks.add(Task(id="t1", name="t", task_type="x")), timeout=1)
+        assert await uow.tasks.exists("t1")
+
+
+async def _enter(store: StateStore, name: str) -> None:
+    async with store.transaction(name):
+        pass
+
+
+class TestSecondaryIndexes:
+    async def test_task_status_index_follows_updates(self):
+        repo = TaskRepository(StateStore())
+        for i in range(4):
+            await repo.add(Task(id=f"t{i}", name="t", task_type="build" if i % 2 else "test"))
+
+        task = await repo.get("t1")
+        task.status = TaskStatus.RUNNING
+        await repo.update(task)
+
+        assert [t.id for t in await repo.get_running()] == ["t1"]
+        assert sorted(t.id for t in await repo.get_by_status(TaskStatus.PENDING)) == ["t0", "t2", "t3"]
+        assert sorted(t.id for t in await repo.get_by_type("build")) == ["t1", "t3"]
+
+        await repo.delete("t1")
+        assert await repo.get_running() == []
+
+    async def test_sessions_by_user(self):
+        repo = SessionRepository(StateStore())
+        for i in range(5):
+            await repo.add(Session(id=f"s{i}", user_id=f"u{i % 2}", username="n"))
+
+        assert sorted(s.id for s in await repo.get_by_user("u1")) == ["s1", "s3"]
+
+
+class TestSQLiteBackend:
+    async def test_workers_share_state_and_indexes(self, tmp_path):
+        path = tmp_path / "state.db"
+        worker_a = StateStore(backend=SQLiteBackend(path))
+        worker_b = StateStore(backend=SQLiteBackend(path))
+
+        await TaskRepository(worker_a).add(Task(id="t1", name="t", task_type="build"))
+        await TaskRepository(worker_b).add(Task(id="t2", name="t", task_type="test"))
+
+        repo = TaskRepository(worker_b)
+        assert await repo.count() == 2
+        assert [t.id for t in await repo.get_by_type("build")] == ["t1"]
+
+        task = await TaskRepository(worker_a).get("t2")
+        task.status = TaskStatus.RUNNING
+        await TaskRepository(worker_a).update(task)
+        assert [t.id for t in await repo.get_running()] == ["t2"]
+
+        assert await TaskRepository(worker_a).delete("t1")
+        assert not await repo.exists("t1")
+
+    async def test_entities_are_stored_as_json(self, tmp_path):
+        path = tmp_path / "state.db"
+        store = StateStore(backend=SQLiteBackend(path))
+        task = Task(id="t1", name="t", task_type="build", payload={"n": 1}, result=TaskResult(success=True))
+        await TaskRepository(store).add(task)
+        await SessionRepository(store).add(Session(id="s1", user_id="u", username="n", permissions={"read"}))
+
+        with sqlite3.connect(path) as conn:
+            rows = dict(conn.execute("SELECT id, value FROM entries").fetchall())
+        assert json.loads(rows["t1"])["status"] == "pending"
+
+        reader = StateStore(backend=SQLiteBackend(path))
+        assert await TaskRepository(reader).get("t1") == task
+        session = await SessionRepository(reader).get("s1")
+        assert session.permissions == {"read"} and session.state is SessionState.ACTIVE
+
+    async def test_usage_totals_include_other_workers_records(self, tmp_path):
+        path = tmp_path / "state.db"
+        worker_a = UsageRepository(StateStore(backend=SQLiteBackend(path)))
+        worker_b = UsageRepository(StateStore(backend=SQLiteBackend(path)))
+
+        await worker_a.add(UsageRecord(id="a", user_id="u1", endpoint="api/entity", cost_units=2))
+        await worker_b.add_many([UsageRecord(id="b", user_id="u1", endpoint="api/entity", cost_units=3)])
+
+        assert await worker_a.get_usage_by_endpoint("u1", "api/entity") == 5
+        assert await worker_b.get_total_usage("u1") == {"api": 5}
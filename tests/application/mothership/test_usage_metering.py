@@ -0,0 +1,152 @@
+"""Tests for batched usage metering and the pre-rolled usage aggregates."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from application.mothership.models.subscription import UsageRecord
+from application.mothership.repositories import StateStore
+from application.mothership.repositories.usage import UsageRepository
+from application.mothership.services.billing.meter import UsageMeter, close_usage_meters
+
+
+def _record(id: str, user_id: str = "u1", endpoint: str = "api/entity", cost: int = 1, **age) -> UsageRecord:
+    return UsageRecord(
+        id=id,
+        user_id=user_id,
+        endpoint=endpoint,
+        cost_units=cost,
+        timestamp=datetime.now(UTC) - timedelta(**age),
+    )
+
+
+class TestUsageAggregates:
+    """The hourly rollups must agree with a scan over all records."""
+
+    @pytest.fixture
+    def repo(self) -> UsageRepository:
+        return UsageRepository(StateStore())
+
+    async def test_usage_by_endpoint_respects_period(self, repo):
+        await repo.add_many(
+            [
+                _record("a", cost=2, minutes=5),
+                _record("b", cost=3, days=10),
+                _record("c", cost=7, days=40),
+                _record("d", endpoint="api/relationship", cost=5, minutes=1),
+                _record("e", user_id="u2", cost=11, minutes=1),
+            ]
+        )
+
+        assert await repo.get_usage_by_endpoint("u1", "api/entity", period_days=30) == 5
+        assert await repo.get_usage_by_endpoint("u1", "api/entity", period_days=60) == 12
+        assert await repo.get_usage_by_endpoint("u1", "api/missing") == 0
+        assert await repo.get_total_usage("u1") == {"api": 10}
+
+    async def test_boundary_hour_is_exact(self, repo):
+        # Records every 7 minutes either side of the period start; some share its hour bucket
+        offsets = [m for m in range(-91, 92, 7) if m]
+        await repo.add_many([_record(f"r{m}", endpoint="x", cost=1, minutes=24 * 60 + m) for m in offsets])
+
+        expected = sum(1 for m in offsets if m < 0)
+        assert await repo.get_usage_by_endpoint("u1", "x", period_days=1) == expected
+        assert await repo.get_total_usage("u1", period_days=1) == {"x": expected}
+
+    async def test_update_and_delete_adjust_rollups(self, repo):
+        record = _record("a", cost=4, minutes=1)
+        await repo.add(record)
+        record.cost_units = 6
+        await repo.update(record)
+        assert await repo.get_usage_by_endpoint("u1", "api/entity") == 6
+
+        assert await repo.delete("a") is True
+        assert await repo.get_usage_by_endpoint("u1", "api/entity") == 0
+        assert await repo.get_by_user("u1") == []
+
+    async def test_get_by_user_date_range(self, repo):
+        await repo.add_many([_record("a", minutes=1), _record("b", days=3), _record("c", days=9)])
+        now = datetime.now(UTC)
+
+        found = await repo.get_by_user("u1", start_date=now - timedelta(days=5), end_date=now - timedelta(days=1))
+        assert [r.id for r in found] == ["b"]
+        assert {r.id for r in await repo.get_by_user("u1")} == {"a", "b", "c"}
+
+
+class TestBatchedUsageMeter:
+    async def test_enqueue_does_not_write_until_flush(self):
+        repo = UsageRepository(StateStore())
+        meter = UsageMeter(repo, batch_size=100, flush_interval=60)
+
+        assert meter.enqueue_usage("u1", "/api/v1/entity") is True
+        assert await repo.count() == 0
+        assert meter.pending == 1
+
+        assert await meter.flush() == 1
+        assert await repo.count() == 1
+        await meter.close()
+
+    async def test_batch_size_triggers_background_flush(self):
+        repo = UsageRepository(StateStore())
+        meter = UsageMeter(repo, batch_size=10, flush_interval=60)
+
+        for _ in range(10):
+            meter.enqueue_usage("u1", "/api/v1/entity")
+        for _ in range(50):
+            if await repo.count() == 10:
+                break
+            await asyncio.sleep(0.01)
+
+        assert await repo.count() == 10
+        await meter.close()
+
+    async def test_interval_triggers_background_flush(self):
+        repo = UsageRepository(StateStore())
+        meter = UsageMeter(repo, batch_size=1000, flush_interval=0.02)
+
+        meter.enqueue_usage("u1", "/api/v1/entity")
+        await asyncio.sleep(0.1)
+
+        assert await repo.count() == 1
+        await meter.close()
+
+    async def test_full_queue_drops_new_records(self):
+        meter = UsageMeter(UsageRepository(StateStore()), queue_size=2, batch_size=100, flush_interval=60)
+
+        assert meter.enqueue_usage("u1", "a") is True
+        assert meter.enqueue_usage("u1", "b") is True
+        assert meter.enqueue_usage("u1", "c") is False
+        assert meter.dropped == 1
+        await meter.close()
+
+    async def test_failed_flush_requeues_batch(self):
+        class FailingRepo(UsageRepository):
+            fail = True
+
+            async def add_many(self, entities):
+                if self.fail:
+                    raise RuntimeError("storage down")
+                return await super().add_many(entities)
+
+        repo = FailingRepo(StateStore())
+        meter = UsageMeter(repo, batch_size=100, flush_interval=60)
+        meter.enqueue_usage("u1", "a")
+
+        assert await meter.flush() == 0
+        assert meter.pending == 1
+
+        repo.fail = False
+        assert await meter.flush() == 1
+        await meter.close()
+
+    async def test_close_usage_meters_drains_pending(self):
+        repo = UsageRepository(StateStore())
+        meter = UsageMeter(repo, batch_size=100, flush_interval=60)
+        meter.enqueue_usage("u1", "a")
+
+        await close_usage_meters()
+
+        assert await repo.count() == 1
+        assert meter.pending == 0
@@ -0,0 +1,102 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from cognitive.patterns.recognition import (
+    DeviationPattern,
+    PatternMatcher,
+    RepetitionPattern,
+    RhythmPattern,
+    TimePattern,
+)
+
+
+def _scan_repeating_sequences(elements: list[str]) -> list[dict]:
+    """The original pairwise scan, for comparison with the n-gram index."""
+    repeating = []
+    for seq_len in [2, 3]:
+        if len(elements) < seq_len * 2:
+            continue
+        for i in range(len(elements) - seq_len + 1):
+            seq = tuple(elements[i : i + seq_len])
+            for j in range(i + seq_len, len(elements) - seq_len + 1):
+                if tuple(elements[j : j + seq_len]) == seq:
+                    repeating.append({"sequence": " ".join(seq), "start_indices": [i, j], "length": seq_len})
+                    break
+    return repeating[:10]
+
+
+def _windows(seed: int) -> list[list[float]]:
+    rng = random.Random(seed)
+    windows = [[], [1.0, 2.0], [3.0] * 30, [0.0] * 25]
+    for _ in range(40):
+        length = rng.choice([4, 6, 19, 20, 21, 35, 60, 150])
+        base = rng.uniform(-2, 5)
+        windows.append([base + rng.gauss(0, 1) * (5 if rng.random() < 0.1 else 1) for _ in range(length)])
+    return windows
+
+
+class TestRepetitionIndex:
+    @pytest.mark.parametrize("alphabet", ["ab", "abcd", "abcdefghij"])
+    def test_matches_pairwise_scan(self, alphabet):
+        rng = random.Random(len(alphabet))
+        recognizer = RepetitionPattern()
+        for length in (0, 4, 5, 7, 30, 200):
+            elements = [rng.choice(alphabet) for _ in range(length)]
+            assert recognizer._find_repeating_sequences(elements) == _scan_repeating_sequences(elements)
+
+
+class TestRecognizeAll:
+    async def test_concurrent_run_matches_sequential_recognizers(self):
+        data = {
+            "intervals": [1.0, 1.1, 0.9, 1.0, 1.2, 1.0],
+            "sequence": ["a", "b", "c", "a", "b", "c", "a"],
+            "values": [float(i % 5) for i in range(45)],
+            "time_series": [(datetime.fromtimestamp(i), float(i % 7)) for i in range(40)],
+            "events": ["open", "edit", "save", "open", "edit"],
+        }
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = await PatternMatcher(executor=executor).recognize_all(data)
+
+        expected = PatternMatcher()
+        assert list(results) == list(expected.patterns)
+        for name, detection in results.items():
+            assert detection == await expected.patterns[name].recognize(data)
+
+    async def test_errors_fall_back_per_pattern(self):
+        results = await PatternMatcher().recognize_all({"values": ["x"] * 30}, ["deviation", "flow", "deviation"])
+
+        assert list(results) == ["deviation", "flow"]
+        assert results["deviation"].explanation.startswith("Error:")
+        assert results["flow"].confidence > 0
+
+
+class TestRecognizeBatch:
+    async def test_scores_match_fresh_recognizers(self):
+        windows = _windows(0)
+        scores = PatternMatcher().recognize_batch(windows)
+
+        for i, window in enumerate(windows):
+            rhythm = await RhythmPattern().recognize({"intervals": window})
+            deviation = await DeviationPattern().recognize({"values": window})
+            series = [(datetime.fromtimestamp(t), v) for t, v in enumerate(window)]
+            time_detection = await TimePattern().recognize({"time_series": series})
+
+            assert scores["rhythm"][i] == pytest.approx(rhythm.confidence)
+            assert scores["deviation"][i] == pytest.approx(deviation.confidence)
+            assert scores["time"][i] == pytest.approx(time_detection.confidence)
+
+    def test_array_input_matches_lists(self):
+        windows = [row[:30] for row in _windows(1) if len(row) >= 30]
+        from_lists = PatternMatcher().recognize_batch(windows)
+        from_array = PatternMatcher().recognize_batch(np.array(windows))
+
+        for name in PatternMatcher.BATCH_PATTERNS:
+            np.testing.assert_allclose(from_array[name], from_lists[name])
+
+    def test_rejects_patterns_without_batch_scoring(self):
+        with pytest.raises(ValueError, match="flow"):
+            PatternMatcher().recognize_batch([[1.0, 2.0]], ["rhythm", "flow"])
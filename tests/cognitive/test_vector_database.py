@@ -0,0 +1,126 @@
+import random
+
+import numpy as np
+import pytest
+
+from cognitive import vectorizer as vectorizer_module
+from cognitive.cognitive_unit import CognitiveUnit, LocomotionComponent, SoundComponent, VisionComponent
+from cognitive.vectorizer import CognitiveVectorizer, VectorDatabase
+
+
+def _trajectory(rng: random.Random, length: int = 8) -> list[CognitiveUnit]:
+    return [
+        CognitiveUnit(
+            vision=VisionComponent(rng.random(), rng.random(), rng.random()),
+            sound=SoundComponent(rng.random(), rng.random()),
+            locomotion=LocomotionComponent(rng.random(), rng.random()),
+        )
+        for _ in range(length)
+    ]
+
+
+def _scan_search(db: VectorDatabase, query: list[CognitiveUnit], top_k: int, method: str) -> list[tuple[str, float]]:
+    """The original per-pair comparison and full sort."""
+    query_vector = db._signature(query)
+    results = [
+        (key, db._vectorizer.compare_signatures(query_vector, vector, method=method))
+        for key, vector in db.vectors.items()
+    ]
+    results.sort(key=lambda x: x[1], reverse=True)
+    return results[:top_k]
+
+
+class TestVectorizeBehavior:
+    def test_returns_computed_matrix(self):
+        units = _trajectory(random.Random(0))
+        cv = CognitiveVectorizer().vectorize_behavior(units)
+        matrix = cv.to_matrix()
+
+        assert matrix.shape == (len(units), 32)
+        assert not np.array_equal(matrix, np.array([u.to_vector() for u in units], dtype=np.float32))
+        assert matrix.min() >= 0.0 and matrix.max() <= 1.0
+        assert matrix[:, 7:].any()  # Derivative features
+        np.testing.assert_allclose(cv.centroid(), matrix.mean(axis=0))
+        assert not matrix.flags.writeable
+
+    def test_adding_a_unit_drops_cached_matrix(self):
+        cv = CognitiveVectorizer().vectorize_behavior(_trajectory(random.Random(1)))
+        cv.add_unit(CognitiveUnit())
+
+        assert cv.to_matrix().shape == (9, 32)
+        np.testing.assert_array_equal(cv.to_matrix()[-1], CognitiveUnit().to_vector())
+
+
+class TestVectorDatabase:
+    @pytest.mark.parametrize("method", ["cosine", "euclidean", "correlation"])
+    def test_matrix_search_matches_pairwise_scan(self, method):
+        rng = random.Random(2)
+        db = VectorDatabase(ann_threshold=None)
+        for i in range(60):
+            db.store(f"t{i}", _trajectory(rng, rng.randint(1, 12)), {"i": i})
+        db.store("empty", [])
+        for i in range(0, 60, 7):
+            db.delete(f"t{i}")
+        db.store("t3", _trajectory(rng))
+
+        for _ in range(5):
+            query = _trajectory(rng)
+            results = db.search(query, top_k=10, method=method)
+            expected = _scan_search(db, query, 10, method)
+
+            assert [key for key, _, _ in results] == [key for key, _ in expected]
+            assert [score for _, score, _ in results] == pytest.approx([score for _, score in expected], abs=1e-5)
+
+    def test_metadata_delete_and_clear(self):
+        rng = random.Random(3)
+        db = VectorDatabase()
+        db.store("a", _trajectory(rng), {"label": "a"})
+        db.store("b", _trajectory(rng))
+
+        results = db.search(_trajectory(rng), top_k=5)
+        assert {key for key, _, _ in results} == {"a", "b"}
+        results[0][2]["mutated"] = True
+        assert "mutated" not in db.metadata[results[0][0]]
+
+        assert db.delete("a") and not db.delete("a")
+        assert db.size() == 1 and list(db.vectors) == ["b"]
+        with pytest.raises(ValueError, match="Unknown comparison method"):
+            db.search(_trajectory(rng), method="manhattan")
+
+        db.clear()
+        assert db.size() == 0 and db.search(_trajectory(rng)) == []
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        rng = random.Random(4)
+        db = VectorDatabase(ann_threshold=None)
+        for i in range(20):
+            db.store(f"t{i}", _trajectory(rng), {"i": i})
+        db.delete("t5")
+        query = _trajectory(rng)
+
+        loaded = VectorDatabase.load(db.save(tmp_path / "db"), ann_threshold=None)
+
+        assert loaded.size() == 19 and loaded.metadata["t7"] == {"i": 7}
+        assert loaded.search(query, top_k=5) == db.search(query, top_k=5)
+
+
+@pytest.mark.skipif(not vectorizer_module.HAS_FAISS, reason="faiss not installed")
+class TestVectorDatabaseAnnIndex:
+    def test_index_search_finds_exact_neighbours_and_persists(self, tmp_path):
+        rng = random.Random(5)
+        db = VectorDatabase(ann_threshold=50)
+        for i in range(200):
+            db.store(f"t{i}", _trajectory(rng), {"i": i})
+        db.delete("t0")
+        query = _trajectory(rng)
+
+        results = db.search(query, top_k=5)
+        exact = _scan_search(db, query, 5, "cosine")
+        assert db._index is not None and db._indexed == db._size
+        assert [key for key, _, _ in results] == [key for key, _ in exact]
+
+        db.save(tmp_path / "db")
+        assert (tmp_path / "db" / VectorDatabase._INDEX_FILE).exists()
+        loaded = VectorDatabase.load(tmp_path / "db", ann_threshold=50)
+        assert loaded._index is not None and loaded._index.ntotal == 199
+        assert [key for key, _, _ in loaded.search(query, top_k=5)] == [key for key, _ in exact]
@@ -0,0 +1,80 @@
+"""Tests for the segmented event log and the indexed EventStore built on it."""
+
+import asyncio
+
+import pytest
+
+from infrastructure.event_bus.event_log import SegmentedEventLog
+from infrastructure.event_bus.event_system import Event, EventResult, EventStatus, EventStore
+
+
+class TestSegmentedEventLog:
+    @pytest.mark.asyncio
+    async def test_concurrent_appends_are_group_committed(self, tmp_path):
+        log = SegmentedEventLog(tmp_path, fsync=False)
+
+        offsets = await asyncio.gather(*(log.append({"n": i}) for i in range(200)))
+
+        assert sorted(offsets) == list(range(200))
+        assert log.commits < 200
+        assert [record["n"] for _, record in log.read()] == list(range(200))
+
+    @pytest.mark.asyncio
+    async def test_segments_roll_and_read_from_offset(self, tmp_path):
+        log = SegmentedEventLog(tmp_path, segment_bytes=512, index_interval=4, fsync=False)
+        for i in range(100):
+            await log.append({"n": i})
+
+        assert len(log.segments) > 1
+        assert [offset for offset, _ in log.read(37)] == list(range(37, 100))
+        assert [record["n"] async for _, record in log.stream(95, chunk_size=2)] == [95, 96, 97, 98, 99]
+
+    @pytest.mark.asyncio
+    async def test_reopen_recovers_offsets_and_truncates_torn_record(self, tmp_path):
+        log = SegmentedEventLog(tmp_path, segment_bytes=256, fsync=False)
+        for i in range(20):
+            await log.append({"n": i})
+        with open(log.segments[-1].path, "ab") as f:
+            f.write(b'{"offset":20,"rec')
+
+        reopened = SegmentedEventLog(tmp_path, segment_bytes=256, fsync=False)
+        assert reopened.next_offset == 20
+        assert await reopened.append({"n": 20}) == 20
+        assert [record["n"] for _, record in reopened.read()] == list(range(21))
+
+
+class TestEventStore:
+    @pytest.mark.asyncio
+    async def test_indexes_return_latest_first(self, tmp_path):
+        store = EventStore(str(tmp_path), fsync=False)
+        for i in range(10):
+            await store.store_event(Event(type="a" if i % 2 else "b", source=f"s{i % 3}", timestamp=float(i)))
+
+        assert [e.timestamp for e in await store.get_events_by_type("a", limit=3)] == [9.0, 7.0, 5.0]
+        assert [e.timestamp for e in await store.get_events_by_source("s0")] == [9.0, 6.0, 3.0, 0.0]
+        assert [e.timestamp for e in await store.get_events_between(2.0, 4.0)] == [2.0, 3.0, 4.0]
+        assert [e.timestamp for e in await store.replay_events("b")] == [0.0, 2.0, 4.0, 6.0, 8.0]
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_timestamps_stay_sorted(self, tmp_path):
+        store = EventStore(str(tmp_path), fsync=False)
+        for ts in (5.0, 1.0, 3.0):
+            await store.store_event(Event(type="a", timestamp=ts))
+
+        assert [e.timestamp for e in await store.get_events_by_type("a")] == [5.0, 3.0, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_retention_is_bounded_and_replay_reads_the_log(self, tmp_path):
+        store = EventStore(str(tmp_path), max_events=5, fsync=False)
+        for i in range(20):
+            await store.store_event(Event(type="a", timestamp=float(i)))
+            await store.store_result(EventResult(event_id=str(i), status=EventStatus.COMPLETED))
+
+        assert len(store.events) == 5
+        assert len(store.results) == 5
+        assert len(await store.get_events_by_type("a", limit=100)) == 5
+        assert [e.timestamp for e in await store.replay_events("a")] == [float(i) for i in range(20)]
+
+        replayed = [(offset, event.timestamp) async for offset, event in store.replay_from(30)]
+        assert [ts for _, ts in replayed] == [15.0, 16.0, 17.0, 18.0, 19.0]
+        assert all(offset >= 30 for offset, _ in replayed)
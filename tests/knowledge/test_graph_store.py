@@ -0,0 +1,167 @@
+"""Tests for Neo4jKnowledgeStore query construction, batching and session reuse against a fake driver."""
+
+from datetime import datetime
+
+import pytest
+
+from grid.knowledge import graph_store
+from grid.knowledge.graph_schema import EntityType, RelationType
+from grid.knowledge.graph_store import Entity, EntityId, Neo4jKnowledgeStore, SearchContext
+
+
+class FakeResult(list):
+    def single(self):
+        return self[0] if self else None
+
+    def consume(self):
+        return None
+
+
+class FakeSession:
+    def __init__(self, driver, **config):
+        self.driver = driver
+        self.config = config
+        self.closed = False
+
+    def run(self, query, params=None, **kwargs):
+        self.driver.queries.append((query, params or {}))
+        if "RETURN 1 as test" in query:
+            return FakeResult([{"test": 1}])
+        for fragment, records in self.driver.responses.items():
+            if fragment in query:
+                return FakeResult(records)
+        return FakeResult()
+
+    def execute_read(self, work):
+        return work(self)
+
+    execute_write = execute_read
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeDriver:
+    def __init__(self):
+        self.queries = []
+        self.responses = {}
+        self.sessions = []
+
+    def session(self, **config):
+        session = FakeSession(self, **config)
+        self.sessions.append(session)
+        return session
+
+    def close(self):
+        pass
+
+
+class FakeGraphDatabase:
+    driver_instance = None
+
+    @classmethod
+    def driver(cls, uri, **kwargs):
+        return cls.driver_instance
+
+    @staticmethod
+    def bookmark_manager():
+        return object()
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    fake = FakeDriver()
+    FakeGraphDatabase.driver_instance = fake
+    monkeypatch.setattr(graph_store, "NEO4J_AVAILABLE", True)
+    monkeypatch.setattr(graph_store, "_GraphDatabase", FakeGraphDatabase)
+    return fake
+
+
+def _node(entity_id, name):
+    now = datetime(2026, 1, 1).isoformat()
+    return {"entity_id": entity_id, "name": name, "created_at": now, "updated_at": now, "embedding": [0.1, 0.2]}
+
+
+def _entity(entity_id, entity_type=EntityType.CONTEXT):
+    now = datetime(2026, 1, 1)
+    properties = {"id": entity_id, "name": entity_id, "description": "d", "created_at": now.isoformat()}
+    return Entity(entity_id, entity_type, properties, now, now)
+
+
+class TestNeo4jKnowledgeStore:
+    def test_schema_creates_fulltext_and_vector_indexes(self, driver):
+        store = Neo4jKnowledgeStore(password="x", embed_fn=lambda text: [0.0] * 8)
+        store.connect()
+
+        schema = " ".join(query for query, _ in driver.queries)
+        assert "CREATE FULLTEXT INDEX knowledge_entity_text" in schema
+        assert "CREATE VECTOR INDEX knowledge_entity_embedding" in schema
+        assert "`vector.dimensions`: 8" in schema
+        assert store.embedding_dimensions == 8
+
+    def test_store_entities_batches_rows_per_label_set(self, driver):
+        store = Neo4jKnowledgeStore(password="x", write_batch_size=2, embed_fn=lambda text: [1.0, 0.0])
+        store.connect()
+        driver.queries.clear()
+
+        entities = [_entity(f"c{i}") for i in range(3)] + [_entity("a0", EntityType.AGENT)]
+        ids = store.store_entities(entities)
+
+        assert [entity_id.value for entity_id in ids] == ["c0", "c1", "c2", "a0"]
+        batches = [params["rows"] for query, params in driver.queries if "UNWIND" in query]
+        assert [len(rows) for rows in batches] == [2, 1, 1]
+        assert batches[0][0]["embedding"] == [1.0, 0.0]
+
+    def test_fulltext_search_escapes_terms_and_strips_internal_label(self, driver):
+        store = Neo4jKnowledgeStore(password="x")
+        store.connect()
+        driver.responses["db.index.fulltext.queryNodes"] = [
+            {"e": _node("a1", "Planner"), "labels": ["KnowledgeEntity", "Agent", "core"]}
+        ]
+
+        results = store.semantic_search("Plan+", SearchContext(query="Plan+", entity_types=[EntityType.AGENT]))
+
+        query, params = driver.queries[-1]
+        assert params["search_term"] == "plan\\+ OR plan\\+*"
+        assert "e:`Agent`" in query and "ORDER BY score DESC" in query
+        assert results[0].entity_type is EntityType.AGENT
+        assert results[0].labels == {"core"}
+        assert "embedding" not in results[0].properties
+
+    def test_vector_search_used_with_embedder(self, driver):
+        store = Neo4jKnowledgeStore(password="x", embed_fn=lambda text: [0.5, 0.5])
+        store.connect()
+
+        store.semantic_search("planner", SearchContext(query="planner", limit=5))
+
+        query, params = driver.queries[-1]
+        assert "db.index.vector.queryNodes('knowledge_entity_embedding', $k, $vector)" in query
+        assert params["vector"] == [0.5, 0.5] and params["k"] == 5
+
+    def test_read_sessions_are_pooled(self, driver):
+        store = Neo4jKnowledgeStore(password="x")
+        store.connect()
+        opened = len(driver.sessions)
+
+        for _ in range(3):
+            store.get_entity(EntityId("missing"))
+
+        read_sessions = driver.sessions[opened:]
+        assert len(read_sessions) == 1
+        assert read_sessions[0].config["default_access_mode"] == "READ"
+
+        store.disconnect()
+        assert read_sessions[0].closed
+
+    def test_create_relationship_requires_both_entities(self, driver):
+        store = Neo4jKnowledgeStore(password="x")
+        store.connect()
+
+        with pytest.raises(ValueError):
+            store.create_relationship(EntityId("a"), EntityId("b"), RelationType.DEPENDS_ON)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Per-layer latency benchmark for the Mothership middleware chain.
+
+Builds the default chain one layer at a time, both as stacked
+BaseHTTPMiddleware and as stages of one ASGIPipelineMiddleware, and drives
+each app in-process with an open-loop load generator at a fixed request rate
+(requests are issued on schedule whether or not earlier ones finished, so
+queueing shows up in the numbers). Latency is measured from the scheduled
+send time to the last response body message.
+
+Reports, per layer and rate, the p50 latency added by that layer on top of
+the layers before it.
+
+Usage:
+    python tests/performance/benchmark_asgi_pipeline.py --rates 1000 5000 --seconds 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from fastapi import FastAPI, Request
+
+from application.mothership.middleware import (
+    ErrorHandlingMiddleware,
+    RateLimitMiddleware,
+    RequestIDMiddleware,
+    SecurityHeadersMiddleware,
+    TimingMiddleware,
+    install_middleware_plan,
+)
+from application.mothership.middleware.accountability import AccountabilityMiddleware
+from application.mothership.middleware.request_size import RequestSizeLimitMiddleware
+from application.mothership.middleware.security_enforcer import SecurityEnforcerMiddleware
+from application.mothership.middleware.usage_tracking import UsageTrackingMiddleware
+from application.mothership.middleware.versioning import VersioningMiddleware
+
+# Outermost first, as in setup_middleware
+LAYERS: list[tuple[type, dict]] = [
+    (ErrorHandlingMiddleware, {}),
+    (SecurityHeadersMiddleware, {}),
+    (SecurityEnforcerMiddleware, {"audit_logging": False}),
+    (TimingMiddleware, {}),
+    (AccountabilityMiddleware, {"log_degraded": False}),
+    (RequestIDMiddleware, {}),
+    (VersioningMiddleware, {"default_version": "v1"}),
+    (RequestSizeLimitMiddleware, {}),
+    (UsageTrackingMiddleware, {}),
+    (RateLimitMiddleware, {"requests_per_minute": 10**9}),
+]
+
+BODY = json.dumps({"query": "hello world", "limit": 10}).encode()
+
+
+def _build(layers: list[tuple[type, dict]], asgi_pipeline: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/v1/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    # install_middleware_plan takes add order, i.e. innermost first
+    install_middleware_plan(app, layers[::-1], asgi_pipeline=asgi_pipeline)
+    return app
+
+
+async def _request(app: FastAPI, scheduled: float) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/echo",
+        "raw_path": b"/api/v1/echo",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(BODY)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = False
+    done = asyncio.Event()
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": BODY, "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            done.set()
+
+    await app(scope, receive, send)
+    return (time.perf_counter() - scheduled) * 1000
+
+
+async def _run(app: FastAPI, rate: int, seconds: float) -> float:
+    # Warm up lazy state (routing, Request caches) outside the measurement
+    for _ in range(50):
+        await _request(app, time.perf_counter())
+
+    total = int(rate * seconds)
+    interval = 1.0 / rate
+    tasks = []
+    start = time.perf_counter()
+    for i in range(total):
+        scheduled = start + i * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(_request(app, scheduled)))
+    latencies = await asyncio.gather(*tasks)
+    return statistics.median(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", type=int, nargs="+", default=[1000, 5000], help="requests per second")
+    parser.add_argument("--seconds", type=float, default=2.0, help="load duration per measurement")
+    args = parser.parse_args()
+
+    for rate in args.rates:
+        print(f"\n{rate} RPS for {args.seconds:.1f}s, p50 latency added per layer (ms)")
+        print(f"{'=' * 72}")
+        print(f"{'layer':<32}{'BaseHTTPMiddleware':>20}{'ASGI pipeline':>20}")
+
+        previous = {mode: asyncio.run(_run(_build([], mode), rate, args.seconds)) for mode in (False, True)}
+        print(f"{'(endpoint only)':<32}{previous[False]:>20.3f}{previous[True]:>20.3f}")
+        for count in range(1, len(LAYERS) + 1):
+            current = {
+                mode: asyncio.run(_run(_build(LAYERS[:count], mode), rate, args.seconds)) for mode in (False, True)
+            }
+            name = LAYERS[count - 1][0].__name__
+            added = {mode: current[mode] - previous[mode] for mode in (False, True)}
+            print(f"{'+ ' + name:<32}{added[False]:>+20.3f}{added[True]:>+20.3f}")
+            previous = current
+        print(f"{'total':<32}{previous[False]:>20.3f}{previous[True]:>20.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the incremental BM25 index used by HybridRetriever.
+
+Measures:
+- Initial build time and incremental add/delete cost per batch
+- Query latency (p50, p95) at a given corpus size
+- rank_bm25 full rebuild + get_scores for comparison (when installed)
+
+Usage:
+    python tests/performance/benchmark_bm25_index.py --chunks 500000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools.rag.retrieval.bm25_index import BM25Index, tokenize
+
+
+def _make_corpus(chunks: int, vocab: int, words: int, seed: int = 0) -> list[str]:
+    """Zipf-distributed synthetic chunks, so common terms have long postings."""
+    rng = np.random.default_rng(seed)
+    terms = [f"w{i}" for i in range(vocab)]
+    ranks = np.minimum(rng.zipf(1.2, size=(chunks, words)), vocab) - 1
+    return [" ".join(terms[r] for r in row) for row in ranks]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=500_000)
+    parser.add_argument("--vocab", type=int, default=50_000)
+    parser.add_argument("--words", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"Generating {args.chunks} chunks...")
+    corpus = _make_corpus(args.chunks, args.vocab, args.words)
+    ids = [f"chunk_{i}" for i in range(args.chunks)]
+    queries = [tokenize(q) for q in _make_corpus(args.queries, args.vocab, 4, seed=1)]
+
+    print(f"\n{'=' * 60}")
+    print("BM25Index")
+    print(f"{'=' * 60}")
+    index = BM25Index()
+    t0 = time.perf_counter()
+    index.add(ids, corpus)
+    print(f"initial build:         {time.perf_counter() - t0:8.2f}s")
+
+    extra = _make_corpus(args.batch, args.vocab, args.words, seed=2)
+    t0 = time.perf_counter()
+    index.add([f"new_{i}" for i in range(args.batch)], extra)
+    print(f"add {args.batch} chunks:        {(time.perf_counter() - t0) * 1000:8.2f}ms")
+    t0 = time.perf_counter()
+    index.delete([f"chunk_{i}" for i in range(args.batch)])
+    print(f"delete {args.batch} chunks:     {(time.perf_counter() - t0) * 1000:8.2f}ms")
+
+    index.top_k(queries[0], 50)  # materialise postings arrays
+    latencies = []
+    for q in queries:
+        t0 = time.perf_counter()
+        index.top_k(q, 50)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    print(f"query p50:             {np.percentile(latencies, 50):8.2f}ms")
+    print(f"query p95:             {np.percentile(latencies, 95):8.2f}ms")
+
+    try:
+        from rank_bm25 import BM25Okapi
+    except ImportError:
+        return
+
+    print(f"\n{'=' * 60}")
+    print("rank_bm25.BM25Okapi (previous behaviour: rebuild on count change)")
+    print(f"{'=' * 60}")
+    t0 = time.perf_counter()
+    bm25 = BM25Okapi([tokenize(t) for t in corpus])
+    print(f"full rebuild:          {time.perf_counter() - t0:8.2f}s")
+    latencies = []
+    for q in queries[:20]:
+        t0 = time.perf_counter()
+        scores = bm25.get_scores(q)
+        sorted(zip(ids, scores, strict=False), key=lambda x: -x[1])[:50]
+        latencies.append((time.perf_counter() - t0) * 1000)
+    print(f"query p50:             {np.percentile(latencies, 50):8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the vection Clusterer: observe() throughput and merge pass cost
+against the cluster cap.
+
+For each cap in --caps, observes --events events drawn from enough distinct
+feature combinations to keep the clusterer at its cap, then times one merge
+pass. Compares the previous per-cluster scans (dict similarity against every
+centroid on assignment, confidence of every cluster on eviction, all pairs on
+merge) with the CentroidIndex. Both use the incremental centroids.
+
+Usage:
+    python tests/performance/benchmark_clusterer.py --caps 100 500 2000 --events 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from vection.workers.clusterer import Cluster, Clusterer, ClusterMember, EventFeatures
+
+WORDS = [f"{a}{b}" for a in ("route", "cache", "index", "shard", "queue", "render") for b in ("er", "ing", "ed")]
+
+
+class ScanClusterer(Clusterer):
+    """Assignment, eviction and merging by visiting clusters one at a time."""
+
+    def _assign_to_cluster(self, observation: EventFeatures) -> None:
+        best_cluster: Cluster | None = None
+        best_similarity = 0.0
+        for cluster in self._clusters.values():
+            similarity = self._calculate_similarity(observation.features, cluster.centroid)
+            if similarity > best_similarity and similarity >= self._similarity_threshold:
+                best_similarity, best_cluster = similarity, cluster
+        if best_cluster is None:
+            self._create_cluster(observation)
+            return
+        member = ClusterMember(
+            observation.event_id, observation.timestamp, observation.session_id, observation.features,
+            distance_to_centroid=1.0 - best_similarity,
+        )  # fmt: skip
+        best_cluster.add_member(member)
+        self._index.set(best_cluster)
+
+    def _evict_weakest_cluster(self) -> None:
+        if self._clusters:
+            clusters = self._clusters
+            self._remove_cluster(
+                min(clusters, key=lambda cid: (clusters[cid].confidence, -clusters[cid].staleness_seconds))
+            )
+
+    async def _merge_clusters(self) -> None:
+        cluster_list = list(self._clusters.values())
+        merged = set()
+        for i, cluster_a in enumerate(cluster_list):
+            if cluster_a.cluster_id in merged:
+                continue
+            for cluster_b in cluster_list[i + 1 :]:
+                if cluster_b.cluster_id in merged:
+                    continue
+                if self._calculate_similarity(cluster_a.centroid, cluster_b.centroid) > 0.9:
+                    source, target = cluster_b, cluster_a
+                    if cluster_a.size < cluster_b.size:
+                        source, target = cluster_a, cluster_b
+                    self._merge_into(source, target)
+                    merged.add(source.cluster_id)
+        for cluster_id in merged:
+            self._remove_cluster(cluster_id)
+
+
+def _events(count: int, combinations: int) -> list[tuple[str, dict]]:
+    rng = random.Random(combinations)
+    events = []
+    for _ in range(count):
+        combination = rng.randrange(combinations)
+        data = {"action": f"action-{combination}", "topic": f"topic-{combination % 17}", "domain": "bench"}
+        data["content"] = " ".join(rng.choices(WORDS, k=6))
+        events.append((f"session-{rng.randrange(100)}", data))
+    return events
+
+
+def _run(clusterer_cls, cap: int, events: list[tuple[str, dict]]) -> tuple[float, float]:
+    """(observe us/event, merge pass ms)."""
+    clusterer = clusterer_cls(max_clusters=cap, similarity_threshold=0.6)
+    start = time.perf_counter()
+    for session_id, data in events:
+        clusterer.observe(data, session_id)
+    observe_us = (time.perf_counter() - start) / len(events) * 1e6
+
+    start = time.perf_counter()
+    asyncio.run(clusterer._merge_clusters())
+    return observe_us, (time.perf_counter() - start) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--caps", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--events", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{args.events} events per cap")
+    print(f"{'=' * 60}")
+    print(f"{'cap':>6}{'scan us/event':>16}{'index us/event':>16}{'scan merge ms':>15}{'index merge ms':>16}")
+    for cap in args.caps:
+        events = _events(args.events, cap * 2)
+        scan_observe, scan_merge = _run(ScanClusterer, cap, events)
+        index_observe, index_merge = _run(Clusterer, cap, events)
+        print(f"{cap:>6}{scan_observe:>16.1f}{index_observe:>16.1f}{scan_merge:>15.1f}{index_merge:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
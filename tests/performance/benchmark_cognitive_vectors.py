@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the cognitive VectorDatabase: search latency against library
+size, comparing the previous per-pair compare_signatures loop and full sort
+with the normalized matrix and argpartition top-k, and (when FAISS is
+installed) the HNSW index and its recall against exact search.
+
+Usage:
+    python tests/performance/benchmark_cognitive_vectors.py --sizes 1000 10000 100000 --queries 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from cognitive.cognitive_unit import CognitiveUnit, LocomotionComponent, SoundComponent, VisionComponent
+from cognitive.vectorizer import HAS_FAISS, VectorDatabase
+
+
+def _trajectory(rng: random.Random, length: int = 8) -> list[CognitiveUnit]:
+    return [
+        CognitiveUnit(
+            vision=VisionComponent(rng.random(), rng.random(), rng.random()),
+            sound=SoundComponent(rng.random(), rng.random()),
+            locomotion=LocomotionComponent(rng.random(), rng.random()),
+        )
+        for _ in range(length)
+    ]
+
+
+def _loop_search(db: VectorDatabase, query: list[CognitiveUnit], top_k: int) -> list[str]:
+    """The previous search: one compare_signatures call per stored vector."""
+    query_vector = db._signature(query)
+    results = [(key, db._vectorizer.compare_signatures(query_vector, vector)) for key, vector in db.vectors.items()]
+    results.sort(key=lambda x: x[1], reverse=True)
+    return [key for key, _ in results[:top_k]]
+
+
+def _fill(size: int, rng: random.Random, **kwargs) -> VectorDatabase:
+    """Build a library of random trajectories without re-vectorizing each one."""
+    db = VectorDatabase(**kwargs)
+    base = [db._signature(_trajectory(rng)) for _ in range(min(size, 500))]
+    for i in range(size):
+        jitter = [rng.gauss(0, 0.01) for _ in range(db.vector_size)]
+        db._append([f"t{i}"], (base[i % len(base)] + jitter)[None], [{"i": i}])
+    return db
+
+
+def _time(fn, queries) -> tuple[float, list]:
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        results.append(fn(query))
+    return (time.perf_counter() - start) / len(queries) * 1e3, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    queries = [_trajectory(rng) for _ in range(args.queries)]
+
+    print(f"Cosine top-{args.top_k} search, FAISS {'available' if HAS_FAISS else 'not installed'}")
+    print(f"{'=' * 60}")
+    print(f"{'vectors':>9}{'loop ms':>11}{'matrix ms':>11}{'hnsw ms':>10}{'recall':>9}")
+    for size in args.sizes:
+        db = _fill(size, random.Random(size), ann_threshold=None)
+        loop_ms, expected = _time(lambda q, db=db: _loop_search(db, q, args.top_k), queries)
+        matrix_ms, exact = _time(lambda q, db=db: [k for k, _, _ in db.search(q, args.top_k)], queries)
+        assert exact == expected
+
+        hnsw_cell, recall_cell = "-", "-"
+        if HAS_FAISS:
+            db.ann_threshold = 0
+            db.search(queries[0], args.top_k)  # Build the index
+            hnsw_ms, approx = _time(lambda q, db=db: [k for k, _, _ in db.search(q, args.top_k)], queries)
+            hits = sum(len(set(a) & set(e)) for a, e in zip(approx, exact, strict=True))
+            hnsw_cell, recall_cell = f"{hnsw_ms:.2f}", f"{hits / (len(exact) * args.top_k):.3f}"
+
+        print(f"{size:>9}{loop_ms:>11.2f}{matrix_ms:>11.2f}{hnsw_cell:>10}{recall_cell:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the vection Correlator: processing tick cost against window population.
+
+For each population in --populations, observes that many events (spread
+over --sessions sessions and --types event types, all inside the temporal
+window) and times one processing tick, with the previous pairwise scan of
+the window and full rescan of every session's sequence, and with the
+incremental counters. The time spent counting in observe() is reported
+separately.
+
+Usage:
+    python tests/performance/benchmark_correlator.py --populations 500 1000 2000 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from vection.workers.correlator import CorrelationType, Correlator
+
+
+class PairwiseCorrelator(Correlator):
+    """Temporal pairs by scanning every pair in the window, sequences by rescanning each session."""
+
+    async def _detect_temporal_correlations(self) -> None:
+        recent = [o for o in self._observations if time.time() - o.timestamp < self._temporal_window]
+        for i, obs_a in enumerate(recent):
+            for obs_b in recent[i + 1 :]:
+                time_diff = abs(obs_b.timestamp - obs_a.timestamp)
+                if time_diff > self._temporal_window:
+                    continue
+                if obs_a.event_type == obs_b.event_type and obs_a.session_id == obs_b.session_id:
+                    continue
+                candidate_id = self._make_candidate_id(CorrelationType.TEMPORAL, obs_a.event_type, obs_b.event_type)
+                candidate = self._get_or_create_candidate(
+                    candidate_id, CorrelationType.TEMPORAL, obs_a.event_type, obs_b.event_type
+                )
+                candidate.add_occurrence(0.1 * (1.0 - time_diff / self._temporal_window))
+
+    async def _detect_sequence_correlations(self) -> None:
+        for sequence in self._sequence_tracker.values():
+            if len(sequence) < 3:
+                continue
+            pairs: dict[tuple[str, str], int] = defaultdict(int)
+            items = list(sequence)
+            for i in range(len(items) - 1):
+                if items[i] != items[i + 1]:
+                    pairs[(items[i], items[i + 1])] += 1
+            for pair, count in pairs.items():
+                if count >= 2:
+                    candidate_id = self._make_candidate_id(CorrelationType.SEQUENCE, pair[0], pair[1])
+                    candidate = self._get_or_create_candidate(candidate_id, CorrelationType.SEQUENCE, *pair)
+                    candidate.add_occurrence(0.1 * count)
+
+
+def _events(count: int, sessions: int, types: int) -> list[tuple[str, dict]]:
+    rng = random.Random(count)
+    return [(f"session-{rng.randrange(sessions)}", {"action": f"action-{rng.randrange(types)}"}) for _ in range(count)]
+
+
+def _time_tick(correlator_cls, events: list[tuple[str, dict]]) -> tuple[float, float]:
+    """(observe ms, tick ms) for a fresh correlator fed the events."""
+    correlator = correlator_cls(temporal_window_seconds=3600.0, max_observations=len(events))
+    start = time.perf_counter()
+    for session_id, data in events:
+        correlator.observe(data, session_id)
+    observed = time.perf_counter()
+    asyncio.run(correlator._process_correlations())
+    return (observed - start) * 1e3, (time.perf_counter() - observed) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--populations", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--types", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"Tick cost, {args.sessions} sessions, {args.types} event types")
+    print(f"{'=' * 60}")
+    print(f"{'window':>8}{'pairwise tick ms':>20}{'incremental tick ms':>22}{'observe ms':>12}")
+    for population in args.populations:
+        events = _events(population, args.sessions, args.types)
+        _, pairwise_ms = _time_tick(PairwiseCorrelator, events)
+        observe_ms, incremental_ms = _time_tick(Correlator, events)
+        print(f"{population:>8}{pairwise_ms:>20.1f}{incremental_ms:>22.2f}{observe_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
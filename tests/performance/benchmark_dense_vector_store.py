@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Benchmark for InMemoryDenseVectorStore index modes.
+
+Measures:
+- First-query latency after each ingest batch (incremental append vs full rebuild)
+- Query latency (p50, p95) for flat, HNSW and IVF indexes
+- Recall@k of the ANN indexes against the exact flat baseline
+- Metadata-filtered vs unfiltered query latency
+- Cold start: re-adding all embeddings vs opening a memory-mapped snapshot
+
+Usage:
+    python tests/performance/benchmark_dense_vector_store.py --rows 100000 --dim 384
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools.rag.vector_store.in_memory_dense import HAS_FAISS, InMemoryDenseVectorStore
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    return float(np.percentile(values, pct)) if values else 0.0
+
+
+def _make_data(rows: int, dim: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(rows, dim)).astype(np.float32)
+
+
+def benchmark_ingest_while_serving(data: np.ndarray, batch_size: int) -> dict[str, float]:
+    """First-query latency after every ingest batch."""
+    print(f"\n{'=' * 60}")
+    print("Ingest-while-serving: first query after each batch")
+    print(f"{'=' * 60}")
+
+    query = data[0].tolist()
+    results = {}
+
+    for label, rebuild in (("incremental", False), ("full rebuild", True)):
+        store = InMemoryDenseVectorStore(ann_index=None)
+        latencies = []
+        for start in range(0, len(data), batch_size):
+            batch = data[start : start + batch_size]
+            store.add(
+                ids=[f"doc_{i}" for i in range(start, start + len(batch))],
+                documents=[""] * len(batch),
+                embeddings=batch,
+            )
+            if rebuild:
+                # Emulates the previous behaviour: drop the index on every add
+                store._index = None
+            t0 = time.perf_counter()
+            store.query(query, n_results=10)
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+        results[label] = statistics.mean(latencies)
+        print(f"{label:>14}: mean {statistics.mean(latencies):8.2f}ms  max {max(latencies):8.2f}ms")
+
+    return results
+
+
+def benchmark_index_modes(data: np.ndarray, queries: np.ndarray, k: int) -> dict[str, dict[str, float]]:
+    """Latency and recall@k of each index mode against exact search."""
+    print(f"\n{'=' * 60}")
+    print(f"Index modes: {len(data)} rows, {len(queries)} queries, recall@{k}")
+    print(f"{'=' * 60}")
+
+    ids = [f"doc_{i}" for i in range(len(data))]
+    exact: list[set[str]] = []
+    results = {}
+
+    for mode in (None, "hnsw", "ivf"):
+        store = InMemoryDenseVectorStore(ann_index=mode, ann_threshold=1)
+        t0 = time.perf_counter()
+        store.add(ids=ids, documents=[""] * len(ids), embeddings=data)
+        store.query(queries[0].tolist(), n_results=k)  # build the index
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        latencies = []
+        hits = []
+        for q in queries:
+            t0 = time.perf_counter()
+            res = store.query(q.tolist(), n_results=k, include=[])
+            latencies.append((time.perf_counter() - t0) * 1000)
+            hits.append(set(res["ids"]))
+
+        if mode is None:
+            exact = hits
+        recall = statistics.mean(len(h & e) / k for h, e in zip(hits, exact, strict=True))
+
+        label = mode or "flat"
+        results[label] = {
+            "build_ms": build_ms,
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "recall": recall,
+        }
+        print(
+            f"{label:>5}: build {build_ms:9.1f}ms  p50 {results[label]['p50_ms']:6.3f}ms  "
+            f"p95 {results[label]['p95_ms']:6.3f}ms  recall@{k} {recall:.3f}"
+        )
+
+    return results
+
+
+def benchmark_filtered_queries(data: np.ndarray, queries: np.ndarray, k: int) -> dict[str, float]:
+    """Latency of ``where``-filtered queries against unfiltered ones."""
+    print(f"\n{'=' * 60}")
+    print("Filtered vs unfiltered queries (exact search)")
+    print(f"{'=' * 60}")
+
+    store = InMemoryDenseVectorStore(ann_index=None)
+    store.add(
+        ids=[f"doc_{i}" for i in range(len(data))],
+        documents=[""] * len(data),
+        embeddings=data,
+        metadatas=[{"source": f"file_{i % 500}.py", "file_type": ("py", "md", "txt")[i % 3]} for i in range(len(data))],
+    )
+
+    filters = {
+        "unfiltered": None,
+        "file_type (1/3 of rows)": {"file_type": "py"},
+        "source (1/500 of rows)": {"source": "file_7.py"},
+        "source + file_type": {"source": "file_7.py", "file_type": "txt"},
+    }
+    results = {}
+    for label, where in filters.items():
+        latencies = []
+        for q in queries:
+            t0 = time.perf_counter()
+            store.query(q.tolist(), n_results=k, where=where, include=[])
+            latencies.append((time.perf_counter() - t0) * 1000)
+        results[label] = _percentile(latencies, 50)
+        print(f"{label:>24}: p50 {results[label]:7.3f}ms  p95 {_percentile(latencies, 95):7.3f}ms")
+
+    return results
+
+
+def benchmark_cold_start(data: np.ndarray) -> dict[str, float]:
+    """Time to first query result for a fresh process-local store."""
+    print(f"\n{'=' * 60}")
+    print("Cold start: re-add vs snapshot load")
+    print(f"{'=' * 60}")
+
+    ids = [f"doc_{i}" for i in range(len(data))]
+    documents = [f"document {i}" for i in range(len(data))]
+    metadatas = [{"source": f"file_{i % 100}.py"} for i in range(len(data))]
+    results = {}
+
+    t0 = time.perf_counter()
+    store = InMemoryDenseVectorStore(ann_index=None)
+    store.add(ids=ids, documents=documents, embeddings=data.tolist(), metadatas=metadatas)
+    results["re-add"] = (time.perf_counter() - t0) * 1000
+
+    with tempfile.TemporaryDirectory() as root:
+        for dtype in ("float32", "float16", "int8"):
+            store.save_snapshot(root, dtype=dtype, keep=1)
+            t0 = time.perf_counter()
+            InMemoryDenseVectorStore.load_snapshot(root, ann_index=None)
+            results[f"load {dtype}"] = (time.perf_counter() - t0) * 1000
+
+    for label, ms in results.items():
+        print(f"{label:>14}: {ms:9.1f}ms")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if not HAS_FAISS:
+        print("faiss is not installed; only the numpy fallback will be measured")
+
+    data = _make_data(args.rows, args.dim)
+    queries = _make_data(args.queries, args.dim, seed=1)
+
+    benchmark_ingest_while_serving(data, args.batch_size)
+    benchmark_filtered_queries(data, queries, args.k)
+    benchmark_cold_start(data)
+    if HAS_FAISS:
+        benchmark_index_modes(data, queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark for DRT attack-vector matching per request.
+
+Stores --vectors attack vectors over --paths endpoints and matches --requests
+signatures against them, with the previous pairwise scan (set-based Jaccard
+against every stored vector) and with AttackVectorIndex. Also times path
+normalization with the regexes compiled per call and precompiled.
+
+Usage:
+    python tests/performance/benchmark_drt_attack_matching.py --vectors 10000 --requests 5000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from application.mothership.middleware.drt_middleware import (
+    AttackVectorIndex,
+    BehavioralSignature,
+    ComprehensiveDRTMiddleware,
+)
+
+HEADERS = ["accept", "accept-encoding", "content-type", "user-agent", "origin", "referer", "x-forwarded-for"]
+HEADERS += [f"x-custom-{i}" for i in range(25)]
+
+
+def _signatures(count: int, paths: int, rng: random.Random) -> list[BehavioralSignature]:
+    return [
+        BehavioralSignature(
+            f"/api/resource-{rng.randrange(paths)}/{{ID}}",
+            rng.choice(["GET", "POST", "PUT", "DELETE"]),
+            tuple(sorted(rng.sample(HEADERS, rng.randint(1, 8)))),
+        )
+        for _ in range(count)
+    ]
+
+
+def _scan(middleware: ComprehensiveDRTMiddleware, vectors: list[BehavioralSignature]):
+    def match(signature: BehavioralSignature) -> tuple[float, BehavioralSignature | None]:
+        best, matched = 0.0, None
+        for vector in vectors:
+            similarity = middleware._calculate_similarity(signature, vector)
+            if similarity > best:
+                best, matched = similarity, vector
+        return best, matched
+
+    return match
+
+
+def _normalize_path_uncompiled(path: str) -> str:
+    normalized = re.sub(r"/[a-f0-9-]{36}", "/{UUID}", path)
+    return re.sub(r"/\d+", "/{ID}", normalized)
+
+
+def _time(fn, inputs: list) -> float:
+    start = time.perf_counter()
+    for item in inputs:
+        fn(item)
+    return (time.perf_counter() - start) / len(inputs) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=10000)
+    parser.add_argument("--paths", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vectors = _signatures(args.vectors, args.paths, rng)
+    requests = _signatures(args.requests, args.paths, rng)
+    middleware = ComprehensiveDRTMiddleware.__new__(ComprehensiveDRTMiddleware)
+
+    start = time.perf_counter()
+    index = AttackVectorIndex(vectors)
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    scan = _scan(middleware, vectors)
+    scan_requests = requests[: max(1, args.requests // 20)]
+    mismatches = sum(scan(r)[0] != index.best_match(r)[0] for r in scan_requests)
+
+    print(f"{args.vectors} attack vectors over {args.paths} paths, {args.requests} requests")
+    print(f"{'=' * 60}")
+    print(f"{'index build':<28}{build_ms:10.1f} ms")
+    print(f"{'pairwise scan':<28}{_time(scan, scan_requests):10.1f} us/request")
+    print(f"{'AttackVectorIndex':<28}{_time(index.best_match, requests):10.1f} us/request")
+    print(f"{'mismatched scores':<28}{mismatches:10d}")
+
+    paths = [f"/api/users/{rng.randrange(10**6)}/orders/{rng.randrange(10**4)}" for _ in range(args.requests)]
+    print(f"{'normalize, re per call':<28}{_time(_normalize_path_uncompiled, paths):10.2f} us/path")
+    print(f"{'normalize, precompiled':<28}{_time(middleware._normalize_path, paths):10.2f} us/path")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Emit cost versus subscription count for the grid.events EventBus.
+
+Subscribes N handlers spread over exact, trailing-wildcard and inner-wildcard
+patterns across many event types, then times emit for a mix of event types.
+
+Compares:
+- linear scan: EventSubscription.matches on every subscription per emit,
+  then a priority sort (the lookup before the pattern index)
+- pattern index: compiled index with the per-event-type match cache
+
+Usage:
+    python tests/performance/benchmark_event_bus_matching.py --subscriptions 100 1000 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from grid.events.core import Event, EventBus, EventPriority, EventSubscription
+
+
+class LinearScanEventBus(EventBus):
+    """Matches every subscription against every event."""
+
+    def _get_matching_subscriptions(self, event: Event) -> list[EventSubscription]:
+        with self._lock:
+            matching = [
+                self._subscriptions[sub_id]
+                for sub_ids in self._pattern_subscriptions.values()
+                for sub_id in sub_ids
+                if self._subscriptions[sub_id].matches(event.type)
+            ]
+        matching.sort(key=lambda s: s.priority, reverse=True)
+        return matching
+
+
+def _populate(bus: EventBus, subscriptions: int) -> None:
+    priorities = list(EventPriority)
+    for i in range(subscriptions):
+        domain, action = f"domain{i % 50}", f"action{i % 200}"
+        kind = i % 10
+        if kind < 7:
+            pattern = f"{domain}:{action}:done"
+        elif kind < 9:
+            pattern = f"{domain}:{action}:*"
+        else:
+            pattern = f"*:{action}:done"
+        bus.subscribe(pattern, lambda event: None, priority=priorities[i % len(priorities)])
+
+
+def _time_emits(bus: EventBus, emits: int) -> tuple[float, float]:
+    events = [Event(type=f"domain{i % 50}:action{i % 200}:done", data={}, source="bench") for i in range(emits)]
+    start = time.perf_counter()
+    for event in events:
+        bus.emit(event)
+    elapsed = time.perf_counter() - start
+    return elapsed / emits * 1e6, bus.get_stats()["events_delivered"] / emits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscriptions", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--emits", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'subscriptions':>14}{'linear scan':>18}{'pattern index':>18}{'handlers/emit':>16}")
+    print(f"{'=' * 66}")
+    for count in args.subscriptions:
+        results = []
+        for bus_class in (LinearScanEventBus, EventBus):
+            bus = bus_class(store_events=False)
+            _populate(bus, count)
+            emits = max(200, args.emits * 100 // max(count, 100)) if bus_class is LinearScanEventBus else args.emits
+            results.append(_time_emits(bus, emits))
+        (linear_us, _), (indexed_us, handlers) = results
+        print(f"{count:>14}{linear_us:>15.1f} us{indexed_us:>15.1f} us{handlers:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
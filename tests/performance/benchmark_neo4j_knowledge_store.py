@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Write and search benchmark for Neo4jKnowledgeStore against a local Neo4j.
+
+Connects to the server in NEO4J_URI / NEO4J_USERNAME / NEO4J_PASSWORD when
+NEO4J_URI is set, otherwise starts a throwaway Neo4j 5 container with
+testcontainers (pip install testcontainers; requires Docker). All benchmark
+entities are deleted afterwards.
+
+Compares:
+- writes: store_entity per entity (one session and transaction each) versus
+  store_entities (UNWIND batches)
+- search: a toLower(...) CONTAINS scan with a new session per call (the
+  search before the indexes) versus the full-text index, and the vector index
+  when --dimensions is given, both on pooled read sessions
+
+Usage:
+    python tests/performance/benchmark_neo4j_knowledge_store.py --entities 20000 --searches 500
+    NEO4J_URI=bolt://localhost:7687 NEO4J_PASSWORD=secret \\
+        python tests/performance/benchmark_neo4j_knowledge_store.py --dimensions 64
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from grid.knowledge.graph_schema import EntityType
+from grid.knowledge.graph_store import Entity, Neo4jKnowledgeStore, SearchContext
+
+WORDS = [f"{a}{b}" for a in ("plan", "route", "cache", "index", "shard", "queue") for b in ("er", "ing", "ed", "s")]
+
+
+class ScanKnowledgeStore(Neo4jKnowledgeStore):
+    """Search as a case-insensitive CONTAINS scan, opening a session per call."""
+
+    def semantic_search(self, query: str, context: SearchContext) -> list[Entity]:
+        driver = self._ensure_driver()
+        with driver.session(database=self.database) as session:
+            result = session.run(
+                """
+                MATCH (e)
+                WHERE toLower(e.name) CONTAINS toLower($search_term)
+                   OR toLower(e.description) CONTAINS toLower($search_term)
+                RETURN e, labels(e) as labels
+                LIMIT $limit
+                """,
+                {"search_term": query, "limit": context.limit},
+            )
+            return [entity for r in result if (entity := self._to_entity(r["e"], r["labels"])) is not None]
+
+
+def _embed(dimensions: int):
+    def embed(text: str) -> list[float]:
+        rng = random.Random(text)
+        return [rng.uniform(-1.0, 1.0) for _ in range(dimensions)]
+
+    return embed
+
+
+def _entities(count: int) -> list[Entity]:
+    rng = random.Random(0)
+    now = datetime.now()
+    entities = []
+    for i in range(count):
+        name = f"bench-{i} {rng.choice(WORDS)}"
+        properties = {
+            "id": f"bench-{i}",
+            "name": name,
+            "description": " ".join(rng.choices(WORDS, k=8)),
+            "created_at": now.isoformat(),
+        }
+        entities.append(Entity(f"bench-{i}", EntityType.CONTEXT, properties, now, now, {"Benchmark"}))
+    return entities
+
+
+@contextlib.contextmanager
+def _neo4j():
+    """Yield (uri, username, password) for a configured server or a test container."""
+    if os.environ.get("NEO4J_URI"):
+        yield os.environ["NEO4J_URI"], os.environ.get("NEO4J_USERNAME", "neo4j"), os.environ["NEO4J_PASSWORD"]
+        return
+
+    from testcontainers.neo4j import Neo4jContainer
+
+    with Neo4jContainer("neo4j:5") as container:
+        yield container.get_connection_url(), container.username, container.password
+
+
+def _time(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=20000)
+    parser.add_argument("--single-writes", type=int, default=500)
+    parser.add_argument("--searches", type=int, default=500)
+    parser.add_argument("--dimensions", type=int, default=0, help="Embedding size; 0 skips the vector index")
+    args = parser.parse_args()
+
+    with _neo4j() as (uri, username, password):
+        embed_fn = _embed(args.dimensions) if args.dimensions else None
+        store = Neo4jKnowledgeStore(uri, username, password, embed_fn=embed_fn)
+        text_store = Neo4jKnowledgeStore(uri, username, password)
+        scan_store = ScanKnowledgeStore(uri, username, password)
+        entities = _entities(args.entities)
+
+        try:
+            print(f"{args.entities} entities, {args.searches} searches")
+            print(f"{'=' * 60}")
+
+            singles = entities[: args.single_writes]
+            single_ms = _time(lambda i: store.store_entity(singles[i]), len(singles))
+            start = time.perf_counter()
+            store.store_entities(entities)
+            batch_ms = (time.perf_counter() - start) / len(entities) * 1e3
+            print(f"{'store_entity':<28}{single_ms:10.3f} ms/entity")
+            print(f"{'store_entities':<28}{batch_ms:10.3f} ms/entity")
+
+            context = SearchContext(query="", limit=20)
+            searches = [random.Random(i).choice(WORDS) for i in range(args.searches)]
+            runs = [("CONTAINS scan", scan_store), ("full-text index", text_store)]
+            if embed_fn is not None:
+                runs.append(("vector index", store))
+            for name, search_store in runs:
+                search_store.semantic_search(searches[0], context)  # Warm up
+                elapsed = _time(lambda i, s=search_store: s.semantic_search(searches[i], context), args.searches)
+                print(f"{name:<28}{elapsed:10.3f} ms/search")
+        finally:
+            with store._write_session() as session:
+                session.run("MATCH (e:Benchmark) CALL { WITH e DETACH DELETE e } IN TRANSACTIONS").consume()
+            for s in (store, text_store, scan_store):
+                s.disconnect()
+
+
+if __name__ == "__main__":
+    main()
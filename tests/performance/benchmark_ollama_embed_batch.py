@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark for OllamaEmbeddingProvider batch embedding.
+
+Runs against a local stub server that mimics Ollama's /api/embeddings and
+/api/embed endpoints with a fixed per-request overhead plus a per-input cost,
+so the numbers isolate request count, connection reuse and concurrency.
+Pass --base-url to measure a real Ollama instance instead.
+
+Measures:
+- Texts/sec for the per-text loop (one /api/embeddings request each)
+- Texts/sec for embed_batch and async_embed_batch over /api/embed
+
+Usage:
+    python tests/performance/benchmark_ollama_embed_batch.py --texts 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools.rag.embeddings.nomic_v2 import OllamaEmbeddingProvider
+
+
+def _stub_server(request_ms: float, input_ms: float, dim: int) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if self.path == "/api/embed":
+                inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+                time.sleep((request_ms + input_ms * len(inputs)) / 1000)
+                payload = {"embeddings": [[0.1] * dim for _ in inputs]}
+            else:
+                time.sleep((request_ms + input_ms) / 1000)
+                payload = {"embedding": [0.1] * dim}
+            data = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=2_000)
+    parser.add_argument("--chars", type=int, default=800)
+    parser.add_argument("--request-ms", type=float, default=5.0, help="stub overhead per HTTP request")
+    parser.add_argument("--input-ms", type=float, default=0.5, help="stub cost per embedded input")
+    parser.add_argument("--base-url", default=None, help="benchmark a real Ollama server instead of the stub")
+    parser.add_argument("--model", default="nomic-embed-text-v2-moe:latest")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = _stub_server(args.request_ms, args.input_ms, dim=768)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    texts = [f"chunk {i} " + "lorem ipsum " * (args.chars // 12) for i in range(args.texts)]
+    print(f"{args.texts} texts of ~{args.chars} chars against {base_url}")
+    print(f"{'=' * 60}")
+
+    provider = OllamaEmbeddingProvider(model=args.model, base_url=base_url)
+
+    t0 = time.perf_counter()
+    for text in texts[: max(1, args.texts // 10)]:
+        provider.embed(text)
+    per_text_rate = max(1, args.texts // 10) / (time.perf_counter() - t0)
+    print(f"{'per-text loop':>20}: {per_text_rate:9.1f} texts/s")
+
+    t0 = time.perf_counter()
+    provider.embed_batch(texts)
+    batch_rate = args.texts / (time.perf_counter() - t0)
+    print(f"{'embed_batch':>20}: {batch_rate:9.1f} texts/s  ({batch_rate / per_text_rate:.1f}x)")
+
+    async def run_async() -> float:
+        t0 = time.perf_counter()
+        await provider.async_embed_batch(texts)
+        elapsed = time.perf_counter() - t0
+        await provider.aclose()
+        return args.texts / elapsed
+
+    async_rate = asyncio.run(run_async())
+    print(f"{'async_embed_batch':>20}: {async_rate:9.1f} texts/s  ({async_rate / per_text_rate:.1f}x)")
+
+    provider.close()
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
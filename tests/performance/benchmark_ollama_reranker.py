@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for OllamaReranker.
+
+Runs against a local stub server that mimics Ollama's /api/generate with a
+fixed per-request cost plus a per-document prompt cost, serving at most
+--parallel requests at a time (like OLLAMA_NUM_PARALLEL). Pass --base-url
+to measure a real Ollama instance instead.
+
+Measures p50/p95 rerank latency for:
+- pointwise: one generate call per candidate
+- listwise: one generate call per group of candidates
+- listwise + cache: queries drawn from a pool, so repeats hit the score cache
+
+Usage:
+    python tests/performance/benchmark_ollama_reranker.py --queries 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools.rag.retrieval.reranker import OllamaReranker
+
+
+def _stub_server(request_ms: float, doc_ms: float, parallel: int) -> ThreadingHTTPServer:
+    slots = threading.Semaphore(parallel)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            prompt = body["prompt"]
+            numbered = re.findall(r"^\[(\d+)\] ", prompt, flags=re.MULTILINE)
+            with slots:
+                time.sleep((request_ms + doc_ms * max(len(numbered), 1)) / 1000)
+            if body.get("format") == "json":
+                response = json.dumps({n: random.randint(0, 10) for n in numbered})
+            else:
+                response = str(random.randint(0, 10))
+            data = json.dumps({"response": response}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def _run(reranker: OllamaReranker, queries: list[str], docs: list[str], ids: list[str]) -> list[float]:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        await reranker.async_rerank(query, docs, top_k=5, ids=ids)
+        latencies.append((time.perf_counter() - start) * 1000)
+    await reranker.close()
+    return latencies
+
+
+def _report(name: str, latencies: list[float], reranker: OllamaReranker) -> None:
+    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+    stats = reranker.get_stats()
+    print(
+        f"{name:<20} p50 {statistics.median(latencies):8.1f} ms   p95 {p95:8.1f} ms   "
+        f"llm calls {stats['llm_calls']:5d}   cache hit rate {stats['hit_rate_percent']:5.1f}%"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--distinct-queries", type=int, default=10, help="query pool size for the cached run")
+    parser.add_argument("--request-ms", type=float, default=40.0, help="stub cost per generate request")
+    parser.add_argument("--doc-ms", type=float, default=5.0, help="stub prompt cost per document")
+    parser.add_argument("--parallel", type=int, default=1, help="stub concurrent request slots")
+    parser.add_argument("--base-url", default=None, help="benchmark a real Ollama server instead of the stub")
+    parser.add_argument("--model", default="mistral-nemo:latest")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = _stub_server(args.request_ms, args.doc_ms, args.parallel)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    docs = [f"chunk {i}: " + "lorem ipsum dolor sit amet " * 15 for i in range(args.candidates)]
+    ids = [f"file_{i}.py#0" for i in range(args.candidates)]
+    unique = [f"question {i}" for i in range(args.queries)]
+    rng = random.Random(0)
+    pooled = [f"question {rng.randrange(args.distinct_queries)}" for _ in range(args.queries)]
+
+    print(f"{args.queries} queries x {args.candidates} candidates against {base_url}")
+    print(f"{'=' * 60}")
+
+    runs = [
+        ("pointwise", {"mode": "pointwise", "cache_size": 0}, unique),
+        ("listwise", {"mode": "listwise", "cache_size": 0}, unique),
+        ("listwise + cache", {"mode": "listwise"}, pooled),
+    ]
+    for name, kwargs, queries in runs:
+        reranker = OllamaReranker(model=args.model, base_url=base_url, max_candidates=args.candidates, **kwargs)
+        latencies = asyncio.run(_run(reranker, queries, docs, ids))
+        _report(name, latencies, reranker)
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark for cognitive pattern recognition: per-recognizer latency,
+PatternMatcher.recognize_all() against awaiting each recognizer in turn
+(inline, and concurrent with a thread or process pool for the kernels),
+repeating-sequence search by pairwise scan vs n-gram index, and per-user
+recognizers vs recognize_batch().
+
+Usage:
+    python tests/performance/benchmark_pattern_recognition.py --iterations 200 --users 1000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from cognitive.patterns.recognition import (
+    DeviationPattern,
+    PatternMatcher,
+    RhythmPattern,
+    TimePattern,
+    _find_repeating_sequences,
+)
+
+
+def _scan_repeating_sequences(elements: list[str]) -> list[dict]:
+    """The previous pairwise scan."""
+    repeating = []
+    for seq_len in [2, 3]:
+        if len(elements) < seq_len * 2:
+            continue
+        for i in range(len(elements) - seq_len + 1):
+            seq = tuple(elements[i : i + seq_len])
+            for j in range(i + seq_len, len(elements) - seq_len + 1):
+                if tuple(elements[j : j + seq_len]) == seq:
+                    repeating.append({"sequence": " ".join(seq), "start_indices": [i, j], "length": seq_len})
+                    break
+    return repeating[:10]
+
+
+def _data(rng: random.Random) -> dict:
+    return {
+        "cognitive_load": 5.0,
+        "engagement": 0.6,
+        "focus": 0.7,
+        "intervals": [1.0 + rng.random() * 0.2 for _ in range(20)],
+        "coordinates": [(rng.random(), rng.random()) for _ in range(20)],
+        "dimensions": {"x": 0.1, "y": 0.5, "z": 0.3},
+        "sequence": [rng.choice("abcdefgh") for _ in range(50)],
+        "values": [rng.gauss(10, 2) for _ in range(40)],
+        "time_series": [(datetime.fromtimestamp(i), rng.gauss(10, 2)) for i in range(100)],
+        "events": [rng.choice(["open", "edit", "save", "close"]) for _ in range(20)],
+        "patterns": ["flow_high", "rhythm_steady", "flow_high"],
+    }
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float]:
+    samples = sorted(samples)
+    return statistics.fmean(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+async def _per_recognizer(iterations: int) -> None:
+    rng = random.Random(0)
+    matcher = PatternMatcher()
+    data = _data(rng)
+    print(f"{'recognizer':>12}{'mean us':>12}{'p99 us':>12}")
+    for name, recognizer in matcher.patterns.items():
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await recognizer.recognize(data)
+            samples.append((time.perf_counter() - start) * 1e6)
+        mean, p99 = _percentiles(samples)
+        print(f"{name:>12}{mean:>12.1f}{p99:>12.1f}")
+
+
+async def _recognize_all(iterations: int) -> None:
+    rng = random.Random(1)
+    data = _data(rng)
+
+    sequential = PatternMatcher()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for recognizer in sequential.patterns.values():
+            await recognizer.recognize(data)
+    sequential_us = (time.perf_counter() - start) / iterations * 1e6
+
+    inline = PatternMatcher()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await inline.recognize_all(data)
+    inline_us = (time.perf_counter() - start) / iterations * 1e6
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        threaded = PatternMatcher(executor=executor)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await threaded.recognize_all(data)
+        threaded_us = (time.perf_counter() - start) / iterations * 1e6
+
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        pooled = PatternMatcher(executor=executor)
+        await pooled.recognize_all(data)  # Start workers
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await pooled.recognize_all(data)
+        pooled_us = (time.perf_counter() - start) / iterations * 1e6
+
+    print(f"{'sequential us':>16}{'inline us':>12}{'thread pool us':>16}{'process pool us':>18}")
+    print(f"{sequential_us:>16.1f}{inline_us:>12.1f}{threaded_us:>16.1f}{pooled_us:>18.1f}")
+
+
+def _repeating_sequences() -> None:
+    rng = random.Random(2)
+    print(f"{'elements':>10}{'scan ms':>12}{'index ms':>12}")
+    for length in (50, 500, 5000):
+        elements = [rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(length)]
+        start = time.perf_counter()
+        scanned = _scan_repeating_sequences(elements)
+        scan_ms = (time.perf_counter() - start) * 1e3
+        start = time.perf_counter()
+        indexed = _find_repeating_sequences(elements)
+        index_ms = (time.perf_counter() - start) * 1e3
+        assert scanned == indexed
+        print(f"{length:>10}{scan_ms:>12.3f}{index_ms:>12.3f}")
+
+
+async def _batch(users: int) -> None:
+    rng = random.Random(3)
+    windows = [[rng.gauss(10, 2) for _ in range(rng.randint(10, 100))] for _ in range(users)]
+
+    start = time.perf_counter()
+    for window in windows:
+        await RhythmPattern().recognize({"intervals": window})
+        await DeviationPattern().recognize({"values": window})
+        await TimePattern().recognize({"time_series": [(datetime.fromtimestamp(t), v) for t, v in enumerate(window)]})
+    loop_ms = (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    PatternMatcher().recognize_batch(windows)
+    batch_ms = (time.perf_counter() - start) * 1e3
+
+    print(f"{'users':>8}{'per-user ms':>14}{'batch ms':>12}")
+    print(f"{users:>8}{loop_ms:>14.1f}{batch_ms:>12.1f}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    print("\nPer-recognizer latency")
+    print(f"{'=' * 60}")
+    await _per_recognizer(args.iterations)
+
+    print("\nrecognize_all, all 9 patterns")
+    print(f"{'=' * 60}")
+    await _recognize_all(args.iterations)
+
+    print("\nRepeating sequence search")
+    print(f"{'=' * 60}")
+    _repeating_sequences()
+
+    print("\nBatch scoring (rhythm, deviation, time)")
+    print(f"{'=' * 60}")
+    await _batch(args.users)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Mothership response cache under concurrent polling.
+
+--pollers clients poll --keys endpoints whose handlers take --handler-ms to
+compute, for --rounds rounds, with values expiring every --expire seconds.
+Compares the previous cache (an unbounded dict with no coalescing: every
+concurrent miss recomputes) against TieredCache with single-flight, and
+TieredCache with stale-while-revalidate.
+
+Usage:
+    python tests/performance/benchmark_response_cache.py --pollers 200 --keys 20 --handler-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from application.mothership.utils.cache import MemoryCache, TieredCache
+
+
+class DictCache:
+    """The cache before this change: a dict of (value, expires_at), no coalescing."""
+
+    def __init__(self) -> None:
+        self._data: dict[str, tuple[str, float]] = {}
+
+    async def get_or_compute(self, key, compute, expire, stale=0):
+        found = self._data.get(key)
+        if found is not None and time.monotonic() < found[1]:
+            return found[0]
+        value = await compute()
+        self._data[key] = (value, time.monotonic() + expire)
+        return value
+
+
+async def _run(cache, args) -> dict:
+    computes = 0
+    latencies: list[float] = []
+
+    def handler(key: str):
+        async def compute() -> str:
+            nonlocal computes
+            computes += 1
+            await asyncio.sleep(args.handler_ms / 1000)
+            return json.dumps({"key": key, "at": time.time()})
+
+        return compute
+
+    async def poller(n: int) -> None:
+        for r in range(args.rounds):
+            key = f"endpoint-{(n + r) % args.keys}"
+            start = time.perf_counter()
+            await cache.get_or_compute(key, handler(key), expire=args.expire, stale=args.stale)
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(args.interval_ms / 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(poller(n) for n in range(args.pollers)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "computes": computes,
+        "requests/s": len(latencies) / elapsed,
+        "p50 ms": latencies[len(latencies) // 2] * 1e3,
+        "p99 ms": latencies[int(len(latencies) * 0.99)] * 1e3,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pollers", type=int, default=200)
+    parser.add_argument("--keys", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--handler-ms", type=float, default=20)
+    parser.add_argument("--interval-ms", type=float, default=10)
+    parser.add_argument("--expire", type=int, default=1)
+    parser.add_argument("--stale", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [
+        ("dict, no coalescing", DictCache(), 0),
+        ("tiered, single-flight", TieredCache(MemoryCache()), 0),
+        ("tiered, stale-while-revalidate", TieredCache(MemoryCache()), args.stale),
+    ]
+    print(f"{args.pollers} pollers x {args.rounds} rounds over {args.keys} keys, {args.handler_ms} ms handlers")
+    print(f"{'=' * 60}")
+    for label, cache, stale in runs:
+        result = asyncio.run(_run(cache, argparse.Namespace(**{**vars(args), "stale": stale})))
+        print(
+            f"{label:<32}{result['computes']:8d} computes{result['requests/s']:10.0f} req/s"
+            f"{result['p50 ms']:8.2f} p50 ms{result['p99 ms']:8.2f} p99 ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Mothership StateStore backends, indexes and lock shards.
+
+Lookups: API key authentication (get_by_key_hash), sessions by user and tasks
+by status over --entities entities, as a scan over every entity (the
+repositories before the secondary indexes) and through the indexes, for the
+in-memory and the SQLite backend.
+
+Transactions: --concurrency writers spread over four collections, each
+holding its transaction across a short await, under one whole-store lock (the
+previous single asyncio.Lock) and under per-collection locks.
+
+Usage:
+    python tests/performance/benchmark_state_store.py --entities 20000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from application.mothership.models.api_key import APIKey
+from application.mothership.models.cockpit import Session, Task, TaskStatus
+from application.mothership.repositories import (
+    SessionRepository,
+    SQLiteBackend,
+    StateStore,
+    TaskRepository,
+)
+from application.mothership.repositories.api_key import APIKeyRepository
+
+COLLECTIONS = ["sessions", "tasks", "api_keys", "invoices"]
+
+
+async def _populate(store: StateStore, entities: int) -> None:
+    sessions, tasks, keys = SessionRepository(store), TaskRepository(store), APIKeyRepository(store)
+    statuses = list(TaskStatus)
+    for i in range(entities):
+        await sessions.add(Session(id=f"s{i}", user_id=f"u{i % 1000}", username="bench"))
+        await tasks.add(Task(id=f"t{i}", name="t", task_type="bench", status=statuses[i % len(statuses)]))
+        await keys.add(APIKey(id=f"k{i}", user_id=f"u{i % 1000}", key_hash=f"hash{i}", name="bench"))
+
+
+def _key_hash(i: int, entities: int) -> str:
+    return f"hash{i * 7919 % entities}"  # Spread lookups over the whole collection
+
+
+def _scans(store: StateStore, entities: int) -> dict:
+    return {
+        "key by hash": lambda i: next(k for k in store.api_keys.values() if k.key_hash == _key_hash(i, entities)),
+        "sessions by user": lambda i: [s for s in store.sessions.values() if s.user_id == f"u{i % 1000}"],
+        "tasks by status": lambda i: [t for t in store.tasks.values() if t.status == TaskStatus.RUNNING],
+    }
+
+
+def _indexed(store: StateStore, entities: int) -> dict:
+    return {
+        "key by hash": lambda i: store.api_keys.first("key_hash", _key_hash(i, entities)),
+        "sessions by user": lambda i: store.sessions.lookup("user_id", f"u{i % 1000}"),
+        "tasks by status": lambda i: store.tasks.lookup("status", TaskStatus.RUNNING),
+    }
+
+
+def _time(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def _lookups(name: str, store: StateStore, entities: int, calls: int) -> None:
+    await _populate(store, entities)
+    queries = zip(_scans(store, entities).items(), _indexed(store, entities).values(), strict=True)
+    for (query, scan), indexed in queries:
+        scan_us = _time(scan, max(5, calls // 20))
+        indexed_us = _time(indexed, calls)
+        print(f"{name:<10}{query:<20}{scan_us:12.1f} us scan{indexed_us:12.1f} us indexed")
+
+
+async def _transactions(sharded: bool, writers: int, rounds: int) -> float:
+    store = StateStore()
+
+    async def writer(n: int) -> None:
+        names = (COLLECTIONS[n % len(COLLECTIONS)],) if sharded else ()
+        for _ in range(rounds):
+            async with store.transaction(*names):
+                await asyncio.sleep(0.0005)  # Work that yields inside the transaction
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(n) for n in range(writers)))
+    return writers * rounds / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=20000)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Lookups over {args.entities} entities per collection")
+    print(f"{'=' * 60}")
+    asyncio.run(_lookups("memory", StateStore(), args.entities, args.calls))
+    with tempfile.TemporaryDirectory() as directory:
+        backend = SQLiteBackend(Path(directory) / "state.db")
+        asyncio.run(_lookups("sqlite", StateStore(backend=backend), args.entities, args.calls))
+        backend.close()
+
+    print(f"\nTransactions, {args.concurrency} writers over {len(COLLECTIONS)} collections")
+    print(f"{'=' * 60}")
+    for label, sharded in (("whole-store lock", False), ("per-collection locks", True)):
+        rate = asyncio.run(_transactions(sharded, args.concurrency, args.rounds))
+        print(f"{label:<24}{rate:10.0f} transactions/s")
+
+
+if __name__ == "__main__":
+    main()
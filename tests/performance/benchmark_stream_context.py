@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the vection StreamContext: session creation at the session cap
+and the cost of a cleanup pass, against the number of sessions.
+
+For each size in --sizes, fills a StreamContext to that many sessions (with
+--threads threads each), then times creating as many new sessions again (each
+one evicting an old session) and one cleanup pass with nothing yet stale.
+Compares the previous single-dict layout (oldest session found by a scan on
+eviction, every session and thread visited on cleanup) with the sharded LRU
+and timer wheels.
+
+Usage:
+    python tests/performance/benchmark_stream_context.py --sizes 1000 10000 50000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from vection.core.stream_context import StreamContext
+
+
+class SweepStreamContext(StreamContext):
+    """Oldest-session eviction by scan and cleanup by full sweep, on one shard."""
+
+    def __init__(self, max_sessions: int) -> None:
+        super().__init__(max_sessions=max_sessions, shard_count=1)
+
+    def create_session(self, session_id=None, metadata=None):
+        shard = self._shards[0]
+        if session_id not in shard.sessions and len(shard.sessions) >= self._max_sessions:
+            self.dissolve_session(min(shard.sessions, key=lambda sid: shard.sessions[sid].established_at))
+        return super().create_session(session_id, metadata)
+
+    async def cleanup(self) -> dict[str, int]:
+        now = time.time()
+        shard = self._shards[0]
+        for session_id, context in list(shard.sessions.items()):
+            if now - context.last_updated.timestamp() > self._session_ttl_seconds:
+                self.dissolve_session(session_id)
+        for session_id, threads in list(shard.threads.items()):
+            for thread_id, thread in list(threads.items()):
+                if now - thread.last_active.timestamp() > self._thread_ttl_seconds:
+                    self.dissolve_thread(session_id, thread_id)
+        return {}
+
+
+def _run(ctx: StreamContext, size: int, threads: int) -> tuple[float, float]:
+    """(create-with-eviction us/session, cleanup ms)."""
+    for i in range(size):
+        ctx.create_session(f"warm-{i}")
+        for t in range(threads):
+            ctx.create_thread(f"warm-{i}", f"thread-{t}")
+
+    start = time.perf_counter()
+    for i in range(size):
+        ctx.create_session(f"new-{i}")
+    create_us = (time.perf_counter() - start) / size * 1e6
+
+    start = time.perf_counter()
+    asyncio.run(ctx.cleanup())
+    return create_us, (time.perf_counter() - start) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--threads", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"Sessions at cap, {args.threads} threads each")
+    print(f"{'=' * 60}")
+    print(f"{'sessions':>9}{'scan create us':>16}{'lru create us':>15}{'sweep cleanup ms':>18}{'wheel cleanup ms':>18}")
+    for size in args.sizes:
+        sweep_create, sweep_cleanup = _run(SweepStreamContext(size), size, args.threads)
+        sharded_create, sharded_cleanup = _run(StreamContext(max_sessions=size), size, args.threads)
+        print(f"{size:>9}{sweep_create:>16.1f}{sharded_create:>15.1f}{sweep_cleanup:>18.2f}{sharded_cleanup:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
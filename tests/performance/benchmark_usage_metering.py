@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the usage metering hot path and quota checks.
+
+Hot path: time spent per request by the usage middleware, either awaiting
+record_usage (one repository transaction per request) or calling
+enqueue_usage (queued and bulk-written by the meter's flush task).
+
+Quota checks: get_usage_by_endpoint over a store holding --records usage
+records spread across --users users and the last 45 days, using a full scan
+(the previous implementation) and the hourly rollups.
+
+Usage:
+    python tests/performance/benchmark_usage_metering.py --requests 50000 --records 200000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from application.mothership.models.subscription import UsageRecord
+from application.mothership.repositories import StateStore
+from application.mothership.repositories.usage import UsageRepository
+from application.mothership.services.billing.meter import UsageMeter
+
+ENDPOINTS = ["/api/v1/entity", "/api/v1/relationship", "/api/v1/batch", "/api/v1/scenario"]
+
+
+class ScanUsageRepository(UsageRepository):
+    """Quota check as a scan over every record."""
+
+    async def get_usage_by_endpoint(self, user_id: str, endpoint: str, period_days: int = 30) -> int:
+        start_date = datetime.now(UTC) - timedelta(days=period_days)
+        records = [r for r in self._store.usage_records.values() if r.user_id == user_id and r.timestamp >= start_date]
+        return sum(r.cost_units for r in records if r.endpoint == endpoint)
+
+
+async def _hot_path(requests: int) -> None:
+    inline = UsageMeter(UsageRepository(StateStore()))
+    start = time.perf_counter()
+    for i in range(requests):
+        await inline.record_usage(f"user-{i % 100}", ENDPOINTS[i % len(ENDPOINTS)], metadata={"method": "POST"})
+    inline_us = (time.perf_counter() - start) / requests * 1e6
+
+    batched = UsageMeter(UsageRepository(StateStore()))
+    start = time.perf_counter()
+    for i in range(requests):
+        batched.enqueue_usage(f"user-{i % 100}", ENDPOINTS[i % len(ENDPOINTS)], metadata={"method": "POST"})
+        if i % 100 == 0:
+            await asyncio.sleep(0)  # Let the flush task run as it would between requests
+    batched_us = (time.perf_counter() - start) / requests * 1e6
+    await batched.close()
+
+    print(f"{'await record_usage':<24}{inline_us:10.2f} us/request")
+    print(f"{'enqueue_usage':<24}{batched_us:10.2f} us/request   (dropped {batched.dropped})")
+
+
+async def _quota_checks(records: int, users: int, checks: int) -> None:
+    rng = random.Random(0)
+    now = datetime.now(UTC)
+    batch = [
+        UsageRecord(
+            id=str(i),
+            user_id=f"user-{rng.randrange(users)}",
+            endpoint=rng.choice(ENDPOINTS),
+            cost_units=rng.randint(1, 10),
+            timestamp=now - timedelta(minutes=rng.randrange(45 * 24 * 60)),
+        )
+        for i in range(records)
+    ]
+    store = StateStore()
+    await UsageRepository(store).add_many(batch)
+
+    for name, repo in (("full scan", ScanUsageRepository(store)), ("hourly rollups", UsageRepository(store))):
+        start = time.perf_counter()
+        for i in range(checks):
+            await repo.get_usage_by_endpoint(f"user-{i % users}", ENDPOINTS[i % len(ENDPOINTS)])
+        elapsed = (time.perf_counter() - start) / checks * 1e6
+        print(f"{name:<24}{elapsed:10.1f} us/check")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--checks", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"Hot path, {args.requests} requests")
+    print(f"{'=' * 60}")
+    asyncio.run(_hot_path(args.requests))
+
+    print(f"\nQuota checks, {args.records} records, {args.users} users")
+    print(f"{'=' * 60}")
+    asyncio.run(_quota_checks(args.records, args.users, args.checks))
+
+
+if __name__ == "__main__":
+    main()
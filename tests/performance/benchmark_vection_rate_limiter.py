@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the vection RateLimiter.
+
+Registers --sessions active sessions, then measures checks/sec for random
+session lookups from one thread and from --threads threads, with the audit
+logging hook disabled so only limiter bookkeeping is timed. Also reports
+the approximate memory held per active session.
+
+Usage:
+    python tests/performance/benchmark_vection_rate_limiter.py --sessions 100000 --checks 500000
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from vection.security.rate_limiter import RateLimitConfig, RateLimiter
+
+
+def _run(limiter: RateLimiter, session_ids: list[str], checks: int, threads: int) -> float:
+    per_thread = checks // threads
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        picks = [rng.choice(session_ids) for _ in range(per_thread)]
+        barrier.wait()
+        for session_id in picks:
+            limiter.check(session_id, "context_query")
+
+    barrier = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--checks", type=int, default=500_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--shards", type=int, default=16)
+    args = parser.parse_args()
+
+    config = RateLimitConfig(enable_logging=False, lock_shards=args.shards)
+    session_ids = [f"session-{i}" for i in range(args.sessions)]
+
+    tracemalloc.start()
+    limiter = RateLimiter(config)
+    for session_id in session_ids:
+        limiter.check(session_id, "context_query")
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{args.sessions} active sessions, {args.shards} lock shards")
+    print(f"{'=' * 60}")
+    print(f"memory per session       {held / args.sessions:8.0f} bytes")
+    for threads in sorted({1, args.threads}):
+        rate = _run(limiter, session_ids, args.checks, threads)
+        print(f"{threads:2d} thread(s)             {rate:10.0f} checks/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 Simplified tests for DRT (Don't Repeat Themselves) Middleware.
 """
 
+import random
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock
 
@@ -10,6 +11,7 @@
 from fastapi.testclient import TestClient
 
 from application.mothership.middleware.drt_middleware import (
+    AttackVectorIndex,
     BehavioralSignature,
     ComprehensiveDRTMiddleware,
 )
@@ -152,6 +154,48 @@ def test_status(self):
         assert status["attack_vectors_count"] == 0
 
 
+class TestAttackVectorIndex:
+    """The index must agree with pairwise _calculate_similarity."""
+
+    def test_matches_pairwise_scan(self):
+        rng = random.Random(0)
+        headers = [f"h{i}" for i in range(12)]
+        paths = ["/api/login", "/api/users/{ID}"]
+
+        def signature() -> BehavioralSignature:
+            return BehavioralSignature(
+                rng.choice(paths), rng.choice(["GET", "POST"]), tuple(rng.sample(headers, rng.randint(0, 5)))
+            )
+
+        vectors = [signature() for _ in range(200)]
+        index = AttackVectorIndex(vectors)
+        middleware = ComprehensiveDRTMiddleware.__new__(ComprehensiveDRTMiddleware)
+
+        for _ in range(300):
+            request = signature()
+            request.headers += ("x-unseen",) * rng.randint(0, 1)
+            expected = max((middleware._calculate_similarity(request, v) for v in vectors), default=0.0)
+            similarity, matched = index.best_match(request)
+            assert similarity == pytest.approx(expected)
+            if expected:
+                assert middleware._calculate_similarity(request, matched) == pytest.approx(expected)
+            else:
+                assert matched is None
+
+    def test_unseen_request_headers_are_not_interned(self):
+        index = AttackVectorIndex([BehavioralSignature("/api/login", "POST", ("content-type",))])
+        similarity, _ = index.best_match(BehavioralSignature("/api/login", "POST", ("content-type", "x-evil")))
+
+        assert similarity == 0.5
+        assert "x-evil" not in index._header_bits
+
+    def test_direct_list_changes_are_reindexed(self):
+        index = AttackVectorIndex()
+        index.vectors.append(BehavioralSignature("/api/login", "POST", ()))
+
+        assert index.best_match(BehavioralSignature("/api/login", "POST", ()))[0] == 1.0
+
+
 class TestDRTIntegration:
     """Integration tests."""
 
@@ -0,0 +1,231 @@
+"""Tests for the incremental BM25 index and HybridRetriever's use of it."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from tools.rag.retrieval.bm25_index import BM25Index, tokenize
+from tools.rag.retrieval.hybrid_retriever import BM25SyncedStore, HybridRetriever
+
+CORPUS = {
+    "a": "The quick brown fox jumps over the lazy dog",
+    "b": "Vector stores index dense embeddings for retrieval",
+    "c": "BM25 ranks documents by term frequency and inverse document frequency",
+    "d": "The fox and the hound are friends",
+    "e": "Hybrid retrieval fuses BM25 and vector rankings",
+}
+
+
+def _index(**kwargs) -> BM25Index:
+    index = BM25Index(**kwargs)
+    index.add(list(CORPUS), list(CORPUS.values()))
+    return index
+
+
+def _reference_score(index: BM25Index, query: str, chunk_id: str) -> float:
+    """Textbook BM25 over the live corpus, for cross-checking the vectorized path."""
+    live = {i: tokenize(index.text(i)) for i in index.ids}
+    n = len(live)
+    avgdl = sum(len(t) for t in live.values()) / n
+    doc = live[chunk_id]
+    score = 0.0
+    for term in tokenize(query):
+        df = sum(term in t for t in live.values())
+        if df == 0:
+            continue
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        tf = doc.count(term)
+        score += idf * tf * (index.k1 + 1) / (tf + index.k1 * (1 - index.b + index.b * len(doc) / avgdl))
+    return score
+
+
+class TestBM25Index:
+    def test_scores_match_reference(self):
+        index = _index()
+        for chunk_id, score in index.top_k(tokenize("fox retrieval bm25"), 10):
+            assert score == pytest.approx(_reference_score(index, "fox retrieval bm25", chunk_id), rel=1e-5)
+
+    def test_top_k_orders_and_skips_zero_scores(self):
+        index = _index()
+        results = index.top_k(tokenize("fox"), 10)
+        assert [chunk_id for chunk_id, _ in results] in (["a", "d"], ["d", "a"])
+        assert results[0][1] >= results[1][1]
+        assert index.top_k(tokenize("nonexistent"), 10) == []
+
+    def test_incremental_add_matches_full_build(self):
+        incremental = BM25Index()
+        for chunk_id, text in CORPUS.items():
+            incremental.add([chunk_id], [text])
+        full = _index()
+        query = tokenize("the fox bm25 vector")
+        assert incremental.top_k(query, 5) == pytest.approx(full.top_k(query, 5))
+
+    def test_delete_updates_statistics(self):
+        index = _index(compact_threshold=1.0)
+        index.delete(["a"])
+
+        assert "a" not in index
+        assert len(index) == 4
+        assert [chunk_id for chunk_id, _ in index.top_k(tokenize("fox"), 10)] == ["d"]
+        for chunk_id, score in index.top_k(tokenize("the fox"), 10):
+            assert score == pytest.approx(_reference_score(index, "the fox", chunk_id), rel=1e-5)
+
+    def test_readd_replaces_text(self):
+        index = _index()
+        index.add(["a"], ["completely different words"])
+        assert len(index) == 5
+        assert [chunk_id for chunk_id, _ in index.top_k(tokenize("fox"), 10)] == ["d"]
+
+    def test_compaction_preserves_results(self):
+        index = _index(compact_threshold=0.3)
+        before = dict(index.top_k(tokenize("retrieval vector"), 10))
+        index.delete(["a", "d"])  # 40% dead triggers compaction
+
+        assert index._dead == 0
+        assert len(index._ids) == 3
+        after = dict(index.top_k(tokenize("retrieval vector"), 10))
+        assert set(after) == set(before)
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        index = _index()
+        index.delete(["c"])
+        path = tmp_path / "bm25.npz"
+        index.save(path)
+
+        loaded = BM25Index.load(path)
+
+        assert sorted(loaded.ids) == sorted(index.ids)
+        assert loaded.text("e") == CORPUS["e"]
+        query = tokenize("hybrid bm25 fox")
+        assert loaded.top_k(query, 5) == pytest.approx(index.top_k(query, 5))
+        loaded.add(["f"], ["a brand new fox"])
+        assert "f" in dict(loaded.top_k(tokenize("fox"), 5))
+
+
+class _FakeCollection:
+    def __init__(self, docs: dict[str, str]) -> None:
+        self.docs = dict(docs)
+        self.document_fetches: list[list[str]] = []
+
+    def get(self, ids=None, include=None, offset=0, limit=None, where=None):
+        if where is not None:
+            return {"ids": [k for k in self.docs if where.get("path") in k]}
+        if ids is None:
+            keys = list(self.docs)[offset : offset + limit if limit else None]
+        else:
+            keys = [i for i in ids if i in self.docs]
+            self.document_fetches.append(keys)
+        result = {"ids": keys}
+        if include and "documents" in include:
+            result["documents"] = [self.docs[k] for k in keys]
+        return result
+
+
+class _FakeStore:
+    def __init__(self, docs: dict[str, str]) -> None:
+        self.collection = _FakeCollection(docs)
+
+    def count(self) -> int:
+        return len(self.collection.docs)
+
+    def add(self, ids, documents, embeddings, metadatas=None) -> None:
+        self.collection.docs.update(zip(ids, documents, strict=True))
+
+    def delete(self, ids=None, where=None) -> None:
+        for chunk_id in ids if ids is not None else self.collection.get(where=where)["ids"]:
+            self.collection.docs.pop(chunk_id, None)
+
+    def reset(self) -> None:
+        self.collection.docs.clear()
+
+
+class TestHybridRetrieverSync:
+    def test_only_new_chunks_are_fetched(self):
+        store = _FakeStore(CORPUS)
+        retriever = HybridRetriever(vector_store=store)
+        retriever._count_ttl = 0
+        assert retriever._ensure_bm25_index()
+        assert sorted(store.collection.document_fetches[0]) == sorted(CORPUS)
+
+        store.collection.docs["f"] = "a new chunk about foxes and fox dens"
+        assert retriever._ensure_bm25_index()
+        assert store.collection.document_fetches[-1] == ["f"]
+        assert "f" in retriever._bm25
+
+        del store.collection.docs["b"]
+        assert retriever._ensure_bm25_index()
+        assert len(store.collection.document_fetches) == 2
+        assert "b" not in retriever._bm25
+
+    def test_persisted_index_is_reused(self, tmp_path):
+        path = tmp_path / "kb.bm25.npz"
+        store = _FakeStore(CORPUS)
+        HybridRetriever(vector_store=store, index_path=path)._ensure_bm25_index()
+        assert path.exists()
+
+        store.collection.document_fetches.clear()
+        retriever = HybridRetriever(vector_store=store, index_path=path)
+        assert retriever._ensure_bm25_index()
+        assert store.collection.document_fetches == []
+
+    def test_push_updates(self):
+        store = _FakeStore({})
+        retriever = HybridRetriever(vector_store=store)
+        retriever.add_chunks(["x", "y"], ["fox den", "vector index"])
+        retriever.remove_chunks(["y"])
+
+        assert len(retriever._bm25) == 1
+        assert retriever._last_doc_count == 1
+
+    def test_push_updates_are_persisted_in_batches(self, tmp_path):
+        path = tmp_path / "kb.bm25.npz"
+        retriever = HybridRetriever(vector_store=_FakeStore({}), index_path=path, persist_after=3)
+        retriever.add_chunks(["x", "y"], ["fox den", "vector index"])
+        assert not path.exists()
+
+        retriever.remove_chunks(["y"])
+        assert BM25Index.load(path).ids == ["x"]
+
+        retriever.add_chunks(["z"], ["quick brown fox"])
+        assert BM25Index.load(path).ids == ["x"]
+        retriever.flush()
+        assert BM25Index.load(path).ids == ["x", "z"]
+
+    def test_synced_store_pushes_writes_into_bm25(self):
+        store = _FakeStore(CORPUS)
+        retriever = HybridRetriever(vector_store=store)
+        retriever._ensure_bm25_index()
+        synced = BM25SyncedStore(store, retriever)
+
+        synced.add(["src/f.py:0", "src/f.py:1"], ["fox den", "fox tail"], [[0.0], [0.0]])
+        assert "src/f.py:1" in retriever._bm25
+        synced.delete(where={"path": "src/f.py"})
+        assert "src/f.py:0" not in retriever._bm25
+        assert retriever._bm25.ids == list(store.collection.docs)
+
+        store.collection.document_fetches.clear()
+        assert retriever._ensure_bm25_index()
+        assert store.collection.document_fetches == []
+
+    def test_synced_store_reset_drops_index(self):
+        store = _FakeStore(CORPUS)
+        retriever = HybridRetriever(vector_store=store)
+        retriever._ensure_bm25_index()
+        synced = BM25SyncedStore(store, retriever)
+
+        synced.reset()
+        synced.add(["x"], ["fox den"], [[0.0]])
+        assert retriever._bm25.ids == ["x"]
+
+    def test_fuse_results_includes_bm25_only_hits(self):
+        store = _FakeStore(CORPUS)
+        retriever = HybridRetriever(vector_store=store)
+        retriever._ensure_bm25_index()
+
+        vec_results = {"ids": ["b"], "documents": [CORPUS["b"]], "metadatas": [{}], "distances": [0.2]}
+        fused = retriever._fuse_results("quick brown fox", vec_results, top_k=3)
+
+        assert "a" in fused["ids"]
+        assert fused["documents"][fused["ids"].index("a")] == CORPUS["a"]
@@ -0,0 +1,153 @@
+"""Tests for the content-addressed embedding cache."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from tools.rag.config import RAGConfig
+from tools.rag.embeddings.cache import CachedEmbeddingProvider, EmbeddingCache, text_key
+from tools.rag.embeddings.factory import get_embedding_provider
+from tools.rag.embeddings.test_provider import DeterministicEmbeddingProvider
+
+
+class _CountingProvider(DeterministicEmbeddingProvider):
+    """Deterministic provider that records what reaches the backend."""
+
+    def __init__(self, dimension: int = 8, model: str = "counting") -> None:
+        super().__init__(dimension=dimension)
+        self.model = model
+        self.batches: list[list[str]] = []
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        return [self._generate_deterministic_embedding(t) for t in texts]
+
+    async def async_embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return self.embed_batch(texts)
+
+
+class TestCachedEmbeddingProvider:
+    def test_only_misses_reach_backend(self):
+        backend = _CountingProvider()
+        provider = CachedEmbeddingProvider(backend)
+
+        first = provider.embed_batch(["a", "b", "a"])
+        second = provider.embed_batch(["b", "c", "a"])
+
+        assert backend.batches == [["a", "b"], ["c"]]
+        assert first[0] == first[2]
+        assert second[0] == pytest.approx(first[1])
+        assert second[2] == pytest.approx(backend.embed("a"))
+
+    def test_hit_rate_metrics(self):
+        provider = CachedEmbeddingProvider(_CountingProvider())
+        provider.embed_batch(["a", "b"])
+        provider.embed_batch(["a", "b", "c", "d"])
+
+        stats = provider.get_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 4
+        assert stats["hit_rate_percent"] == pytest.approx(33.33)
+        assert stats["entries"] == 4
+
+    def test_model_and_dimension_namespace_entries(self):
+        cache = EmbeddingCache()
+        small = _CountingProvider(dimension=8, model="small")
+        large = _CountingProvider(dimension=16, model="large")
+        CachedEmbeddingProvider(small, cache).embed("shared")
+        result = CachedEmbeddingProvider(large, cache).embed("shared")
+
+        assert len(result) == 16
+        assert large.batches == [["shared"]]
+
+    def test_dimension_and_model_come_from_each_call(self):
+        class _FallbackProvider(_CountingProvider):
+            @property
+            def dimension(self) -> int:
+                raise AssertionError("dimension probe must not run while embedding")
+
+            def embed_batch(self, texts: list[str]) -> list[list[float]]:
+                self.batches.append(list(texts))
+                self.model = "fallback"  # e.g. the configured model was not found
+                return [[1.0] * 12 for _ in texts]
+
+        cache = EmbeddingCache()
+        backend = _FallbackProvider(model="primary")
+        provider = CachedEmbeddingProvider(backend, cache)
+
+        assert len(provider.embed("text")) == 12
+        assert provider.dimension == 12
+        assert list(cache.get_many("_FallbackProvider:fallback", 12, [text_key("text")])) == [text_key("text")]
+        assert cache.get_many("_FallbackProvider:primary", None, [text_key("text")]) == {}
+
+        reopened = CachedEmbeddingProvider(_FallbackProvider(model="fallback"), cache)
+        assert reopened.embed("text") == [1.0] * 12
+        assert reopened.provider.batches == []
+
+    def test_zero_vectors_are_not_cached(self):
+        backend = _CountingProvider()
+        backend.embed_batch = lambda texts: [[0.0] * 8 for _ in texts]
+        provider = CachedEmbeddingProvider(backend)
+        provider.embed("unembeddable")
+
+        assert len(provider.cache) == 0
+
+    async def test_async_batch_uses_cache(self):
+        backend = _CountingProvider()
+        provider = CachedEmbeddingProvider(backend)
+        provider.embed_batch(["a"])
+
+        result = await provider.async_embed_batch(["a", "z"])
+
+        assert backend.batches == [["a"], ["z"]]
+        assert len(result) == 2
+
+    def test_delegates_unknown_attributes(self):
+        provider = CachedEmbeddingProvider(_CountingProvider())
+        assert provider.similarity("x", "x") == pytest.approx(1.0)
+
+
+class TestEmbeddingCache:
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "cache.sqlite"
+        cache = EmbeddingCache(path)
+        cache.put_many("m", 3, [(text_key("hello"), [1.0, 2.0, 3.0])])
+        cache.close()
+
+        reopened = EmbeddingCache(path)
+        found = reopened.get_many("m", 3, [text_key("hello"), text_key("other")])
+
+        assert list(found) == [text_key("hello")]
+        np.testing.assert_array_equal(found[text_key("hello")], [1.0, 2.0, 3.0])
+        assert len(reopened) == 1
+
+    def test_lru_eviction_respects_size_cap(self):
+        vector_bytes = 4 * 4
+        cache = EmbeddingCache(max_bytes=10 * vector_bytes)
+        keys = [text_key(str(i)) for i in range(10)]
+        cache.put_many("m", 4, [(k, np.ones(4)) for k in keys])
+        cache.get_many("m", 4, keys[:2])  # keep the first two recently used
+
+        cache.put_many("m", 4, [(text_key("new"), np.ones(4))])
+
+        stats = cache.get_stats()
+        assert stats["bytes"] <= 10 * vector_bytes * 0.9
+        assert stats["evictions"] > 0
+        remaining = cache.get_many("m", 4, [*keys, text_key("new")])
+        assert keys[0] in remaining and keys[1] in remaining
+        assert text_key("new") in remaining
+        assert keys[2] not in remaining
+
+
+class TestFactoryWrapping:
+    def test_cache_path_defaults_under_vector_store(self, tmp_path):
+        config = RAGConfig(embedding_provider="ollama", vector_store_path=str(tmp_path))
+        provider = get_embedding_provider(config=config)
+
+        assert isinstance(provider, CachedEmbeddingProvider)
+        assert provider.cache.path == str((tmp_path / "embedding_cache.sqlite").resolve())
+
+    def test_cache_can_be_disabled(self, tmp_path):
+        config = RAGConfig(embedding_provider="ollama", vector_store_path=str(tmp_path), embedding_cache_enabled=False)
+        assert not isinstance(get_embedding_provider(config=config), CachedEmbeddingProvider)
@@ -0,0 +1,351 @@
+"""Tests for the matrix-backed InMemoryDenseVectorStore."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from tools.rag.vector_store import in_memory_dense
+from tools.rag.vector_store.in_memory_dense import InMemoryDenseVectorStore
+
+
+def _random_vectors(n: int, dim: int = 16, seed: int = 0) -> list[list[float]]:
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n, dim)).astype(np.float32).tolist()
+
+
+def _fill(store: InMemoryDenseVectorStore, n: int, dim: int = 16, seed: int = 0, prefix: str = "doc") -> None:
+    vectors = _random_vectors(n, dim, seed)
+    store.add(
+        ids=[f"{prefix}_{i}" for i in range(n)],
+        documents=[f"text {prefix} {i}" for i in range(n)],
+        embeddings=vectors,
+        metadatas=[{"source": f"file_{i % 3}.py"} for i in range(n)],
+    )
+
+
+@pytest.fixture(params=[True, False], ids=["faiss", "numpy"])
+def store(request, monkeypatch):
+    if request.param and not in_memory_dense.HAS_FAISS:
+        pytest.skip("faiss not installed")
+    monkeypatch.setattr(in_memory_dense, "HAS_FAISS", request.param)
+    return InMemoryDenseVectorStore()
+
+
+class TestAppendAndQuery:
+    def test_exact_match_is_nearest(self, store):
+        _fill(store, 50)
+        target = _random_vectors(50)[17]
+
+        result = store.query(target, n_results=3)
+
+        assert result["ids"][0] == "doc_17"
+        assert result["distances"][0] == pytest.approx(0.0, abs=1e-5)
+        assert result["distances"] == sorted(result["distances"])
+
+    def test_append_after_query_extends_index_without_rebuild(self, store):
+        _fill(store, 20, seed=1, prefix="a")
+        store.query(_random_vectors(1, seed=9)[0], n_results=1)
+        index_before = store._index
+
+        _fill(store, 20, seed=2, prefix="b")
+        result = store.query(_random_vectors(20, seed=2)[5], n_results=1)
+
+        assert result["ids"] == ["b_5"]
+        assert store.count() == 40
+        if in_memory_dense.HAS_FAISS:
+            assert store._index is index_before
+            assert store._index.ntotal == 40
+
+    def test_matrix_grows_beyond_initial_capacity(self):
+        store = InMemoryDenseVectorStore(initial_capacity=4)
+        _fill(store, 100)
+        assert store.count() == 100
+        assert store._matrix.shape[0] >= 100
+
+    def test_dimension_mismatch_raises(self, store):
+        _fill(store, 3, dim=8)
+        with pytest.raises(ValueError, match="dimension"):
+            store.add(ids=["x"], documents=["x"], embeddings=[[1.0, 2.0]])
+
+    def test_readd_replaces_existing_id(self, store):
+        store.add(ids=["a"], documents=["old"], embeddings=[[1.0, 0.0]])
+        store.add(ids=["a"], documents=["new"], embeddings=[[0.0, 1.0]])
+
+        result = store.query([0.0, 1.0], n_results=5)
+
+        assert store.count() == 1
+        assert result["documents"] == ["new"]
+
+    def test_where_filter(self, store):
+        _fill(store, 30)
+        result = store.query(_random_vectors(1, seed=5)[0], n_results=30, where={"source": "file_1.py"})
+        assert len(result["ids"]) == 10
+        assert all(m["source"] == "file_1.py" for m in result["metadatas"])
+
+
+class TestTombstones:
+    def test_deleted_rows_are_not_returned(self, store):
+        store.compact_threshold = 1.0  # keep tombstones in place
+        _fill(store, 10)
+        store.delete(ids=["doc_3"])
+
+        result = store.query(_random_vectors(10)[3], n_results=10)
+
+        assert store.count() == 9
+        assert "doc_3" not in result["ids"]
+        assert len(result["ids"]) == 9
+
+    def test_delete_by_where(self, store):
+        _fill(store, 9)
+        store.delete(where={"source": "file_0.py"})
+        assert store.count() == 6
+
+    def test_compact_drops_dead_rows(self, store):
+        store.compact_threshold = 1.0
+        _fill(store, 10)
+        store.delete(ids=[f"doc_{i}" for i in range(5)])
+
+        store.compact()
+
+        assert store._size == 5
+        assert store._dead == 0
+        assert store.query(_random_vectors(10)[7], n_results=1)["ids"] == ["doc_7"]
+
+    @pytest.mark.parametrize("racing_rebuilds", [1, in_memory_dense._COMPACT_ATTEMPTS])
+    def test_compact_keeps_writes_made_during_rebuild(self, store, monkeypatch, racing_rebuilds):
+        store.compact_threshold = 1.0
+        _fill(store, 10)
+        store.delete(ids=[f"doc_{i}" for i in range(5)])
+        build_index = store._build_index
+        calls = 0
+
+        def racing_build_index(matrix):
+            nonlocal calls
+            calls += 1
+            if calls <= racing_rebuilds:
+                store.add(ids=[f"late_{calls}"], documents=["late"], embeddings=[_random_vectors(1, seed=calls)[0]])
+                store.delete(ids=[f"doc_{4 + calls}"])
+            return build_index(matrix)
+
+        monkeypatch.setattr(store, "_build_index", racing_build_index)
+        store.compact()
+
+        survivors = {f"doc_{i}" for i in range(5 + racing_rebuilds, 10)}
+        expected = survivors | {f"late_{i + 1}" for i in range(racing_rebuilds)}
+        assert store._dead == 0
+        assert set(store._ids) == expected
+        assert store.count() == len(expected)
+        assert store.query(_random_vectors(1, seed=1)[0], n_results=1)["ids"] == ["late_1"]
+
+    def test_background_compaction_after_threshold(self, store):
+        store.compact_threshold = 0.5
+        _fill(store, 10)
+        store.delete(ids=[f"doc_{i}" for i in range(6)])
+        store._compaction_thread.join(timeout=5)
+
+        assert store._size == 4
+        assert store.count() == 4
+        assert store.query(_random_vectors(10)[8], n_results=1)["ids"] == ["doc_8"]
+
+    def test_repeated_id_in_one_batch_keeps_last(self, store):
+        store.compact_threshold = 1.0
+        vectors = _random_vectors(2)
+        store.add(ids=["a", "a"], documents=["first", "second"], embeddings=vectors)
+
+        assert store.count() == 1
+        assert store.query(vectors[0], n_results=5)["documents"] == ["second"]
+        store.delete(ids=["a"])
+        assert store.count() == 0
+        assert store.query(vectors[1], n_results=5)["ids"] == []
+
+    def test_upserts_schedule_compaction(self, store):
+        store.compact_threshold = 0.5
+        _fill(store, 10)
+        _fill(store, 10)
+        store._compaction_thread.join(timeout=5)
+
+        assert store._size == 10
+        assert store.count() == 10
+
+
+class TestMetadataIndex:
+    def test_multi_key_filter_intersects_postings(self, store):
+        vectors = _random_vectors(40)
+        store.add(
+            ids=[f"doc_{i}" for i in range(40)],
+            documents=[""] * 40,
+            embeddings=vectors,
+            metadatas=[{"source": f"file_{i % 4}.py", "file_type": "py" if i % 2 else "md"} for i in range(40)],
+        )
+
+        result = store.query(vectors[5], n_results=40, where={"source": "file_1.py", "file_type": "py"})
+        empty = store.query(vectors[5], n_results=40, where={"source": "file_1.py", "file_type": "md"})
+
+        assert result["ids"][0] == "doc_5"
+        assert len(result["ids"]) == 10
+        assert empty["ids"] == []
+
+    def test_filter_matches_brute_force_on_both_paths(self, store):
+        _fill(store, 300)
+        query = _random_vectors(1, seed=7)[0]
+        q = np.asarray(query) / np.linalg.norm(query)
+
+        # file_0.py is a third of the rows (full-matrix masked path); a single
+        # id is far below the gather fraction (gathered-rows path).
+        store.add(ids=["rare"], documents=[""], embeddings=[query], metadatas=[{"source": "rare.py"}])
+        for where in ({"source": "file_0.py"}, {"source": "rare.py"}):
+            result = store.query(query, n_results=5, where=where)
+            expected = [
+                (i, float(np.dot(store._matrix[i], q)))
+                for i, m in enumerate(store._metadatas)
+                if m["source"] == where["source"]
+            ]
+            expected.sort(key=lambda x: -x[1])
+            assert result["ids"] == [store._ids[i] for i, _ in expected[:5]]
+
+    def test_filter_skips_tombstones_and_unknown_values(self, store):
+        store.compact_threshold = 1.0
+        _fill(store, 9)
+        store.delete(ids=["doc_1", "doc_4"])
+
+        result = store.query(_random_vectors(9)[1], n_results=9, where={"source": "file_1.py"})
+
+        assert result["ids"] == ["doc_7"]
+        assert store.query([1.0] * 16, where={"source": "nope"})["ids"] == []
+        assert store.query([1.0] * 16, where={"missing_key": 1})["ids"] == []
+
+    def test_unhashable_metadata_values_fall_back_to_scan(self, store):
+        store.add(
+            ids=["a", "b"],
+            documents=["", ""],
+            embeddings=[[1.0, 0.0], [0.0, 1.0]],
+            metadatas=[{"tags": ["x", "y"]}, {"tags": ["z"]}],
+        )
+        assert store.query([1.0, 0.0], where={"tags": ["z"]})["ids"] == ["b"]
+
+    def test_postings_rebuilt_after_compaction(self, store):
+        store.compact_threshold = 1.0
+        _fill(store, 12)
+        store.delete(where={"source": "file_0.py"})
+        store.compact()
+
+        result = store.query(_random_vectors(12)[2], n_results=12, where={"source": "file_2.py"})
+
+        assert len(result["ids"]) == 4
+        assert result["ids"][0] == "doc_2"
+
+
+@pytest.mark.skipif(not in_memory_dense.HAS_FAISS, reason="faiss not installed")
+@pytest.mark.parametrize("kind", ["hnsw", "ivf"])
+def test_promotes_to_ann_index_above_threshold(kind):
+    store = InMemoryDenseVectorStore(ann_index=kind, ann_threshold=200)
+    _fill(store, 100)
+    store.query(_random_vectors(1, seed=3)[0], n_results=1)
+    assert store._index_kind == "flat"
+
+    _fill(store, 200, seed=4, prefix="more")
+    result = store.query(_random_vectors(200, seed=4)[42], n_results=1)
+
+    assert store._index_kind == kind
+    assert result["ids"] == ["more_42"]
+
+
+def test_rejects_unknown_ann_index():
+    with pytest.raises(ValueError):
+        InMemoryDenseVectorStore(ann_index="annoy")
+
+
+class TestSnapshots:
+    def test_roundtrip_is_memory_mapped(self, store, tmp_path):
+        _fill(store, 25)
+        store.delete(ids=["doc_0"])
+        store.save_snapshot(tmp_path)
+
+        loaded = InMemoryDenseVectorStore.load_snapshot(tmp_path)
+        target = _random_vectors(25)[11]
+
+        assert isinstance(loaded._matrix, np.memmap)
+        assert loaded.count() == 24
+        assert loaded.query(target, n_results=1)["ids"] == ["doc_11"]
+        assert loaded.query(target, n_results=3, where={"source": "file_2.py"})["ids"][0] == "doc_11"
+        assert loaded.query(target, n_results=1)["metadatas"] == [{"source": "file_2.py"}]
+
+    def test_loaded_store_accepts_adds_and_deletes(self, tmp_path):
+        store = InMemoryDenseVectorStore()
+        _fill(store, 10)
+        store.save_snapshot(tmp_path)
+
+        loaded = InMemoryDenseVectorStore.load_snapshot(tmp_path)
+        _fill(loaded, 5, seed=3, prefix="new")
+        loaded.delete(ids=["doc_2"])
+
+        assert loaded.count() == 14
+        assert loaded.query(_random_vectors(5, seed=3)[4], n_results=1)["documents"] == ["text new 4"]
+        # The snapshot on disk is untouched by the in-memory changes
+        assert InMemoryDenseVectorStore.load_snapshot(tmp_path).count() == 10
+
+    @pytest.mark.parametrize("dtype", ["float16", "int8"])
+    def test_quantized_snapshots(self, tmp_path, dtype):
+        store = InMemoryDenseVectorStore()
+        _fill(store, 40)
+        store.save_snapshot(tmp_path, dtype=dtype)
+
+        loaded = InMemoryDenseVectorStore.load_snapshot(tmp_path)
+
+        assert loaded._matrix.dtype == np.float32
+        assert loaded.query(_random_vectors(40)[9], n_results=1)["ids"] == ["doc_9"]
+        np.testing.assert_allclose(np.linalg.norm(loaded._matrix, axis=1), 1.0, rtol=1e-3)
+
+    def test_new_version_swaps_current_and_prunes(self, tmp_path):
+        from tools.rag.vector_store.snapshot import current_snapshot
+
+        store = InMemoryDenseVectorStore()
+        _fill(store, 5)
+        first = store.save_snapshot(tmp_path, keep=2)
+        reader = InMemoryDenseVectorStore.load_snapshot(tmp_path)
+
+        _fill(store, 5, seed=1, prefix="b")
+        store.save_snapshot(tmp_path, keep=2)
+        third = store.save_snapshot(tmp_path, keep=2)
+
+        assert current_snapshot(tmp_path) == third
+        assert not first.exists()
+        assert len(list(tmp_path.glob("v*"))) == 2
+        # A reader opened on the pruned version keeps its mapping
+        assert reader.count() == 5
+        assert InMemoryDenseVectorStore.load_snapshot(tmp_path).count() == 10
+
+    def test_concurrent_writers_publish_distinct_versions(self, tmp_path):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from tools.rag.vector_store.snapshot import current_snapshot
+
+        store = InMemoryDenseVectorStore()
+        _fill(store, 5)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            published = list(pool.map(lambda _: store.save_snapshot(tmp_path, keep=20), range(8)))
+
+        assert len(set(published)) == 8
+        assert current_snapshot(tmp_path) == max(published)
+        assert not list(tmp_path.glob(".tmp-*"))
+
+    def test_missing_or_incompatible_snapshot_raises(self, tmp_path):
+        from tools.rag.vector_store import SnapshotError
+
+        with pytest.raises(SnapshotError):
+            InMemoryDenseVectorStore.load_snapshot(tmp_path)
+
+        store = InMemoryDenseVectorStore()
+        _fill(store, 3)
+        version = store.save_snapshot(tmp_path)
+        (version / "manifest.json").write_text('{"format_version": 99}')
+        with pytest.raises(SnapshotError, match="Unsupported"):
+            InMemoryDenseVectorStore.load_snapshot(tmp_path)
+
+    def test_empty_store_snapshot(self, tmp_path):
+        InMemoryDenseVectorStore().save_snapshot(tmp_path)
+        loaded = InMemoryDenseVectorStore.load_snapshot(tmp_path)
+        assert loaded.count() == 0
+        loaded.add(ids=["a"], documents=["a"], embeddings=[[1.0, 0.0]])
+        assert loaded.query([1.0, 0.0])["ids"] == ["a"]
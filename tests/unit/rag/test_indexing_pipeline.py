@@ -0,0 +1,183 @@
+"""Tests for the streaming index_repository pipeline and FileTracker stat short-circuit."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from tools.rag.embeddings.test_provider import DeterministicEmbeddingProvider
+from tools.rag.indexing import file_tracker
+from tools.rag.indexing.file_tracker import FileTracker
+from tools.rag.indexing.indexer import index_repository
+from tools.rag.indexing.pipeline import PARALLEL_MIN_FILES
+from tools.rag.vector_store.in_memory_dense import InMemoryDenseVectorStore
+
+
+def _make_repo(root, files: int) -> None:
+    (root / "pkg").mkdir()
+    for i in range(files):
+        body = "\n\n".join(f"def function_{i}_{j}():\n    return {j}  # padding text for chunking" for j in range(6))
+        (root / "pkg" / f"module_{i}.py").write_text(body, encoding="utf-8")
+    (root / "README.md").write_text("# Title\n\nSome documentation text that is long enough to chunk.\n")
+    (root / "empty.txt").write_text("   \n")
+    (root / "image.png").write_bytes(b"\x89PNG")
+
+
+def _rows(store, where=None) -> dict:
+    """Every live row of a store (optionally filtered), via an exhaustive query."""
+    probe = [1.0] * store.embedding_dim
+    return store.query(probe, n_results=max(store.count(), 1), where=where, include=["documents", "metadatas"])
+
+
+def _index(root, **kwargs):
+    store = InMemoryDenseVectorStore()
+    index_repository(
+        str(root),
+        chunk_size=200,
+        overlap=20,
+        embedding_provider=DeterministicEmbeddingProvider(dimension=16),
+        vector_store=store,
+        exclude_dirs=[],
+        quiet=True,
+        **kwargs,
+    )
+    return store
+
+
+class TestIndexRepositoryPipeline:
+    def test_indexes_chunks_with_metadata(self, tmp_path):
+        _make_repo(tmp_path, files=3)
+        store = _index(tmp_path, workers=1, embed_batch_size=4, queue_size=1)
+
+        result = _rows(store, where={"path": "pkg/module_0.py"})
+        assert result["ids"]
+        assert all(i.startswith("pkg/module_0.py#") for i in result["ids"])
+        meta = result["metadatas"][0]
+        assert meta["path"] == "pkg/module_0.py"
+        assert len(meta["file_hash"]) == 64
+        assert _rows(store, where={"path": "empty.txt"})["ids"] == []
+
+    def test_process_pool_matches_in_process(self, tmp_path):
+        _make_repo(tmp_path, files=PARALLEL_MIN_FILES + 4)
+        serial = _index(tmp_path, workers=1)
+        parallel = _index(tmp_path, workers=2)
+
+        assert serial.count() == parallel.count()
+        assert sorted(_rows(serial)["ids"]) == sorted(_rows(parallel)["ids"])
+
+    def test_metrics_report_stages_and_queues(self, tmp_path, monkeypatch):
+        captured = {}
+        from tools.rag.indexing import indexer
+
+        original = indexer.IndexingMetrics.finalize
+
+        def finalize(self):
+            captured["metrics"] = self
+            original(self)
+
+        monkeypatch.setattr(indexer.IndexingMetrics, "finalize", finalize)
+        _make_repo(tmp_path, files=3)
+        store = _index(tmp_path, workers=1, embed_batch_size=2)
+
+        metrics = captured["metrics"]
+        assert set(metrics.stage_items) == {"walk", "prepare", "embed", "write"}
+        assert metrics.stage_items["write"] == store.count() == metrics.chunks_created
+        assert metrics.queue_depth_samples["embed"] > 0
+        assert metrics.skip_reasons == {"Empty file": 1}
+        assert "Queue Depth" in metrics.report()
+
+    def test_context_errors_skip_only_failing_chunks(self, tmp_path):
+        class ShortContextProvider(DeterministicEmbeddingProvider):
+            def embed_batch(self, texts):
+                if any("function_0_3" in t for t in texts):
+                    raise RuntimeError("input exceeds context length")
+                return super().embed_batch(texts)
+
+            def embed(self, text):
+                if "function_0_3" in text:
+                    raise RuntimeError("input exceeds context length")
+                return super().embed(text)
+
+        _make_repo(tmp_path, files=1)
+        store = InMemoryDenseVectorStore()
+        index_repository(
+            str(tmp_path),
+            chunk_size=60,
+            overlap=0,
+            embedding_provider=ShortContextProvider(dimension=8),
+            vector_store=store,
+            exclude_dirs=[],
+            quiet=True,
+            workers=1,
+        )
+        documents = _rows(store)["documents"]
+        assert any("function_0_2" in doc for doc in documents)
+        assert not any("function_0_3" in doc for doc in documents)
+
+    def test_writer_error_propagates(self, tmp_path):
+        class BrokenStore(InMemoryDenseVectorStore):
+            def add(self, *args, **kwargs):
+                raise OSError("disk full")
+
+        _make_repo(tmp_path, files=2)
+        with pytest.raises(OSError, match="disk full"):
+            index_repository(
+                str(tmp_path),
+                embedding_provider=DeterministicEmbeddingProvider(dimension=8),
+                vector_store=BrokenStore(),
+                exclude_dirs=[],
+                quiet=True,
+                workers=1,
+                embed_batch_size=1,
+                queue_size=1,
+            )
+
+
+class TestFileTrackerStatShortCircuit:
+    def test_unchanged_files_are_not_hashed(self, tmp_path, monkeypatch):
+        path = tmp_path / "a.py"
+        path.write_text("print('a')")
+        tracker = FileTracker(persist_dir=str(tmp_path / ".rag_db"))
+        st = path.stat()
+        tracker.update_file(
+            "a.py", file_tracker.compute_file_hash(path), 10, 1, mtime_ns=st.st_mtime_ns, stat_size=st.st_size
+        )
+
+        calls = []
+        monkeypatch.setattr(file_tracker, "compute_file_hash", lambda p: calls.append(p) or "")
+
+        assert tracker.get_changed_files(tmp_path, [path]) == []
+        assert calls == []
+        assert tracker.stat_hits == 1
+
+    def test_touched_identical_file_refreshes_stat(self, tmp_path):
+        path = tmp_path / "a.py"
+        path.write_text("print('a')")
+        tracker = FileTracker(persist_dir=str(tmp_path / ".rag_db"))
+        tracker.update_file("a.py", file_tracker.compute_file_hash(path), 10, 1)  # legacy state, no stat
+
+        assert tracker.get_changed_files(tmp_path, [path]) == []
+        assert tracker.get_file_state("a.py").mtime_ns == path.stat().st_mtime_ns
+        assert tracker.get_changed_files(tmp_path, [path]) == []
+        assert tracker.stat_hits == 1
+
+    def test_modified_file_is_detected(self, tmp_path):
+        path = tmp_path / "a.py"
+        path.write_text("print('a')")
+        tracker = FileTracker(persist_dir=str(tmp_path / ".rag_db"))
+        st = path.stat()
+        tracker.update_file(
+            "a.py", file_tracker.compute_file_hash(path), 10, 1, mtime_ns=st.st_mtime_ns, stat_size=st.st_size
+        )
+
+        path.write_text("print('b')")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert tracker.get_changed_files(tmp_path, [path]) == [path]
+
+    def test_legacy_state_file_loads(self, tmp_path):
+        tracker = FileTracker(persist_dir=str(tmp_path))
+        tracker.update_file("a.py", "abc", 10, 1)
+        tracker.save()
+        assert FileTracker(persist_dir=str(tmp_path)).get_file_state("a.py").mtime_ns == 0
@@ -0,0 +1,154 @@
+"""Tests for OllamaEmbeddingProvider's batched /api/embed path."""
+
+from __future__ import annotations
+
+import json
+import threading
+
+import httpx
+import pytest
+
+from tools.rag.embeddings.nomic_v2 import OllamaEmbeddingProvider
+
+DIM = 4
+
+
+def _vector(text: str) -> list[float]:
+    return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0, 0.0]
+
+
+class _StubOllama:
+    """Records /api/embed requests and answers with deterministic vectors."""
+
+    def __init__(self, context_chars: int = 10_000, status: int = 200, missing: tuple[str, ...] = ()) -> None:
+        self.context_chars = context_chars
+        self.status = status
+        self.missing = missing
+        self.requests: list[list[str]] = []
+        self._lock = threading.Lock()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/embed"
+        body = json.loads(request.content)
+        inputs = body["input"]
+        with self._lock:
+            self.requests.append(inputs)
+        if body["model"] in self.missing:
+            return httpx.Response(404, text="model not found")
+        if self.status != 200:
+            return httpx.Response(self.status, text="model not found")
+        if sum(len(t) for t in inputs) > self.context_chars:
+            return httpx.Response(500, text="the input length exceeds the context length")
+        return httpx.Response(200, json={"embeddings": [_vector(t) for t in inputs]})
+
+
+def _provider(stub: _StubOllama, **kwargs) -> OllamaEmbeddingProvider:
+    provider = OllamaEmbeddingProvider(**kwargs)
+    transport = httpx.MockTransport(stub.handler)
+    provider._create_client = lambda: httpx.Client(transport=transport)
+    provider._create_async_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(stub.handler))
+    return provider
+
+
+class TestEmbedBatch:
+    def test_packs_texts_into_few_requests(self):
+        stub = _StubOllama()
+        texts = [f"chunk number {i}" for i in range(10)]
+
+        result = _provider(stub, max_batch_size=4).embed_batch(texts)
+
+        assert result == [_vector(t) for t in texts]
+        assert sorted(len(r) for r in stub.requests) == [2, 4, 4]
+
+    def test_token_budget_bounds_requests(self):
+        stub = _StubOllama()
+        texts = ["x" * 300] * 6  # ~101 estimated tokens each
+
+        _provider(stub, batch_token_budget=250).embed_batch(texts)
+
+        assert all(len(r) <= 2 for r in stub.requests)
+        assert sum(len(r) for r in stub.requests) == 6
+
+    def test_blank_texts_skip_the_backend(self):
+        stub = _StubOllama()
+
+        result = _provider(stub).embed_batch(["", "hello", "   "])
+
+        assert stub.requests == [["hello"]]
+        assert result == [[0.0] * DIM, _vector("hello"), [0.0] * DIM]
+
+    def test_context_overflow_splits_batch(self):
+        stub = _StubOllama(context_chars=250)
+        texts = ["a" * 100, "b" * 100, "c" * 100, "d" * 100]
+
+        result = _provider(stub, max_in_flight=1).embed_batch(texts)
+
+        assert result == [_vector(t) for t in texts]
+        assert stub.requests[0] == texts
+        assert max(len(r) for r in stub.requests[1:]) <= 2
+
+    def test_oversized_single_text_is_shortened(self):
+        stub = _StubOllama(context_chars=100)
+
+        result = _provider(stub).embed_batch(["z" * 400])
+
+        assert result[0] == _vector("z" * 100)
+
+    def test_missing_model_raises_pull_guidance(self):
+        stub = _StubOllama(status=404)
+
+        with pytest.raises(RuntimeError, match="ollama pull"):
+            _provider(stub).embed_batch(["hello"])
+
+    def test_missing_model_falls_back_like_embed(self):
+        stub = _StubOllama(missing=("missing",))
+        provider = _provider(stub, model="missing")
+        provider._models_to_try = lambda: [provider.model, "present"]
+
+        assert provider.embed_batch(["hello", "world"]) == [_vector("hello"), _vector("world")]
+        assert provider.model == "present"
+        assert len(stub.requests) == 2
+
+    def test_blank_slots_get_separate_zero_vectors(self):
+        result = _provider(_StubOllama()).embed_batch(["", "hello", ""])
+
+        result[0][0] = 1.0
+        assert result[2] == [0.0] * DIM
+
+    def test_client_is_reused(self):
+        stub = _StubOllama()
+        provider = _provider(stub, max_batch_size=1)
+        provider.embed_batch(["a", "b", "c"])
+        client = provider._http
+
+        provider.embed_batch(["d"])
+
+        assert provider._http is client
+        provider.close()
+        assert provider._http is None
+
+
+class TestAsyncEmbedBatch:
+    async def test_matches_sync_path(self):
+        stub = _StubOllama(context_chars=250)
+        texts = ["a" * 100, "", "c" * 100, "d" * 100, "short"]
+        provider = _provider(stub, max_batch_size=2)
+
+        result = await provider.async_embed_batch(texts)
+
+        assert result == provider.embed_batch(texts)
+        await provider.aclose()
+
+    async def test_missing_model_falls_back(self):
+        stub = _StubOllama(missing=("missing",))
+        provider = _provider(stub, model="missing")
+        provider._models_to_try = lambda: [provider.model, "present"]
+
+        assert await provider.async_embed_batch(["hello"]) == [_vector("hello")]
+        assert provider.model == "present"
+        await provider.aclose()
+
+    async def test_async_embed_single(self):
+        provider = _provider(_StubOllama())
+        assert await provider.async_embed("hello") == _vector("hello")
+        assert provider.dimension == DIM
@@ -0,0 +1,121 @@
+"""Tests for OllamaReranker listwise scoring, score cache and early exit."""
+
+from __future__ import annotations
+
+import json
+import re
+
+import httpx
+import pytest
+
+from tools.rag.retrieval.reranker import OllamaReranker, _parse_listwise_scores
+
+DOCS = ["alpha relevant", "beta noise", "gamma relevant", "delta noise"]
+
+
+class _FakeOllama:
+    """Scores 9 for documents containing 'relevant', 1 otherwise."""
+
+    def __init__(self, omit: set[int] | None = None) -> None:
+        self.prompts: list[dict] = []
+        self.omit = omit or set()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.prompts.append(body)
+        prompt = body["prompt"]
+        if body.get("format") == "json":
+            docs = re.findall(r"^\[(\d+)\] (.*)$", prompt, flags=re.MULTILINE)
+            scores = {n: (9 if "relevant" in text else 1) for n, text in docs if int(n) not in self.omit}
+            return httpx.Response(200, json={"response": json.dumps(scores)})
+        document = prompt.split("Document: ", 1)[1]
+        return httpx.Response(200, json={"response": "9" if "relevant" in document else "1"})
+
+
+def _reranker(fake: _FakeOllama, **kwargs) -> OllamaReranker:
+    reranker = OllamaReranker(**kwargs)
+    reranker._client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler), base_url="http://ollama")
+    return reranker
+
+
+class TestOllamaReranker:
+    async def test_pointwise_parses_response(self):
+        fake = _FakeOllama()
+        result = await _reranker(fake, mode="pointwise").async_rerank("q", DOCS, top_k=2)
+
+        assert sorted(i for i, _ in result) == [0, 2]
+        assert all(score == 9.0 for _, score in result)
+        assert len(fake.prompts) == len(DOCS)
+
+    async def test_listwise_scores_in_one_call(self):
+        fake = _FakeOllama()
+        result = await _reranker(fake).async_rerank("q", DOCS, top_k=2)
+
+        assert sorted(i for i, _ in result) == [0, 2]
+        assert len(fake.prompts) == 1
+
+    async def test_listwise_groups_and_fills_omissions(self):
+        fake = _FakeOllama(omit={2})
+        reranker = _reranker(fake, listwise_batch_size=3)
+
+        result = await reranker.async_rerank("q", DOCS, top_k=2)
+
+        assert sorted(i for i, _ in result) == [0, 2]
+        # Groups of 3 and 1; the first answer omits its document [2] ("beta noise"), which is retried alone
+        assert [p.get("format") for p in fake.prompts].count("json") == 2
+        assert len(fake.prompts) == 3
+        assert fake.prompts[-1]["prompt"].endswith("Document: beta noise\n\nScore:")
+
+    async def test_score_cache_skips_repeat_calls(self):
+        fake = _FakeOllama()
+        reranker = _reranker(fake, mode="pointwise")
+        ids = [f"doc#{i}" for i in range(len(DOCS))]
+
+        await reranker.async_rerank("q", DOCS, top_k=2, ids=ids)
+        await reranker.async_rerank("q", [*DOCS, "epsilon relevant"], top_k=2, ids=[*ids, "doc#4"])
+
+        assert len(fake.prompts) == len(DOCS) + 1
+        stats = reranker.get_stats()
+        assert stats["cache_hits"] == len(DOCS)
+        assert stats["cache_size"] == len(DOCS) + 1
+
+    async def test_cache_is_lru_bounded_and_keyed_by_query(self):
+        fake = _FakeOllama()
+        reranker = _reranker(fake, mode="pointwise", cache_size=3)
+
+        await reranker.async_rerank("q1", DOCS, top_k=2)
+        await reranker.async_rerank("q2", DOCS[:1], top_k=1)
+
+        assert reranker.get_stats()["cache_size"] == 3
+        assert len(fake.prompts) == len(DOCS) + 1
+
+    async def test_failed_scores_are_not_cached(self):
+        reranker = OllamaReranker(mode="pointwise")
+        reranker._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(500)), base_url="http://ollama"
+        )
+
+        result = await reranker.async_rerank("q", DOCS[:2], top_k=2)
+
+        assert [score for _, score in result] == [0.0, 0.0]
+        assert reranker.get_stats()["cache_size"] == 0
+
+    async def test_early_exit_on_decisive_margin(self):
+        fake = _FakeOllama()
+        reranker = _reranker(fake, early_exit_margin=0.2)
+
+        decisive = await reranker.async_rerank("q", DOCS, top_k=2, distances=[0.1, 0.15, 0.6, 0.7])
+        assert [i for i, _ in decisive] == [0, 1]
+        assert decisive[0][1] == pytest.approx(9.0)
+        assert fake.prompts == []
+
+        await reranker.async_rerank("q", DOCS, top_k=2, distances=[0.1, 0.15, 0.2, 0.7])
+        assert len(fake.prompts) == 1
+        assert reranker.get_stats()["early_exits"] == 1
+
+
+def test_parse_listwise_formats():
+    assert _parse_listwise_scores('{"1": 7, "[2]": "3", "9": 5}', 2) == {0: 7.0, 1: 3.0}
+    assert _parse_listwise_scores('{"scores": [2, 11]}', 2) == {0: 2.0, 1: 10.0}
+    assert _parse_listwise_scores("1: 4\n2 = 8.5", 2) == {0: 4.0, 1: 8.5}
+    assert _parse_listwise_scores("no scores here", 2) == {}
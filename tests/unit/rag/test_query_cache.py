@@ -0,0 +1,106 @@
+"""Tests for the two-tier RAG QueryCache."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from tools.rag.cache import QueryCache
+
+SOURCES = [{"index": 1, "distance": 0.1, "metadata": {"path": "a.py"}}]
+
+
+def _set(cache: QueryCache, query: str, answer: str = "answer") -> None:
+    cache.set(query=query, top_k=5, source_ids=["a"], chunk_count=1, answer=answer, sources=SOURCES)
+
+
+def _get(cache: QueryCache, query: str):
+    return cache.get(query=query, top_k=5, source_ids=["a"], chunk_count=1)
+
+
+class TestExactTier:
+    def test_evicts_least_recently_used(self):
+        cache = QueryCache(max_size=2)
+        _set(cache, "q1")
+        _set(cache, "q2")
+        assert _get(cache, "q1") is not None  # q1 becomes most recently used
+
+        _set(cache, "q3")
+
+        assert _get(cache, "q2") is None
+        assert _get(cache, "q1") is not None
+        assert _get(cache, "q3") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_byte_cap_bounds_cache(self):
+        cache = QueryCache(max_size=100, max_bytes=2_000)
+        for i in range(10):
+            _set(cache, f"q{i}", answer="x" * 500)
+
+        assert cache.size_bytes <= 2_000
+        assert len(cache.cache) < 10
+        assert _get(cache, "q9") is not None
+
+    def test_resetting_a_key_keeps_byte_count(self):
+        cache = QueryCache()
+        _set(cache, "q", answer="short")
+        _set(cache, "q", answer="a much longer answer")
+        assert len(cache.cache) == 1
+        assert cache.size_bytes == next(iter(cache.cache.values())).size_bytes
+
+    def test_expired_entry_is_a_miss(self):
+        cache = QueryCache(ttl_seconds=60)
+        _set(cache, "q")
+        next(iter(cache.cache.values())).created_at = datetime.now(UTC) - timedelta(seconds=120)
+
+        assert _get(cache, "q") is None
+        assert cache.size_bytes == 0
+
+
+class TestSemanticTier:
+    def test_near_duplicate_query_hits(self):
+        cache = QueryCache(semantic_threshold=0.95)
+        base = np.ones(8)
+        cache.set_semantic(base, top_k=5, answer="cached", sources=SOURCES, generation=cache.generation)
+
+        hit = cache.get_semantic(base + 0.01, top_k=5)
+
+        assert hit is not None
+        assert hit["answer"] == "cached"
+        assert hit["cache_similarity"] == pytest.approx(1.0, abs=1e-3)
+
+    def test_dissimilar_query_or_other_top_k_misses(self):
+        cache = QueryCache(semantic_threshold=0.95)
+        cache.set_semantic(np.eye(8)[0], top_k=5, answer="cached", sources=SOURCES, generation=cache.generation)
+
+        assert cache.get_semantic(np.eye(8)[1], top_k=5) is None
+        assert cache.get_semantic(np.eye(8)[0], top_k=10) is None
+        assert cache.get_stats()["semantic_misses"] == 2
+
+    def test_generation_change_invalidates(self):
+        cache = QueryCache()
+        generation = cache.generation
+        cache.set_semantic(np.ones(4), top_k=5, answer="old", sources=SOURCES, generation=generation)
+        cache.advance_generation()
+
+        assert cache.get_semantic(np.ones(4), top_k=5) is None
+        # A response computed against the old index is not cached either
+        cache.set_semantic(np.ones(4), top_k=5, answer="stale", sources=SOURCES, generation=generation)
+        assert cache.get_semantic(np.ones(4), top_k=5) is None
+
+    def test_disabled_with_zero_threshold(self):
+        cache = QueryCache(semantic_threshold=0)
+        cache.set_semantic(np.ones(4), top_k=5, answer="cached", sources=SOURCES, generation=cache.generation)
+        assert not cache.semantic_enabled
+        assert cache.get_semantic(np.ones(4), top_k=5) is None
+
+    def test_semantic_tier_is_lru_bounded(self):
+        cache = QueryCache(max_size=3)
+        for i in range(5):
+            cache.set_semantic(np.eye(8)[i], top_k=5, answer=str(i), sources=SOURCES, generation=cache.generation)
+
+        assert cache.get_stats()["semantic_size"] == 3
+        assert cache.get_semantic(np.eye(8)[0], top_k=5) is None
+        assert cache.get_semantic(np.eye(8)[4], top_k=5)["answer"] == "4"
@@ -0,0 +1,122 @@
+"""Tests for RAGEngine.astream_query and background retrieval evaluation."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from tools.rag import rag_engine
+from tools.rag.config import ModelMode, RAGConfig
+from tools.rag.rag_engine import RAGEngine
+
+CHUNKS = ["The ", "engine ", "streams."]
+
+
+class _StreamingLLM:
+    """LLM stub whose stream can be held open until the test releases it."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def async_generate(self, prompt: str, temperature: float = 0.7, **kwargs) -> str:
+        return "".join(CHUNKS)
+
+    async def async_stream(self, prompt: str, temperature: float = 0.7, **kwargs):
+        yield CHUNKS[0]
+        await self.release.wait()
+        for chunk in CHUNKS[1:]:
+            yield chunk
+
+
+@pytest.fixture
+def engine(monkeypatch, tmp_path):
+    llm = _StreamingLLM()
+    monkeypatch.setattr(rag_engine, "get_llm_provider", lambda config: llm)
+    config = RAGConfig(
+        embedding_provider="simple",
+        llm_mode=ModelMode.CLOUD,
+        vector_store_provider="in_memory",
+        vector_store_path=str(tmp_path),
+        use_hybrid=False,
+        use_reranker=False,
+        use_intelligent_rag=False,
+        top_k=2,
+    )
+    engine = RAGEngine(config=config)
+    engine.add_documents(
+        ["The RAG engine streams answers token by token.", "Unrelated notes about gardening."],
+        ids=["a", "b"],
+        metadatas=[{"path": "a.md"}, {"path": "b.md"}],
+    )
+    return engine
+
+
+async def _collect(stream) -> list[dict]:
+    return [event async for event in stream]
+
+
+class TestAstreamQuery:
+    async def test_yields_sources_tokens_then_done(self, engine):
+        events = await _collect(engine.astream_query("How does the engine stream?"))
+
+        assert [e["type"] for e in events] == ["sources", "token", "token", "token", "done"]
+        assert [e["data"]["text"] for e in events if e["type"] == "token"] == CHUNKS
+        done = events[-1]["data"]
+        assert done["answer"] == "".join(CHUNKS)
+        assert done["cached"] is False
+        assert {s["metadata"]["path"] for s in done["sources"]} == {"a.md", "b.md"}
+        await engine.drain_background_tasks()
+
+    async def test_first_token_arrives_before_generation_finishes(self, engine):
+        engine.llm_provider.release.clear()
+        stream = engine.astream_query("How does the engine stream?", include_sources=False)
+
+        first = await asyncio.wait_for(anext(stream), timeout=5)
+        assert first == {"type": "token", "data": {"text": CHUNKS[0]}}
+
+        engine.llm_provider.release.set()
+        rest = await _collect(stream)
+        assert rest[-1]["type"] == "done"
+        assert "sources" not in rest[-1]["data"]
+        await engine.drain_background_tasks()
+
+    async def test_evaluation_runs_off_the_critical_path(self, engine, monkeypatch):
+        unblock = threading.Event()
+        evaluated = []
+
+        def slow_evaluate(query, retrieved_docs, golden_docs=None):
+            unblock.wait(timeout=10)
+            evaluated.append(query)
+            return {"context_relevance_avg": 0.5}
+
+        monkeypatch.setattr(engine._evaluator, "evaluate_retrieval", slow_evaluate)
+
+        events = await asyncio.wait_for(_collect(engine.astream_query("engine stream")), timeout=5)
+        assert events[-1]["type"] == "done"
+        assert "evaluation_metrics" not in events[-1]["data"]
+        assert evaluated == []
+
+        unblock.set()
+        await engine.drain_background_tasks()
+        assert evaluated == ["engine stream"]
+        assert not engine._background_tasks
+
+    async def test_cached_answer_is_a_single_token(self, engine):
+        await _collect(engine.astream_query("engine stream"))
+        events = await _collect(engine.astream_query("engine stream"))
+
+        assert [e["type"] for e in events] == ["sources", "token", "done"]
+        assert events[-1]["data"]["cached"] is True
+        assert events[1]["data"]["text"] == "".join(CHUNKS)
+        await engine.drain_background_tasks()
+
+
+async def test_query_still_reports_evaluation_metrics(engine):
+    result = await engine.query("How does the engine stream?")
+
+    assert result["answer"] == "".join(CHUNKS)
+    assert "context_relevance_avg" in result["evaluation_metrics"]
+    assert not engine._background_tasks
@@ -11,6 +11,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
 from datetime import datetime, timedelta
 
@@ -282,6 +283,123 @@ def filter_fn(event):
         assert len(received) == 1
 
 
+class TestSubscriptionMatching:
+    """The compiled pattern index must agree with EventSubscription.matches."""
+
+    PATTERNS = [
+        "input:cli:received",
+        "input:cli:*",
+        "input:*",
+        "inp*",
+        "*",
+        "input:*:received",
+        "*:cli:*:x",
+        "*:*",
+        "input:*:*",
+        "a*b:c",
+        "input:cli",
+    ]
+    EVENT_TYPES = [
+        "input:cli:received",
+        "input:cli:sent",
+        "input:api:received",
+        "input:cli",
+        "input",
+        "output:cli:deep:x",
+        "a*b:c",
+        "axb:c",
+        "input:*:z",
+        "",
+        "x:y",
+    ]
+
+    def test_index_matches_reference(self):
+        """Every subscription found for an event type must satisfy matches(), and vice versa."""
+        bus = EventBus(store_events=False)
+        subs = {bus.subscribe(pattern, lambda e: None): pattern for pattern in self.PATTERNS}
+
+        for event_type in self.EVENT_TYPES:
+            found = {s.subscription_id for s in bus._get_matching_subscriptions(Event(event_type, {}, "t"))}
+            expected = {sid for sid in subs if bus._subscriptions[sid].matches(event_type)}
+            assert found == expected, event_type
+
+    def test_cache_invalidated_on_subscribe_and_unsubscribe(self):
+        """Subscriptions added or removed after an emit are seen by the next emit."""
+        bus = EventBus(store_events=False)
+        received = []
+
+        bus.emit(Event(type="test:event", data={}, source="test"))
+        sub_id = bus.subscribe("test:*", lambda e: received.append(e))
+        bus.emit(Event(type="test:event", data={}, source="test"))
+        bus.unsubscribe(sub_id)
+        bus.emit(Event(type="test:event", data={}, source="test"))
+
+        assert len(received) == 1
+        assert bus.get_stats()["patterns"] == 0
+
+    async def test_emit_async_runs_coroutine_handlers_concurrently(self):
+        """Coroutine handlers should overlap rather than run one after another."""
+        bus = EventBus(store_events=False)
+        running = 0
+        peak = 0
+
+        async def handler(event):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for _ in range(5):
+            bus.subscribe("test:*", handler)
+        sync_received = []
+        bus.subscribe("test:*", lambda e: sync_received.append(e))
+
+        await bus.emit_async(Event(type="test:event", data={}, source="test"))
+
+        assert peak == 5
+        assert len(sync_received) == 1
+        assert bus.get_stats()["events_delivered"] == 6
+
+    async def test_emit_async_handler_timeout(self):
+        """A handler exceeding its timeout counts as an error without blocking the others."""
+        bus = EventBus(handler_timeout=0.01)
+        done = []
+
+        async def slow(event):
+            await asyncio.sleep(1)
+
+        async def fast(event):
+            done.append(event)
+
+        bus.subscribe("test:*", slow)
+        bus.subscribe("test:*", fast, once=True)
+        await bus.emit_async(Event(type="test:event", data={}, source="test"))
+
+        assert len(done) == 1
+        assert bus.get_stats()["errors"] == 1
+        assert bus.get_stats()["subscriptions"] == 1
+        assert bus.get_event_store().get_by_type("system:error:handler_failed")
+
+    async def test_emit_async_awaits_async_callable_objects(self):
+        """Objects with an ``async def __call__`` are dispatched as coroutine handlers."""
+        bus = EventBus(store_events=False)
+
+        class Handler:
+            def __init__(self):
+                self.received = []
+
+            async def __call__(self, event):
+                self.received.append(event)
+
+        handler = Handler()
+        bus.subscribe("test:*", handler)
+        await bus.emit_async(Event(type="test:event", data={}, source="test"))
+
+        assert len(handler.received) == 1
+        assert bus.get_stats()["events_delivered"] == 1
+
+
 class TestMiddleware:
     """Tests for middleware components."""
 
@@ -372,3 +372,70 @@ def test_unicode_characters(self):
         result = sanitize_text("Hello 世界 🌍")
 
         assert "Hello 世界 🌍" in result or "Hello" in result
+
+
+class TestCombinedScanner:
+    """Tests for the combined scanner, safe-text fast path and verdict cache."""
+
+    def test_safe_text_fast_path(self):
+        """Plain words and punctuation should pass through untouched."""
+        sanitizer = InputSanitizer()
+        result = sanitizer.sanitize_text_full("Hello, World! Version 2.0 is out.")
+
+        assert result.is_safe is True
+        assert result.sanitized_content == "Hello, World! Version 2.0 is out."
+        assert result.modifications_made == []
+
+    def test_safe_chars_still_checked_for_sql(self):
+        """SQL keywords are made of safe characters and must still be detected."""
+        sanitizer = InputSanitizer()
+        result = sanitizer.sanitize_text_full("1 UNION SELECT password")
+
+        assert result.is_safe is False
+        assert any(t["type"] == ThreatType.SQL_INJECTION.value for t in result.threats_detected)
+
+    def test_removal_order_preserved(self):
+        """Patterns should apply in order, each on the output of the previous one."""
+        sanitizer = InputSanitizer()
+        result = sanitizer.sanitize_text_full("<script>x</script> ../etc eval(1)")
+        types = [t["type"] for t in result.threats_detected]
+
+        assert types == [ThreatType.XSS.value, ThreatType.CODE_INJECTION.value, ThreatType.PATH_TRAVERSAL.value]
+
+    def test_non_ascii_lookalikes_detected(self):
+        """Case-insensitive matches outside ASCII should not be skipped by the anchor check."""
+        sanitizer = InputSanitizer()
+        result = sanitizer.sanitize_text_full("<ſcript>alert(1)")
+
+        assert any(t["type"] == ThreatType.XSS.value for t in result.threats_detected)
+
+    def test_cached_verdict_is_a_copy(self):
+        """Cache hits should return results callers can modify safely."""
+        sanitizer = InputSanitizer()
+        first = sanitizer.sanitize_text_full("javascript:alert(1)")
+        first.threats_detected.clear()
+        second = sanitizer.sanitize_text_full("javascript:alert(1)")
+
+        assert second.threats_detected
+        assert second.sanitized_content == first.sanitized_content
+
+    def test_verdict_cache_bounded(self):
+        """The verdict cache should evict beyond its configured size."""
+        sanitizer = InputSanitizer(SanitizationConfig(verdict_cache_size=2))
+        for text in ("a", "b", "c"):
+            sanitizer.sanitize_text_full(text)
+
+        assert list(sanitizer._verdicts) == ["b", "c"]
+
+    def test_long_strings_not_cached(self):
+        """Strings above the cacheable length should not be cached."""
+        sanitizer = InputSanitizer(SanitizationConfig(verdict_cache_max_length=4))
+        sanitizer.sanitize_text_full("longer than four")
+
+        assert len(sanitizer._verdicts) == 0
+
+    def test_detect_threats_clean_text(self):
+        """detect_threats should return nothing for clean text."""
+        sanitizer = InputSanitizer()
+
+        assert sanitizer.detect_threats("just a normal sentence") == []
@@ -140,3 +140,98 @@ def test_registry_creates_different_trackers_for_different_sessions(self):
         assert tracker1 is not tracker2
         assert tracker1.session_id == "session-1"
         assert tracker2.session_id == "session-2"
+
+
+@pytest.mark.unit
+class TestStreamContextBudgets:
+    """Test sharded session storage, eviction and expiry."""
+
+    def test_least_recently_used_session_is_evicted(self):
+        from vection.core.stream_context import StreamContext
+
+        ctx = StreamContext(max_sessions=3, shard_count=1)
+        dissolved = []
+        ctx.on("session_dissolved", dissolved.append)
+        for session_id in ("s1", "s2", "s3"):
+            ctx.create_session(session_id)
+
+        ctx.get_session("s1")
+        ctx.create_session("s4")
+
+        assert sorted(ctx.list_sessions()) == ["s1", "s3", "s4"]
+        assert dissolved == ["s2"]
+        assert ctx.get_stats()["sessions_evicted"] == 1
+
+    def test_shards_hold_their_share_of_the_budget(self):
+        from vection.core.stream_context import StreamContext
+
+        ctx = StreamContext(max_sessions=64, shard_count=8)
+        for i in range(500):
+            ctx.create_session(f"session-{i}")
+
+        stats = ctx.get_stats()
+        assert stats["active_sessions"] == ctx.get_session_count() <= 64
+        assert stats["sessions_evicted"] == 500 - stats["active_sessions"]
+        assert stats["retained_histories"] <= 64
+
+    def test_least_recently_used_thread_is_evicted(self):
+        from vection.core.stream_context import StreamContext
+
+        ctx = StreamContext(max_threads_per_session=2)
+        ctx.create_session("s1")
+        ctx.create_thread("s1", "t1")
+        ctx.create_thread("s1", "t2")
+        ctx.get_thread("s1", "t1")
+        ctx.create_thread("s1", "t3")
+
+        assert ctx.list_threads("s1") == ["t1", "t3"]
+
+    async def test_cleanup_expires_only_idle_sessions_and_threads(self):
+        import time
+        from datetime import datetime
+
+        from vection.core.stream_context import StreamContext
+
+        ctx = StreamContext(session_ttl_hours=1.0, thread_ttl_hours=1.0)
+        ctx.create_session("idle")
+        busy = ctx.create_session("busy")
+        ctx.create_thread("busy", "t-idle")
+        busy_thread = ctx.create_thread("busy", "t-busy")
+
+        # Two hours on, only the busy session and thread have seen activity
+        later = time.time() + 2 * 3600
+        busy.last_updated = busy_thread.last_active = datetime.fromtimestamp(later - 60)
+        with patch("vection.core.stream_context.time.time", return_value=later):
+            stats = await ctx.cleanup()
+
+        assert stats["sessions_dissolved"] == 1
+        assert stats["threads_dissolved"] == 1
+        assert ctx.list_sessions() == ["busy"]
+        assert ctx.list_threads("busy") == ["t-busy"]
+        assert ctx.get_stats()["sessions_expired"] == 1
+
+
+@pytest.mark.unit
+class TestEngineDecay:
+    """Idle expiry in the engine's periodic decay."""
+
+    async def _run(self, interact: bool) -> list[str]:
+        from vection.core.engine import Vection
+
+        clock = [1_000_000.0]
+        with patch("vection.core.engine.time.time", side_effect=lambda: clock[0]):
+            engine = Vection()
+            await engine.establish("s1", {})
+            for _ in range(13):  # Decay passes 301 s apart: over an hour in total
+                clock[0] += 301.0
+                if interact:
+                    await engine.establish("s1", {})
+                else:
+                    await engine._maybe_decay()
+        return engine.get_all_sessions()
+
+    async def test_idle_session_expires_after_an_hour_of_decay_passes(self):
+        assert await self._run(interact=False) == []
+
+    async def test_active_session_survives_decay_passes(self):
+        assert await self._run(interact=True) == ["s1"]
@@ -0,0 +1,45 @@
+"""Tests for the TimerWheel used by StreamContext and the engine."""
+
+import pytest
+
+from vection.core.timer_wheel import TimerWheel
+
+
+@pytest.mark.unit
+class TestTimerWheel:
+    def test_keys_fire_once_their_slot_elapses(self):
+        wheel: TimerWheel[str] = TimerWheel(resolution=10.0, slots=8, start=1000.0)
+        wheel.schedule("a", 1015.0)
+        wheel.schedule("b", 1042.0)
+
+        assert wheel.advance(1016.0) == []  # Slot 1010-1020 still open
+        assert wheel.advance(1020.0) == ["a"]
+        assert wheel.advance(1049.0) == []
+        assert wheel.advance(1050.0) == ["b"]
+        assert len(wheel) == 0
+
+    def test_deadlines_beyond_one_revolution_wait_for_their_lap(self):
+        wheel: TimerWheel[str] = TimerWheel(resolution=10.0, slots=4, start=0.0)
+        wheel.schedule("far", 95.0)  # Shares a slot with 15, 55
+
+        assert wheel.advance(60.0) == []
+        assert "far" in wheel
+        assert wheel.advance(500.0) == ["far"]
+
+    def test_reschedule_and_cancel(self):
+        wheel: TimerWheel[str] = TimerWheel(resolution=1.0, slots=16, start=0.0)
+        wheel.schedule("a", 3.0)
+        wheel.schedule("a", 9.0)
+        wheel.schedule("b", 2.0)
+        assert wheel.cancel("b")
+        assert not wheel.cancel("b")
+
+        assert wheel.advance(5.0) == []
+        assert wheel.advance(10.0) == ["a"]
+
+    def test_past_deadlines_fire_on_next_elapsed_slot(self):
+        wheel: TimerWheel[str] = TimerWheel(resolution=1.0, slots=16, start=0.0)
+        wheel.advance(50.0)
+        wheel.schedule("late", 10.0)
+
+        assert wheel.advance(51.0) == ["late"]
@@ -91,6 +91,59 @@ def test_different_sessions_independent(self):
         # session2 should still have quota
         assert limiter.allow("session2", "default")
 
+    def test_sliding_window_weights_previous_window(self):
+        """Test that the previous window's count decays across the current one."""
+        from vection.security.rate_limiter import RateLimitEntry
+
+        entry = RateLimitEntry(window_start=0.0)
+        for _ in range(10):
+            entry.add_request()
+
+        assert entry.estimate(10.0, now=5.0) == 10
+        # A quarter into the next window, three quarters of the old count remain
+        assert entry.estimate(10.0, now=12.5) == 7.5
+        # Two windows later nothing remains
+        assert entry.estimate(10.0, now=31.0) == 0
+
+    def test_retry_after_when_blocked(self):
+        """Test that retry_after points at the time a request is allowed again."""
+        from vection.security.rate_limiter import RateLimitEntry
+
+        entry = RateLimitEntry(window_start=0.0)
+        for _ in range(10):
+            entry.add_request()
+
+        wait = entry.retry_after(limit=5, window_seconds=10.0, now=2.0)
+        assert wait == 13.0
+        assert entry.estimate(10.0, now=2.0 + wait + 0.01) < 5
+
+    def test_get_session_status_does_not_consume(self):
+        """Test that get_session_status reports without consuming quota."""
+        from vection.security.rate_limiter import RateLimitConfig, RateLimiter
+
+        limiter = RateLimiter(config=RateLimitConfig(default_limit=2, enable_logging=False))
+        limiter.allow("session1", "default")
+
+        status = limiter.get_session_status("session1")["default"]
+        assert status.current_count == 1
+        assert limiter.allow("session1", "default")
+        assert not limiter.allow("session1", "default")
+
+    def test_sharded_limits_hold_across_threads(self):
+        """Test that concurrent checks never allow more than the limit."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from vection.security.rate_limiter import RateLimitConfig, RateLimiter
+
+        limiter = RateLimiter(config=RateLimitConfig(default_limit=50, enable_logging=False, lock_shards=4))
+        sessions = [f"session{i}" for i in range(8)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: limiter.allow(sessions[i % 8], "default"), range(800)))
+
+        assert sum(results) == 8 * 50
+        assert limiter.get_stats()["active_sessions"] == 8
+
 
 @pytest.mark.unit
 class TestInputValidator:
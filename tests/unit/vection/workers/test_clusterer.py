@@ -0,0 +1,106 @@
+"""Tests for the Clusterer's centroid index and incremental centroids."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from vection.workers.clusterer import CentroidIndex, Cluster, Clusterer, ClusterMember, ClusterType
+
+WORDS = ["alpha", "bravo", "charlie", "delta", "echoes", "foxtrot", "golfer"]
+
+
+def _cluster(cluster_id: str, centroid: dict) -> Cluster:
+    return Cluster(cluster_id=cluster_id, cluster_type=ClusterType.FEATURE, label=cluster_id, centroid=centroid)
+
+
+def _features(rng: random.Random) -> dict:
+    features = {key: rng.choice(["a", "b", "c"]) for key in ("action", "topic", "domain") if rng.random() < 0.7}
+    if rng.random() < 0.6:
+        features["keywords"] = tuple(sorted(rng.choices(WORDS, k=rng.randint(1, 5))))
+    return features
+
+
+@pytest.mark.unit
+class TestCentroidIndex:
+    def test_scores_match_dict_similarity(self):
+        rng = random.Random(0)
+        clusterer = Clusterer()
+        index = CentroidIndex(capacity=4)  # Exercise growth
+        centroids = {f"c{i}": _features(rng) for i in range(40)}
+        for cluster_id, centroid in centroids.items():
+            index.set(_cluster(cluster_id, centroid))
+        for cluster_id in ("c3", "c17", "c39"):
+            index.remove(cluster_id)
+            del centroids[cluster_id]
+
+        for _ in range(50):
+            features = _features(rng)
+            scores = index.similarities(features)
+            for cluster_id, score in zip(index.cluster_ids, scores, strict=True):
+                assert score == pytest.approx(clusterer._calculate_similarity(features, centroids[cluster_id]))
+
+    def test_similar_pairs_match_pairwise_scan(self):
+        rng = random.Random(1)
+        clusterer = Clusterer()
+        index = CentroidIndex()
+        index.BLOCK_COLUMNS = 7  # Exercise blocking
+        centroids = {f"c{i}": _features(rng) for i in range(30)}
+        for cluster_id, centroid in centroids.items():
+            index.set(_cluster(cluster_id, centroid))
+
+        ids = list(centroids)
+        expected = [
+            (a, b)
+            for i, a in enumerate(ids)
+            for b in ids[i + 1 :]
+            if clusterer._calculate_similarity(centroids[a], centroids[b]) > 0.5
+        ]
+        assert index.similar_pairs(0.5) == expected
+
+
+@pytest.mark.unit
+class TestIncrementalCentroid:
+    def test_centroid_follows_capped_members(self):
+        rng = random.Random(2)
+        cluster = _cluster("c", {})
+        for i in range(250):
+            features = {"action": rng.choice("xxy"), "topic": rng.choice("pq")}
+            cluster.add_member(ClusterMember(f"e{i}", 0.0, "s", features, distance_to_centroid=rng.random()))
+
+        assert cluster.size == 100
+        for key in ("action", "topic"):
+            counts = Counter(m.features[key] for m in cluster.members)
+            assert counts[cluster.centroid[key]] == max(counts.values())
+        average = sum(m.distance_to_centroid for m in cluster.members) / 100
+        assert cluster.stability_score == pytest.approx(1.0 - average)
+
+
+@pytest.mark.unit
+class TestClustering:
+    async def test_similar_events_share_a_cluster_and_merge(self):
+        clusterer = Clusterer(similarity_threshold=0.7)
+        for _ in range(5):
+            clusterer.observe({"action": "search", "topic": "billing"}, "s1")
+        clusterer.observe({"action": "login", "topic": "account"}, "s2")
+        assert clusterer.cluster_count == 2
+
+        # A second cluster with the same centroid, as left behind by eviction and re-creation
+        duplicate = clusterer._create_cluster(clusterer._observations[0])
+        assert clusterer.cluster_count == 3
+
+        await clusterer._merge_clusters()
+        assert clusterer.cluster_count == 2
+        assert duplicate.cluster_id not in clusterer._index.cluster_ids
+        assert sorted(c["size"] for c in clusterer.get_clusters()) == [1, 6]
+
+    def test_eviction_keeps_index_in_step(self):
+        clusterer = Clusterer(max_clusters=3)
+        for _ in range(3):
+            clusterer.observe({"action": "popular"}, "s1")
+        for i in range(10):
+            clusterer.observe({"action": f"action-{i}"}, "s1")
+
+        assert clusterer.cluster_count == 3
+        assert sorted(clusterer._index.cluster_ids) == sorted(clusterer._clusters)
+        assert "action:popular" in {c["label"] for c in clusterer.get_clusters()}
@@ -0,0 +1,104 @@
+"""Tests for the Correlator's incremental temporal and sequence counting."""
+
+import random
+from collections import defaultdict
+from unittest.mock import patch
+
+import pytest
+
+from vection.workers.correlator import CorrelationType, Correlator
+
+
+def _feed(correlator: Correlator, events: list[tuple[float, str, str]]) -> None:
+    """Observe (timestamp, session, action) events at their timestamps."""
+    for timestamp, session, action in events:
+        with patch("vection.workers.correlator.time.time", return_value=timestamp):
+            correlator.observe({"action": action}, session)
+
+
+def _candidates(correlator: Correlator, correlation_type: CorrelationType) -> dict[frozenset, tuple[int, float]]:
+    return {
+        frozenset((c.item_a, c.item_b)): (c.occurrence_count, c.confidence_accumulator)
+        for c in correlator._candidates.values()
+        if c.correlation_type == correlation_type
+    }
+
+
+def _events(count: int, seed: int = 0) -> list[tuple[float, str, str]]:
+    rng = random.Random(seed)
+    now = 1_700_000_000.0
+    events = []
+    for _ in range(count):
+        now += rng.uniform(0, 3)
+        events.append((now, f"s{rng.randrange(4)}", rng.choice("abcde")))
+    return events
+
+
+@pytest.mark.unit
+class TestTemporalCorrelation:
+    async def test_matches_pairwise_count(self):
+        events = _events(300)
+        correlator = Correlator(temporal_window_seconds=20.0, max_observations=50)
+        _feed(correlator, events)
+        await correlator._detect_temporal_correlations()
+
+        expected: dict[frozenset, list[float]] = defaultdict(lambda: [0, 0.0])
+        for j, (t_b, session_b, type_b) in enumerate(events):
+            for t_a, session_a, type_a in events[max(0, j - 49) : j]:
+                if t_b - t_a >= 20.0 or (type_a == type_b and session_a == session_b):
+                    continue
+                pair = expected[frozenset((type_a, type_b))]
+                pair[0] += 1
+                pair[1] += 0.1 * (1.0 - (t_b - t_a) / 20.0)
+
+        found = _candidates(correlator, CorrelationType.TEMPORAL)
+        assert found.keys() == expected.keys()
+        for pair, (count, total) in expected.items():
+            assert found[pair][0] == count
+            assert found[pair][1] == pytest.approx(total)
+
+    async def test_pairs_are_counted_once(self):
+        correlator = Correlator(temporal_window_seconds=60.0)
+        _feed(correlator, [(100.0, "s1", "login"), (101.0, "s2", "search")])
+
+        await correlator._detect_temporal_correlations()
+        await correlator._detect_temporal_correlations()
+
+        assert [c.occurrence_count for c in correlator._candidates.values()] == [1]
+
+
+@pytest.mark.unit
+class TestSequenceCorrelation:
+    async def test_matches_rescan_of_session_sequences(self):
+        events = _events(400, seed=1)
+        correlator = Correlator()
+        _feed(correlator, events)
+        await correlator._detect_sequence_correlations()
+
+        sequences: dict[str, list[str]] = defaultdict(list)
+        for _, session, action in events:
+            sequences[session].append(action)
+        expected: dict[frozenset, list[float]] = defaultdict(lambda: [0, 0.0])
+        for sequence in sequences.values():
+            recent = sequence[-20:]
+            pairs: dict[tuple[str, str], int] = defaultdict(int)
+            for a, b in zip(recent, recent[1:], strict=False):
+                if a != b:
+                    pairs[(a, b)] += 1
+            for (a, b), count in pairs.items():
+                if count >= 2:
+                    expected[frozenset((a, b))][0] += 1
+                    expected[frozenset((a, b))][1] += 0.1 * count
+
+        found = _candidates(correlator, CorrelationType.SEQUENCE)
+        assert found.keys() == expected.keys()
+        for pair, (count, total) in expected.items():
+            assert found[pair][0] == count
+            assert found[pair][1] == pytest.approx(total)
+
+    def test_reset_clears_incremental_state(self):
+        correlator = Correlator()
+        _feed(correlator, _events(50))
+        correlator.reset()
+
+        assert not correlator._window and not correlator._repeated_pairs and not correlator._pending_temporal